@@ -0,0 +1,621 @@
+#!/usr/bin/env python3
+"""
+Load test for the Lambda handlers of the Python services
+
+Builds API Gateway proxy events for every function in a service's
+serverless.yml (scheduled and SQS functions get their own event shapes),
+fills them from services/<service>/scripts/load_scenarios.json, and invokes
+the handlers in-process with a thread pool against the database configured by
+DB_HOST/DB_PORT/DB_NAME/DB_USER/DB_PASSWORD (a local Postgres seeded with the
+services' setup scripts; see docker-compose.yml).
+
+Per endpoint it reports throughput, p50/p95/p99 latency, status codes and
+queries per request. Query counts come from timing_utils: its per-request
+record is captured instead of printed. Results are written as JSON so runs
+can be compared with --compare.
+
+Each service runs in its own Python process because the services share module
+names (db_utils, query_utils, ...) on their flat import path.
+
+Events are generated deterministically from --seed; --dump-events writes them
+as JSON lines (no database needed) and --replay runs a JSON-lines file of
+recorded events ({"service", "function", "event"}) instead.
+
+Writes (POST/PUT/DELETE, scheduled and queue functions) change data, so they
+only run with --include-writes.
+
+Examples:
+    python scripts/load_test.py --concurrency 8 --requests 200
+    python scripts/load_test.py --service product-service \
+        --endpoint products_list --endpoint products_get
+    python scripts/load_test.py --output loadtest-results/after.json \
+        --compare loadtest-results/before.json
+    python scripts/load_test.py --dump-events loadtest-results/events.jsonl
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICES = ("product-service", "payment-service", "user-service")
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+SCENARIOS_FILE = os.path.join("scripts", "load_scenarios.json")
+
+
+# --- Events -------------------------------------------------------------------
+
+
+class LambdaContext:
+    """The parts of the Lambda context object the handlers use"""
+
+    def __init__(self, function_name: str, request_id: str, timeout_ms: int = 900000):
+        self.function_name = function_name
+        self.aws_request_id = request_id
+        self.memory_limit_in_mb = 512
+        self._deadline = time.monotonic() + timeout_ms / 1000
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def api_event(
+    method: str,
+    resource: str,
+    path_parameters: Dict[str, Any],
+    query: Dict[str, Any],
+    body: Any,
+    headers: Dict[str, str],
+    request_id: str,
+) -> Dict[str, Any]:
+    """API Gateway REST (v1) proxy event, as Lambda receives it"""
+    path = resource
+    for name, value in path_parameters.items():
+        path = path.replace("{%s}" % name, str(value))
+    return {
+        "resource": resource,
+        "path": path,
+        "httpMethod": method,
+        "headers": {
+            "Content-Type": "application/json",
+            "User-Agent": "gamarriando-load-test",
+            **headers,
+        },
+        "multiValueHeaders": None,
+        "queryStringParameters": {name: str(value) for name, value in query.items()} or None,
+        "multiValueQueryStringParameters": None,
+        "pathParameters": {name: str(value) for name, value in path_parameters.items()} or None,
+        "stageVariables": None,
+        "requestContext": {
+            "requestId": request_id,
+            "stage": "loadtest",
+            "httpMethod": method,
+            "path": path,
+            "resourcePath": resource,
+            "identity": {"sourceIp": "127.0.0.1", "userAgent": "gamarriando-load-test"},
+        },
+        "body": json.dumps(body) if body is not None else None,
+        "isBase64Encoded": False,
+    }
+
+
+def schedule_event(request_id: str) -> Dict[str, Any]:
+    """EventBridge scheduled event"""
+    return {
+        "version": "0",
+        "id": request_id,
+        "detail-type": "Scheduled Event",
+        "source": "aws.events",
+        "time": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "resources": [],
+        "detail": {},
+    }
+
+
+def sqs_event(bodies: List[Any], request_id: str) -> Dict[str, Any]:
+    """SQS batch with one record per message body"""
+    return {
+        "Records": [
+            {
+                "messageId": f"{request_id}-{index}",
+                "receiptHandle": f"{request_id}-{index}",
+                "body": json.dumps(body),
+                "attributes": {},
+                "messageAttributes": {},
+                "eventSource": "aws:sqs",
+            }
+            for index, body in enumerate(bodies)
+        ]
+    }
+
+
+def load_routes(service_dir: str) -> Dict[str, Dict[str, Any]]:
+    """Function name -> handler module and trigger, from serverless.yml"""
+    try:
+        import yaml
+    except ImportError:
+        sys.exit("The load test reads serverless.yml and needs PyYAML: pip install pyyaml")
+
+    with open(os.path.join(service_dir, "serverless.yml")) as f:
+        config = yaml.safe_load(f)
+
+    routes = {}
+    for name, function in (config.get("functions") or {}).items():
+        route = {"module": function["handler"].rsplit(".", 1)[0].replace("/", "."), "kind": None}
+        for trigger in function.get("events") or []:
+            if "http" in trigger and str(trigger["http"].get("method", "")).upper() != "OPTIONS":
+                route.update(
+                    kind="http",
+                    method=trigger["http"]["method"].upper(),
+                    path=trigger["http"]["path"],
+                )
+                break
+            if "schedule" in trigger or "sqs" in trigger:
+                route["kind"] = "schedule" if "schedule" in trigger else "sqs"
+        routes[name] = route
+    return routes
+
+
+def _fill(value: Any, substitutions: Dict[str, str]) -> Any:
+    """Replace {n} and {run} in every string of a JSON value"""
+    if isinstance(value, str):
+        for key, replacement in substitutions.items():
+            value = value.replace("{%s}" % key, replacement)
+        return value
+    if isinstance(value, dict):
+        return {key: _fill(item, substitutions) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, substitutions) for item in value]
+    return value
+
+
+def _pick(rng: random.Random, value: Any) -> Any:
+    """A list in a scenario means "one of these" per request"""
+    return rng.choice(value) if isinstance(value, list) else value
+
+
+def auth_header(profile: Dict[str, Any]) -> Dict[str, str]:
+    """Bearer token minted with the service's own auth_utils"""
+    import auth_utils
+
+    token = auth_utils.generate_token(
+        profile["user_id"], profile["email"], profile["username"], profile["roles"]
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+def build_events(
+    function: str,
+    route: Dict[str, Any],
+    scenario: Dict[str, Any],
+    defaults: Dict[str, Any],
+    profiles: Dict[str, Any],
+    count: int,
+    seed: int,
+    run_id: str,
+) -> List[Dict[str, Any]]:
+    """`count` events for one function, the same for the same seed"""
+    rng = random.Random(f"{seed}:{function}")
+    headers = auth_header(profiles[scenario["auth"]]) if scenario.get("auth") else {}
+    events = []
+    for n in range(count):
+        request_id = f"loadtest-{run_id}-{function}-{n}"
+        substitutions = {"n": str(n), "run": run_id}
+        if route["kind"] == "schedule":
+            events.append(schedule_event(request_id))
+        elif route["kind"] == "sqs":
+            events.append(
+                sqs_event(_fill(scenario.get("records", [{}]), substitutions), request_id)
+            )
+        else:
+            path = scenario.get("path", route["path"])
+            path_parameters = {
+                name: _pick(rng, value)
+                for name, value in {
+                    **defaults.get("path_parameters", {}),
+                    **scenario.get("path_parameters", {}),
+                }.items()
+                if "{%s}" % name in path
+            }
+            query = _pick(rng, scenario.get("query", {}))
+            body = _fill(scenario["body"], substitutions) if "body" in scenario else None
+            events.append(
+                api_event(
+                    route["method"],
+                    path,
+                    path_parameters,
+                    query,
+                    body,
+                    {**headers, **_fill(scenario.get("headers", {}), substitutions)},
+                    request_id,
+                )
+            )
+    return events
+
+
+def is_write(route: Dict[str, Any]) -> bool:
+    return route["kind"] in ("schedule", "sqs") or route.get("method") in WRITE_METHODS
+
+
+# --- Running ------------------------------------------------------------------
+
+_local = threading.local()
+
+
+def _capture(record: Dict[str, Any]) -> None:
+    """timing_utils.emit replacement: keep the request's record for the runner"""
+    _local.record = record
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def invoke(handler, function: str, event: Dict[str, Any]) -> Dict[str, Any]:
+    """One handler call: latency, status and the timing record's query count"""
+    request_id = (
+        (event.get("requestContext") or {}).get("requestId") or event.get("id") or str(uuid.uuid4())
+    )
+    _local.record = None
+    started = time.perf_counter()
+    try:
+        response = handler(event, LambdaContext(function, request_id))
+        status = response.get("statusCode", 200) if isinstance(response, dict) else 200
+    except Exception as e:
+        status = f"exception:{type(e).__name__}"
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    record = _local.record or {}
+    return {
+        "ms": elapsed_ms,
+        "status": status,
+        "queries": record.get("DbQueries"),
+        "db_ms": record.get("DbMs"),
+    }
+
+
+def summarize(samples: List[Dict[str, Any]], wall_s: float, concurrency: int) -> Dict[str, Any]:
+    latencies = sorted(sample["ms"] for sample in samples)
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        statuses[str(sample["status"])] = statuses.get(str(sample["status"]), 0) + 1
+    queries = [sample["queries"] for sample in samples if sample["queries"] is not None]
+    db_ms = [sample["db_ms"] for sample in samples if sample["db_ms"] is not None]
+    return {
+        "requests": len(samples),
+        "concurrency": concurrency,
+        "wall_s": round(wall_s, 3),
+        "throughput_rps": round(len(samples) / wall_s, 2) if wall_s else None,
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "max_ms": round(latencies[-1], 2),
+        "errors": sum(
+            count
+            for status, count in statuses.items()
+            if not status.isdigit() or int(status) >= 500
+        ),
+        "status_codes": statuses,
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        "db_ms_per_request": round(sum(db_ms) / len(db_ms), 2) if db_ms else None,
+    }
+
+
+def run_endpoint(
+    handler, function: str, events: List[Dict[str, Any]], warmup: int, concurrency: int
+) -> Dict[str, Any]:
+    """Warm up sequentially, then measure the rest with `concurrency` threads"""
+    for event in events[:warmup]:
+        invoke(handler, function, event)
+    measured = events[warmup:]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(lambda event: invoke(handler, function, event), measured))
+    return summarize(samples, time.perf_counter() - started, concurrency)
+
+
+def run_service(service: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker side: plan and run every selected function of one service"""
+    import importlib
+
+    service_dir = os.path.join(ROOT, "services", service)
+    sys.path.insert(0, service_dir)
+    os.chdir(service_dir)
+
+    import timing_utils
+
+    timing_utils.ENABLED = True
+    timing_utils.emit = _capture
+
+    routes = load_routes(service_dir)
+    with open(os.path.join(service_dir, SCENARIOS_FILE)) as f:
+        scenarios = json.load(f)
+
+    replayed: Dict[str, List[Dict[str, Any]]] = {}
+    if config.get("replay"):
+        with open(config["replay"]) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if entry["service"] == service:
+                        replayed.setdefault(entry["function"], []).append(entry["event"])
+
+    count = config["warmup"] + config["requests"]
+    results: Dict[str, Any] = {}
+    dumped: List[Dict[str, Any]] = []
+    for function, route in routes.items():
+        scenario = scenarios.get("functions", {}).get(function, {})
+        if config.get("endpoints") and function not in config["endpoints"]:
+            continue
+        if config.get("replay") and function not in replayed:
+            continue
+        if scenario.get("skip") or route["kind"] is None:
+            results[function] = {
+                "skipped": scenario.get("skip") or "no http, schedule or sqs trigger"
+            }
+            continue
+        if is_write(route) and not config.get("include_writes"):
+            results[function] = {"skipped": "write (use --include-writes)"}
+            continue
+
+        try:
+            if function in replayed:
+                events = [replayed[function][n % len(replayed[function])] for n in range(count)]
+            else:
+                events = build_events(
+                    function,
+                    route,
+                    scenario,
+                    scenarios.get("defaults", {}),
+                    scenarios.get("auth", {}),
+                    count,
+                    config["seed"],
+                    config["run_id"],
+                )
+        except Exception as e:
+            results[function] = {"error": f"building events failed: {e}"}
+            continue
+        if config.get("dump_events"):
+            dumped.extend(
+                {"service": service, "function": function, "event": event} for event in events
+            )
+            continue
+
+        try:
+            handler = importlib.import_module(route["module"]).lambda_handler
+        except Exception as e:
+            results[function] = {"error": f"import failed: {type(e).__name__}: {e}"}
+            continue
+        # Handlers raise the root logger to INFO on import; keep the run quiet
+        logging.getLogger().setLevel(logging.WARNING)
+        results[function] = run_endpoint(
+            handler, function, events, config["warmup"], config["concurrency"]
+        )
+        print(
+            f"  {service}/{function}: {results[function]['throughput_rps']} req/s, "
+            f"p95 {results[function]['p95_ms']} ms",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    if config.get("dump_events"):
+        return {
+            "events": dumped,
+            "not_built": {function: result for function, result in results.items()},
+        }
+    return results
+
+
+# --- Reporting ----------------------------------------------------------------
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], max_regression: float) -> List[str]:
+    """
+    Endpoints whose p95 or throughput moved by more than max_regression,
+    or that run more queries
+    """
+    regressions = []
+    for service, endpoints in current["results"].items():
+        for function, result in endpoints.items():
+            before = baseline.get("results", {}).get(service, {}).get(function) or {}
+            if "p95_ms" not in before or "p95_ms" not in result:
+                continue
+            label = f"{service}/{function}"
+            if result["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+                regressions.append(f"{label}: p95 {before['p95_ms']} -> {result['p95_ms']} ms")
+            if result["throughput_rps"] < before["throughput_rps"] * (1 - max_regression):
+                regressions.append(
+                    f"{label}: throughput {before['throughput_rps']} -> "
+                    f"{result['throughput_rps']} req/s"
+                )
+            if (result["queries_per_request"] or 0) > (before["queries_per_request"] or 0):
+                regressions.append(
+                    f"{label}: queries/request {before['queries_per_request']} -> "
+                    f"{result['queries_per_request']}"
+                )
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{'endpoint':<42} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'q/req':>6} {'errors':>6}"
+    )
+    for service, endpoints in report["results"].items():
+        for function, r in endpoints.items():
+            label = f"{service}/{function}"
+            if "p95_ms" not in r:
+                print(f"{label:<42} {r.get('skipped') or r.get('error')}")
+                continue
+            queries = r["queries_per_request"] if r["queries_per_request"] is not None else "-"
+            print(
+                f"{label:<42} {r['throughput_rps']:>9} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+                f"{r['p99_ms']:>8} {queries:>6} {r['errors']:>6}"
+            )
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Replay API Gateway events against the Lambda handlers in-process"
+    )
+    parser.add_argument(
+        "--service",
+        action="append",
+        choices=SERVICES,
+        help="Service to run (repeatable; default all)",
+    )
+    parser.add_argument(
+        "--endpoint", action="append", help="Function name from serverless.yml (repeatable)"
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="Threads invoking the handler")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument(
+        "--warmup", type=int, default=10, help="Unmeasured sequential requests per endpoint"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the generated events")
+    parser.add_argument(
+        "--include-writes",
+        action="store_true",
+        help="Also run POST/PUT/DELETE, scheduled and SQS functions",
+    )
+    parser.add_argument(
+        "--replay", help="JSON lines of recorded events to run instead of generated ones"
+    )
+    parser.add_argument("--dump-events", help="Write the generated events as JSON lines and exit")
+    parser.add_argument("--output", help="Results file (default loadtest-results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to check for regressions")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Allowed p95/throughput change (0.2 = 20%%)",
+    )
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-config", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        config = json.loads(args.worker_config)
+        result = run_service(args.worker, config)
+        with open(config["worker_output"], "w") as f:
+            json.dump(result, f, default=str)
+        return 0
+
+    started_at = datetime.now(timezone.utc)
+    config = {
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "include_writes": args.include_writes,
+        "endpoints": args.endpoint,
+        "replay": os.path.abspath(args.replay) if args.replay else None,
+        "dump_events": bool(args.dump_events),
+        "run_id": started_at.strftime("%Y%m%d%H%M%S"),
+    }
+    # Request logs would dominate the profile; timing records are captured, not printed
+    env = dict(
+        os.environ,
+        REQUEST_LOG_SAMPLE_RATE=os.getenv("REQUEST_LOG_SAMPLE_RATE", "0"),
+        REQUEST_TIMING="true",
+    )
+
+    results: Dict[str, Any] = {}
+    events: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for service in args.service or SERVICES:
+            print(f"{service}...", file=sys.stderr, flush=True)
+            worker_output = os.path.join(tmp, f"{service}.json")
+            subprocess.run(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "--worker",
+                    service,
+                    "--worker-config",
+                    json.dumps({**config, "worker_output": worker_output}),
+                ],
+                env=env,
+                check=True,
+            )
+            with open(worker_output) as f:
+                result = json.load(f)
+            if args.dump_events:
+                events.extend(result["events"])
+                for function, reason in result["not_built"].items():
+                    print(
+                        f"  {service}/{function}: {reason.get('skipped') or reason.get('error')}",
+                        file=sys.stderr,
+                    )
+            else:
+                results[service] = result
+
+    if args.dump_events:
+        os.makedirs(os.path.dirname(os.path.abspath(args.dump_events)), exist_ok=True)
+        with open(args.dump_events, "w") as f:
+            for entry in events:
+                f.write(json.dumps(entry) + "\n")
+        print(f"{len(events)} events written to {args.dump_events}")
+        return 0
+
+    report = {
+        "meta": {
+            "started_at": started_at.isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "db_host": os.getenv("DB_HOST", ""),
+            **{
+                key: config[key]
+                for key in ("concurrency", "requests", "warmup", "seed", "include_writes", "replay")
+            },
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(ROOT, "loadtest-results", f"{config['run_id']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print_report(report)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+Streaming export utilities for Gamarriando Payment Service
+
+Exports read through a psycopg2 named (server-side) cursor, fetching
+`itersize` rows per round trip, and write each row to the output as it
+arrives, so memory stays constant however many orders or transactions match.
+There is no OFFSET paging and no COUNT query.
+"""
+
+import os
+import csv
+import json
+import time
+import uuid
+import logging
+import tempfile
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Dict, Any, List, Iterator, Optional, TextIO, Tuple
+
+import psycopg2.extras
+
+from db_utils import get_db_connection
+from storage_utils import ObjectStore, get_object_store
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+EXPORT_DATASETS = {
+    "orders": {
+        "table": "orders",
+        "columns": [
+            "id",
+            "user_id",
+            "status",
+            "total_amount",
+            "currency",
+            "shipping_address",
+            "billing_address",
+            "notes",
+            "created_at",
+            "updated_at",
+        ],
+        "filters": {"status": "status", "user_id": "user_id"},
+    },
+    "transactions": {
+        "table": "transactions",
+        "columns": [
+            "id",
+            "payment_id",
+            "transaction_type",
+            "amount",
+            "currency",
+            "status",
+            "gateway_transaction_id",
+            "gateway_response",
+            "metadata",
+            "created_at",
+            "updated_at",
+        ],
+        "filters": {
+            "status": "status",
+            "transaction_type": "transaction_type",
+            "payment_id": "payment_id",
+        },
+    },
+}
+
+
+def get_export_config() -> Dict[str, Any]:
+    """Get export configuration from environment variables"""
+    return {
+        "itersize": int(os.getenv("EXPORT_ITERSIZE", "2000")),
+        "prefix": os.getenv("EXPORT_OBJECT_PREFIX", "exports"),
+    }
+
+
+class JSONEncoder(json.JSONEncoder):
+    """Custom JSON encoder to handle Decimal and datetime objects"""
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return float(obj)
+        elif isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        return super().default(obj)
+
+
+def parse_date_filter(value: Optional[str], field: str) -> Optional[datetime]:
+    """Parse an ISO date or datetime filter value"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Field '{field}' must be an ISO date (YYYY-MM-DD) or datetime")
+
+
+def build_export_query(dataset: str, filters: Dict[str, Any]) -> Tuple[str, List[str], tuple]:
+    """
+    Build the export SELECT for a dataset. Supported filters: the dataset's
+    equality filters plus date_from (inclusive) / date_to (exclusive) on
+    created_at. Returns (sql, columns, parameters).
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset}'. Use one of: {', '.join(EXPORT_DATASETS)}")
+    spec = EXPORT_DATASETS[dataset]
+
+    where_conditions = []
+    parameters = []
+    for name, column in spec["filters"].items():
+        if filters.get(name) not in (None, ""):
+            where_conditions.append(f"{column} = %s")
+            parameters.append(filters[name])
+
+    date_from = parse_date_filter(filters.get("date_from"), "date_from")
+    date_to = parse_date_filter(filters.get("date_to"), "date_to")
+    if date_from:
+        where_conditions.append("created_at >= %s")
+        parameters.append(date_from)
+    if date_to:
+        where_conditions.append("created_at < %s")
+        parameters.append(date_to)
+
+    where_clause = f"WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
+    sql = f"""
+        SELECT {', '.join(spec['columns'])}
+        FROM {spec['table']}
+        {where_clause}
+        ORDER BY id
+    """
+    return sql, spec["columns"], tuple(parameters)
+
+
+def iter_export_rows(
+    sql: str, parameters: tuple, itersize: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """Stream rows through a named server-side cursor, itersize rows per fetch"""
+    itersize = itersize or get_export_config()["itersize"]
+    with get_db_connection() as conn:
+        with conn.cursor(
+            name=f"export_{uuid.uuid4().hex}", cursor_factory=psycopg2.extras.RealDictCursor
+        ) as cursor:
+            cursor.itersize = itersize
+            cursor.execute(sql, parameters)
+            for row in cursor:
+                yield row
+        # Read-only: end the transaction that holds the cursor
+        conn.rollback()
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=JSONEncoder)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def write_rows(rows: Iterator[Dict[str, Any]], output: TextIO, fmt: str, columns: List[str]) -> int:
+    """Write rows to a text stream as NDJSON or CSV and return the row count"""
+    count = 0
+    if fmt == "ndjson":
+        for row in rows:
+            output.write(json.dumps(row, cls=JSONEncoder, separators=(",", ":")))
+            output.write("\n")
+            count += 1
+    elif fmt == "csv":
+        writer = csv.writer(output)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([_csv_value(row[column]) for column in columns])
+            count += 1
+    else:
+        raise ValueError(
+            f"Unsupported export format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    return count
+
+
+def export_dataset(
+    dataset: str,
+    fmt: str,
+    filters: Dict[str, Any],
+    path: Optional[str] = None,
+    object_key: Optional[str] = None,
+    store: Optional[ObjectStore] = None,
+    itersize: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Export a dataset to a local file (path, or a temp file) and optionally
+    upload it to the object store under object_key. Returns export stats.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unsupported export format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    sql, columns, parameters = build_export_query(dataset, filters)
+
+    started = time.perf_counter()
+    temporary = path is None
+    if temporary:
+        handle, path = tempfile.mkstemp(prefix=f"{dataset}-", suffix=f".{fmt}")
+        os.close(handle)
+
+    try:
+        with open(path, "w", encoding="utf-8", newline="") as output:
+            rows = write_rows(iter_export_rows(sql, parameters, itersize), output, fmt, columns)
+        size = os.path.getsize(path)
+
+        location = path
+        if object_key:
+            content_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+            location = (store or get_object_store()).put_file(object_key, path, content_type)
+    finally:
+        if temporary and object_key and os.path.exists(path):
+            os.remove(path)
+
+    duration = time.perf_counter() - started
+    return {
+        "dataset": dataset,
+        "format": fmt,
+        "filters": {k: v for k, v in filters.items() if v not in (None, "")},
+        "rows": rows,
+        "bytes": size,
+        "location": location,
+        "duration_ms": round(duration * 1000, 2),
+        "rows_per_second": round(rows / duration, 1) if duration > 0 else None,
+    }
+
+
+def default_object_key(dataset: str, fmt: str) -> str:
+    """exports/<dataset>/<UTC timestamp>-<short id>.<fmt>"""
+    timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    return f"{get_export_config()['prefix']}/{dataset}/{timestamp}-{uuid.uuid4().hex[:8]}.{fmt}"
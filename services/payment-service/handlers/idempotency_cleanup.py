@@ -0,0 +1,30 @@
+"""
+Idempotency Cleanup Lambda function with RDS support
+Scheduled (EventBridge) removal of expired idempotency keys
+"""
+
+import logging
+import sys
+from typing import Dict, Any
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from idempotency_utils import cleanup_expired_idempotency_keys
+from timing_utils import timed_handler
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Idempotency Cleanup Lambda function - scheduled hourly
+    """
+    log_request(event, context, "idempotency_cleanup")
+
+    deleted = cleanup_expired_idempotency_keys()
+    logger.info(f"Deleted {deleted} expired idempotency keys")
+
+    return {"deleted": deleted}
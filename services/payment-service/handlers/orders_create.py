@@ -12,17 +12,26 @@ from typing import Dict, Any
 
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
-from db_utils import execute_insert, execute_single_query, execute_query
+import psycopg2.extras
+from db_utils import get_db_connection, execute_single_query, execute_query
+from outbox_utils import write_outbox_event
+from inventory_utils import reserve_stock
+from pricing_utils import PricingError, price_order
+from idempotency_utils import idempotent
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
+@idempotent('orders_create')
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Orders Create Lambda function - POST /api/v1/orders
     """
     try:
-        logger.info(f"Orders create request: {json.dumps(event)}")
+        log_request(event, context, 'orders_create')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -30,7 +39,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'statusCode': 200,
                 'headers': {
                     'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+                    'Access-Control-Allow-Headers': 'Content-Type, Authorization, Idempotency-Key',
                     'Access-Control-Allow-Methods': 'POST, OPTIONS'
                 },
                 'body': ''
@@ -40,7 +49,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         body = json.loads(event.get('body', '{}'))
         
         # Validate required fields
-        required_fields = ['user_id', 'total_amount', 'order_items']
+        required_fields = ['user_id', 'order_items']
         for field in required_fields:
             if not body.get(field):
                 return error_response(f"Field '{field}' is required", 400)
@@ -50,6 +59,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if not order_items or len(order_items) == 0:
             return error_response("At least one order item is required", 400)
         
+        # Price every line from the catalog (one bulk lookup); client prices are only checked
+        try:
+            pricing = price_order(order_items, body.get('total_amount'))
+        except PricingError as e:
+            return pricing_error_response(e)
+        
         # Create order in database
         order_query = """
             INSERT INTO orders (user_id, status, total_amount, currency, shipping_address, billing_address, notes, created_at, updated_at)
@@ -61,7 +76,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         order_parameters = (
             body['user_id'],
             body.get('status', 'pending'),
-            float(body['total_amount']),
+            pricing['total_amount'],
             body.get('currency', 'USD'),
             json.dumps(body.get('shipping_address', {})),
             json.dumps(body.get('billing_address', {})),
@@ -70,25 +85,43 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             now
         )
         
-        order_id = execute_insert(order_query, order_parameters)
-        
-        # Create order items
-        for item in order_items:
-            item_query = """
-                INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            
-            item_parameters = (
-                order_id,
-                int(item['product_id']),
-                int(item['quantity']),
-                float(item['unit_price']),
-                float(item['total_price']),
+        item_rows = [
+            (
+                line['product_id'],
+                line['quantity'],
+                line['unit_price'],
+                line['total_price'],
                 now
             )
-            
-            execute_insert(item_query, item_parameters)
+            for line in pricing['lines']
+        ]
+        
+        # Create the order, its items, its stock reservations and the order.created outbox event in one transaction
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(order_query, order_parameters)
+                order_id = cursor.fetchone()[0]
+                
+                # Create order items
+                psycopg2.extras.execute_values(cursor, """
+                    INSERT INTO order_items (order_id, product_id, quantity, unit_price, total_price, created_at)
+                    VALUES %s
+                """, [(order_id,) + row for row in item_rows])
+                
+                # Reserve stock for every line in one statement; nothing is written if any line is short
+                insufficient_items = reserve_stock(cursor, order_id, order_items)
+                if insufficient_items:
+                    conn.rollback()
+                    return insufficient_stock_response(insufficient_items)
+                
+                write_outbox_event(cursor, 'order', order_id, 'order.created', {
+                    'order_id': order_id,
+                    'user_id': body['user_id'],
+                    'total_amount': pricing['total_amount'],
+                    'currency': body.get('currency', 'USD'),
+                    'item_count': len(item_rows)
+                })
+                conn.commit()
         
         # Get the created order with items
         get_order_query = """
@@ -152,7 +185,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -166,12 +199,42 @@ def created_response(data: Any, message: str = "Created successfully") -> Dict[s
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
     }
 
+def pricing_error_response(error: PricingError) -> Dict[str, Any]:
+    """Create pricing error response listing the lines that failed verification"""
+    return {
+        'statusCode': error.status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'body': json_body({
+            'message': error.message,
+            'error': 'pricing_mismatch' if error.status_code == 409 else 'invalid_items',
+            'pricing_errors': error.errors
+        })
+    }
+
+def insufficient_stock_response(items: Any) -> Dict[str, Any]:
+    """Create insufficient stock response listing the lines that could not be reserved"""
+    return {
+        'statusCode': 409,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'body': json_body({
+            'message': 'Insufficient stock for one or more items',
+            'error': 'insufficient_stock',
+            'insufficient_items': items
+        })
+    }
+
 def error_response(message: str, status_code: int = 500, error: str = None) -> Dict[str, Any]:
     """Create error response"""
     response_data = {'message': message}
@@ -184,5 +247,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
@@ -3,7 +3,6 @@ Orders Delete Lambda function with RDS support
 DELETE /api/v1/orders/{order_id}
 """
 
-import json
 import logging
 import os
 import sys
@@ -11,17 +10,21 @@ from typing import Dict, Any
 
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
-from db_utils import execute_single_query, execute_delete
+from db_utils import get_db_connection, execute_single_query
+from inventory_utils import release_order_reservations
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Orders Delete Lambda function - DELETE /api/v1/orders/{order_id}
     """
     try:
-        logger.info(f"Orders delete request: {json.dumps(event)}")
+        log_request(event, context, 'orders_delete')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -57,13 +60,20 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if payments_count > 0:
             return error_response(f"Cannot delete order with {payments_count} payments. Please cancel payments first.", 409)
         
-        # Delete order items first (foreign key constraint)
-        delete_items_query = "DELETE FROM order_items WHERE order_id = %s"
-        execute_delete(delete_items_query, (int(order_id),))
-        
-        # Delete order
-        delete_query = "DELETE FROM orders WHERE id = %s"
-        affected_rows = execute_delete(delete_query, (int(order_id),))
+        # Return reserved stock, then delete items and order in one transaction
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                released = release_order_reservations(cursor, int(order_id))
+                if released:
+                    logger.info(f"Released {released} stock reservations for order {order_id}")
+                
+                # Delete order items first (foreign key constraint)
+                cursor.execute("DELETE FROM order_items WHERE order_id = %s", (int(order_id),))
+                
+                # Delete order
+                cursor.execute("DELETE FROM orders WHERE id = %s", (int(order_id),))
+                affected_rows = cursor.rowcount
+                conn.commit()
         
         if affected_rows == 0:
             return error_response("Order not found or could not be deleted", 404)
@@ -84,7 +94,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -98,7 +108,7 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'message': message
         })
     }
@@ -115,5 +125,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
@@ -3,7 +3,6 @@ Orders Get Lambda function with RDS support
 GET /api/v1/orders/{order_id}
 """
 
-import json
 import logging
 import os
 import sys
@@ -12,16 +11,19 @@ from typing import Dict, Any
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_single_query, execute_query
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Orders Get Lambda function - GET /api/v1/orders/{order_id}
     """
     try:
-        logger.info(f"Orders get request: {json.dumps(event)}")
+        log_request(event, context, 'orders_get')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -104,7 +106,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -118,7 +120,7 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'message': message
         })
     }
@@ -135,5 +137,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
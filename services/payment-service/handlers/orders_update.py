@@ -12,17 +12,21 @@ from typing import Dict, Any
 
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
-from db_utils import execute_single_query, execute_update
+from db_utils import get_db_connection, execute_single_query
+from inventory_utils import commit_order_reservations, release_order_reservations
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Orders Update Lambda function - PUT /api/v1/orders/{order_id}
     """
     try:
-        logger.info(f"Orders update request: {json.dumps(event)}")
+        log_request(event, context, 'orders_update')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -98,7 +102,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             WHERE id = %s
         """
         
-        affected_rows = execute_update(update_query, tuple(parameters))
+        # Cancelling an order returns its reserved stock in the same transaction; moving it
+        # past pending (confirmed, shipped, ...) consumes the stock so the sweeper never restocks it
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(update_query, tuple(parameters))
+                affected_rows = cursor.rowcount
+                if affected_rows and body.get('status') == 'cancelled':
+                    release_order_reservations(cursor, int(order_id))
+                elif affected_rows and body.get('status') not in (None, 'pending'):
+                    commit_order_reservations(cursor, int(order_id))
+                conn.commit()
         
         if affected_rows == 0:
             return error_response("Order not found or no changes made", 404)
@@ -143,7 +157,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -157,7 +171,7 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'message': message
         })
     }
@@ -174,5 +188,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
@@ -0,0 +1,52 @@
+"""
+Outbox Relay Lambda function with RDS support
+Scheduled (EventBridge) publication of outbox events to notification-service
+"""
+
+import json
+import logging
+import sys
+from typing import Dict, Any
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from outbox_utils import get_outbox_sink, relay_outbox_batch, cleanup_published_events
+from timing_utils import timed_handler
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Stop starting new batches when less than this much invocation time is left
+MIN_REMAINING_MS = 5000
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Outbox Relay Lambda function - scheduled every minute
+    Relays batches until the outbox is drained or the invocation is about to time out
+    """
+    log_request(event, context, "outbox_relay")
+
+    sink = get_outbox_sink()
+    totals = {"batches": 0, "published": 0, "failed": 0, "dead_lettered": 0}
+
+    while True:
+        stats = relay_outbox_batch(sink)
+        if stats["fetched"] == 0:
+            break
+        totals["batches"] += 1
+        totals["published"] += stats["published"]
+        totals["failed"] += stats["failed"]
+        totals["dead_lettered"] += stats["dead_lettered"]
+
+        # A batch with only failures would just spin on the same rows
+        if stats["published"] == 0:
+            break
+        if context is not None and context.get_remaining_time_in_millis() < MIN_REMAINING_MS:
+            break
+
+    totals["cleaned_up"] = cleanup_published_events()
+    logger.info(f"Outbox relay result: {json.dumps(totals)}")
+    return totals
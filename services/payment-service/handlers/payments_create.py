@@ -13,16 +13,21 @@ from typing import Dict, Any
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_insert, execute_single_query
+from idempotency_utils import idempotent
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
+@idempotent('payments_create')
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Payments Create Lambda function - POST /api/v1/payments
     """
     try:
-        logger.info(f"Payments create request: {json.dumps(event)}")
+        log_request(event, context, 'payments_create')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -30,7 +35,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'statusCode': 200,
                 'headers': {
                     'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+                    'Access-Control-Allow-Headers': 'Content-Type, Authorization, Idempotency-Key',
                     'Access-Control-Allow-Methods': 'POST, OPTIONS'
                 },
                 'body': ''
@@ -121,7 +126,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -135,7 +140,7 @@ def created_response(data: Any, message: str = "Created successfully") -> Dict[s
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -153,5 +158,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
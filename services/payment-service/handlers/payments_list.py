@@ -3,7 +3,6 @@ Payments List Lambda function with RDS support
 GET /api/v1/payments
 """
 
-import json
 import logging
 import os
 import sys
@@ -11,17 +10,36 @@ from typing import Dict, Any
 
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
-from db_utils import execute_query
+from query_utils import ListSpec, FilterField, fetch_page, parse_datetime
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+PAYMENTS_LIST = ListSpec(
+    table='payments',
+    columns="""id, order_id, amount, currency, payment_method, status,
+               gateway_response, metadata, created_at, updated_at""",
+    filters={
+        'order_id': FilterField('order_id', int, ('eq', 'in')),
+        'status': FilterField('status', operators=('eq', 'in')),
+        'payment_method': FilterField('payment_method', operators=('eq', 'in')),
+        'amount': FilterField('amount', float, ('gte', 'lte')),
+        'created_at': FilterField('created_at', parse_datetime, ('gte', 'lte'))
+    },
+    # Each sort key has a (column, id) index: migrations/list_sort_indexes.sql
+    sort_fields={'created_at': 'created_at', 'amount': 'amount'},
+    defaults={'status': 'active'}
+)
+
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Payments List Lambda function - GET /api/v1/payments
     """
     try:
-        logger.info(f"Payments list request: {json.dumps(event)}")
+        log_request(event, context, 'payments_list')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -37,45 +55,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         # Get query parameters
         query_params = event.get('queryStringParameters') or {}
-        order_id = query_params.get('order_id')
-        status = query_params.get('status', 'active')
         limit = int(query_params.get('limit', 100))
         skip = int(query_params.get('skip', 0))
         
-        # Build query with filters using psycopg2 parameters
-        where_conditions = ["1=1"]  # Always true condition
-        parameters = []
-        
-        if order_id:
-            where_conditions.append("order_id = %s")
-            parameters.append(int(order_id))
-        
-        if status:
-            where_conditions.append("status = %s")
-            parameters.append(status)
-        
-        where_clause = " AND ".join(where_conditions)
-        
-        # Add pagination parameters
-        parameters.extend([limit, skip])
-        
-        # Query payments from database
-        query = f"""
-            SELECT id, order_id, amount, currency, payment_method, status, 
-                   gateway_response, metadata, created_at, updated_at
-            FROM payments
-            WHERE {where_clause}
-            ORDER BY created_at DESC
-            LIMIT %s OFFSET %s
-        """
-        
-        payments_data = execute_query(query, tuple(parameters))
-        
-        # Get total count for pagination (remove limit and offset parameters)
-        count_parameters = parameters[:-2]
-        count_query = f"SELECT COUNT(*) as total FROM payments WHERE {where_clause}"
-        count_result = execute_query(count_query, tuple(count_parameters))
-        total_count = int(count_result[0]['total']) if count_result else 0
+        # Filters, search and sort are validated against PAYMENTS_LIST and compiled
+        # into one statement that also returns the total; ?cursor= (a previous page's
+        # next_cursor) switches to a keyset seek that skips the total
+        payments_data, total_count, list_query = fetch_page(
+            PAYMENTS_LIST, query_params, skip, limit, query_params.get('cursor')
+        )
         
         # Convert data types for JSON serialization
         for payment in payments_data:
@@ -97,12 +85,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'pagination': {
                 'skip': skip,
                 'limit': limit,
-                'has_more': (skip + limit) < total_count
+                'has_more': list_query.has_more,
+                'next_cursor': list_query.next_cursor
             },
-            'filters': {
-                'order_id': order_id,
-                'status': status
-            }
+            'filters': list_query.filters,
+            'sort': list_query.sort
         }, f"Retrieved {len(payments_data)} payments")
         
     except ValueError as e:
@@ -119,7 +106,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -137,5 +124,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
@@ -7,22 +7,27 @@ import json
 import logging
 import os
 import sys
-from datetime import datetime
 from typing import Dict, Any
 
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
-from db_utils import execute_single_query, execute_update, execute_insert
+from payment_state import PaymentTransitionError, claim_for_processing
+from payment_processing import get_processing_mode, process_claimed_payment, enqueue_payment_processing
+from idempotency_utils import idempotent
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
+@idempotent('payments_process')
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Payments Process Lambda function - POST /api/v1/payments/{payment_id}/process
     """
     try:
-        logger.info(f"Payments process request: {json.dumps(event)}")
+        log_request(event, context, 'payments_process')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -30,7 +35,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'statusCode': 200,
                 'headers': {
                     'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+                    'Access-Control-Allow-Headers': 'Content-Type, Authorization, Idempotency-Key',
                     'Access-Control-Allow-Methods': 'POST, OPTIONS'
                 },
                 'body': ''
@@ -46,63 +51,31 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Parse request body
         body = json.loads(event.get('body', '{}'))
         
-        # Get payment details
-        payment_query = """
-            SELECT id, order_id, amount, currency, payment_method, status, 
-                   gateway_response, metadata
-            FROM payments
-            WHERE id = %s
-        """
-        
-        payment = execute_single_query(payment_query, (int(payment_id),))
-        
-        if not payment:
-            return not_found_response("Payment not found")
-        
-        if payment['status'] != 'pending':
-            return error_response(f"Payment is already {payment['status']}. Cannot process.", 409)
-        
-        # Simulate payment processing (in real implementation, integrate with Stripe/PayPal)
-        processing_result = simulate_payment_processing(payment, body)
-        
-        # Update payment status
-        update_payment_query = """
-            UPDATE payments 
-            SET status = %s, gateway_response = %s, updated_at = %s
-            WHERE id = %s
-        """
-        
-        now = datetime.utcnow()
-        execute_update(update_payment_query, (
-            processing_result['status'],
-            json.dumps(processing_result['gateway_response']),
-            now,
-            int(payment_id)
-        ))
-        
-        # Create transaction record
-        transaction_query = """
-            INSERT INTO transactions (payment_id, transaction_type, amount, currency, 
-                                    status, gateway_transaction_id, gateway_response, 
-                                    created_at, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """
-        
-        transaction_id = execute_insert(transaction_query, (
-            int(payment_id),
-            'payment',
-            payment['amount'],
-            payment['currency'],
-            processing_result['status'],
-            processing_result['gateway_response'].get('transaction_id'),
-            json.dumps(processing_result['gateway_response']),
-            now,
-            now
-        ))
-        
-        # Get updated payment
-        updated_payment = execute_single_query(payment_query, (int(payment_id),))
+        # Atomically claim the payment (pending -> processing); concurrent retries get 409.
+        # In async mode the worker takes the gateway lease when it picks the message up.
+        is_async = get_processing_mode() == 'async'
+        payment = claim_for_processing(int(payment_id), take_lease=not is_async)
+        
+        # Async mode: hand the claimed payment to payments_worker and return immediately
+        if is_async:
+            message_id = enqueue_payment_processing(payment, body)
+            
+            payment['id'] = str(payment['id'])
+            payment['order_id'] = str(payment['order_id'])
+            payment['amount'] = float(payment['amount'])
+            if payment['gateway_response'] is None:
+                payment['gateway_response'] = {}
+            if payment['metadata'] is None:
+                payment['metadata'] = {}
+            
+            return accepted_response({
+                'payment': payment,
+                'message_id': message_id
+            }, "Payment accepted for processing")
+        
+        # Call the gateway and settle the payment + transaction in a single statement
+        updated_payment, processing_result = process_claimed_payment(payment, body)
+        transaction_id = updated_payment.pop('transaction_id')
         
         # Convert data types for JSON serialization
         updated_payment['id'] = str(updated_payment['id'])
@@ -119,6 +92,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'processing_result': processing_result
         }, f"Payment processed successfully with status: {processing_result['status']}")
         
+    except PaymentTransitionError as e:
+        if e.status_code == 404:
+            return not_found_response(e.message)
+        return error_response(e.message, e.status_code)
     except json.JSONDecodeError:
         return error_response("Invalid JSON in request body", 400)
     except ValueError as e:
@@ -127,39 +104,6 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.error(f"Payments process error: {str(e)}")
         return error_response("Failed to process payment", 500, str(e))
 
-def simulate_payment_processing(payment: Dict[str, Any], request_body: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Simulate payment processing with external gateway
-    In real implementation, this would integrate with Stripe, PayPal, etc.
-    """
-    # Simulate processing logic
-    import random
-    
-    # 90% success rate for simulation
-    is_successful = random.random() < 0.9
-    
-    if is_successful:
-        return {
-            'status': 'completed',
-            'gateway_response': {
-                'transaction_id': f"txn_{random.randint(100000, 999999)}",
-                'gateway': payment['payment_method'],
-                'processed_at': datetime.utcnow().isoformat(),
-                'fee': round(float(payment['amount']) * 0.029, 2),  # 2.9% fee
-                'net_amount': round(float(payment['amount']) * 0.971, 2)
-            }
-        }
-    else:
-        return {
-            'status': 'failed',
-            'gateway_response': {
-                'error_code': 'CARD_DECLINED',
-                'error_message': 'Your card was declined',
-                'gateway': payment['payment_method'],
-                'processed_at': datetime.utcnow().isoformat()
-            }
-        }
-
 def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
     """Create success response"""
     return {
@@ -168,7 +112,21 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
+            'data': data,
+            'message': message,
+        })
+    }
+
+def accepted_response(data: Any, message: str = "Accepted") -> Dict[str, Any]:
+    """Create accepted response"""
+    return {
+        'statusCode': 202,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*'
+        },
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -182,7 +140,7 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'message': message
         })
     }
@@ -199,5 +157,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
@@ -0,0 +1,171 @@
+"""
+Payments Summary List Lambda function with RDS support
+GET /api/v1/payments/summary
+"""
+
+import logging
+import sys
+from typing import Dict, Any
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from db_utils import execute_query
+from summary_utils import SUMMARY_VIEWS, staleness_headers
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Payments Summary List Lambda function - GET /api/v1/payments/summary
+    Reads from the payment_summary materialized view instead of aggregating live
+    """
+    try:
+        log_request(event, context, "payments_summary_list")
+
+        # Handle CORS
+        if event.get("httpMethod") == "OPTIONS":
+            return {
+                "statusCode": 200,
+                "headers": {
+                    "Access-Control-Allow-Origin": "*",
+                    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+                    "Access-Control-Allow-Methods": "GET, OPTIONS",
+                },
+                "body": "",
+            }
+
+        # Get query parameters
+        query_params = event.get("queryStringParameters") or {}
+        order_id = query_params.get("order_id")
+        user_id = query_params.get("user_id")
+        status = query_params.get("status")
+        payment_method = query_params.get("payment_method")
+        limit = int(query_params.get("limit", 100))
+        skip = int(query_params.get("skip", 0))
+
+        view_name = SUMMARY_VIEWS["payment_summary"]
+
+        # Build query with filters using psycopg2 parameters
+        where_conditions = ["1=1"]  # Always true condition
+        parameters = []
+
+        if order_id:
+            where_conditions.append("order_id = %s")
+            parameters.append(int(order_id))
+
+        if user_id:
+            where_conditions.append("user_id = %s")
+            parameters.append(user_id)
+
+        if status:
+            where_conditions.append("status = %s")
+            parameters.append(status)
+
+        if payment_method:
+            where_conditions.append("payment_method = %s")
+            parameters.append(payment_method)
+
+        where_clause = " AND ".join(where_conditions)
+
+        # Query payment summaries from the materialized view
+        query = f"""
+            SELECT id, order_id, amount, currency, payment_method, status, created_at,
+                   updated_at, user_id, order_total, transaction_count
+            FROM {view_name}
+            WHERE {where_clause}
+            ORDER BY created_at DESC
+            LIMIT %s OFFSET %s
+        """
+
+        summaries_data = execute_query(query, tuple(parameters + [limit, skip]))
+
+        # Total count and last refresh time in a single round trip
+        count_query = f"""
+            SELECT COUNT(*) as total,
+                   (SELECT refreshed_at FROM summary_refresh_log
+                    WHERE view_name = %s) as refreshed_at
+            FROM {view_name}
+            WHERE {where_clause}
+        """
+        count_result = execute_query(count_query, tuple([view_name] + parameters))
+        total_count = int(count_result[0]["total"]) if count_result else 0
+        refreshed_at = count_result[0]["refreshed_at"] if count_result else None
+
+        # Convert data types for JSON serialization
+        for summary in summaries_data:
+            summary["id"] = str(summary["id"])
+            summary["order_id"] = str(summary["order_id"]) if summary["order_id"] else None
+            summary["amount"] = float(summary["amount"])
+            summary["order_total"] = (
+                float(summary["order_total"]) if summary["order_total"] is not None else None
+            )
+            summary["transaction_count"] = int(summary["transaction_count"])
+            if summary["created_at"]:
+                summary["created_at"] = summary["created_at"].isoformat()
+            if summary["updated_at"]:
+                summary["updated_at"] = summary["updated_at"].isoformat()
+
+        return success_response(
+            {
+                "payments": summaries_data,
+                "total": total_count,
+                "pagination": {
+                    "skip": skip,
+                    "limit": limit,
+                    "has_more": (skip + limit) < total_count,
+                },
+                "filters": {
+                    "order_id": order_id,
+                    "user_id": user_id,
+                    "status": status,
+                    "payment_method": payment_method,
+                },
+                "refreshed_at": refreshed_at.isoformat() if refreshed_at else None,
+            },
+            f"Retrieved {len(summaries_data)} payment summaries",
+            staleness_headers(refreshed_at),
+        )
+
+    except ValueError as e:
+        return error_response("Invalid query parameters", 400, str(e))
+    except Exception as e:
+        logger.error(f"Payments summary list error: {str(e)}")
+        return error_response("Failed to retrieve payment summaries", 500, str(e))
+
+
+def success_response(
+    data: Any, message: str = "Success", extra_headers: Dict[str, str] = None
+) -> Dict[str, Any]:
+    """Create success response"""
+    headers = {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"}
+    if extra_headers:
+        headers.update(extra_headers)
+
+    return {
+        "statusCode": 200,
+        "headers": headers,
+        "body": json_body(
+            {
+                "data": data,
+                "message": message,
+            }
+        ),
+    }
+
+
+def error_response(message: str, status_code: int = 500, error: str = None) -> Dict[str, Any]:
+    """Create error response"""
+    response_data = {"message": message}
+    if error:
+        response_data["error"] = str(error)
+
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(response_data),
+    }
@@ -0,0 +1,33 @@
+"""
+Payments Sweeper Lambda function with RDS support
+Scheduled (EventBridge) recovery of payments stuck in processing or refunding
+"""
+
+import json
+import logging
+import sys
+from typing import Dict, Any
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from payment_processing import sweep_stale_processing, sweep_stale_refunds
+from timing_utils import timed_handler
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Payments Sweeper Lambda function - scheduled every minute
+    Re-queues payments whose processing lease expired (worker or request
+    crashed, message lost) and fails those past PAYMENT_MAX_PROCESSING_ATTEMPTS.
+    Releases refund claims whose request died before settling.
+    """
+    log_request(event, context, "payments_sweeper")
+
+    stats = {"processing": sweep_stale_processing(), "refunds": sweep_stale_refunds()}
+    logger.info(f"Payments sweeper result: {json.dumps(stats)}")
+    return stats
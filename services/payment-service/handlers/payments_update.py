@@ -13,16 +13,19 @@ from typing import Dict, Any
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_single_query, execute_update
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Payments Update Lambda function - PUT /api/v1/payments/{payment_id}
     """
     try:
-        logger.info(f"Payments update request: {json.dumps(event)}")
+        log_request(event, context, 'payments_update')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -144,7 +147,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -158,7 +161,7 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'message': message
         })
     }
@@ -175,5 +178,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
@@ -0,0 +1,49 @@
+"""
+Payments Worker Lambda function with RDS support
+Consumes the payment processing queue (async PAYMENT_PROCESSING_MODE)
+"""
+
+import json
+import logging
+import os
+import sys
+from typing import Dict, Any
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from payment_processing import handle_payment_message, drain_payment_queue
+from timing_utils import timed_handler
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Payments Worker Lambda function
+    - SQS event source: processes the delivered batch and reports per-message failures
+    - Any other invocation (schedule, local run): drains the configured queue in batches
+    """
+    records = (event or {}).get("Records")
+
+    if records is None:
+        batch_size = int(
+            (event or {}).get("batch_size", os.getenv("PAYMENT_WORKER_BATCH_SIZE", "10"))
+        )
+        max_batches = (event or {}).get("max_batches")
+        stats = drain_payment_queue(batch_size=batch_size, max_batches=max_batches)
+        logger.info(f"Payments worker drain: {json.dumps(stats)}")
+        return stats
+
+    # Only failed messages are returned to the queue (ReportBatchItemFailures)
+    batch_item_failures = []
+    for record in records:
+        try:
+            outcome = handle_payment_message(json.loads(record["body"]))
+            logger.info(f"Payments worker outcome: {json.dumps(outcome)}")
+        except Exception as e:
+            logger.error(f"Payments worker error for message {record.get('messageId')}: {str(e)}")
+            batch_item_failures.append({"itemIdentifier": record["messageId"]})
+
+    return {"batchItemFailures": batch_item_failures}
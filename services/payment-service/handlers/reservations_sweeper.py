@@ -0,0 +1,47 @@
+"""
+Reservations Sweeper Lambda function with RDS support
+Scheduled (EventBridge) release of expired stock reservations
+"""
+
+import json
+import logging
+import sys
+from typing import Dict, Any
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from inventory_utils import sweep_expired_reservations
+from timing_utils import timed_handler
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Stop starting new batches when less than this much invocation time is left
+MIN_REMAINING_MS = 5000
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Reservations Sweeper Lambda function - scheduled every minute
+    Returns stock of reservations whose order was not paid before expires_at
+    and cancels those orders
+    """
+    log_request(event, context, "reservations_sweeper")
+
+    totals = {"batches": 0, "released": 0, "products_restocked": 0, "orders_cancelled": 0}
+
+    while True:
+        stats = sweep_expired_reservations()
+        if stats.get("released", 0) == 0:
+            break
+        totals["batches"] += 1
+        for key in ("released", "products_restocked", "orders_cancelled"):
+            totals[key] += stats[key]
+
+        if context is not None and context.get_remaining_time_in_millis() < MIN_REMAINING_MS:
+            break
+
+    logger.info(f"Reservations sweeper result: {json.dumps(totals)}")
+    return totals
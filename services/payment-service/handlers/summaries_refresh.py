@@ -0,0 +1,28 @@
+"""
+Summaries Refresh Lambda function with RDS support
+Scheduled (EventBridge) refresh of the materialized summary views
+"""
+
+import logging
+import sys
+from typing import Dict, Any
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from summary_utils import refresh_all_summary_views
+from timing_utils import timed_handler
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Summaries Refresh Lambda function - scheduled every few minutes
+    Optionally accepts {"summaries": ["order_summary", ...]} to refresh a subset
+    """
+    log_request(event, context, "summaries_refresh")
+
+    return refresh_all_summary_views((event or {}).get("summaries"))
@@ -0,0 +1,85 @@
+"""
+Transactions Export Lambda function with RDS support
+GET /api/v1/transactions/export
+"""
+
+import logging
+import sys
+from typing import Dict, Any
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from export_utils import EXPORT_DATASETS, export_dataset, default_object_key
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Transactions Export Lambda function - GET /api/v1/transactions/export
+    Streams matching transactions with a server-side cursor into an NDJSON/CSV file in the
+    object store and returns its location (the file never has to fit in the response)
+    """
+    try:
+        log_request(event, context, "transactions_export")
+
+        # Handle CORS
+        if event.get("httpMethod") == "OPTIONS":
+            return {
+                "statusCode": 200,
+                "headers": {
+                    "Access-Control-Allow-Origin": "*",
+                    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+                    "Access-Control-Allow-Methods": "GET, OPTIONS",
+                },
+                "body": "",
+            }
+
+        # Get query parameters
+        query_params = event.get("queryStringParameters") or {}
+        fmt = query_params.get("format", "ndjson").lower()
+        filter_names = list(EXPORT_DATASETS["transactions"]["filters"]) + ["date_from", "date_to"]
+        filters = {name: query_params.get(name) for name in filter_names}
+
+        result = export_dataset(
+            "transactions", fmt, filters, object_key=default_object_key("transactions", fmt)
+        )
+
+        return success_response(result, f"Exported {result['rows']} transactions")
+
+    except ValueError as e:
+        return error_response("Invalid query parameters", 400, str(e))
+    except Exception as e:
+        logger.error(f"Transactions export error: {str(e)}")
+        return error_response("Failed to export transactions", 500, str(e))
+
+
+def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
+    """Create success response"""
+    return {
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(
+            {
+                "data": data,
+                "message": message,
+            }
+        ),
+    }
+
+
+def error_response(message: str, status_code: int = 500, error: str = None) -> Dict[str, Any]:
+    """Create error response"""
+    response_data = {"message": message}
+    if error:
+        response_data["error"] = str(error)
+
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(response_data),
+    }
@@ -3,7 +3,6 @@ Transactions List Lambda function with RDS support
 GET /api/v1/transactions
 """
 
-import json
 import logging
 import os
 import sys
@@ -11,17 +10,36 @@ from typing import Dict, Any
 
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
-from db_utils import execute_query
+from query_utils import ListSpec, FilterField, fetch_page, parse_datetime
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+TRANSACTIONS_LIST = ListSpec(
+    table='transactions',
+    columns="""id, payment_id, transaction_type, amount, currency, status,
+               gateway_transaction_id, gateway_response, metadata, created_at, updated_at""",
+    filters={
+        'payment_id': FilterField('payment_id', int, ('eq', 'in')),
+        'transaction_type': FilterField('transaction_type', operators=('eq', 'in')),
+        'status': FilterField('status', operators=('eq', 'in')),
+        'amount': FilterField('amount', float, ('gte', 'lte')),
+        'created_at': FilterField('created_at', parse_datetime, ('gte', 'lte'))
+    },
+    # Each sort key has a (column, id) index: migrations/list_sort_indexes.sql
+    sort_fields={'created_at': 'created_at', 'amount': 'amount'},
+    defaults={'status': 'active'}
+)
+
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Transactions List Lambda function - GET /api/v1/transactions
     """
     try:
-        logger.info(f"Transactions list request: {json.dumps(event)}")
+        log_request(event, context, 'transactions_list')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -37,50 +55,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         # Get query parameters
         query_params = event.get('queryStringParameters') or {}
-        payment_id = query_params.get('payment_id')
-        transaction_type = query_params.get('transaction_type')
-        status = query_params.get('status', 'active')
         limit = int(query_params.get('limit', 100))
         skip = int(query_params.get('skip', 0))
         
-        # Build query with filters using psycopg2 parameters
-        where_conditions = ["1=1"]  # Always true condition
-        parameters = []
-        
-        if payment_id:
-            where_conditions.append("payment_id = %s")
-            parameters.append(int(payment_id))
-        
-        if transaction_type:
-            where_conditions.append("transaction_type = %s")
-            parameters.append(transaction_type)
-        
-        if status:
-            where_conditions.append("status = %s")
-            parameters.append(status)
-        
-        where_clause = " AND ".join(where_conditions)
-        
-        # Add pagination parameters
-        parameters.extend([limit, skip])
-        
-        # Query transactions from database
-        query = f"""
-            SELECT id, payment_id, transaction_type, amount, currency, status, 
-                   gateway_transaction_id, gateway_response, metadata, created_at, updated_at
-            FROM transactions
-            WHERE {where_clause}
-            ORDER BY created_at DESC
-            LIMIT %s OFFSET %s
-        """
-        
-        transactions_data = execute_query(query, tuple(parameters))
-        
-        # Get total count for pagination (remove limit and offset parameters)
-        count_parameters = parameters[:-2]
-        count_query = f"SELECT COUNT(*) as total FROM transactions WHERE {where_clause}"
-        count_result = execute_query(count_query, tuple(count_parameters))
-        total_count = int(count_result[0]['total']) if count_result else 0
+        # Filters, search and sort are validated against TRANSACTIONS_LIST and compiled
+        # into one statement that also returns the total; ?cursor= (a previous page's
+        # next_cursor) switches to a keyset seek that skips the total
+        transactions_data, total_count, list_query = fetch_page(
+            TRANSACTIONS_LIST, query_params, skip, limit, query_params.get('cursor')
+        )
         
         # Convert data types for JSON serialization
         for transaction in transactions_data:
@@ -102,13 +85,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'pagination': {
                 'skip': skip,
                 'limit': limit,
-                'has_more': (skip + limit) < total_count
+                'has_more': list_query.has_more,
+                'next_cursor': list_query.next_cursor
             },
-            'filters': {
-                'payment_id': payment_id,
-                'transaction_type': transaction_type,
-                'status': status
-            }
+            'filters': list_query.filters,
+            'sort': list_query.sort
         }, f"Retrieved {len(transactions_data)} transactions")
         
     except ValueError as e:
@@ -125,7 +106,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -143,5 +124,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
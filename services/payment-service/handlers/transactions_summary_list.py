@@ -0,0 +1,168 @@
+"""
+Transactions Summary List Lambda function with RDS support
+GET /api/v1/transactions/summary
+"""
+
+import logging
+import sys
+from typing import Dict, Any
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from db_utils import execute_query
+from summary_utils import SUMMARY_VIEWS, staleness_headers
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Transactions Summary List Lambda function - GET /api/v1/transactions/summary
+    Reads from the transaction_summary materialized view instead of aggregating live
+    """
+    try:
+        log_request(event, context, "transactions_summary_list")
+
+        # Handle CORS
+        if event.get("httpMethod") == "OPTIONS":
+            return {
+                "statusCode": 200,
+                "headers": {
+                    "Access-Control-Allow-Origin": "*",
+                    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+                    "Access-Control-Allow-Methods": "GET, OPTIONS",
+                },
+                "body": "",
+            }
+
+        # Get query parameters
+        query_params = event.get("queryStringParameters") or {}
+        payment_id = query_params.get("payment_id")
+        user_id = query_params.get("user_id")
+        transaction_type = query_params.get("transaction_type")
+        status = query_params.get("status")
+        limit = int(query_params.get("limit", 100))
+        skip = int(query_params.get("skip", 0))
+
+        view_name = SUMMARY_VIEWS["transaction_summary"]
+
+        # Build query with filters using psycopg2 parameters
+        where_conditions = ["1=1"]  # Always true condition
+        parameters = []
+
+        if payment_id:
+            where_conditions.append("payment_id = %s")
+            parameters.append(int(payment_id))
+
+        if user_id:
+            where_conditions.append("user_id = %s")
+            parameters.append(user_id)
+
+        if transaction_type:
+            where_conditions.append("transaction_type = %s")
+            parameters.append(transaction_type)
+
+        if status:
+            where_conditions.append("status = %s")
+            parameters.append(status)
+
+        where_clause = " AND ".join(where_conditions)
+
+        # Query transaction summaries from the materialized view
+        query = f"""
+            SELECT id, payment_id, transaction_type, amount, currency, status,
+                   gateway_transaction_id, created_at, updated_at, order_id, payment_method, user_id
+            FROM {view_name}
+            WHERE {where_clause}
+            ORDER BY created_at DESC
+            LIMIT %s OFFSET %s
+        """
+
+        summaries_data = execute_query(query, tuple(parameters + [limit, skip]))
+
+        # Total count and last refresh time in a single round trip
+        count_query = f"""
+            SELECT COUNT(*) as total,
+                   (SELECT refreshed_at FROM summary_refresh_log
+                    WHERE view_name = %s) as refreshed_at
+            FROM {view_name}
+            WHERE {where_clause}
+        """
+        count_result = execute_query(count_query, tuple([view_name] + parameters))
+        total_count = int(count_result[0]["total"]) if count_result else 0
+        refreshed_at = count_result[0]["refreshed_at"] if count_result else None
+
+        # Convert data types for JSON serialization
+        for summary in summaries_data:
+            summary["id"] = str(summary["id"])
+            summary["payment_id"] = str(summary["payment_id"]) if summary["payment_id"] else None
+            summary["order_id"] = str(summary["order_id"]) if summary["order_id"] else None
+            summary["amount"] = float(summary["amount"])
+            if summary["created_at"]:
+                summary["created_at"] = summary["created_at"].isoformat()
+            if summary["updated_at"]:
+                summary["updated_at"] = summary["updated_at"].isoformat()
+
+        return success_response(
+            {
+                "transactions": summaries_data,
+                "total": total_count,
+                "pagination": {
+                    "skip": skip,
+                    "limit": limit,
+                    "has_more": (skip + limit) < total_count,
+                },
+                "filters": {
+                    "payment_id": payment_id,
+                    "user_id": user_id,
+                    "transaction_type": transaction_type,
+                    "status": status,
+                },
+                "refreshed_at": refreshed_at.isoformat() if refreshed_at else None,
+            },
+            f"Retrieved {len(summaries_data)} transaction summaries",
+            staleness_headers(refreshed_at),
+        )
+
+    except ValueError as e:
+        return error_response("Invalid query parameters", 400, str(e))
+    except Exception as e:
+        logger.error(f"Transactions summary list error: {str(e)}")
+        return error_response("Failed to retrieve transaction summaries", 500, str(e))
+
+
+def success_response(
+    data: Any, message: str = "Success", extra_headers: Dict[str, str] = None
+) -> Dict[str, Any]:
+    """Create success response"""
+    headers = {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"}
+    if extra_headers:
+        headers.update(extra_headers)
+
+    return {
+        "statusCode": 200,
+        "headers": headers,
+        "body": json_body(
+            {
+                "data": data,
+                "message": message,
+            }
+        ),
+    }
+
+
+def error_response(message: str, status_code: int = 500, error: str = None) -> Dict[str, Any]:
+    """Create error response"""
+    response_data = {"message": message}
+    if error:
+        response_data["error"] = str(error)
+
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(response_data),
+    }
@@ -0,0 +1,275 @@
+"""
+Idempotency-Key utilities for Gamarriando Payment Service Lambda functions
+"""
+
+import os
+import json
+import math
+import hashlib
+import logging
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Dict, Any, Optional, Callable
+
+from db_utils import execute_single_query, execute_returning, execute_update, execute_delete
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def get_idempotency_config() -> Dict[str, Any]:
+    """Get idempotency configuration from environment variables"""
+    return {
+        "retention_hours": int(os.getenv("IDEMPOTENCY_RETENTION_HOURS", "24")),
+        # Longer than any API handler timeout, so a live claim is never taken over
+        "lock_seconds": int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60")),
+        "enabled": os.getenv("IDEMPOTENCY_ENABLED", "true").lower() == "true",
+    }
+
+
+def get_idempotency_key(event: Dict[str, Any]) -> Optional[str]:
+    """Extract the Idempotency-Key header (API Gateway may change header casing)"""
+    headers = event.get("headers") or {}
+    for name, value in headers.items():
+        if name.lower() == IDEMPOTENCY_HEADER.lower() and value:
+            return value.strip()
+    return None
+
+
+def get_caller_scope(event: Dict[str, Any]) -> str:
+    """
+    Identify the caller a key belongs to: the API Gateway authorizer principal
+    when there is one, else a digest of the Authorization header, else '' for
+    anonymous requests. Keys never match across callers.
+    """
+    authorizer = (event.get("requestContext") or {}).get("authorizer") or {}
+    claims = authorizer.get("claims") or (authorizer.get("jwt") or {}).get("claims") or {}
+    principal = authorizer.get("principalId") or claims.get("sub")
+    if principal:
+        return f"principal:{principal}"[:128]
+
+    headers = event.get("headers") or {}
+    for name, value in headers.items():
+        if name.lower() == "authorization" and value:
+            return "auth:" + hashlib.sha256(value.encode("utf-8")).hexdigest()
+    return ""
+
+
+def compute_request_hash(event: Dict[str, Any]) -> str:
+    """Hash the parts of the request that must match for a key to be reused"""
+    fingerprint = json.dumps(
+        {
+            "method": event.get("httpMethod"),
+            "path": event.get("path"),
+            "pathParameters": event.get("pathParameters") or {},
+            "body": event.get("body") or "",
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(status_code: int) -> bool:
+    """
+    Success responses are stored for replay. Client errors are not, except
+    409/422, which describe the state of the resource rather than a request
+    the client can fix and resend. Server errors are never stored.
+    """
+    return status_code < 400 or status_code in (409, 422)
+
+
+def get_stored_response(endpoint: str, caller: str, key: str) -> Optional[Dict[str, Any]]:
+    """Look up a completed, non-expired response (single unique index probe)"""
+    sql = """
+        SELECT request_hash, status_code, response_headers, response_body
+        FROM idempotency_keys
+        WHERE endpoint = %s AND caller = %s AND idempotency_key = %s
+          AND state = 'completed' AND expires_at > NOW()
+    """
+    return execute_single_query(sql, (endpoint, caller, key))
+
+
+def claim_key(endpoint: str, caller: str, key: str, request_hash: str) -> Optional[int]:
+    """
+    Claim a key by inserting (and committing) an in_progress row. An existing
+    row is only taken over when it has expired, or when it is an in_progress
+    claim for the same payload whose lease ran out (its handler crashed).
+    Returns the row id, or None when another request holds the key.
+    """
+    config = get_idempotency_config()
+    sql = """
+        INSERT INTO idempotency_keys (endpoint, caller, idempotency_key, request_hash, state,
+                                      locked_until, created_at, expires_at)
+        VALUES (%s, %s, %s, %s, 'in_progress', NOW() + make_interval(secs => %s), NOW(),
+                NOW() + make_interval(hours => %s))
+        ON CONFLICT (endpoint, caller, idempotency_key) DO UPDATE
+        SET request_hash = EXCLUDED.request_hash,
+            state = 'in_progress',
+            status_code = NULL,
+            response_headers = NULL,
+            response_body = NULL,
+            locked_until = EXCLUDED.locked_until,
+            created_at = EXCLUDED.created_at,
+            expires_at = EXCLUDED.expires_at
+        WHERE idempotency_keys.expires_at <= NOW()
+           OR (idempotency_keys.state = 'in_progress'
+               AND idempotency_keys.locked_until <= NOW()
+               AND idempotency_keys.request_hash = EXCLUDED.request_hash)
+        RETURNING id
+    """
+    row = execute_returning(
+        sql,
+        (endpoint, caller, key, request_hash, config["lock_seconds"], config["retention_hours"]),
+    )
+    return row["id"] if row else None
+
+
+def get_key_record(endpoint: str, caller: str, key: str) -> Optional[Dict[str, Any]]:
+    """Current row of a key, whatever its state"""
+    sql = """
+        SELECT id, request_hash, state, status_code, response_headers, response_body, locked_until
+        FROM idempotency_keys
+        WHERE endpoint = %s AND caller = %s AND idempotency_key = %s
+    """
+    return execute_single_query(sql, (endpoint, caller, key))
+
+
+def complete_key(record_id: int, response: Dict[str, Any]) -> bool:
+    """Store the response on a claimed key so duplicates replay it"""
+    sql = """
+        UPDATE idempotency_keys
+        SET state = 'completed', status_code = %s, response_headers = %s, response_body = %s,
+            locked_until = NULL, expires_at = NOW() + make_interval(hours => %s)
+        WHERE id = %s AND state = 'in_progress'
+    """
+    return (
+        execute_update(
+            sql,
+            (
+                response.get("statusCode", 200),
+                json.dumps(response.get("headers") or {}),
+                response.get("body"),
+                get_idempotency_config()["retention_hours"],
+                record_id,
+            ),
+        )
+        > 0
+    )
+
+
+def release_key(record_id: int) -> bool:
+    """Drop a claim whose response is not stored, so the key can be retried"""
+    sql = "DELETE FROM idempotency_keys WHERE id = %s AND state = 'in_progress'"
+    return execute_delete(sql, (record_id,)) > 0
+
+
+def replay_response(stored: Dict[str, Any], request_hash: str) -> Dict[str, Any]:
+    """Rebuild the Lambda response from a stored record"""
+    if stored["request_hash"] != request_hash:
+        return idempotency_error_response(
+            "Idempotency-Key was already used with a different request payload", 422
+        )
+
+    headers = dict(stored["response_headers"] or {})
+    headers[REPLAY_HEADER] = "true"
+    return {
+        "statusCode": stored["status_code"],
+        "headers": headers,
+        "body": stored["response_body"],
+    }
+
+
+def in_progress_response(record: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """409 for a duplicate that arrives while the original is still running"""
+    response = idempotency_error_response(
+        "A request with this Idempotency-Key is still being processed", 409
+    )
+    locked_until = (record or {}).get("locked_until")
+    if locked_until is not None:
+        if locked_until.tzinfo is None:
+            locked_until = locked_until.replace(tzinfo=timezone.utc)
+        retry_after = (locked_until - datetime.now(timezone.utc)).total_seconds()
+        response["headers"]["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def idempotency_error_response(message: str, status_code: int) -> Dict[str, Any]:
+    """Create error response"""
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json.dumps({"message": message}),
+    }
+
+
+def idempotent(endpoint: str) -> Callable:
+    """
+    Decorator for POST lambda_handlers honouring the Idempotency-Key header.
+    Requests without the header run unchanged. Keys are scoped to the route
+    (endpoint) and the caller. The first request claims the key with a
+    committed in_progress row and runs the handler without holding a
+    connection or lock; duplicates replay the stored response, or get 409
+    while the original is still running. A claim whose handler crashed is
+    taken over once its lease (IDEMPOTENCY_LOCK_SECONDS) has expired.
+    """
+
+    def decorator(handler: Callable) -> Callable:
+        @wraps(handler)
+        def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+            if event.get("httpMethod") == "OPTIONS" or not get_idempotency_config()["enabled"]:
+                return handler(event, context)
+
+            key = get_idempotency_key(event)
+            if not key:
+                return handler(event, context)
+            if len(key) > MAX_KEY_LENGTH:
+                return idempotency_error_response(
+                    f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters", 400
+                )
+
+            caller = get_caller_scope(event)
+            request_hash = compute_request_hash(event)
+
+            # Fast path: a completed duplicate is answered from one indexed lookup
+            stored = get_stored_response(endpoint, caller, key)
+            if stored:
+                logger.info(f"Replaying stored response for {endpoint} idempotency key")
+                return replay_response(stored, request_hash)
+
+            record_id = claim_key(endpoint, caller, key, request_hash)
+            if record_id is None:
+                record = get_key_record(endpoint, caller, key)
+                if record and (
+                    record["state"] == "completed" or record["request_hash"] != request_hash
+                ):
+                    return replay_response(record, request_hash)
+                return in_progress_response(record)
+
+            try:
+                response = handler(event, context)
+            except Exception:
+                release_key(record_id)
+                raise
+
+            try:
+                if is_cacheable(response.get("statusCode", 500)):
+                    complete_key(record_id, response)
+                else:
+                    release_key(record_id)
+            except Exception as e:
+                # The request itself ran; only replay is lost and the claim expires with its lease
+                logger.error(f"Failed to store idempotent response for {endpoint}: {str(e)}")
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def cleanup_expired_idempotency_keys() -> int:
+    """Delete idempotency keys past their retention window"""
+    sql = "DELETE FROM idempotency_keys WHERE expires_at < NOW()"
+    return execute_delete(sql)
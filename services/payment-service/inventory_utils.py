@@ -0,0 +1,198 @@
+"""
+Inventory reservation utilities for Gamarriando Payment Service
+
+Stock for every cart line is checked and decremented in one set-based
+statement, so flash sales cannot oversell and an order costs one round trip
+for inventory no matter how many lines it has.
+"""
+
+import os
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+import psycopg2.extras
+
+from db_utils import execute_returning
+
+logger = logging.getLogger(__name__)
+
+
+def get_inventory_config() -> Dict[str, Any]:
+    """Get inventory configuration from environment variables"""
+    return {
+        "reservation_ttl_minutes": int(os.getenv("STOCK_RESERVATION_TTL_MINUTES", "30")),
+        "sweeper_batch_size": int(os.getenv("STOCK_SWEEPER_BATCH_SIZE", "500")),
+    }
+
+
+def aggregate_quantities(order_items: List[Dict[str, Any]]) -> List[tuple]:
+    """Collapse cart lines into (product_id, quantity) pairs sorted by product id"""
+    quantities = OrderedDict()
+    for item in order_items:
+        product_id = int(item["product_id"])
+        quantity = int(item["quantity"])
+        if quantity <= 0:
+            raise ValueError(f"Quantity for product {product_id} must be positive")
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+    # Sorted so concurrent orders lock shared products in the same order
+    return sorted(quantities.items())
+
+
+def reserve_stock(
+    cursor, order_id: int, order_items: List[Dict[str, Any]], ttl_minutes: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Lock, check and decrement stock for all lines and record the reservations,
+    using the caller's cursor/transaction. Returns the insufficient lines
+    (empty list on success); the caller must roll back when it is not empty.
+    """
+    requested = aggregate_quantities(order_items)
+    ttl = ttl_minutes or get_inventory_config()["reservation_ttl_minutes"]
+
+    sql = """
+        WITH requested(product_id, quantity) AS (
+            VALUES %s
+        ), locked AS (
+            SELECT p.id
+            FROM products p
+            JOIN requested r ON r.product_id = p.id
+            ORDER BY p.id
+            FOR UPDATE OF p
+        ), decremented AS (
+            UPDATE products p
+            SET stock = p.stock - r.quantity, updated_at = NOW()
+            FROM requested r, locked l
+            WHERE p.id = r.product_id AND l.id = p.id AND p.stock >= r.quantity
+            RETURNING p.id, p.stock
+        ), reserved AS (
+            INSERT INTO stock_reservations (order_id, product_id, quantity, status, expires_at)
+            SELECT {order_id}, r.product_id, r.quantity, 'reserved',
+                   NOW() + make_interval(mins => {ttl})
+            FROM requested r
+            JOIN decremented d ON d.id = r.product_id
+        )
+        SELECT r.product_id, r.quantity as requested, p.stock as available,
+               d.id IS NOT NULL as reserved
+        FROM requested r
+        LEFT JOIN decremented d ON d.id = r.product_id
+        LEFT JOIN products p ON p.id = r.product_id
+    """.format(order_id=int(order_id), ttl=int(ttl))
+
+    rows = psycopg2.extras.execute_values(
+        cursor,
+        sql,
+        requested,
+        template="(%s::integer, %s::integer)",
+        page_size=max(len(requested), 1),
+        fetch=True,
+    )
+
+    insufficient = []
+    for product_id, quantity, available, reserved in rows:
+        if not reserved:
+            insufficient.append(
+                {
+                    "product_id": str(product_id),
+                    "requested": quantity,
+                    "available": available if available is not None else 0,
+                    "reason": (
+                        "insufficient_stock" if available is not None else "product_not_found"
+                    ),
+                }
+            )
+    return sorted(insufficient, key=lambda line: int(line["product_id"]))
+
+
+def release_order_reservations(cursor, order_id: int) -> int:
+    """Return the stock of an order's open reservations (order cancelled or deleted)"""
+    cursor.execute(
+        """
+        WITH released AS (
+            UPDATE stock_reservations
+            SET status = 'released', updated_at = NOW()
+            WHERE order_id = %s AND status = 'reserved'
+            RETURNING product_id, quantity
+        ), restocked AS (
+            UPDATE products p
+            SET stock = p.stock + r.quantity, updated_at = NOW()
+            FROM (SELECT product_id, SUM(quantity) as quantity FROM released GROUP BY product_id) r
+            WHERE p.id = r.product_id
+            RETURNING p.id
+        )
+        SELECT COUNT(*) FROM released
+    """,
+        (order_id,),
+    )
+    return cursor.fetchone()[0]
+
+
+def commit_order_reservations(cursor, order_id: int) -> int:
+    """
+    Mark an order's open reservations as consumed (order confirmed) so the
+    sweeper never restocks them
+    """
+    cursor.execute(
+        """
+        UPDATE stock_reservations
+        SET status = 'committed', updated_at = NOW()
+        WHERE order_id = %s AND status = 'reserved'
+    """,
+        (order_id,),
+    )
+    return cursor.rowcount
+
+
+def sweep_expired_reservations(batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    Release one batch of expired reservations in a single statement: restore
+    stock, cancel their orders and emit order.cancelled outbox events.
+    Only reservations of orders that are still pending and have no payment
+    in processing or completed are swept; a paid or confirmed order keeps
+    its stock however long settlement takes. SKIP LOCKED lets several
+    sweepers run without blocking each other, and skips reservations a
+    payment claim is extending at that moment.
+    """
+    batch_size = batch_size or get_inventory_config()["sweeper_batch_size"]
+    sql = """
+        WITH expired AS (
+            UPDATE stock_reservations
+            SET status = 'expired', updated_at = NOW()
+            WHERE id IN (
+                SELECT sr.id
+                FROM stock_reservations sr
+                JOIN orders o ON o.id = sr.order_id
+                WHERE sr.status = 'reserved' AND sr.expires_at < NOW()
+                  AND o.status = 'pending'
+                  AND NOT EXISTS (
+                      SELECT 1 FROM payments p
+                      WHERE p.order_id = sr.order_id AND p.status IN ('processing', 'completed')
+                  )
+                ORDER BY sr.expires_at
+                LIMIT %s
+                FOR UPDATE OF sr SKIP LOCKED
+            )
+            RETURNING order_id, product_id, quantity
+        ), restocked AS (
+            UPDATE products p
+            SET stock = p.stock + e.quantity, updated_at = NOW()
+            FROM (SELECT product_id, SUM(quantity) as quantity FROM expired GROUP BY product_id) e
+            WHERE p.id = e.product_id
+            RETURNING p.id
+        ), cancelled AS (
+            UPDATE orders
+            SET status = 'cancelled', updated_at = NOW()
+            WHERE id IN (SELECT DISTINCT order_id FROM expired) AND status = 'pending'
+            RETURNING id
+        ), events AS (
+            INSERT INTO outbox (aggregate_type, aggregate_id, event_type, payload)
+            SELECT 'order', id::text, 'order.cancelled',
+                   jsonb_build_object('order_id', id, 'reason', 'stock_reservation_expired')
+            FROM cancelled
+        )
+        SELECT (SELECT COUNT(*) FROM expired) as released,
+               (SELECT COUNT(*) FROM restocked) as products_restocked,
+               (SELECT COUNT(*) FROM cancelled) as orders_cancelled
+    """
+    result = execute_returning(sql, (batch_size,))
+    return {key: int(value) for key, value in (result or {}).items()}
@@ -0,0 +1,29 @@
+-- Gamarriando Payment Service - Idempotency keys
+-- Stores the response of POST requests sent with an Idempotency-Key header so retries
+-- (e.g. after an API Gateway timeout) replay the original response instead of re-running it.
+-- Run after payment_tables.sql.
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    id SERIAL PRIMARY KEY,
+    endpoint VARCHAR(100) NOT NULL,
+    -- Authorizer principal or Authorization digest; '' for anonymous callers
+    caller VARCHAR(128) NOT NULL DEFAULT '',
+    idempotency_key VARCHAR(255) NOT NULL,
+    request_hash CHAR(64) NOT NULL,
+    -- in_progress: claimed by a running request until locked_until; completed: response stored
+    state VARCHAR(20) NOT NULL DEFAULT 'in_progress' CHECK (state IN ('in_progress', 'completed')),
+    locked_until TIMESTAMP WITH TIME ZONE,
+    status_code INTEGER,
+    response_headers JSONB,
+    response_body TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- Lookup and claim path: one unique index probe per (endpoint, caller, key)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_idempotency_keys_endpoint_caller_key
+    ON idempotency_keys(endpoint, caller, idempotency_key);
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at ON idempotency_keys(expires_at);
+
+-- Display summary
+SELECT 'Idempotency keys migration completed successfully!' as status;
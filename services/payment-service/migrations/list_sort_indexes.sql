@@ -0,0 +1,28 @@
+-- Gamarriando Payment Service - Indexes behind the list sort keys
+-- Every key in the orders, payments and transactions list specs has a (column, id)
+-- index. List queries order by the key and then id, so "ORDER BY created_at DESC,
+-- id DESC LIMIT n" and the keyset seek "(created_at, id) < (x, y)" are index range
+-- scans instead of a sort of every match, and ties keep a stable order across pages.
+-- Run after payment_tables.sql with psql (CONCURRENTLY cannot run inside a transaction).
+
+-- Row comparisons never match NULL, so sort columns must be NOT NULL for cursors to
+-- reach every row; created_at already defaults to NOW()
+UPDATE orders SET created_at = NOW() WHERE created_at IS NULL;
+UPDATE payments SET created_at = NOW() WHERE created_at IS NULL;
+UPDATE transactions SET created_at = NOW() WHERE created_at IS NULL;
+ALTER TABLE orders ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE payments ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE transactions ALTER COLUMN created_at SET NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_created_at_id ON orders(created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_total_amount_id ON orders(total_amount, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_created_at_id ON payments(created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_amount_id ON payments(amount, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_created_at_id ON transactions(created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_amount_id ON transactions(amount, id);
+
+-- Superseded by the composite indexes above, which serve the same lookups
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_created_at;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_total_amount;
+DROP INDEX CONCURRENTLY IF EXISTS idx_payments_created_at;
+DROP INDEX CONCURRENTLY IF EXISTS idx_transactions_created_at;
@@ -0,0 +1,35 @@
+-- Gamarriando Payment Service - Transactional outbox
+-- Order/payment events are written in the same transaction as the change itself and
+-- published to notification-service by the outbox_relay Lambda. Run after payment_tables.sql.
+
+CREATE TABLE IF NOT EXISTS outbox (
+    id BIGSERIAL PRIMARY KEY,
+    aggregate_type VARCHAR(50) NOT NULL,      -- 'order', 'payment'
+    aggregate_id VARCHAR(255) NOT NULL,
+    event_type VARCHAR(100) NOT NULL,         -- 'order.created', 'payment.completed', ...
+    payload JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    published_at TIMESTAMP WITH TIME ZONE,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+
+-- Relay scan: only unpublished rows, in insertion order
+CREATE INDEX IF NOT EXISTS idx_outbox_unpublished ON outbox(id) WHERE published_at IS NULL;
+-- Cleanup of published rows past retention
+CREATE INDEX IF NOT EXISTS idx_outbox_published_at ON outbox(published_at) WHERE published_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_outbox_aggregate ON outbox(aggregate_type, aggregate_id);
+
+-- Rows that failed OUTBOX_MAX_ATTEMPTS times; kept for inspection, no longer relayed
+ALTER TABLE outbox ADD COLUMN IF NOT EXISTS dead_lettered_at TIMESTAMP WITH TIME ZONE;
+
+-- Relay scan and per-aggregate ordering check: only pending (unpublished, live) rows
+CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox(id)
+    WHERE published_at IS NULL AND dead_lettered_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_outbox_pending_aggregate ON outbox(aggregate_type, aggregate_id, id)
+    WHERE published_at IS NULL AND dead_lettered_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_outbox_dead_lettered ON outbox(dead_lettered_at)
+    WHERE dead_lettered_at IS NOT NULL;
+
+-- Display summary
+SELECT 'Outbox migration completed successfully!' as status;
@@ -0,0 +1,32 @@
+-- Gamarriando Payment Service - Payment state machine constraints
+-- Backs the conditional transitions in payment_state.py. Run after payment_tables.sql.
+
+-- At most one completed refund per payment; concurrent refunds that both pass the
+-- status check are rejected here instead of double-refunding
+CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_single_refund
+    ON transactions(payment_id)
+    WHERE transaction_type = 'refund' AND status = 'completed';
+
+-- Processing lease: only the worker (or sync request) holding a fresh lease calls the
+-- gateway; payments_sweeper re-queues payments whose lease expired
+ALTER TABLE payments ADD COLUMN IF NOT EXISTS processing_started_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE payments ADD COLUMN IF NOT EXISTS processing_attempts INTEGER NOT NULL DEFAULT 0;
+
+-- Sweeper path: only the (few) payments currently in processing
+CREATE INDEX IF NOT EXISTS idx_payments_processing_lease
+    ON payments(COALESCE(processing_started_at, updated_at))
+    WHERE status = 'processing';
+
+-- Refund claim: a refund request moves the payment to refunding (with the amount it
+-- refunds) before calling the gateway; refund_attempts picks the gateway idempotency key
+ALTER TABLE payments ADD COLUMN IF NOT EXISTS refund_amount DECIMAL(10,2);
+ALTER TABLE payments ADD COLUMN IF NOT EXISTS refund_started_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE payments ADD COLUMN IF NOT EXISTS refund_attempts INTEGER NOT NULL DEFAULT 0;
+
+-- Sweeper path: only the payments currently refunding
+CREATE INDEX IF NOT EXISTS idx_payments_refund_claim
+    ON payments(refund_started_at)
+    WHERE status = 'refunding';
+
+-- Display summary
+SELECT 'Payment state migration completed successfully!' as status;
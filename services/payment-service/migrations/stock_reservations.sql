@@ -0,0 +1,28 @@
+-- Gamarriando Payment Service - Stock reservations
+-- orders_create decrements products.stock for all cart lines in one statement and records
+-- a reservation per line. Reservations are committed when the payment completes and
+-- released (stock restored) by the reservations_sweeper Lambda once they expire.
+-- Run after payment_tables.sql.
+
+CREATE TABLE IF NOT EXISTS stock_reservations (
+    id SERIAL PRIMARY KEY,
+    order_id INTEGER NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    product_id INTEGER NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    quantity INTEGER NOT NULL CHECK (quantity > 0),
+    status VARCHAR(20) NOT NULL DEFAULT 'reserved',  -- 'reserved', 'committed', 'released', 'expired'
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_stock_reservations_order_id ON stock_reservations(order_id);
+-- Sweeper scan: only open reservations, oldest expiry first
+CREATE INDEX IF NOT EXISTS idx_stock_reservations_open_expires_at
+    ON stock_reservations(expires_at) WHERE status = 'reserved';
+
+CREATE TRIGGER update_stock_reservations_updated_at
+    BEFORE UPDATE ON stock_reservations
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Display summary
+SELECT 'Stock reservations migration completed successfully!' as status;
@@ -0,0 +1,95 @@
+-- Gamarriando Payment Service - Materialized summary views
+-- Materialized versions of order_summary, payment_summary and transaction_summary.
+-- Run after payment_tables.sql. Refreshed by the summaries_refresh scheduled Lambda.
+
+-- Track when each materialized view was last refreshed (used for staleness headers)
+CREATE TABLE IF NOT EXISTS summary_refresh_log (
+    view_name VARCHAR(100) PRIMARY KEY,
+    refreshed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    duration_ms INTEGER
+);
+
+-- Materialized order summary
+CREATE MATERIALIZED VIEW IF NOT EXISTS order_summary_mv AS
+SELECT
+    o.id,
+    o.user_id,
+    o.status,
+    o.total_amount,
+    o.currency,
+    o.created_at,
+    o.updated_at,
+    COUNT(oi.id) as item_count,
+    COALESCE(SUM(oi.quantity), 0) as total_quantity
+FROM orders o
+LEFT JOIN order_items oi ON o.id = oi.order_id
+GROUP BY o.id, o.user_id, o.status, o.total_amount, o.currency, o.created_at, o.updated_at;
+
+-- Materialized payment summary
+CREATE MATERIALIZED VIEW IF NOT EXISTS payment_summary_mv AS
+SELECT
+    p.id,
+    p.order_id,
+    p.amount,
+    p.currency,
+    p.payment_method,
+    p.status,
+    p.created_at,
+    p.updated_at,
+    o.user_id,
+    o.total_amount as order_total,
+    COUNT(t.id) as transaction_count
+FROM payments p
+LEFT JOIN orders o ON p.order_id = o.id
+LEFT JOIN transactions t ON p.id = t.payment_id
+GROUP BY p.id, p.order_id, p.amount, p.currency, p.payment_method, p.status, p.created_at, p.updated_at, o.user_id, o.total_amount;
+
+-- Materialized transaction summary
+CREATE MATERIALIZED VIEW IF NOT EXISTS transaction_summary_mv AS
+SELECT
+    t.id,
+    t.payment_id,
+    t.transaction_type,
+    t.amount,
+    t.currency,
+    t.status,
+    t.gateway_transaction_id,
+    t.created_at,
+    t.updated_at,
+    p.order_id,
+    p.payment_method,
+    o.user_id
+FROM transactions t
+LEFT JOIN payments p ON t.payment_id = p.id
+LEFT JOIN orders o ON p.order_id = o.id;
+
+-- Unique indexes are required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_order_summary_mv_id ON order_summary_mv(id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_payment_summary_mv_id ON payment_summary_mv(id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_transaction_summary_mv_id ON transaction_summary_mv(id);
+
+-- Indexes for the list endpoint filters
+CREATE INDEX IF NOT EXISTS idx_order_summary_mv_user_id ON order_summary_mv(user_id);
+CREATE INDEX IF NOT EXISTS idx_order_summary_mv_status ON order_summary_mv(status);
+CREATE INDEX IF NOT EXISTS idx_order_summary_mv_created_at ON order_summary_mv(created_at);
+
+CREATE INDEX IF NOT EXISTS idx_payment_summary_mv_order_id ON payment_summary_mv(order_id);
+CREATE INDEX IF NOT EXISTS idx_payment_summary_mv_user_id ON payment_summary_mv(user_id);
+CREATE INDEX IF NOT EXISTS idx_payment_summary_mv_status ON payment_summary_mv(status);
+CREATE INDEX IF NOT EXISTS idx_payment_summary_mv_created_at ON payment_summary_mv(created_at);
+
+CREATE INDEX IF NOT EXISTS idx_transaction_summary_mv_payment_id ON transaction_summary_mv(payment_id);
+CREATE INDEX IF NOT EXISTS idx_transaction_summary_mv_user_id ON transaction_summary_mv(user_id);
+CREATE INDEX IF NOT EXISTS idx_transaction_summary_mv_status ON transaction_summary_mv(status);
+CREATE INDEX IF NOT EXISTS idx_transaction_summary_mv_created_at ON transaction_summary_mv(created_at);
+
+-- Record the initial population
+INSERT INTO summary_refresh_log (view_name, refreshed_at) VALUES
+('order_summary_mv', NOW()),
+('payment_summary_mv', NOW()),
+('transaction_summary_mv', NOW())
+ON CONFLICT (view_name) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at;
+
+-- Display summary
+SELECT 'Summary materialized views migration completed successfully!' as status;
+SELECT view_name, refreshed_at FROM summary_refresh_log ORDER BY view_name;
@@ -0,0 +1,202 @@
+"""
+Transactional outbox utilities for Gamarriando Payment Service
+
+Handlers write events into the outbox table inside the same transaction as
+the order/payment change. The outbox_relay Lambda later reads unpublished rows
+with FOR UPDATE SKIP LOCKED (so several relays never publish the same row)
+and hands them to a pluggable sink, keeping notification fan-out off the
+checkout request path.
+
+Events of one aggregate are published in order: a row is only relayed once
+every earlier event of its aggregate is published, so a failed
+payment.completed holds back the payment.refunded behind it. After
+OUTBOX_MAX_ATTEMPTS failures a row is dead-lettered (dead_lettered_at, logged
+at ERROR) and stops blocking its aggregate.
+"""
+
+import os
+import json
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Dict, Any, Optional
+
+import psycopg2.extras
+
+from db_utils import get_db_connection, execute_delete
+from queue_utils import PaymentQueue, SQSQueue
+
+logger = logging.getLogger(__name__)
+
+
+class JSONEncoder(json.JSONEncoder):
+    """Custom JSON encoder to handle Decimal and datetime objects"""
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return float(obj)
+        elif isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        return super().default(obj)
+
+
+def get_outbox_config() -> Dict[str, Any]:
+    """Get outbox configuration from environment variables"""
+    return {
+        "sink": os.getenv("OUTBOX_SINK", "log"),
+        "notification_queue_url": os.getenv("NOTIFICATION_QUEUE_URL", ""),
+        "batch_size": int(os.getenv("OUTBOX_BATCH_SIZE", "100")),
+        "max_attempts": int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10")),
+        "retention_days": int(os.getenv("OUTBOX_RETENTION_DAYS", "7")),
+        "region": os.getenv("AWS_REGION", "us-east-1"),
+    }
+
+
+class OutboxSink(ABC):
+    """Destination for relayed outbox events"""
+
+    @abstractmethod
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Deliver one event; raise to have it retried"""
+
+
+class LoggingSink(OutboxSink):
+    """Writes events to the log (local development)"""
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        logger.info(f"Outbox event: {json.dumps(event, cls=JSONEncoder)}")
+
+
+class QueueSink(OutboxSink):
+    """Sends events to an SQS-shaped queue consumed by notification-service"""
+
+    def __init__(self, queue: PaymentQueue):
+        self.queue = queue
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        self.queue.send_message(json.loads(json.dumps(event, cls=JSONEncoder)))
+
+
+def get_outbox_sink() -> OutboxSink:
+    """Build the sink selected by OUTBOX_SINK"""
+    config = get_outbox_config()
+    if config["sink"] == "log":
+        return LoggingSink()
+    if config["sink"] == "sqs":
+        return QueueSink(SQSQueue(config["notification_queue_url"], config["region"]))
+    raise ValueError(f"Unknown outbox sink: {config['sink']}")
+
+
+def write_outbox_event(
+    cursor, aggregate_type: str, aggregate_id: Any, event_type: str, payload: Dict[str, Any]
+) -> None:
+    """Insert an event using the caller's cursor, so it commits with the caller's transaction"""
+    cursor.execute(
+        """
+        INSERT INTO outbox (aggregate_type, aggregate_id, event_type, payload)
+        VALUES (%s, %s, %s, %s)
+        """,
+        (aggregate_type, str(aggregate_id), event_type, json.dumps(payload, cls=JSONEncoder)),
+    )
+
+
+def relay_outbox_batch(
+    sink: Optional[OutboxSink] = None, batch_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Publish one batch of unpublished events. Rows are locked with SKIP LOCKED
+    for the duration of the batch; successes are marked published and failures
+    are retried on a later batch. Only the oldest pending event of each
+    aggregate is eligible, so events of one aggregate never overtake each
+    other (a row locked by another relay also holds back its successors).
+    A row failing for the OUTBOX_MAX_ATTEMPTS-th time is dead-lettered.
+    """
+    config = get_outbox_config()
+    sink = sink or get_outbox_sink()
+    batch_size = batch_size or config["batch_size"]
+
+    select_sql = """
+        SELECT o.id, o.aggregate_type, o.aggregate_id, o.event_type, o.payload, o.created_at,
+               o.attempts
+        FROM outbox o
+        WHERE o.published_at IS NULL AND o.dead_lettered_at IS NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM outbox e
+              WHERE e.aggregate_type = o.aggregate_type AND e.aggregate_id = o.aggregate_id
+                AND e.id < o.id AND e.published_at IS NULL AND e.dead_lettered_at IS NULL
+          )
+        ORDER BY o.id
+        LIMIT %s
+        FOR UPDATE OF o SKIP LOCKED
+    """
+
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.execute(select_sql, (batch_size,))
+            rows = cursor.fetchall()
+
+            published_ids = []
+            failed_ids = []
+            failed_errors = []
+            for row in rows:
+                event = {
+                    "id": row["id"],
+                    "type": row["event_type"],
+                    "aggregate_type": row["aggregate_type"],
+                    "aggregate_id": row["aggregate_id"],
+                    "payload": row["payload"],
+                    "occurred_at": row["created_at"],
+                }
+                try:
+                    sink.publish(event)
+                    published_ids.append(row["id"])
+                except Exception as e:
+                    logger.warning(f"Outbox event {row['id']} publish error: {str(e)}")
+                    failed_ids.append(row["id"])
+                    failed_errors.append(str(e))
+
+            if published_ids:
+                cursor.execute(
+                    "UPDATE outbox SET published_at = NOW(), attempts = attempts + 1 "
+                    "WHERE id = ANY(%s)",
+                    (published_ids,),
+                )
+            dead_lettered = []
+            if failed_ids:
+                cursor.execute(
+                    """
+                    UPDATE outbox o
+                    SET attempts = o.attempts + 1,
+                        last_error = f.error,
+                        dead_lettered_at = CASE WHEN o.attempts + 1 >= %s THEN NOW() END
+                    FROM unnest(%s::bigint[], %s::text[]) AS f(id, error)
+                    WHERE o.id = f.id
+                    RETURNING o.id, o.aggregate_type, o.aggregate_id, o.event_type, o.attempts,
+                              o.last_error, o.dead_lettered_at
+                    """,
+                    (config["max_attempts"], failed_ids, failed_errors),
+                )
+                dead_lettered = [row for row in cursor.fetchall() if row["dead_lettered_at"]]
+            conn.commit()
+
+    for row in dead_lettered:
+        logger.error(
+            f"Outbox event {row['id']} ({row['event_type']} of {row['aggregate_type']} "
+            f"{row['aggregate_id']}) dead-lettered after {row['attempts']} attempts: "
+            f"{row['last_error']}"
+        )
+
+    return {
+        "fetched": len(rows),
+        "published": len(published_ids),
+        "failed": len(failed_ids),
+        "dead_lettered": len(dead_lettered),
+    }
+
+
+def cleanup_published_events(retention_days: Optional[int] = None) -> int:
+    """Delete published events older than the retention window"""
+    days = retention_days or get_outbox_config()["retention_days"]
+    sql = "DELETE FROM outbox WHERE published_at < NOW() - make_interval(days => %s)"
+    return execute_delete(sql, (days,))
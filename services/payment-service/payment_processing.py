@@ -0,0 +1,339 @@
+"""
+Payment processing pipeline for Gamarriando Payment Service
+
+In sync mode payments_process calls the gateway inside the API request. In
+async mode it only claims the payment and enqueues it; payments_worker drains
+the queue in batches and settles each payment.
+
+The gateway is only called by the holder of the payment's processing lease,
+with the payment's idempotency key, so neither a redelivered message nor a
+retry after a crash can charge twice. sweep_stale_processing re-queues
+payments whose lease holder died and fails them after
+PAYMENT_MAX_PROCESSING_ATTEMPTS.
+
+Refunds are claimed (completed -> refunding) before the gateway is called,
+so of two concurrent refund requests only the winner refunds; the other gets
+409 without any money moving. sweep_stale_refunds releases claims whose
+request died.
+"""
+
+import os
+import json
+import random
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+from payment_state import (
+    PaymentTransitionError,
+    apply_refund,
+    claim_for_refund,
+    find_stale_processing,
+    find_stale_refunds,
+    get_payment,
+    release_processing_claim,
+    release_processing_lease,
+    release_refund_claim,
+    release_stale_refund,
+    requeue_stale_processing,
+    settle_processing,
+    take_processing_lease,
+)
+from queue_utils import PaymentQueue, get_payment_queue
+
+logger = logging.getLogger(__name__)
+
+
+def get_processing_mode() -> str:
+    """'sync' processes inside the request, 'async' enqueues and returns 202"""
+    return os.getenv("PAYMENT_PROCESSING_MODE", "sync").lower()
+
+
+def get_max_processing_attempts() -> int:
+    """Gateway attempts before a stuck payment is failed instead of re-queued"""
+    return int(os.getenv("PAYMENT_MAX_PROCESSING_ATTEMPTS", "3"))
+
+
+def gateway_idempotency_key(payment: Dict[str, Any]) -> str:
+    """One key per payment: every retry of the same charge is the same gateway request"""
+    return f"payment-{payment['id']}"
+
+
+def simulate_payment_processing(
+    payment: Dict[str, Any], request_body: Dict[str, Any], idempotency_key: str
+) -> Dict[str, Any]:
+    """
+    Simulate payment processing with external gateway
+    In real implementation, this would integrate with Stripe, PayPal, etc.,
+    passing idempotency_key (Stripe's Idempotency-Key, PayPal's PayPal-Request-Id)
+    so a repeated call returns the original charge instead of a new one.
+    """
+    # Like a real gateway, the same idempotency key always gets the same outcome
+    gateway = random.Random(idempotency_key)
+
+    # 90% success rate for simulation
+    is_successful = gateway.random() < 0.9
+
+    if is_successful:
+        return {
+            "status": "completed",
+            "gateway_response": {
+                "transaction_id": f"txn_{gateway.randint(100000, 999999)}",
+                "idempotency_key": idempotency_key,
+                "gateway": payment["payment_method"],
+                "processed_at": datetime.utcnow().isoformat(),
+                "fee": round(float(payment["amount"]) * 0.029, 2),  # 2.9% fee
+                "net_amount": round(float(payment["amount"]) * 0.971, 2),
+            },
+        }
+    else:
+        return {
+            "status": "failed",
+            "gateway_response": {
+                "idempotency_key": idempotency_key,
+                "error_code": "CARD_DECLINED",
+                "error_message": "Your card was declined",
+                "gateway": payment["payment_method"],
+                "processed_at": datetime.utcnow().isoformat(),
+            },
+        }
+
+
+def process_claimed_payment(
+    payment: Dict[str, Any], request_body: Dict[str, Any], release_on_error: bool = True
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Call the gateway for a payment whose processing lease we hold and settle
+    it. Returns (payment, processing_result).
+    """
+    try:
+        processing_result = simulate_payment_processing(
+            payment, request_body, gateway_idempotency_key(payment)
+        )
+    except Exception:
+        # The API path hands the payment back to the client; the worker keeps it
+        # in processing and only drops its lease so the redelivery can retry
+        if release_on_error:
+            release_processing_claim(int(payment["id"]))
+        else:
+            release_processing_lease(int(payment["id"]))
+        raise
+
+    updated_payment = settle_processing(int(payment["id"]), processing_result)
+    return updated_payment, processing_result
+
+
+def enqueue_payment_processing(
+    payment: Dict[str, Any], request_body: Dict[str, Any], queue: Optional[PaymentQueue] = None
+) -> str:
+    """Enqueue a claimed payment for the worker. Releases the claim if the enqueue fails."""
+    queue = queue or get_payment_queue()
+    try:
+        return queue.send_message(
+            {
+                "payment_id": int(payment["id"]),
+                "request": request_body,
+                "enqueued_at": datetime.utcnow().isoformat(),
+            }
+        )
+    except Exception:
+        release_processing_claim(int(payment["id"]))
+        raise
+
+
+def handle_payment_message(message_body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Process one queued payment. Deliveries of settled payments, and of
+    payments whose lease another delivery holds, are skipped: the lease
+    holder settles it, or sweep_stale_processing re-queues it if it dies.
+    """
+    payment_id = int(message_body["payment_id"])
+    payment = take_processing_lease(payment_id)
+
+    if not payment:
+        current = get_payment(payment_id)
+        status = current["status"] if current else "missing"
+        if status == "processing":
+            status = "leased"
+        logger.info(f"Skipping payment {payment_id}: status is {status}")
+        return {"payment_id": payment_id, "result": "skipped", "status": status}
+
+    try:
+        updated_payment, processing_result = process_claimed_payment(
+            payment, message_body.get("request") or {}, release_on_error=False
+        )
+    except PaymentTransitionError as e:
+        # Another delivery settled it between our read and our update
+        logger.info(f"Skipping payment {payment_id}: {e.message}")
+        return {"payment_id": payment_id, "result": "skipped", "status": "settled"}
+
+    return {
+        "payment_id": payment_id,
+        "result": "processed",
+        "status": processing_result["status"],
+        "transaction_id": updated_payment["transaction_id"],
+    }
+
+
+def sweep_stale_processing(
+    queue: Optional[PaymentQueue] = None, limit: int = 100
+) -> Dict[str, Any]:
+    """
+    Recover payments stuck in processing after their lease holder died (a
+    crashed worker or API request) or their message was lost. They are
+    queued again, where the gateway idempotency key makes the retry safe;
+    after PAYMENT_MAX_PROCESSING_ATTEMPTS leases they are failed instead.
+    """
+    queue = queue or get_payment_queue()
+    stats = {"requeued": 0, "failed": 0, "skipped": 0}
+
+    for stale in find_stale_processing(limit):
+        payment_id = int(stale["id"])
+        try:
+            if stale["processing_attempts"] >= get_max_processing_attempts():
+                # Taking the lease makes sure no live worker is still calling the gateway
+                if not take_processing_lease(payment_id):
+                    stats["skipped"] += 1
+                    continue
+                settle_processing(
+                    payment_id,
+                    {
+                        "status": "failed",
+                        "gateway_response": {
+                            "error_code": "PROCESSING_TIMEOUT",
+                            "error_message": "Payment processing did not complete",
+                            "attempts": stale["processing_attempts"],
+                            "processed_at": datetime.utcnow().isoformat(),
+                        },
+                    },
+                )
+                stats["failed"] += 1
+            elif requeue_stale_processing(payment_id):
+                queue.send_message(
+                    {
+                        "payment_id": payment_id,
+                        "request": {},
+                        "enqueued_at": datetime.utcnow().isoformat(),
+                    }
+                )
+                stats["requeued"] += 1
+            else:
+                stats["skipped"] += 1
+        except PaymentTransitionError:
+            # Settled by its lease holder in the meantime
+            stats["skipped"] += 1
+        except Exception as e:
+            logger.error(f"Stale payment {payment_id} recovery failed: {str(e)}")
+            stats["skipped"] += 1
+
+    return stats
+
+
+def refund_idempotency_key(payment: Dict[str, Any]) -> str:
+    """
+    One key per refund attempt of a payment: a retry after a released claim
+    reuses it; only a refund the gateway declined moves on to a new key
+    """
+    return f"refund-{payment['id']}-{payment['refund_attempts']}"
+
+
+def simulate_refund_processing(
+    payment: Dict[str, Any], refund_amount: float, reason: str, idempotency_key: str
+) -> Dict[str, Any]:
+    """
+    Simulate refund processing with external gateway
+    In real implementation, this would integrate with Stripe, PayPal, etc.,
+    passing idempotency_key so a repeated call returns the original refund.
+    """
+    gateway = random.Random(idempotency_key)
+
+    # 95% success rate for refunds (usually higher than payments)
+    is_successful = gateway.random() < 0.95
+
+    if is_successful:
+        return {
+            "status": "completed",
+            "gateway_response": {
+                "refund_id": f"re_{gateway.randint(100000, 999999)}",
+                "idempotency_key": idempotency_key,
+                "gateway": payment["payment_method"],
+                "refunded_at": datetime.utcnow().isoformat(),
+                "amount": refund_amount,
+                "reason": reason,
+                "processing_time": "2-5 business days",
+            },
+        }
+    else:
+        return {
+            "status": "failed",
+            "gateway_response": {
+                "idempotency_key": idempotency_key,
+                "error_code": "REFUND_FAILED",
+                "error_message": "Refund could not be processed at this time",
+                "gateway": payment["payment_method"],
+                "attempted_at": datetime.utcnow().isoformat(),
+            },
+        }
+
+
+def refund_payment(
+    payment_id: int, refund_amount: Optional[float], reason: str
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Claim, refund at the gateway and settle. refund_amount None refunds the
+    whole amount (resolved by the claim). Returns (payment, refund_result);
+    the payment carries transaction_id and refund_amount.
+    """
+    payment = claim_for_refund(payment_id, refund_amount)
+    try:
+        refund_result = simulate_refund_processing(
+            payment, float(payment["refund_amount"]), reason, refund_idempotency_key(payment)
+        )
+    except Exception:
+        release_refund_claim(payment_id)
+        raise
+    return apply_refund(payment_id, refund_result), refund_result
+
+
+def sweep_stale_refunds(limit: int = 100) -> Dict[str, Any]:
+    """Release refund claims whose request died before settling (see release_stale_refund)"""
+    stats = {"released": 0, "skipped": 0}
+    for stale in find_stale_refunds(limit):
+        try:
+            if release_stale_refund(int(stale["id"])):
+                stats["released"] += 1
+            else:
+                stats["skipped"] += 1
+        except Exception as e:
+            logger.error(f"Stale refund {stale['id']} release failed: {str(e)}")
+            stats["skipped"] += 1
+    return stats
+
+
+def drain_payment_queue(
+    queue: Optional[PaymentQueue] = None, batch_size: int = 10, max_batches: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Receive and process messages in batches until the queue is empty (or
+    max_batches is reached). Failed messages are not deleted and become
+    visible again after the visibility timeout.
+    """
+    queue = queue or get_payment_queue()
+    stats = {"batches": 0, "processed": 0, "skipped": 0, "failed": 0}
+
+    while max_batches is None or stats["batches"] < max_batches:
+        messages = queue.receive_messages(max_messages=batch_size)
+        if not messages:
+            break
+        stats["batches"] += 1
+
+        for message in messages:
+            try:
+                outcome = handle_payment_message(json.loads(message["Body"]))
+                queue.delete_message(message["ReceiptHandle"])
+                stats[outcome["result"]] += 1
+            except Exception as e:
+                logger.error(f"Payment message {message['MessageId']} failed: {str(e)}")
+                stats["failed"] += 1
+
+    return stats
@@ -0,0 +1,418 @@
+"""
+Payment state machine for Gamarriando Payment Service
+
+Every transition is a single conditional UPDATE ... WHERE status = <expected>
+RETURNING, so concurrent requests cannot both move the same payment, and the
+matching transaction row (and its outbox event) is inserted in the same
+statement via CTEs (settlement also commits the order's stock reservations).
+
+    pending --claim--> processing --settle--> completed | failed
+    completed --claim--> refunding --refund--> refunded (full) | completed (partial, failed)
+
+Payments of cancelled orders are never claimed, and never completed.
+
+Only the holder of the processing lease (processing_started_at, younger
+than PAYMENT_PROCESSING_LEASE_SECONDS) calls the gateway: the API claim takes
+it in sync mode, payments_worker takes it per message in async mode, so a
+redelivered message cannot charge twice while the first delivery is running.
+Refunds follow the same pattern: only the request that moves the payment to
+refunding calls the gateway.
+"""
+
+import os
+import json
+import logging
+from typing import Dict, Any, List, Optional
+
+import psycopg2.errors
+
+from db_utils import execute_query, execute_single_query, execute_returning
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_COLUMNS = (
+    "id, order_id, amount, currency, payment_method, status, gateway_response, metadata"
+)
+
+
+class PaymentTransitionError(Exception):
+    """Raised when a payment cannot make the requested transition"""
+
+    def __init__(self, message: str, status_code: int = 409):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def get_payment(payment_id: int) -> Optional[Dict[str, Any]]:
+    """Get payment by ID"""
+    sql = f"SELECT {PAYMENT_COLUMNS} FROM payments WHERE id = %s"
+    return execute_single_query(sql, (payment_id,))
+
+
+def _raise_for_current_state(payment_id: int, action: str) -> None:
+    """Explain why a conditional transition matched no row (only runs on the failure path)"""
+    payment = execute_single_query(
+        """
+        SELECT p.status, o.status as order_status
+        FROM payments p
+        LEFT JOIN orders o ON o.id = p.order_id
+        WHERE p.id = %s
+    """,
+        (payment_id,),
+    )
+    if not payment:
+        raise PaymentTransitionError("Payment not found", 404)
+    if payment["order_status"] == "cancelled" and payment["status"] == "pending":
+        raise PaymentTransitionError(f"Order is cancelled. Cannot {action}.", 409)
+    raise PaymentTransitionError(f"Payment is already {payment['status']}. Cannot {action}.", 409)
+
+
+def get_lease_seconds() -> int:
+    """How long a processing lease protects a gateway call; longer than any handler timeout"""
+    return int(os.getenv("PAYMENT_PROCESSING_LEASE_SECONDS", "120"))
+
+
+def claim_for_processing(payment_id: int, take_lease: bool = True) -> Dict[str, Any]:
+    """
+    Move a payment from pending to processing and return it (one round trip).
+    Refused when its order is cancelled; the order row is share-locked so a
+    concurrent cancellation either waits for the claim or makes it fail.
+    The order's open reservations are held for at least one more lease so the
+    reservations sweeper cannot expire them while the payment is in flight.
+    take_lease=False is for async mode: the payment is queued and the worker
+    takes the lease when it picks the message up.
+    """
+    sql = f"""
+        WITH claimed AS (
+            UPDATE payments
+            SET status = 'processing',
+                processing_started_at = CASE WHEN %s THEN NOW() END,
+                processing_attempts = CASE WHEN %s THEN 1 ELSE 0 END,
+                updated_at = NOW()
+            WHERE id = %s AND status = 'pending'
+              AND (order_id IS NULL OR EXISTS (
+                  SELECT 1 FROM orders o
+                  WHERE o.id = payments.order_id AND o.status <> 'cancelled'
+                  FOR SHARE
+              ))
+            RETURNING {PAYMENT_COLUMNS}
+        ), held AS (
+            UPDATE stock_reservations
+            SET expires_at = GREATEST(expires_at, NOW() + make_interval(secs => %s)),
+                updated_at = NOW()
+            WHERE order_id = (SELECT order_id FROM claimed) AND status = 'reserved'
+        )
+        SELECT * FROM claimed
+    """
+    payment = execute_returning(sql, (take_lease, take_lease, payment_id, get_lease_seconds()))
+    if not payment:
+        _raise_for_current_state(payment_id, "process")
+    return payment
+
+
+def take_processing_lease(payment_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Take the gateway-call lease of a processing payment. Succeeds when nobody
+    holds it or the holder's lease has expired (it crashed); None otherwise.
+    """
+    sql = f"""
+        UPDATE payments
+        SET processing_started_at = NOW(),
+            processing_attempts = processing_attempts + 1,
+            updated_at = NOW()
+        WHERE id = %s AND status = 'processing'
+          AND (processing_started_at IS NULL
+               OR processing_started_at < NOW() - make_interval(secs => %s))
+        RETURNING {PAYMENT_COLUMNS}, processing_attempts
+    """
+    return execute_returning(sql, (payment_id, get_lease_seconds()))
+
+
+def release_processing_lease(payment_id: int) -> bool:
+    """Give the lease back without settling (the gateway call raised) so a retry can take it"""
+    sql = """
+        UPDATE payments
+        SET processing_started_at = NULL, updated_at = NOW()
+        WHERE id = %s AND status = 'processing'
+        RETURNING id
+    """
+    return execute_returning(sql, (payment_id,)) is not None
+
+
+def release_processing_claim(payment_id: int) -> bool:
+    """Return a claimed payment to pending (e.g. the gateway call raised)"""
+    sql = """
+        UPDATE payments
+        SET status = 'pending', processing_started_at = NULL, updated_at = NOW()
+        WHERE id = %s AND status = 'processing'
+        RETURNING id
+    """
+    return execute_returning(sql, (payment_id,)) is not None
+
+
+def find_stale_processing(limit: int = 100) -> List[Dict[str, Any]]:
+    """
+    Payments stuck in processing: leased by a worker or request that died, or
+    queued (no lease) for longer than a lease without any worker picking them up
+    """
+    sql = """
+        SELECT id, processing_attempts
+        FROM payments
+        WHERE status = 'processing'
+          AND COALESCE(processing_started_at, updated_at) < NOW() - make_interval(secs => %s)
+        ORDER BY COALESCE(processing_started_at, updated_at)
+        LIMIT %s
+    """
+    return execute_query(sql, (get_lease_seconds(), limit))
+
+
+def requeue_stale_processing(payment_id: int) -> bool:
+    """Drop the expired lease of a stuck payment before it is queued again"""
+    sql = """
+        UPDATE payments
+        SET processing_started_at = NULL, updated_at = NOW()
+        WHERE id = %s AND status = 'processing'
+          AND COALESCE(processing_started_at, updated_at) < NOW() - make_interval(secs => %s)
+        RETURNING id
+    """
+    return execute_returning(sql, (payment_id, get_lease_seconds())) is not None
+
+
+def settle_processing(payment_id: int, processing_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Move a processing payment to the gateway outcome and record the payment
+    transaction in the same statement. A completed payment also commits the
+    order's stock reservations so the sweeper no longer releases them.
+    A payment whose order was cancelled meanwhile is never completed: it is
+    settled as failed with ORDER_CANCELLED and refund_required in its
+    gateway_response, so the charge can be refunded.
+    Returns the updated payment with its transaction_id.
+    """
+    gateway_response = json.dumps(processing_result["gateway_response"])
+    sql = f"""
+        WITH target AS (
+            SELECT p.id as payment_id,
+                   %s = 'completed' AND COALESCE((
+                       SELECT o.status = 'cancelled' FROM orders o WHERE o.id = p.order_id FOR SHARE
+                   ), false) as order_cancelled
+            FROM payments p
+            WHERE p.id = %s AND p.status = 'processing'
+            FOR UPDATE OF p
+        ), updated AS (
+            UPDATE payments
+            SET status = CASE WHEN t.order_cancelled THEN 'failed' ELSE %s END,
+                gateway_response = CASE WHEN t.order_cancelled
+                    THEN %s::jsonb
+                         || '{{"error_code": "ORDER_CANCELLED", "refund_required": true}}'::jsonb
+                    ELSE %s::jsonb END,
+                processing_started_at = NULL,
+                updated_at = NOW()
+            FROM target t
+            WHERE payments.id = t.payment_id
+            RETURNING {PAYMENT_COLUMNS}
+        ), txn AS (
+            INSERT INTO transactions (payment_id, transaction_type, amount, currency,
+                                      status, gateway_transaction_id, gateway_response,
+                                      created_at, updated_at)
+            SELECT id, 'payment', amount, currency, status, %s, gateway_response, NOW(), NOW()
+            FROM updated
+            RETURNING id
+        ), event AS (
+            INSERT INTO outbox (aggregate_type, aggregate_id, event_type, payload)
+            SELECT 'payment', id::text, 'payment.' || status,
+                   jsonb_build_object('payment_id', id, 'order_id', order_id, 'amount', amount,
+                                      'currency', currency, 'status', status,
+                                      'transaction_id', (SELECT id FROM txn))
+            FROM updated
+        ), committed AS (
+            UPDATE stock_reservations
+            SET status = 'committed', updated_at = NOW()
+            WHERE order_id = (SELECT order_id FROM updated WHERE status = 'completed')
+              AND status = 'reserved'
+        )
+        SELECT updated.*, (SELECT id FROM txn) as transaction_id
+        FROM updated
+    """
+    payment = execute_returning(
+        sql,
+        (
+            processing_result["status"],
+            payment_id,
+            processing_result["status"],
+            gateway_response,
+            gateway_response,
+            processing_result["gateway_response"].get("transaction_id"),
+        ),
+    )
+    if not payment:
+        _raise_for_current_state(payment_id, "settle")
+    if payment["status"] != processing_result["status"]:
+        logger.warning(
+            f"Payment {payment_id} settled as failed: its order was cancelled during processing"
+        )
+    return payment
+
+
+def _raise_for_refund(payment_id: int, refund_amount: Optional[float]) -> None:
+    """Explain why a refund claim matched no row (only runs on the failure path)"""
+    payment = execute_single_query(
+        """
+        SELECT status, amount, EXISTS (
+                   SELECT 1 FROM transactions
+                   WHERE payment_id = payments.id AND transaction_type = 'refund'
+                     AND status = 'completed'
+               ) as refunded
+        FROM payments
+        WHERE id = %s
+    """,
+        (payment_id,),
+    )
+    if not payment:
+        raise PaymentTransitionError("Payment not found", 404)
+    if payment["status"] == "refunding":
+        raise PaymentTransitionError("A refund for this payment is already in progress", 409)
+    if payment["status"] != "completed":
+        raise PaymentTransitionError(
+            f"Payment is {payment['status']}. Only completed payments can be refunded.", 409
+        )
+    if payment["refunded"]:
+        raise PaymentTransitionError("Payment has already been refunded", 409)
+    if refund_amount is not None and refund_amount > float(payment["amount"]):
+        raise PaymentTransitionError("Refund amount cannot exceed payment amount", 400)
+    raise PaymentTransitionError("Payment cannot be refunded", 409)
+
+
+def claim_for_refund(payment_id: int, refund_amount: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Move a completed, not yet refunded payment to refunding and return it with
+    the claimed refund_amount (the whole amount when none is given) and
+    refund_attempts. Only the caller that wins this claim calls the gateway.
+    """
+    sql = f"""
+        UPDATE payments
+        SET status = 'refunding',
+            refund_amount = COALESCE(%s, amount),
+            refund_started_at = NOW(),
+            updated_at = NOW()
+        WHERE id = %s
+          AND status = 'completed'
+          AND COALESCE(%s, amount) <= amount
+          AND NOT EXISTS (
+              SELECT 1 FROM transactions
+              WHERE payment_id = payments.id AND transaction_type = 'refund'
+                AND status = 'completed'
+          )
+        RETURNING {PAYMENT_COLUMNS}, refund_amount, refund_attempts
+    """
+    payment = execute_returning(sql, (refund_amount, payment_id, refund_amount))
+    if not payment:
+        _raise_for_refund(payment_id, refund_amount)
+    return payment
+
+
+def release_refund_claim(payment_id: int) -> bool:
+    """Return a refunding payment to completed (the gateway call raised)"""
+    sql = """
+        UPDATE payments
+        SET status = 'completed', refund_started_at = NULL, updated_at = NOW()
+        WHERE id = %s AND status = 'refunding'
+        RETURNING id
+    """
+    return execute_returning(sql, (payment_id,)) is not None
+
+
+def find_stale_refunds(limit: int = 100) -> List[Dict[str, Any]]:
+    """Payments left in refunding for longer than a lease (the refund request died)"""
+    sql = """
+        SELECT id
+        FROM payments
+        WHERE status = 'refunding'
+          AND refund_started_at < NOW() - make_interval(secs => %s)
+        ORDER BY refund_started_at
+        LIMIT %s
+    """
+    return execute_query(sql, (get_lease_seconds(), limit))
+
+
+def release_stale_refund(payment_id: int) -> bool:
+    """
+    Release an expired refund claim. refund_attempts is unchanged, so the next
+    claim calls the gateway with the same idempotency key and gets back the
+    refund the dead request may already have made instead of a second one.
+    """
+    sql = """
+        UPDATE payments
+        SET status = 'completed', refund_started_at = NULL, updated_at = NOW()
+        WHERE id = %s AND status = 'refunding'
+          AND refund_started_at < NOW() - make_interval(secs => %s)
+        RETURNING id
+    """
+    return execute_returning(sql, (payment_id, get_lease_seconds())) is not None
+
+
+def apply_refund(payment_id: int, refund_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Settle a refund claim in one statement and record the refund transaction
+    for the claimed refund_amount. A completed full refund moves the payment
+    to refunded; partial or failed refunds return it to completed, and a
+    failed one bumps refund_attempts so a later refund uses a new gateway key.
+    idx_transactions_single_refund still guards against a second completed refund.
+    """
+    refund_completed = refund_result["status"] == "completed"
+    gateway_response = json.dumps(refund_result["gateway_response"])
+    sql = f"""
+        WITH updated AS (
+            UPDATE payments
+            SET status = CASE WHEN %s AND refund_amount >= amount THEN 'refunded'
+                              ELSE 'completed' END,
+                refund_attempts = refund_attempts + CASE WHEN %s THEN 0 ELSE 1 END,
+                refund_started_at = NULL,
+                updated_at = NOW()
+            WHERE id = %s AND status = 'refunding'
+            RETURNING {PAYMENT_COLUMNS}, refund_amount
+        ), txn AS (
+            INSERT INTO transactions (payment_id, transaction_type, amount, currency,
+                                      status, gateway_transaction_id, gateway_response,
+                                      created_at, updated_at)
+            SELECT id, 'refund', refund_amount, currency, %s, %s, %s, NOW(), NOW()
+            FROM updated
+            RETURNING id
+        ), event AS (
+            INSERT INTO outbox (aggregate_type, aggregate_id, event_type, payload)
+            SELECT 'payment', id::text, %s,
+                   jsonb_build_object('payment_id', id, 'order_id', order_id, 'status', status,
+                                      'refund_amount', refund_amount, 'currency', currency,
+                                      'transaction_id', (SELECT id FROM txn))
+            FROM updated
+        )
+        SELECT updated.*, (SELECT id FROM txn) as transaction_id
+        FROM updated
+    """
+    try:
+        payment = execute_returning(
+            sql,
+            (
+                refund_completed,
+                refund_completed,
+                payment_id,
+                refund_result["status"],
+                refund_result["gateway_response"].get("refund_id"),
+                gateway_response,
+                "payment.refunded" if refund_completed else "payment.refund_failed",
+            ),
+        )
+    except psycopg2.errors.UniqueViolation:
+        # A completed refund already exists
+        raise PaymentTransitionError("Payment has already been refunded", 409)
+
+    if not payment:
+        current = get_payment(payment_id)
+        if not current:
+            raise PaymentTransitionError("Payment not found", 404)
+        # The claim expired and payments_sweeper released it
+        raise PaymentTransitionError(
+            f"Payment is {current['status']}. The refund claim was released before it settled.",
+            409,
+        )
+    return payment
@@ -0,0 +1,267 @@
+"""
+Order pricing utilities for Gamarriando Payment Service
+
+Line and order totals are computed server-side from the products table with
+Decimal arithmetic. All referenced products are loaded with one
+WHERE id = ANY(%s) query; a short-TTL in-process cache (kept across warm
+Lambda invocations) absorbs repeated lookups of hot SKUs.
+"""
+
+import os
+import time
+import logging
+import threading
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Dict, Any, List, Optional, Iterable
+
+from db_utils import execute_query
+
+logger = logging.getLogger(__name__)
+
+CENT = Decimal("0.01")
+
+
+def get_pricing_config() -> Dict[str, Any]:
+    """Get pricing configuration from environment variables"""
+    return {
+        "cache_ttl_seconds": float(os.getenv("PRICE_CACHE_TTL_SECONDS", "30")),
+        "cache_max_entries": int(os.getenv("PRICE_CACHE_MAX_ENTRIES", "5000")),
+    }
+
+
+class PricingError(Exception):
+    """Raised when an order cannot be priced or the client totals do not match"""
+
+    def __init__(self, message: str, errors: List[Dict[str, Any]], status_code: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.errors = errors
+        self.status_code = status_code
+
+
+class PriceCache:
+    """Product id -> (price, status) with a per-entry expiry"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, product_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for product_id in product_ids:
+                entry = self._entries.get(product_id)
+                if entry and entry[0] > now:
+                    found[product_id] = entry[1]
+        return found
+
+    def set_many(self, products: Dict[int, Dict[str, Any]]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if len(self._entries) + len(products) > self.max_entries:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) + len(products) > self.max_entries:
+                    self._entries.clear()
+            for product_id, product in products.items():
+                self._entries[product_id] = (expires_at, product)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_price_cache: Optional[PriceCache] = None
+
+
+def get_price_cache() -> PriceCache:
+    """Process-wide price cache, created on first use"""
+    global _price_cache
+    if _price_cache is None:
+        config = get_pricing_config()
+        _price_cache = PriceCache(config["cache_ttl_seconds"], config["cache_max_entries"])
+    return _price_cache
+
+
+def load_product_prices(product_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """Return {product_id: {'price', 'status'}} for the given ids, querying only cache misses"""
+    ids = sorted(set(int(product_id) for product_id in product_ids))
+    cache = get_price_cache()
+    products = cache.get_many(ids)
+
+    missing = [product_id for product_id in ids if product_id not in products]
+    if missing:
+        rows = execute_query(
+            "SELECT id, price, status FROM products WHERE id = ANY(%s)", (missing,)
+        )
+        loaded = {
+            row["id"]: {"price": Decimal(row["price"]), "status": row["status"]} for row in rows
+        }
+        cache.set_many(loaded)
+        products.update(loaded)
+    return products
+
+
+def to_money(value: Any, field: str) -> Decimal:
+    """Parse a client-supplied amount into a Decimal rounded to cents"""
+    try:
+        return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"Field '{field}' must be a number")
+
+
+def parse_integer(value: Any) -> Optional[int]:
+    """Return value as an int when it is an integer or an integral string, else None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().lstrip("+-").isdigit():
+        return int(value)
+    return None
+
+
+def validate_order_items(order_items: Any) -> List[Dict[str, Any]]:
+    """
+    Check the shape of every line before any database work: product_id and
+    quantity must be integers, quantity at least 1 and client prices numeric.
+    Returns the parsed lines; raises a 400 PricingError listing every bad line.
+    """
+    if not isinstance(order_items, list):
+        raise PricingError(
+            "Order items could not be priced", [{"reason": "order_items_not_a_list"}]
+        )
+
+    parsed = []
+    errors = []
+    for index, item in enumerate(order_items):
+        if not isinstance(item, dict):
+            errors.append({"line": index, "reason": "invalid_line"})
+            continue
+
+        product_id = parse_integer(item.get("product_id"))
+        quantity = parse_integer(item.get("quantity"))
+        if "product_id" not in item or item["product_id"] is None:
+            errors.append({"line": index, "reason": "product_id_required"})
+        elif product_id is None or product_id < 1:
+            errors.append({"line": index, "reason": "invalid_product_id"})
+        if "quantity" not in item or item["quantity"] is None:
+            errors.append({"line": index, "reason": "quantity_required"})
+        elif quantity is None:
+            errors.append({"line": index, "reason": "invalid_quantity"})
+        elif quantity < 1:
+            errors.append({"line": index, "reason": "quantity_below_minimum"})
+        for field in ("unit_price", "total_price"):
+            if item.get(field) is not None:
+                try:
+                    to_money(item[field], field)
+                except ValueError:
+                    errors.append({"line": index, "reason": f"invalid_{field}"})
+
+        parsed.append({**item, "product_id": product_id, "quantity": quantity})
+
+    if errors:
+        raise PricingError("Order items could not be priced", errors, 400)
+    return parsed
+
+
+def price_order(order_items: List[Dict[str, Any]], client_total: Any = None) -> Dict[str, Any]:
+    """
+    Price every line from the catalog and compare against the client's
+    unit_price / total_price / total_amount when they are supplied.
+    Returns {'lines': [...], 'total_amount': Decimal}; raises PricingError
+    listing every malformed, unknown, unavailable or mismatched line.
+    """
+    order_items = validate_order_items(order_items)
+    expected_total = None
+    if client_total is not None:
+        try:
+            expected_total = to_money(client_total, "total_amount")
+        except ValueError:
+            raise PricingError(
+                "Order items could not be priced", [{"reason": "invalid_total_amount"}]
+            )
+    products = load_product_prices(item["product_id"] for item in order_items)
+
+    lines = []
+    errors = []
+    for index, item in enumerate(order_items):
+        product_id = item["product_id"]
+        quantity = item["quantity"]
+        product = products.get(product_id)
+
+        if product is None:
+            errors.append(
+                {"line": index, "product_id": str(product_id), "reason": "product_not_found"}
+            )
+            continue
+        if product["status"] != "active":
+            errors.append(
+                {"line": index, "product_id": str(product_id), "reason": "product_not_available"}
+            )
+            continue
+
+        unit_price = product["price"].quantize(CENT, rounding=ROUND_HALF_UP)
+        total_price = (unit_price * quantity).quantize(CENT, rounding=ROUND_HALF_UP)
+
+        if (
+            item.get("unit_price") is not None
+            and to_money(item["unit_price"], "unit_price") != unit_price
+        ):
+            errors.append(
+                {
+                    "line": index,
+                    "product_id": str(product_id),
+                    "reason": "unit_price_mismatch",
+                    "expected": str(unit_price),
+                    "received": str(item["unit_price"]),
+                }
+            )
+        elif (
+            item.get("total_price") is not None
+            and to_money(item["total_price"], "total_price") != total_price
+        ):
+            errors.append(
+                {
+                    "line": index,
+                    "product_id": str(product_id),
+                    "reason": "total_price_mismatch",
+                    "expected": str(total_price),
+                    "received": str(item["total_price"]),
+                }
+            )
+
+        lines.append(
+            {
+                "product_id": product_id,
+                "quantity": quantity,
+                "unit_price": unit_price,
+                "total_price": total_price,
+            }
+        )
+
+    if errors:
+        # Unknown/unavailable products are a bad request; stale client prices are a conflict
+        unpriceable = any(error["reason"].startswith("product_") for error in errors)
+        raise PricingError("Order items could not be priced", errors, 400 if unpriceable else 409)
+
+    total_amount = sum((line["total_price"] for line in lines), Decimal("0.00"))
+    if expected_total is not None and expected_total != total_amount:
+        raise PricingError(
+            "Order total does not match item prices",
+            [
+                {
+                    "reason": "total_amount_mismatch",
+                    "expected": str(total_amount),
+                    "received": str(client_total),
+                }
+            ],
+            409,
+        )
+
+    return {"lines": lines, "total_amount": total_amount}
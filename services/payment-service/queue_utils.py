@@ -0,0 +1,239 @@
+"""
+Message queue utilities for Gamarriando Payment Service
+
+PaymentQueue mirrors the subset of the SQS API the service uses
+(send_message / receive_messages / delete_message). SQSQueue is used in AWS;
+InMemoryQueue and SQLiteQueue let the whole pipeline run offline.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def get_queue_config() -> Dict[str, Any]:
+    """Get queue configuration from environment variables"""
+    return {
+        "backend": os.getenv("PAYMENT_QUEUE_BACKEND", "sqs"),
+        "queue_url": os.getenv("PAYMENT_QUEUE_URL", ""),
+        "sqlite_path": os.getenv("PAYMENT_QUEUE_SQLITE_PATH", "/tmp/payment_queue.db"),
+        "visibility_timeout": int(os.getenv("PAYMENT_QUEUE_VISIBILITY_TIMEOUT", "60")),
+        "region": os.getenv("AWS_REGION", "us-east-1"),
+    }
+
+
+class PaymentQueue(ABC):
+    """SQS-shaped queue interface. Messages are dicts with MessageId, ReceiptHandle and Body."""
+
+    @abstractmethod
+    def send_message(self, body: Dict[str, Any]) -> str:
+        """Enqueue a JSON-serializable body and return its message id"""
+
+    @abstractmethod
+    def receive_messages(
+        self, max_messages: int = 10, visibility_timeout: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Receive up to max_messages; they stay invisible until deleted or the timeout expires"""
+
+    @abstractmethod
+    def delete_message(self, receipt_handle: str) -> None:
+        """Acknowledge a received message"""
+
+
+class SQSQueue(PaymentQueue):
+    """Amazon SQS implementation"""
+
+    def __init__(self, queue_url: str, region: str = "us-east-1"):
+        import boto3
+
+        self.queue_url = queue_url
+        self.client = boto3.client("sqs", region_name=region)
+
+    def send_message(self, body: Dict[str, Any]) -> str:
+        response = self.client.send_message(QueueUrl=self.queue_url, MessageBody=json.dumps(body))
+        return response["MessageId"]
+
+    def receive_messages(
+        self, max_messages: int = 10, visibility_timeout: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        params = {
+            "QueueUrl": self.queue_url,
+            "MaxNumberOfMessages": min(max_messages, 10),  # SQS hard limit
+            "WaitTimeSeconds": 1,
+        }
+        if visibility_timeout is not None:
+            params["VisibilityTimeout"] = visibility_timeout
+        response = self.client.receive_message(**params)
+        return [
+            {"MessageId": m["MessageId"], "ReceiptHandle": m["ReceiptHandle"], "Body": m["Body"]}
+            for m in response.get("Messages", [])
+        ]
+
+    def delete_message(self, receipt_handle: str) -> None:
+        self.client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=receipt_handle)
+
+
+class InMemoryQueue(PaymentQueue):
+    """In-process queue for tests and local runs (single process only)"""
+
+    def __init__(self, visibility_timeout: int = 60):
+        self.visibility_timeout = visibility_timeout
+        self._messages = OrderedDict()  # message_id -> [body, visible_at, receipt_handle]
+        self._lock = threading.Lock()
+
+    def send_message(self, body: Dict[str, Any]) -> str:
+        message_id = str(uuid.uuid4())
+        with self._lock:
+            self._messages[message_id] = [json.dumps(body), 0.0, None]
+        return message_id
+
+    def receive_messages(
+        self, max_messages: int = 10, visibility_timeout: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        now = time.monotonic()
+        received = []
+        with self._lock:
+            for message_id, message in self._messages.items():
+                if len(received) >= max_messages:
+                    break
+                if message[1] <= now:
+                    message[1] = now + timeout
+                    message[2] = str(uuid.uuid4())
+                    received.append(
+                        {"MessageId": message_id, "ReceiptHandle": message[2], "Body": message[0]}
+                    )
+        return received
+
+    def delete_message(self, receipt_handle: str) -> None:
+        with self._lock:
+            for message_id, message in list(self._messages.items()):
+                if message[2] == receipt_handle:
+                    del self._messages[message_id]
+                    return
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._messages)
+
+
+class SQLiteQueue(PaymentQueue):
+    """SQLite-backed queue so an API process and a worker process can share it offline"""
+
+    def __init__(self, path: str, visibility_timeout: int = 60):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS queue_messages (
+                    message_id TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    visible_at REAL NOT NULL DEFAULT 0,
+                    receipt_handle TEXT,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_queue_messages_visible_at "
+                "ON queue_messages(visible_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def send_message(self, body: Dict[str, Any]) -> str:
+        message_id = str(uuid.uuid4())
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO queue_messages (message_id, body, visible_at, created_at) "
+                "VALUES (?, ?, 0, ?)",
+                (message_id, json.dumps(body), time.time()),
+            )
+        finally:
+            conn.close()
+        return message_id
+
+    def receive_messages(
+        self, max_messages: int = 10, visibility_timeout: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        now = time.time()
+        conn = self._connect()
+        try:
+            # BEGIN IMMEDIATE takes the write lock so two workers never claim the same rows
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT message_id, body FROM queue_messages "
+                "WHERE visible_at <= ? ORDER BY created_at LIMIT ?",
+                (now, max_messages),
+            ).fetchall()
+            received = []
+            for message_id, body in rows:
+                receipt_handle = str(uuid.uuid4())
+                conn.execute(
+                    "UPDATE queue_messages SET visible_at = ?, receipt_handle = ? "
+                    "WHERE message_id = ?",
+                    (now + timeout, receipt_handle, message_id),
+                )
+                received.append(
+                    {"MessageId": message_id, "ReceiptHandle": receipt_handle, "Body": body}
+                )
+            conn.execute("COMMIT")
+            return received
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def delete_message(self, receipt_handle: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM queue_messages WHERE receipt_handle = ?", (receipt_handle,))
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM queue_messages").fetchone()[0]
+        finally:
+            conn.close()
+
+
+_payment_queue: Optional[PaymentQueue] = None
+
+
+def get_payment_queue() -> PaymentQueue:
+    """Get the configured payment queue (reused across Lambda invocations)"""
+    global _payment_queue
+    if _payment_queue is None:
+        config = get_queue_config()
+        backend = config["backend"]
+        if backend == "sqs":
+            _payment_queue = SQSQueue(config["queue_url"], config["region"])
+        elif backend == "sqlite":
+            _payment_queue = SQLiteQueue(config["sqlite_path"], config["visibility_timeout"])
+        elif backend == "memory":
+            _payment_queue = InMemoryQueue(config["visibility_timeout"])
+        else:
+            raise ValueError(f"Unknown payment queue backend: {backend}")
+    return _payment_queue
+
+
+def set_payment_queue(queue: Optional[PaymentQueue]) -> None:
+    """Override the payment queue (used by tests and local runners)"""
+    global _payment_queue
+    _payment_queue = queue
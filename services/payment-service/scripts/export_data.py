@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Export orders or transactions as NDJSON/CSV using a server-side cursor.
+
+Examples:
+    python scripts/export_data.py transactions --format csv --status completed \
+        --date-from 2024-10-01 --date-to 2024-11-01 --output /tmp/transactions.csv
+    python scripts/export_data.py orders --object-key exports/orders/october.ndjson
+    python scripts/export_data.py orders --output - | gzip > orders.ndjson.gz
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# Make the service modules importable when run from the repository
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from export_utils import (
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+    build_export_query,
+    iter_export_rows,
+    write_rows,
+    export_dataset,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stream an export of payment-service data")
+    parser.add_argument("dataset", choices=sorted(EXPORT_DATASETS))
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--status")
+    parser.add_argument("--date-from", help="Inclusive ISO date/datetime on created_at")
+    parser.add_argument("--date-to", help="Exclusive ISO date/datetime on created_at")
+    parser.add_argument("--user-id", help="orders only")
+    parser.add_argument("--transaction-type", help="transactions only")
+    parser.add_argument("--payment-id", help="transactions only")
+    parser.add_argument(
+        "--itersize", type=int, help="Rows fetched per round trip (default EXPORT_ITERSIZE)"
+    )
+    parser.add_argument("--output", help="File path, or '-' for stdout")
+    parser.add_argument("--object-key", help="Upload the export to the object store under this key")
+    args = parser.parse_args()
+
+    filters = {
+        "status": args.status,
+        "date_from": args.date_from,
+        "date_to": args.date_to,
+        "user_id": args.user_id,
+        "transaction_type": args.transaction_type,
+        "payment_id": args.payment_id,
+    }
+    filters = {
+        name: value
+        for name, value in filters.items()
+        if name in EXPORT_DATASETS[args.dataset]["filters"] or name.startswith("date_")
+    }
+
+    if args.output == "-":
+        sql, columns, parameters = build_export_query(args.dataset, filters)
+        rows = write_rows(
+            iter_export_rows(sql, parameters, args.itersize), sys.stdout, args.format, columns
+        )
+        print(f"Exported {rows} {args.dataset}", file=sys.stderr)
+        return 0
+
+    result = export_dataset(
+        args.dataset,
+        args.format,
+        filters,
+        path=args.output,
+        object_key=args.object_key,
+        itersize=args.itersize,
+    )
+    print(json.dumps(result, indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -59,6 +59,13 @@ if [ "$TABLE_COUNT" -eq 4 ]; then
         DROP TABLE IF EXISTS payments CASCADE;
         DROP TABLE IF EXISTS order_items CASCADE;
         DROP TABLE IF EXISTS orders CASCADE;
+        DROP MATERIALIZED VIEW IF EXISTS transaction_summary_mv CASCADE;
+        DROP MATERIALIZED VIEW IF EXISTS payment_summary_mv CASCADE;
+        DROP MATERIALIZED VIEW IF EXISTS order_summary_mv CASCADE;
+        DROP TABLE IF EXISTS summary_refresh_log CASCADE;
+        DROP TABLE IF EXISTS idempotency_keys CASCADE;
+        DROP TABLE IF EXISTS outbox CASCADE;
+        DROP TABLE IF EXISTS stock_reservations CASCADE;
         DROP VIEW IF EXISTS transaction_summary CASCADE;
         DROP VIEW IF EXISTS payment_summary CASCADE;
         DROP VIEW IF EXISTS order_summary CASCADE;
@@ -82,6 +89,60 @@ else
     exit 1
 fi
 
+# Run the materialized summary views migration
+echo -e "${YELLOW}📊 Running summary views migration...${NC}"
+if PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" -f "$(dirname "$0")/../migrations/summary_views.sql"; then
+    echo -e "${GREEN}✅ Summary views migration completed successfully${NC}"
+else
+    echo -e "${RED}❌ Summary views migration failed. Please check the error messages above.${NC}"
+    exit 1
+fi
+
+# Run the idempotency keys migration
+echo -e "${YELLOW}📊 Running idempotency keys migration...${NC}"
+if PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" -f "$(dirname "$0")/../migrations/idempotency_keys.sql"; then
+    echo -e "${GREEN}✅ Idempotency keys migration completed successfully${NC}"
+else
+    echo -e "${RED}❌ Idempotency keys migration failed. Please check the error messages above.${NC}"
+    exit 1
+fi
+
+# Run the payment state migration
+echo -e "${YELLOW}📊 Running payment state migration...${NC}"
+if PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" -f "$(dirname "$0")/../migrations/payment_state.sql"; then
+    echo -e "${GREEN}✅ Payment state migration completed successfully${NC}"
+else
+    echo -e "${RED}❌ Payment state migration failed. Please check the error messages above.${NC}"
+    exit 1
+fi
+
+# Run the outbox migration
+echo -e "${YELLOW}📊 Running outbox migration...${NC}"
+if PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" -f "$(dirname "$0")/../migrations/outbox.sql"; then
+    echo -e "${GREEN}✅ Outbox migration completed successfully${NC}"
+else
+    echo -e "${RED}❌ Outbox migration failed. Please check the error messages above.${NC}"
+    exit 1
+fi
+
+# Run the stock reservations migration
+echo -e "${YELLOW}📊 Running stock reservations migration...${NC}"
+if PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" -f "$(dirname "$0")/../migrations/stock_reservations.sql"; then
+    echo -e "${GREEN}✅ Stock reservations migration completed successfully${NC}"
+else
+    echo -e "${RED}❌ Stock reservations migration failed. Please check the error messages above.${NC}"
+    exit 1
+fi
+
+# Run the list sort indexes migration
+echo -e "${YELLOW}📊 Running list sort indexes migration...${NC}"
+if PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" -f "$(dirname "$0")/../migrations/list_sort_indexes.sql"; then
+    echo -e "${GREEN}✅ List sort indexes migration completed successfully${NC}"
+else
+    echo -e "${RED}❌ List sort indexes migration failed. Please check the error messages above.${NC}"
+    exit 1
+fi
+
 # Verify tables were created
 echo -e "${YELLOW}🔍 Verifying table creation...${NC}"
 TABLE_COUNT=$(PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" -t -c "
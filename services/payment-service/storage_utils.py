@@ -0,0 +1,105 @@
+"""
+Object storage utilities for Gamarriando Payment Service
+
+A small S3-shaped interface used by bulk exports so large files can be
+read from (or written to) S3 in production and a local directory offline.
+"""
+
+import os
+import shutil
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Any, BinaryIO, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def get_storage_config() -> Dict[str, Any]:
+    """Get object storage configuration from environment variables"""
+    return {
+        "backend": os.getenv("OBJECT_STORE_BACKEND", "s3"),
+        "bucket": os.getenv("BULK_BUCKET_NAME", os.getenv("S3_BUCKET_NAME", "")),
+        "region": os.getenv("S3_REGION", "us-east-1"),
+        "local_dir": os.getenv("OBJECT_STORE_LOCAL_DIR", "/tmp/gamarriando-objects"),
+    }
+
+
+class ObjectStore(ABC):
+    """Read and write whole objects by key"""
+
+    @abstractmethod
+    def open_object(self, key: str) -> BinaryIO:
+        """Return a binary stream over the object; the caller closes it"""
+
+    @abstractmethod
+    def put_file(self, key: str, path: str, content_type: str = "application/octet-stream") -> str:
+        """Upload a local file under key and return its location"""
+
+
+class LocalObjectStore(ObjectStore):
+    """Objects are files under a base directory (local development and tests)"""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.base_dir, key))
+        if not path.startswith(os.path.abspath(self.base_dir) + os.sep):
+            raise ValueError(f"Invalid object key: {key}")
+        return path
+
+    def open_object(self, key: str) -> BinaryIO:
+        path = self._path(key)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Object not found: {key}")
+        return open(path, "rb")
+
+    def put_file(self, key: str, path: str, content_type: str = "application/octet-stream") -> str:
+        destination = self._path(key)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copyfile(path, destination)
+        return destination
+
+
+class S3ObjectStore(ObjectStore):
+    """Objects in an S3 bucket; reads are streamed, uploads use managed multipart transfers"""
+
+    def __init__(self, bucket: str, region: str):
+        import boto3
+
+        self.bucket = bucket
+        self.client = boto3.client("s3", region_name=region)
+
+    def open_object(self, key: str) -> BinaryIO:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.NoSuchKey:
+            raise FileNotFoundError(f"Object not found: {key}")
+        return response["Body"]
+
+    def put_file(self, key: str, path: str, content_type: str = "application/octet-stream") -> str:
+        self.client.upload_file(path, self.bucket, key, ExtraArgs={"ContentType": content_type})
+        return f"s3://{self.bucket}/{key}"
+
+
+_object_store: Optional[ObjectStore] = None
+
+
+def get_object_store() -> ObjectStore:
+    """Object store selected by OBJECT_STORE_BACKEND ('s3' or 'local')"""
+    global _object_store
+    if _object_store is None:
+        config = get_storage_config()
+        if config["backend"] == "s3":
+            _object_store = S3ObjectStore(config["bucket"], config["region"])
+        elif config["backend"] == "local":
+            _object_store = LocalObjectStore(config["local_dir"])
+        else:
+            raise ValueError(f"Unknown object store backend: {config['backend']}")
+    return _object_store
+
+
+def set_object_store(store: Optional[ObjectStore]) -> None:
+    """Override the object store (tests and local tooling)"""
+    global _object_store
+    _object_store = store
@@ -0,0 +1,101 @@
+"""
+Materialized summary view utilities for Gamarriando Payment Service
+"""
+
+import os
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+from db_utils import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+# Public summary name -> materialized view backing it
+SUMMARY_VIEWS = {
+    "order_summary": "order_summary_mv",
+    "payment_summary": "payment_summary_mv",
+    "transaction_summary": "transaction_summary_mv",
+}
+
+
+def get_summary_config() -> Dict[str, Any]:
+    """Get summary refresh configuration from environment variables"""
+    return {
+        "refresh_concurrently": os.getenv("SUMMARY_REFRESH_CONCURRENTLY", "true").lower() == "true",
+        "max_staleness_seconds": int(os.getenv("SUMMARY_MAX_STALENESS_SECONDS", "300")),
+    }
+
+
+def refresh_summary_view(summary_name: str, concurrently: Optional[bool] = None) -> Dict[str, Any]:
+    """Refresh a single materialized summary view and record the refresh time"""
+    view_name = SUMMARY_VIEWS.get(summary_name)
+    if not view_name:
+        raise ValueError(f"Unknown summary: {summary_name}")
+
+    if concurrently is None:
+        concurrently = get_summary_config()["refresh_concurrently"]
+
+    # CONCURRENTLY keeps the view readable during refresh (requires the unique index)
+    refresh_sql = f"REFRESH MATERIALIZED VIEW {'CONCURRENTLY ' if concurrently else ''}{view_name}"
+    # clock_timestamp(), not NOW(): NOW() is the transaction start, before the refresh ran
+    log_sql = """
+        INSERT INTO summary_refresh_log (view_name, refreshed_at, duration_ms)
+        VALUES (%s, clock_timestamp(), %s)
+        ON CONFLICT (view_name) DO UPDATE
+        SET refreshed_at = EXCLUDED.refreshed_at, duration_ms = EXCLUDED.duration_ms
+    """
+
+    started = time.monotonic()
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(refresh_sql)
+            duration_ms = int((time.monotonic() - started) * 1000)
+            cursor.execute(log_sql, (view_name, duration_ms))
+            conn.commit()
+
+    logger.info(f"Refreshed {view_name} in {duration_ms}ms (concurrently={concurrently})")
+    return {
+        "summary": summary_name,
+        "view": view_name,
+        "duration_ms": duration_ms,
+        "concurrently": concurrently,
+    }
+
+
+def refresh_all_summary_views(
+    summary_names: Optional[List[str]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Refresh the given (or all) materialized summary views, collecting failures per view"""
+    names = summary_names or list(SUMMARY_VIEWS.keys())
+
+    refreshed = []
+    failed = []
+    for summary_name in names:
+        try:
+            refreshed.append(refresh_summary_view(summary_name))
+        except Exception as e:
+            # Keep refreshing the remaining views; one failure should not block the others
+            logger.error(f"Summary refresh error for {summary_name}: {str(e)}")
+            failed.append({"summary": summary_name, "error": str(e)})
+
+    return {"refreshed": refreshed, "failed": failed}
+
+
+def staleness_headers(refreshed_at: Optional[datetime]) -> Dict[str, str]:
+    """Build response headers describing how stale a materialized summary is"""
+    if refreshed_at is None:
+        return {"X-Data-Staleness-Seconds": "unknown"}
+
+    if refreshed_at.tzinfo is None:
+        refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+
+    staleness = max(0, int((datetime.now(timezone.utc) - refreshed_at).total_seconds()))
+    max_staleness = get_summary_config()["max_staleness_seconds"]
+
+    return {
+        "X-Data-Refreshed-At": refreshed_at.isoformat(),
+        "X-Data-Staleness-Seconds": str(staleness),
+        "X-Data-Stale": "true" if staleness > max_staleness else "false",
+    }
@@ -0,0 +1,202 @@
+import pytest
+
+from queue_utils import InMemoryQueue, SQLiteQueue, set_payment_queue
+
+
+@pytest.fixture
+def memory_queue():
+    """In-process payment queue installed as the service queue"""
+    queue = InMemoryQueue(visibility_timeout=60)
+    set_payment_queue(queue)
+    yield queue
+    set_payment_queue(None)
+
+
+@pytest.fixture
+def sqlite_queue(tmp_path):
+    """SQLite-backed payment queue in a temporary file"""
+    queue = SQLiteQueue(str(tmp_path / "payment_queue.db"), visibility_timeout=60)
+    set_payment_queue(queue)
+    yield queue
+    set_payment_queue(None)
+
+
+@pytest.fixture
+def fake_payments(monkeypatch):
+    """In-memory stand-in for the payments table behind payment_state, with a settable clock"""
+    import payment_processing
+    from payment_state import PaymentTransitionError
+
+    lease_seconds = 120
+    clock = {"now": 0.0}
+    payments = {
+        1: {
+            "id": 1,
+            "order_id": 10,
+            "amount": 100,
+            "currency": "USD",
+            "payment_method": "credit_card",
+            "status": "pending",
+            "gateway_response": None,
+            "metadata": None,
+            "processing_started_at": None,
+            "processing_attempts": 0,
+            "updated_at": 0.0,
+        },
+        2: {
+            "id": 2,
+            "order_id": 20,
+            "amount": 80,
+            "currency": "USD",
+            "payment_method": "credit_card",
+            "status": "completed",
+            "gateway_response": None,
+            "metadata": None,
+            "processing_started_at": None,
+            "processing_attempts": 1,
+            "updated_at": 0.0,
+            "refund_amount": None,
+            "refund_started_at": None,
+            "refund_attempts": 0,
+        },
+    }
+    transactions = []
+
+    def stale(payment):
+        started = payment["processing_started_at"]
+        return (
+            payment["status"] == "processing"
+            and (started if started is not None else payment["updated_at"])
+            < clock["now"] - lease_seconds
+        )
+
+    def claim(payment_id, take_lease=True):
+        payment = payments[payment_id]
+        assert payment["status"] == "pending"
+        payment.update(
+            status="processing",
+            processing_started_at=clock["now"] if take_lease else None,
+            processing_attempts=1 if take_lease else 0,
+            updated_at=clock["now"],
+        )
+        return dict(payment)
+
+    def take_lease(payment_id):
+        payment = payments[payment_id]
+        if payment["status"] != "processing" or not (
+            payment["processing_started_at"] is None or stale(payment)
+        ):
+            return None
+        payment["processing_started_at"] = clock["now"]
+        payment["processing_attempts"] += 1
+        return dict(payment)
+
+    def release_lease(payment_id):
+        payments[payment_id]["processing_started_at"] = None
+        return True
+
+    def get_payment(payment_id):
+        payment = payments.get(payment_id)
+        return dict(payment) if payment else None
+
+    def settle(payment_id, result):
+        payment = payments[payment_id]
+        if payment["status"] != "processing":
+            raise PaymentTransitionError(f"Payment is already {payment['status']}. Cannot settle.")
+        payment.update(
+            status=result["status"],
+            gateway_response=result["gateway_response"],
+            processing_started_at=None,
+        )
+        transactions.append({"payment_id": payment_id, "status": result["status"]})
+        return dict(payment, transaction_id=len(transactions))
+
+    def release(payment_id):
+        payments[payment_id].update(status="pending", processing_started_at=None)
+        return True
+
+    def find_stale(limit=100):
+        return [
+            {"id": p["id"], "processing_attempts": p["processing_attempts"]}
+            for p in payments.values()
+            if stale(p)
+        ][:limit]
+
+    def requeue(payment_id):
+        payment = payments[payment_id]
+        if not stale(payment):
+            return False
+        payment.update(processing_started_at=None, updated_at=clock["now"])
+        return True
+
+    def refunded(payment_id):
+        return any(
+            t["payment_id"] == payment_id
+            and t.get("type") == "refund"
+            and t["status"] == "completed"
+            for t in transactions
+        )
+
+    def claim_refund(payment_id, refund_amount=None):
+        payment = payments[payment_id]
+        amount = payment["amount"] if refund_amount is None else refund_amount
+        if payment["status"] != "completed" or refunded(payment_id) or amount > payment["amount"]:
+            raise PaymentTransitionError(f"Payment is {payment['status']}. Cannot refund.")
+        payment.update(status="refunding", refund_amount=amount, refund_started_at=clock["now"])
+        return dict(payment)
+
+    def release_refund(payment_id):
+        payments[payment_id].update(status="completed", refund_started_at=None)
+        return True
+
+    def apply_refund(payment_id, result):
+        payment = payments[payment_id]
+        if payment["status"] != "refunding":
+            raise PaymentTransitionError(f"Payment is {payment['status']}. Cannot settle refund.")
+        completed = result["status"] == "completed"
+        payment.update(
+            status=(
+                "refunded"
+                if completed and payment["refund_amount"] >= payment["amount"]
+                else "completed"
+            ),
+            refund_attempts=payment["refund_attempts"] + (0 if completed else 1),
+            refund_started_at=None,
+        )
+        transactions.append(
+            {"payment_id": payment_id, "type": "refund", "status": result["status"]}
+        )
+        return dict(payment, transaction_id=len(transactions))
+
+    def find_stale_refunds(limit=100):
+        return [
+            {"id": p["id"]}
+            for p in payments.values()
+            if p["status"] == "refunding" and p["refund_started_at"] < clock["now"] - lease_seconds
+        ][:limit]
+
+    def release_stale_refund(payment_id):
+        if payment_id not in {p["id"] for p in find_stale_refunds()}:
+            return False
+        return release_refund(payment_id)
+
+    monkeypatch.setattr(payment_processing, "claim_for_refund", claim_refund)
+    monkeypatch.setattr(payment_processing, "release_refund_claim", release_refund)
+    monkeypatch.setattr(payment_processing, "apply_refund", apply_refund)
+    monkeypatch.setattr(payment_processing, "find_stale_refunds", find_stale_refunds)
+    monkeypatch.setattr(payment_processing, "release_stale_refund", release_stale_refund)
+    monkeypatch.setattr(payment_processing, "get_payment", get_payment)
+    monkeypatch.setattr(payment_processing, "settle_processing", settle)
+    monkeypatch.setattr(payment_processing, "release_processing_claim", release)
+    monkeypatch.setattr(payment_processing, "take_processing_lease", take_lease)
+    monkeypatch.setattr(payment_processing, "release_processing_lease", release_lease)
+    monkeypatch.setattr(payment_processing, "find_stale_processing", find_stale)
+    monkeypatch.setattr(payment_processing, "requeue_stale_processing", requeue)
+
+    return {
+        "payments": payments,
+        "transactions": transactions,
+        "claim": claim,
+        "take_lease": take_lease,
+        "clock": clock,
+    }
@@ -0,0 +1,112 @@
+"""
+Tests for streaming exports
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+import export_utils
+from export_utils import build_export_query, write_rows, export_dataset
+from storage_utils import LocalObjectStore, ObjectStore
+
+ROWS = [
+    {
+        "id": 1,
+        "payment_id": 7,
+        "transaction_type": "payment",
+        "amount": Decimal("10.50"),
+        "currency": "USD",
+        "status": "completed",
+        "gateway_transaction_id": "txn_1",
+        "gateway_response": {"fee": 0.3},
+        "metadata": None,
+        "created_at": datetime(2024, 10, 1, 12, 0),
+        "updated_at": None,
+    },
+]
+
+
+class TestBuildExportQuery:
+    """Test the export SELECT"""
+
+    def test_applies_equality_and_date_filters(self):
+        """Test that only supported, non-empty filters become parameters"""
+        sql, columns, parameters = build_export_query(
+            "transactions",
+            {
+                "status": "completed",
+                "transaction_type": "",
+                "date_from": "2024-10-01",
+                "user_id": "ignored",
+            },
+        )
+
+        assert "status = %s" in sql and "created_at >= %s" in sql
+        assert "transaction_type" not in sql.split("WHERE")[1]
+        assert parameters == ("completed", datetime(2024, 10, 1))
+        assert "ORDER BY id" in sql and "OFFSET" not in sql
+
+    def test_rejects_unknown_dataset_and_bad_dates(self):
+        """Test that invalid input raises ValueError"""
+        with pytest.raises(ValueError):
+            build_export_query("users", {})
+        with pytest.raises(ValueError):
+            build_export_query("orders", {"date_to": "last week"})
+
+
+class TestWriteRows:
+    """Test NDJSON and CSV serialization"""
+
+    def test_ndjson(self):
+        """Test one compact JSON object per line"""
+        output = io.StringIO()
+        assert write_rows(iter(ROWS), output, "ndjson", []) == 1
+        record = json.loads(output.getvalue().splitlines()[0])
+        assert record["amount"] == 10.5
+        assert record["created_at"] == "2024-10-01T12:00:00"
+
+    def test_csv(self):
+        """Test header plus rows with JSON columns encoded"""
+        columns = ["id", "amount", "gateway_response"]
+        output = io.StringIO()
+        write_rows(iter(ROWS), output, "csv", columns)
+        lines = list(csv.reader(io.StringIO(output.getvalue())))
+        assert lines == [columns, ["1", "10.50", '{"fee": 0.3}']]
+
+
+class TestExportDataset:
+    """Test export to the object store"""
+
+    def test_uploads_and_reports_stats(self, monkeypatch, tmp_path):
+        """Test that the streamed file lands under the object key"""
+        monkeypatch.setattr(
+            export_utils, "iter_export_rows", lambda sql, parameters, itersize=None: iter(ROWS)
+        )
+        store = LocalObjectStore(str(tmp_path))
+
+        result = export_dataset(
+            "transactions",
+            "ndjson",
+            {"status": "completed"},
+            object_key="exports/t.ndjson",
+            store=store,
+        )
+
+        assert result["rows"] == 1
+        assert result["location"] == str(tmp_path / "exports" / "t.ndjson")
+        assert (tmp_path / "exports" / "t.ndjson").stat().st_size == result["bytes"]
+
+    def test_incomplete_store_cannot_be_instantiated(self):
+        """Test that a store must implement both open_object and put_file"""
+
+        class ReadOnlyStore(ObjectStore):
+            def open_object(self, key):
+                return io.BytesIO()
+
+        with pytest.raises(TypeError):
+            ReadOnlyStore()
@@ -0,0 +1,165 @@
+"""
+Tests for Idempotency-Key claims, replay and caller scoping
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import idempotency_utils
+from idempotency_utils import idempotent, get_caller_scope, is_cacheable
+
+
+@pytest.fixture
+def keys(monkeypatch):
+    """In-memory stand-in for the idempotency_keys table"""
+    rows = {}
+
+    def claim(endpoint, caller, key, request_hash):
+        row = rows.get((endpoint, caller, key))
+        if row and not (
+            row["state"] == "in_progress"
+            and row["locked_until"] <= datetime.now(timezone.utc)
+            and row["request_hash"] == request_hash
+        ):
+            return None
+        rows[(endpoint, caller, key)] = {
+            "id": len(rows) + 1,
+            "request_hash": request_hash,
+            "state": "in_progress",
+            "locked_until": datetime.now(timezone.utc) + timedelta(seconds=60),
+            "status_code": None,
+            "response_headers": None,
+            "response_body": None,
+        }
+        return rows[(endpoint, caller, key)]["id"]
+
+    def find(record_id):
+        return next(k for k, row in rows.items() if row["id"] == record_id)
+
+    def complete(record_id, response):
+        rows[find(record_id)].update(
+            state="completed",
+            status_code=response["statusCode"],
+            response_headers=response["headers"],
+            response_body=response["body"],
+        )
+        return True
+
+    def release(record_id):
+        del rows[find(record_id)]
+        return True
+
+    def stored(endpoint, caller, key):
+        row = rows.get((endpoint, caller, key))
+        return row if row and row["state"] == "completed" else None
+
+    monkeypatch.setattr(idempotency_utils, "claim_key", claim)
+    monkeypatch.setattr(idempotency_utils, "complete_key", complete)
+    monkeypatch.setattr(idempotency_utils, "release_key", release)
+    monkeypatch.setattr(idempotency_utils, "get_stored_response", stored)
+    monkeypatch.setattr(idempotency_utils, "get_key_record", lambda *key: rows.get(key))
+    return rows
+
+
+def post(body, key="key-1", authorization="Bearer a"):
+    return {
+        "httpMethod": "POST",
+        "path": "/api/v1/payments",
+        "body": json.dumps(body),
+        "headers": {"Idempotency-Key": key, "Authorization": authorization},
+    }
+
+
+def counting_handler(status_code=201):
+    calls = []
+
+    @idempotent("payments_create")
+    def handler(event, context):
+        calls.append(event)
+        return {
+            "statusCode": status_code,
+            "headers": {"Content-Type": "application/json"},
+            "body": json.dumps({"call": len(calls)}),
+        }
+
+    return handler, calls
+
+
+def test_duplicate_replays_without_running_the_handler(keys):
+    """Test that a retry with the same key gets the stored response"""
+    handler, calls = counting_handler()
+
+    first = handler(post({"amount": 10}), None)
+    second = handler(post({"amount": 10}), None)
+
+    assert len(calls) == 1
+    assert second["body"] == first["body"] and second["headers"]["Idempotent-Replayed"] == "true"
+    assert handler(post({"amount": 99}), None)["statusCode"] == 422
+
+
+def test_keys_are_scoped_to_the_caller(keys):
+    """Test that two callers sending the same key both run"""
+    handler, calls = counting_handler()
+
+    handler(post({"amount": 10}, authorization="Bearer a"), None)
+    handler(post({"amount": 10}, authorization="Bearer b"), None)
+
+    assert len(calls) == 2
+
+
+def test_in_progress_duplicate_gets_409(keys):
+    """Test that a duplicate arriving while the original runs does not run again"""
+    duplicates = []
+
+    @idempotent("payments_create")
+    def handler(event, context):
+        duplicates.append(handler(event, context))
+        return {"statusCode": 201, "headers": {}, "body": "{}"}
+
+    handler(post({"amount": 10}), None)
+
+    [duplicate] = duplicates
+    assert duplicate["statusCode"] == 409 and int(duplicate["headers"]["Retry-After"]) > 0
+
+
+def test_client_errors_release_the_key(keys):
+    """Test that a 400 is not cached, so a corrected retry runs"""
+    handler, calls = counting_handler(status_code=400)
+
+    handler(post({"amount": 10}), None)
+    handler(post({"amount": 10}), None)
+
+    assert len(calls) == 2 and not keys
+
+
+def test_expired_claim_of_a_crashed_handler_is_taken_over(keys):
+    """Test that a claim left behind past its lease can be retried"""
+    handler, calls = counting_handler()
+    event = post({"amount": 10})
+    request_hash = idempotency_utils.compute_request_hash(event)
+    idempotency_utils.claim_key("payments_create", get_caller_scope(event), "key-1", request_hash)
+    [row] = keys.values()
+
+    assert handler(event, None)["statusCode"] == 409
+    row["locked_until"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+    assert handler(event, None)["statusCode"] == 201 and len(calls) == 1
+
+
+def test_cacheable_statuses_and_caller_scope():
+    """Test which responses are stored and how callers are identified"""
+    assert [is_cacheable(code) for code in (200, 201, 400, 404, 409, 422, 500)] == [
+        True,
+        True,
+        False,
+        False,
+        True,
+        True,
+        False,
+    ]
+    assert (
+        get_caller_scope({"requestContext": {"authorizer": {"claims": {"sub": "u-1"}}}})
+        == "principal:u-1"
+    )
+    assert get_caller_scope({"headers": {}}) == ""
@@ -0,0 +1,93 @@
+"""
+Tests for stock reservation helpers
+"""
+
+import pytest
+
+import inventory_utils
+from inventory_utils import (
+    aggregate_quantities,
+    commit_order_reservations,
+    sweep_expired_reservations,
+)
+
+
+class TestAggregateQuantities:
+    """Test how cart lines are collapsed before the set-based reservation"""
+
+    def test_merges_duplicate_products_and_sorts_by_id(self):
+        """Test that repeated products are summed and lines come back in lock order"""
+        items = [
+            {"product_id": "7", "quantity": 1},
+            {"product_id": 3, "quantity": 2},
+            {"product_id": 7, "quantity": "4"},
+        ]
+
+        assert aggregate_quantities(items) == [(3, 2), (7, 5)]
+
+    def test_rejects_non_positive_quantities(self):
+        """Test that zero or negative quantities are refused before touching stock"""
+        with pytest.raises(ValueError):
+            aggregate_quantities([{"product_id": 1, "quantity": 0}])
+
+
+class TestSweepExpiredReservations:
+    """Test which reservations the sweeper may release"""
+
+    @pytest.fixture
+    def statements(self, monkeypatch):
+        """Capture the sweep statement instead of running it"""
+        captured = []
+
+        def execute_returning(sql, parameters):
+            captured.append((" ".join(sql.split()), parameters))
+            return {"released": 3, "products_restocked": 2, "orders_cancelled": 1}
+
+        monkeypatch.setattr(inventory_utils, "execute_returning", execute_returning)
+        return captured
+
+    def test_only_unpaid_pending_orders_are_swept(self, statements):
+        """Test that confirmed orders and orders with a payment in flight keep their stock"""
+        sweep_expired_reservations()
+
+        [(sql, _)] = statements
+        candidates = sql.split("FOR UPDATE OF sr SKIP LOCKED")[0]
+        assert "o.status = 'pending'" in candidates
+        assert (
+            "NOT EXISTS ( SELECT 1 FROM payments p WHERE p.order_id = sr.order_id "
+            "AND p.status IN ('processing', 'completed') )" in candidates
+        )
+
+    def test_batch_size_and_result(self, statements, monkeypatch):
+        """Test that one statement sweeps at most one batch and reports integer counts"""
+        monkeypatch.setenv("STOCK_SWEEPER_BATCH_SIZE", "50")
+
+        assert sweep_expired_reservations() == {
+            "released": 3,
+            "products_restocked": 2,
+            "orders_cancelled": 1,
+        }
+        assert sweep_expired_reservations(batch_size=10) == {
+            "released": 3,
+            "products_restocked": 2,
+            "orders_cancelled": 1,
+        }
+        assert [parameters for _, parameters in statements] == [(50,), (10,)]
+
+
+class TestCommitOrderReservations:
+    """Test that confirming an order consumes its reservations"""
+
+    def test_open_reservations_are_committed(self):
+        """Test that only reserved rows of the order move to committed"""
+
+        class Cursor:
+            rowcount = 2
+
+            def execute(self, sql, parameters):
+                self.sql, self.parameters = " ".join(sql.split()), parameters
+
+        cursor = Cursor()
+        assert commit_order_reservations(cursor, 7) == 2
+        assert "SET status = 'committed'" in cursor.sql and "status = 'reserved'" in cursor.sql
+        assert cursor.parameters == (7,)
@@ -0,0 +1,93 @@
+"""
+Tests for sampled, redacted request logging
+"""
+
+import json
+import logging
+
+import pytest
+
+import log_utils
+from log_utils import log_request, log_response, redact, is_sampled
+
+
+class Context:
+    def __init__(self, request_id):
+        self.aws_request_id = request_id
+
+
+EVENT = {
+    "httpMethod": "POST",
+    "path": "/api/v1/payments",
+    "headers": {
+        "Authorization": "Bearer secret-token",
+        "Content-Type": "application/json",
+        "Cookie": "a=b",
+    },
+    "queryStringParameters": {"token": "reset-me", "page": "2"},
+    "requestContext": {"requestId": "gw-1", "identity": {"sourceIp": "10.0.0.1"}},
+    "body": json.dumps({"card_number": "4111111111111111", "amount": 10}),
+}
+
+
+def lines(caplog):
+    return [
+        json.loads(record.getMessage()) for record in caplog.records if record.name == "log_utils"
+    ]
+
+
+def test_request_line_is_redacted_and_bodyless(caplog):
+    """Test that secrets, cookies and the body never reach the log"""
+    with caplog.at_level(logging.INFO):
+        log_request(EVENT, Context("req-1"), "payments_create")
+
+    [line] = lines(caplog)
+    assert line["handler"] == "payments_create" and line["request_id"] == "req-1"
+    assert line["query"] == {"token": "[REDACTED]", "page": "2"}
+    assert line["headers"] == {"content-type": "application/json"}
+    assert line["body_length"] == len(EVENT["body"])
+    for secret in ("secret-token", "reset-me", "4111111111111111", "10.0.0.1"):
+        assert secret not in caplog.text
+
+
+def test_redact_nested_values():
+    """Test that sensitive keys are masked at any depth, case-insensitively"""
+    assert redact({"user": {"Password": "x", "items": [{"cvv": "123", "sku": 1}]}}) == {
+        "user": {"Password": "[REDACTED]", "items": [{"cvv": "[REDACTED]", "sku": 1}]}
+    }
+
+
+def test_sampled_out_requests_build_nothing(caplog, monkeypatch):
+    """Test that a sampled-out request skips the summary and its success response"""
+    monkeypatch.setattr(log_utils, "SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(log_utils, "summarize_event", lambda event: pytest.fail("summary built"))
+
+    with caplog.at_level(logging.INFO):
+        log_request(EVENT, Context("req-2"), "payments_create")
+        log_response({"statusCode": 200, "body": "{}"}, "payments_create")
+        log_response({"statusCode": 502, "body": "{}"}, "payments_create")
+
+    [line] = lines(caplog)
+    assert line["status"] == 502 and caplog.records[-1].levelno == logging.ERROR
+
+
+def test_sampling_is_stable_per_request_id(monkeypatch):
+    """Test that a request id always gets the same decision, at about the configured rate"""
+    monkeypatch.setattr(log_utils, "SAMPLE_RATE", 0.25)
+    decisions = [is_sampled(f"req-{i}") for i in range(2000)]
+
+    assert decisions == [is_sampled(f"req-{i}") for i in range(2000)]
+    assert 400 < sum(decisions) < 600
+
+
+def test_scheduled_events_are_summarized(caplog):
+    """Test that EventBridge events log their source, not their payload"""
+    with caplog.at_level(logging.INFO):
+        log_request(
+            {"source": "aws.events", "detail-type": "Scheduled Event", "detail": {"x": 1}},
+            None,
+            "outbox_relay",
+        )
+
+    [line] = lines(caplog)
+    assert line["source"] == "aws.events" and "detail" not in line
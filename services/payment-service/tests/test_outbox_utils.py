@@ -0,0 +1,147 @@
+"""
+Tests for the outbox relay batch: publishing, retries and dead-lettering
+"""
+
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+
+import outbox_utils
+from outbox_utils import OutboxSink, relay_outbox_batch
+
+
+class FakeCursor:
+    """Cursor returning queued results for each execute() that reads rows"""
+
+    def __init__(self, results):
+        self.results = results
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+
+    def fetchall(self):
+        return self.results.pop(0)
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self, cursor_factory=None):
+        return self._cursor
+
+    def commit(self):
+        pass
+
+
+class FailingSink(OutboxSink):
+    """Publishes every event except the ones whose id is in fail_ids"""
+
+    def __init__(self, fail_ids=()):
+        self.fail_ids = set(fail_ids)
+        self.published = []
+
+    def publish(self, event):
+        if event["id"] in self.fail_ids:
+            raise RuntimeError("sink unavailable")
+        self.published.append(event["id"])
+
+
+def outbox_row(row_id, aggregate_id="1", attempts=0):
+    return {
+        "id": row_id,
+        "aggregate_type": "payment",
+        "aggregate_id": aggregate_id,
+        "event_type": "payment.completed",
+        "payload": {},
+        "created_at": datetime.now(timezone.utc),
+        "attempts": attempts,
+    }
+
+
+@pytest.fixture
+def outbox_db(monkeypatch):
+    """Install a fake connection; returns a function queueing cursor results"""
+    state = {}
+
+    def install(*results):
+        state["cursor"] = FakeCursor(list(results))
+
+        @contextmanager
+        def connection():
+            yield FakeConnection(state["cursor"])
+
+        monkeypatch.setattr(outbox_utils, "get_db_connection", connection)
+        return state["cursor"]
+
+    monkeypatch.setenv("OUTBOX_MAX_ATTEMPTS", "3")
+    return install
+
+
+class TestRelayBatch:
+    """Test relay_outbox_batch against a fake database"""
+
+    def test_incomplete_sink_cannot_be_instantiated(self):
+        """Test that a sink must implement publish"""
+
+        class Incomplete(OutboxSink):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_only_the_oldest_pending_event_of_an_aggregate_is_selected(self, outbox_db):
+        """Test that the batch query holds back events behind an unpublished one"""
+        cursor = outbox_db([])
+
+        relay_outbox_batch(FailingSink(), batch_size=10)
+
+        select_sql = cursor.statements[0][0]
+        assert "NOT EXISTS" in select_sql
+        assert "e.id < o.id" in select_sql
+        assert "dead_lettered_at IS NULL" in select_sql
+
+    def test_failures_are_retried_and_successes_published(self, outbox_db):
+        """Test that one failing event does not stop the rest of the batch"""
+        cursor = outbox_db(
+            [outbox_row(1, "1"), outbox_row(2, "2")],
+            [{**outbox_row(2, "2", attempts=1), "last_error": "x", "dead_lettered_at": None}],
+        )
+        sink = FailingSink(fail_ids={2})
+
+        stats = relay_outbox_batch(sink, batch_size=10)
+
+        assert sink.published == [1]
+        assert stats == {"fetched": 2, "published": 1, "failed": 1, "dead_lettered": 0}
+        failure_params = cursor.statements[-1][1]
+        assert failure_params == (3, [2], ["sink unavailable"])
+
+    def test_last_attempt_is_dead_lettered_and_logged(self, outbox_db, caplog):
+        """Test that a row reaching OUTBOX_MAX_ATTEMPTS is counted and logged at ERROR"""
+        outbox_db(
+            [outbox_row(7, attempts=2)],
+            [
+                {
+                    **outbox_row(7, attempts=3),
+                    "last_error": "sink unavailable",
+                    "dead_lettered_at": datetime.now(timezone.utc),
+                }
+            ],
+        )
+
+        with caplog.at_level(logging.WARNING, logger=outbox_utils.logger.name):
+            stats = relay_outbox_batch(FailingSink(fail_ids={7}), batch_size=10)
+
+        assert stats["dead_lettered"] == 1
+        errors = [r for r in caplog.records if r.levelno == logging.ERROR]
+        assert len(errors) == 1
+        assert "dead-lettered after 3 attempts" in errors[0].getMessage()
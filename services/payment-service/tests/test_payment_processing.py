@@ -0,0 +1,232 @@
+"""
+Tests for the asynchronous payment processing pipeline
+"""
+
+import json
+
+import pytest
+
+import payment_processing
+from payment_processing import (
+    drain_payment_queue,
+    enqueue_payment_processing,
+    refund_payment,
+    simulate_payment_processing,
+    sweep_stale_processing,
+    sweep_stale_refunds,
+)
+from payment_state import PaymentTransitionError
+from queue_utils import PaymentQueue
+
+
+class TestPaymentQueues:
+    """Test the SQS-shaped local queue implementations"""
+
+    def test_memory_queue_hides_received_messages(self, memory_queue):
+        """Test that received messages stay invisible until deleted"""
+        memory_queue.send_message({"payment_id": 1})
+        memory_queue.send_message({"payment_id": 2})
+
+        first = memory_queue.receive_messages(max_messages=1)
+        assert len(first) == 1
+        assert json.loads(first[0]["Body"]) == {"payment_id": 1}
+
+        second = memory_queue.receive_messages(max_messages=10)
+        assert [json.loads(m["Body"])["payment_id"] for m in second] == [2]
+
+        memory_queue.delete_message(first[0]["ReceiptHandle"])
+        assert len(memory_queue) == 1
+
+    def test_memory_queue_redelivers_after_visibility_timeout(self, memory_queue):
+        """Test that unacknowledged messages become visible again"""
+        memory_queue.send_message({"payment_id": 1})
+        assert memory_queue.receive_messages(visibility_timeout=0)
+        assert memory_queue.receive_messages(visibility_timeout=0)
+
+    def test_sqlite_queue_round_trip(self, sqlite_queue):
+        """Test send, receive and delete against the SQLite queue"""
+        message_id = sqlite_queue.send_message({"payment_id": 7})
+
+        messages = sqlite_queue.receive_messages()
+        assert messages[0]["MessageId"] == message_id
+        assert sqlite_queue.receive_messages() == []
+
+        sqlite_queue.delete_message(messages[0]["ReceiptHandle"])
+        assert len(sqlite_queue) == 0
+
+    def test_incomplete_queue_cannot_be_instantiated(self):
+        """Test that a backend missing part of the interface fails when created"""
+
+        class SendOnlyQueue(PaymentQueue):
+            def send_message(self, body):
+                return "1"
+
+        with pytest.raises(TypeError, match="delete_message"):
+            SendOnlyQueue()
+
+
+class TestPaymentPipeline:
+    """Test enqueue -> worker drain -> settle, offline"""
+
+    def test_enqueued_payment_is_settled_by_worker(self, memory_queue, fake_payments):
+        """Test that the worker settles a claimed payment and acknowledges the message"""
+        payment = fake_payments["claim"](1, take_lease=False)
+        enqueue_payment_processing(payment, {"card_token": "tok_test"})
+
+        stats = drain_payment_queue(batch_size=5)
+
+        assert stats == {"batches": 1, "processed": 1, "skipped": 0, "failed": 0}
+        assert fake_payments["payments"][1]["status"] in ("completed", "failed")
+        assert len(fake_payments["transactions"]) == 1
+        assert len(memory_queue) == 0
+
+    def test_duplicate_delivery_is_skipped(self, sqlite_queue, fake_payments):
+        """Test that a second message for a settled payment does not settle it twice"""
+        payment = fake_payments["claim"](1, take_lease=False)
+        enqueue_payment_processing(payment, {})
+        enqueue_payment_processing(payment, {})
+
+        stats = drain_payment_queue(batch_size=1)
+
+        assert stats["processed"] == 1
+        assert stats["skipped"] == 1
+        assert len(fake_payments["transactions"]) == 1
+        assert len(sqlite_queue) == 0
+
+    def test_failed_enqueue_releases_claim(self, fake_payments):
+        """Test that a payment is returned to pending when the queue is unavailable"""
+
+        class BrokenQueue:
+            def send_message(self, body):
+                raise RuntimeError("queue unavailable")
+
+        payment = fake_payments["claim"](1)
+        with pytest.raises(RuntimeError):
+            enqueue_payment_processing(payment, {}, queue=BrokenQueue())
+
+        assert fake_payments["payments"][1]["status"] == "pending"
+
+    def test_redelivery_during_a_live_lease_does_not_call_the_gateway(
+        self, memory_queue, fake_payments, monkeypatch
+    ):
+        """Test that a second delivery while the first is still charging is skipped"""
+        calls = []
+        monkeypatch.setattr(
+            payment_processing,
+            "simulate_payment_processing",
+            lambda *args: calls.append(args) or pytest.fail("gateway called"),
+        )
+        payment = fake_payments["claim"](1, take_lease=False)
+        fake_payments["take_lease"](1)  # the first delivery is in flight
+        enqueue_payment_processing(payment, {})
+
+        stats = drain_payment_queue()
+
+        assert stats["skipped"] == 1 and not calls
+        assert fake_payments["payments"][1]["status"] == "processing"
+
+    def test_gateway_gets_one_idempotency_key_per_payment(self):
+        """Test that repeating a charge with the same key returns the same result"""
+        payment = {"id": 1, "amount": 100, "payment_method": "credit_card"}
+        first = simulate_payment_processing(payment, {}, "payment-1")
+        second = simulate_payment_processing(payment, {}, "payment-1")
+
+        assert first["gateway_response"].get("transaction_id") == second["gateway_response"].get(
+            "transaction_id"
+        )
+        assert (
+            first["status"] == second["status"]
+            and first["gateway_response"]["idempotency_key"] == "payment-1"
+        )
+
+
+class TestStaleProcessingSweep:
+    """Test recovery of payments whose lease holder died"""
+
+    def test_live_lease_is_left_alone(self, memory_queue, fake_payments):
+        """Test that a payment still within its lease is not touched"""
+        fake_payments["claim"](1)
+        fake_payments["clock"]["now"] = 60
+
+        assert sweep_stale_processing() == {"requeued": 0, "failed": 0, "skipped": 0}
+        assert len(memory_queue) == 0
+
+    def test_expired_lease_is_requeued_and_settled(self, memory_queue, fake_payments):
+        """Test that a crashed request's payment is queued again and the worker settles it"""
+        fake_payments["claim"](1)
+        fake_payments["clock"]["now"] = 200
+
+        assert sweep_stale_processing()["requeued"] == 1
+        assert sweep_stale_processing()["requeued"] == 0
+
+        assert drain_payment_queue()["processed"] == 1
+        assert fake_payments["payments"][1]["status"] in ("completed", "failed")
+
+    def test_too_many_attempts_fail_the_payment(self, memory_queue, fake_payments):
+        """Test that a payment is failed instead of re-queued after the attempt limit"""
+        fake_payments["claim"](1)
+        fake_payments["payments"][1]["processing_attempts"] = 3
+        fake_payments["clock"]["now"] = 200
+
+        assert sweep_stale_processing() == {"requeued": 0, "failed": 1, "skipped": 0}
+        assert fake_payments["payments"][1]["status"] == "failed"
+        assert fake_payments["transactions"] == [{"payment_id": 1, "status": "failed"}]
+        assert len(memory_queue) == 0
+
+
+class TestRefunds:
+    """Test that only the holder of a refund claim calls the gateway"""
+
+    @pytest.fixture
+    def gateway_calls(self, monkeypatch):
+        calls = []
+        simulate = payment_processing.simulate_refund_processing
+
+        def record(payment, refund_amount, reason, idempotency_key):
+            calls.append((refund_amount, idempotency_key))
+            return simulate(payment, refund_amount, reason, idempotency_key)
+
+        monkeypatch.setattr(payment_processing, "simulate_refund_processing", record)
+        return calls
+
+    def test_concurrent_refund_never_reaches_the_gateway(self, fake_payments, gateway_calls):
+        """Test that a second refund while the first holds the claim gets 409 without refunding"""
+        payment = payment_processing.claim_for_refund(2, None)
+
+        with pytest.raises(PaymentTransitionError):
+            refund_payment(2, 30, "Duplicate")
+
+        assert gateway_calls == [] and payment["refund_amount"] == 80
+
+    def test_default_amount_is_the_whole_payment(self, fake_payments, gateway_calls):
+        """Test that a refund without amount refunds the claimed full amount once"""
+        payment, result = refund_payment(2, None, "Customer request")
+
+        assert gateway_calls == [(80.0, "refund-2-0")]
+        assert payment["status"] == ("refunded" if result["status"] == "completed" else "completed")
+
+    def test_gateway_error_releases_the_claim(self, fake_payments, monkeypatch):
+        """Test that a raising gateway call hands the payment back as completed"""
+
+        def fail(*args):
+            raise ConnectionError("gateway down")
+
+        monkeypatch.setattr(payment_processing, "simulate_refund_processing", fail)
+
+        with pytest.raises(ConnectionError):
+            refund_payment(2, 10, "Customer request")
+        assert fake_payments["payments"][2]["status"] == "completed"
+
+    def test_stale_claim_is_released_and_retried_with_the_same_key(
+        self, fake_payments, gateway_calls
+    ):
+        """Test that a claim whose request died is released and the retry reuses its key"""
+        payment_processing.claim_for_refund(2, None)
+        fake_payments["clock"]["now"] = 60
+        assert sweep_stale_refunds() == {"released": 0, "skipped": 0}
+
+        fake_payments["clock"]["now"] = 200
+        assert sweep_stale_refunds() == {"released": 1, "skipped": 0}
+        refund_payment(2, None, "Customer request")
+
+        assert gateway_calls == [(80.0, "refund-2-0")]
@@ -0,0 +1,112 @@
+"""
+Tests for server-side order pricing
+"""
+
+from decimal import Decimal
+
+import pytest
+
+import pricing_utils
+from pricing_utils import PriceCache, PricingError, price_order
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    """Products table stand-in that records every bulk lookup"""
+    products = {
+        1: {"id": 1, "price": Decimal("19.99"), "status": "active"},
+        2: {"id": 2, "price": Decimal("5.10"), "status": "active"},
+        3: {"id": 3, "price": Decimal("7.00"), "status": "draft"},
+    }
+    queries = []
+
+    def execute_query(sql, parameters=None):
+        queries.append(list(parameters[0]))
+        return [products[i] for i in parameters[0] if i in products]
+
+    monkeypatch.setattr(pricing_utils, "execute_query", execute_query)
+    monkeypatch.setattr(pricing_utils, "_price_cache", PriceCache(ttl_seconds=30, max_entries=100))
+    return queries
+
+
+class TestPriceOrder:
+    """Test line and order totals computed from the catalog"""
+
+    def test_computes_totals_with_one_lookup(self, catalog):
+        """Test that all lines are priced from a single ANY() query with exact decimals"""
+        result = price_order(
+            [
+                {"product_id": 1, "quantity": 3},
+                {"product_id": "2", "quantity": 1, "unit_price": 5.1},
+            ],
+            client_total="65.07",
+        )
+
+        assert catalog == [[1, 2]]
+        assert [line["total_price"] for line in result["lines"]] == [
+            Decimal("59.97"),
+            Decimal("5.10"),
+        ]
+        assert result["total_amount"] == Decimal("65.07")
+
+    def test_rejects_stale_client_prices(self, catalog):
+        """Test that a mismatched unit price or total is reported as a conflict"""
+        with pytest.raises(PricingError) as excinfo:
+            price_order([{"product_id": 1, "quantity": 1, "unit_price": "9.99"}])
+        assert excinfo.value.status_code == 409
+        assert excinfo.value.errors[0]["reason"] == "unit_price_mismatch"
+
+        with pytest.raises(PricingError) as excinfo:
+            price_order([{"product_id": 1, "quantity": 2}], client_total=39.99)
+        assert excinfo.value.errors[0]["expected"] == "39.98"
+
+    def test_rejects_unknown_and_unavailable_products(self, catalog):
+        """Test that missing or inactive products are a bad request"""
+        with pytest.raises(PricingError) as excinfo:
+            price_order([{"product_id": 3, "quantity": 1}, {"product_id": 99, "quantity": 1}])
+        assert excinfo.value.status_code == 400
+        assert [e["reason"] for e in excinfo.value.errors] == [
+            "product_not_available",
+            "product_not_found",
+        ]
+
+    def test_hot_products_are_served_from_cache(self, catalog):
+        """Test that only cache misses hit the database"""
+        price_order([{"product_id": 1, "quantity": 1}])
+        price_order([{"product_id": 1, "quantity": 1}, {"product_id": 2, "quantity": 1}])
+
+        assert catalog == [[1], [2]]
+
+    def test_rejects_malformed_lines_before_any_lookup(self, catalog):
+        """Test that missing, non-integer or non-positive fields are a 400 listing every line"""
+        with pytest.raises(PricingError) as excinfo:
+            price_order(
+                [
+                    {"quantity": 1},
+                    {"product_id": "abc", "quantity": 1},
+                    {"product_id": 1, "quantity": 0},
+                    {"product_id": 1, "quantity": 1.5},
+                    {"product_id": 1, "quantity": 1, "unit_price": "free"},
+                    "not-a-line",
+                ]
+            )
+
+        assert excinfo.value.status_code == 400
+        assert [(e["line"], e["reason"]) for e in excinfo.value.errors] == [
+            (0, "product_id_required"),
+            (1, "invalid_product_id"),
+            (2, "quantity_below_minimum"),
+            (3, "invalid_quantity"),
+            (4, "invalid_unit_price"),
+            (5, "invalid_line"),
+        ]
+        assert catalog == []
+
+    def test_rejects_non_numeric_total(self, catalog):
+        """Test that an unparseable total_amount is a 400 rather than a ValueError"""
+        with pytest.raises(PricingError) as excinfo:
+            price_order([{"product_id": 1, "quantity": 1}], client_total="lots")
+
+        assert excinfo.value.status_code == 400
+        assert excinfo.value.errors == [{"reason": "invalid_total_amount"}]
+        assert catalog == []
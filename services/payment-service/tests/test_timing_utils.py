@@ -0,0 +1,132 @@
+"""
+Tests for request timing and the db_utils hooks
+"""
+
+import json
+
+import pytest
+
+import db_utils
+import timing_utils
+from timing_utils import timed_handler, span, json_body
+
+
+class FakeCursor:
+    """Stands in for a psycopg2 cursor class behind InstrumentedCursorMixin"""
+
+    rowcount = -1
+
+    def execute(self, query, vars=None):
+        self.rowcount = 3
+        return None
+
+
+@pytest.fixture
+def emitted(monkeypatch):
+    """EMF records written by timed handlers"""
+    records = []
+    monkeypatch.setattr(timing_utils, "emit", records.append)
+    return records
+
+
+def handler(event, context):
+    with span("auth"):
+        pass
+    cursor = db_utils.instrumented_cursor(FakeCursor)()
+    cursor.execute("SELECT *\n  FROM payments WHERE id = %s", (1,))
+    return {
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/json"},
+        "body": json_body({"ok": True}),
+    }
+
+
+class TestTimedHandler:
+    """Test the decorator end to end with an instrumented fake cursor"""
+
+    def test_adds_server_timing_and_keeps_headers(self, emitted, monkeypatch):
+        """Test that with DEBUG on the response gains Server-Timing next to its own headers"""
+        monkeypatch.setattr(timing_utils, "SERVER_TIMING_HEADER", True)
+
+        response = timed_handler(handler)({}, None)
+
+        assert response["headers"]["Content-Type"] == "application/json"
+        server_timing = response["headers"]["Server-Timing"]
+        assert "db;dur=" in server_timing and 'desc="1 queries"' in server_timing
+        assert server_timing.split(", ")[-1].startswith("total;dur=")
+        assert json.loads(response["body"]) == {"ok": True}
+        assert "Timing-Allow-Origin" not in response["headers"]
+
+    def test_server_timing_is_off_by_default(self, emitted, monkeypatch):
+        """Test that without DEBUG only the EMF record is written, not the header"""
+        monkeypatch.setattr(timing_utils, "SERVER_TIMING_HEADER", False)
+
+        response = timed_handler(handler)({}, None)
+
+        assert "Server-Timing" not in response["headers"]
+        assert len(emitted) == 1
+
+    def test_emits_one_emf_record_with_statements(self, emitted):
+        """Test the EMF metrics and the per-statement properties"""
+        timed_handler(handler)({}, type("Context", (), {"aws_request_id": "req-1"})())
+
+        [record] = emitted
+        metrics = {metric["Name"] for metric in record["_aws"]["CloudWatchMetrics"][0]["Metrics"]}
+        assert {
+            "AuthMs",
+            "DbConnectMs",
+            "DbMs",
+            "SerializeMs",
+            "TotalMs",
+            "DbQueries",
+            "DbRows",
+        } <= metrics
+        assert record["Handler"] == "test_timing_utils" and record["Service"] == "payment-service"
+        assert record["StatusCode"] == 200 and record["RequestId"] == "req-1"
+        assert record["DbQueries"] == 1 and record["DbRows"] == 3
+        assert record["Statements"][0]["sql"] == "SELECT * FROM payments WHERE id = %s"
+
+    def test_records_failures_as_500(self, emitted):
+        """Test that an exception still produces a record before propagating"""
+
+        def failing(event, context):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            timed_handler(failing)({}, None)
+
+        assert emitted[0]["StatusCode"] == 500
+
+    def test_disabled_passes_through(self, emitted, monkeypatch):
+        """Test that REQUEST_TIMING=false leaves responses untouched"""
+        monkeypatch.setattr(timing_utils, "ENABLED", False)
+
+        response = timed_handler(handler)({}, None)
+
+        assert "Server-Timing" not in response["headers"] and emitted == []
+
+
+class TestDbHooks:
+    """Test the db_utils observer registry"""
+
+    def test_hook_errors_do_not_break_queries(self):
+        """Test that a failing hook is logged, not raised"""
+
+        def broken(event, elapsed_ms, **details):
+            raise RuntimeError("hook failure")
+
+        db_utils.add_db_hook(broken)
+        try:
+            cursor = db_utils.instrumented_cursor(FakeCursor)()
+            cursor.execute("SELECT 1")
+        finally:
+            db_utils.remove_db_hook(broken)
+
+        assert cursor.rowcount == 3
+
+    def test_statements_outside_a_request_are_ignored(self):
+        """Test that queries run outside a timed handler record nothing"""
+        cursor = db_utils.instrumented_cursor(FakeCursor)()
+        cursor.execute("SELECT 1")
+
+        assert timing_utils.current_timing() is None
@@ -8,11 +8,11 @@ from alembic import context
 # Add the app directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from app.database import Base
+from app.models.base import Base
 from app.config import settings
 
 # Import all models to ensure they are registered with SQLAlchemy
-from app.models import *
+from app.models import category, product, vendor  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
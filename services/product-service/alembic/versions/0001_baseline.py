@@ -0,0 +1,28 @@
+"""baseline schema
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+
+from alembic import op
+
+from app.database import model_metadata
+
+# revision identifiers, used by Alembic.
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tables that already exist (created by migrations/init_database.sql) are left as they are
+    model_metadata().create_all(bind=op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    # No-op: the baseline adopts tables that predate Alembic, so it cannot tell
+    # which ones it created; dropping them would delete the catalog
+    pass
@@ -1,51 +1,96 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
-from app.services.category_service import CategoryService
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_async_db
+from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CATEGORY_LIST_ADAPTER
+from app.schemas.product import ProductResponse, PRODUCT_LIST_ADAPTER
+from app.services.async_category_service import AsyncCategoryService
+from app.services.projection import models_to_json, rows_to_json
 
 router = APIRouter()
 
 @router.get("/", response_model=List[CategoryResponse])
-async def get_categories(db: Session = Depends(get_db)):
+async def get_categories(db: AsyncSession = Depends(get_async_db)):
     """Get all categories"""
-    service = CategoryService(db)
-    return service.get_categories()
+    service = AsyncCategoryService(db)
+    if settings.read_mode("categories.list") == "core":
+        return Response(rows_to_json(await service.get_category_rows()), media_type="application/json")
+    return Response(models_to_json(CATEGORY_LIST_ADAPTER, await service.get_categories()), media_type="application/json")
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-async def get_category(category_id: int, db: Session = Depends(get_db)):
+async def get_category(category_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific category by ID"""
-    service = CategoryService(db)
-    category = service.get_category(category_id)
+    service = AsyncCategoryService(db)
+    category = await service.get_category(category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     return category
 
+@router.get("/{category_id}/ancestors", response_model=List[CategoryResponse])
+async def get_category_ancestors(category_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get the ancestors of a category, root first"""
+    service = AsyncCategoryService(db)
+    if not await service.get_category(category_id):
+        raise HTTPException(status_code=404, detail="Category not found")
+    ancestors = await service.get_ancestors(category_id)
+    return Response(models_to_json(CATEGORY_LIST_ADAPTER, ancestors), media_type="application/json")
+
+@router.get("/{category_id}/descendants", response_model=List[CategoryResponse])
+async def get_category_descendants(
+    category_id: int,
+    max_depth: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all descendants of a category, ordered by depth"""
+    service = AsyncCategoryService(db)
+    if not await service.get_category(category_id):
+        raise HTTPException(status_code=404, detail="Category not found")
+    descendants = await service.get_descendants(category_id, max_depth)
+    return Response(models_to_json(CATEGORY_LIST_ADAPTER, descendants), media_type="application/json")
+
+@router.get("/{category_id}/products", response_model=List[ProductResponse])
+async def get_category_products(
+    category_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    status: Optional[str] = "active",
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get products in a category and all of its subcategories"""
+    service = AsyncCategoryService(db)
+    if not await service.get_category(category_id):
+        raise HTTPException(status_code=404, detail="Category not found")
+    products = await service.get_subtree_products(category_id, skip=skip, limit=limit, status=status)
+    return Response(models_to_json(PRODUCT_LIST_ADAPTER, products), media_type="application/json")
+
 @router.post("/", response_model=CategoryResponse)
-async def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
+async def create_category(category: CategoryCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new category"""
-    service = CategoryService(db)
-    return service.create_category(category)
+    service = AsyncCategoryService(db)
+    return await service.create_category(category)
 
 @router.put("/{category_id}", response_model=CategoryResponse)
 async def update_category(
     category_id: int,
     category: CategoryUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an existing category"""
-    service = CategoryService(db)
-    updated_category = service.update_category(category_id, category)
+    service = AsyncCategoryService(db)
+    try:
+        updated_category = await service.update_category(category_id, category)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not updated_category:
         raise HTTPException(status_code=404, detail="Category not found")
     return updated_category
 
 @router.delete("/{category_id}")
-async def delete_category(category_id: int, db: Session = Depends(get_db)):
+async def delete_category(category_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a category"""
-    service = CategoryService(db)
-    success = service.delete_category(category_id)
+    service = AsyncCategoryService(db)
+    success = await service.delete_category(category_id)
     if not success:
         raise HTTPException(status_code=404, detail="Category not found")
     return {"message": "Category deleted successfully"}
\ No newline at end of file
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
-from app.services.product_service import ProductService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_async_db
+from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, PRODUCT_LIST_ADAPTER
+from app.services.async_product_service import AsyncProductService
+from app.services.projection import models_to_json, rows_to_json
 
 router = APIRouter()
 
@@ -14,52 +16,61 @@ async def get_products(
     category_id: Optional[int] = None,
     vendor_id: Optional[int] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all products with optional filtering"""
-    service = ProductService(db)
-    products = service.get_products(
+    service = AsyncProductService(db)
+    if settings.read_mode("products.list") == "core":
+        rows = await service.get_product_rows(
+            skip=skip,
+            limit=limit,
+            category_id=category_id,
+            vendor_id=vendor_id,
+            status=status
+        )
+        return Response(rows_to_json(rows), media_type="application/json")
+    products = await service.get_products(
         skip=skip,
         limit=limit,
         category_id=category_id,
         vendor_id=vendor_id,
         status=status
     )
-    return products
+    return Response(models_to_json(PRODUCT_LIST_ADAPTER, products), media_type="application/json")
 
 @router.get("/{product_id}", response_model=ProductResponse)
-async def get_product(product_id: int, db: Session = Depends(get_db)):
+async def get_product(product_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific product by ID"""
-    service = ProductService(db)
-    product = service.get_product(product_id)
+    service = AsyncProductService(db)
+    product = await service.get_product(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
 @router.post("/", response_model=ProductResponse)
-async def create_product(product: ProductCreate, db: Session = Depends(get_db)):
+async def create_product(product: ProductCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new product"""
-    service = ProductService(db)
-    return service.create_product(product)
+    service = AsyncProductService(db)
+    return await service.create_product(product)
 
 @router.put("/{product_id}", response_model=ProductResponse)
 async def update_product(
     product_id: int,
     product: ProductUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an existing product"""
-    service = ProductService(db)
-    updated_product = service.update_product(product_id, product)
+    service = AsyncProductService(db)
+    updated_product = await service.update_product(product_id, product)
     if not updated_product:
         raise HTTPException(status_code=404, detail="Product not found")
     return updated_product
 
 @router.delete("/{product_id}")
-async def delete_product(product_id: int, db: Session = Depends(get_db)):
+async def delete_product(product_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a product"""
-    service = ProductService(db)
-    success = service.delete_product(product_id)
+    service = AsyncProductService(db)
+    success = await service.delete_product(product_id)
     if not success:
         raise HTTPException(status_code=404, detail="Product not found")
     return {"message": "Product deleted successfully"}
\ No newline at end of file
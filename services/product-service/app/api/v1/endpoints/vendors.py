@@ -1,51 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from typing import List
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.schemas.vendor import VendorCreate, VendorUpdate, VendorResponse
-from app.services.vendor_service import VendorService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_async_db
+from app.schemas.vendor import VendorCreate, VendorUpdate, VendorResponse, VENDOR_LIST_ADAPTER
+from app.services.async_vendor_service import AsyncVendorService
+from app.services.projection import models_to_json, rows_to_json
 
 router = APIRouter()
 
 @router.get("/", response_model=List[VendorResponse])
-async def get_vendors(db: Session = Depends(get_db)):
+async def get_vendors(db: AsyncSession = Depends(get_async_db)):
     """Get all vendors"""
-    service = VendorService(db)
-    return service.get_vendors()
+    service = AsyncVendorService(db)
+    if settings.read_mode("vendors.list") == "core":
+        return Response(rows_to_json(await service.get_vendor_rows()), media_type="application/json")
+    return Response(models_to_json(VENDOR_LIST_ADAPTER, await service.get_vendors()), media_type="application/json")
 
 @router.get("/{vendor_id}", response_model=VendorResponse)
-async def get_vendor(vendor_id: int, db: Session = Depends(get_db)):
+async def get_vendor(vendor_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific vendor by ID"""
-    service = VendorService(db)
-    vendor = service.get_vendor(vendor_id)
+    service = AsyncVendorService(db)
+    vendor = await service.get_vendor(vendor_id)
     if not vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
     return vendor
 
 @router.post("/", response_model=VendorResponse)
-async def create_vendor(vendor: VendorCreate, db: Session = Depends(get_db)):
+async def create_vendor(vendor: VendorCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new vendor"""
-    service = VendorService(db)
-    return service.create_vendor(vendor)
+    service = AsyncVendorService(db)
+    return await service.create_vendor(vendor)
 
 @router.put("/{vendor_id}", response_model=VendorResponse)
 async def update_vendor(
     vendor_id: int,
     vendor: VendorUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an existing vendor"""
-    service = VendorService(db)
-    updated_vendor = service.update_vendor(vendor_id, vendor)
+    service = AsyncVendorService(db)
+    updated_vendor = await service.update_vendor(vendor_id, vendor)
     if not updated_vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
     return updated_vendor
 
 @router.delete("/{vendor_id}")
-async def delete_vendor(vendor_id: int, db: Session = Depends(get_db)):
+async def delete_vendor(vendor_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a vendor"""
-    service = VendorService(db)
-    success = service.delete_vendor(vendor_id)
+    service = AsyncVendorService(db)
+    success = await service.delete_vendor(vendor_id)
     if not success:
         raise HTTPException(status_code=404, detail="Vendor not found")
     return {"message": "Vendor deleted successfully"}
\ No newline at end of file
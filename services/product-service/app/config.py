@@ -29,9 +29,29 @@ class Settings:
         self.debug = os.getenv("DEBUG", "true").lower() == "true"
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
         
+        # Read mode per list endpoint: "core" selects only the response columns and
+        # serializes rows directly; endpoints left out use ORM objects + response_model
+        self.core_read_endpoints = {
+            name.strip()
+            for name in os.getenv("CORE_READ_ENDPOINTS", "products.list,categories.list,vendors.list").split(",")
+            if name.strip()
+        }
+        
+        # Startup schema step: "check" (one alembic_version query, cached), "create"
+        # (create_all, for throwaway local SQLite databases) or "skip"
+        self.schema_startup = os.getenv(
+            "SCHEMA_STARTUP", "create" if self.database_url.startswith("sqlite") else "check"
+        )
+        # Alembic revision this build expects; unset accepts any applied revision
+        self.schema_version = os.getenv("SCHEMA_VERSION") or None
+        
         # S3 Configuration
         self.s3_bucket = os.getenv("S3_BUCKET", "gamarriando-dev-product-images")
         self.s3_region = os.getenv("S3_REGION", "us-east-1")
+    
+    def read_mode(self, endpoint: str) -> str:
+        """'core' or 'orm' for an endpoint name such as 'products.list'"""
+        return "core" if endpoint in self.core_read_endpoints else "orm"
 
 
 # Global settings instance
@@ -2,9 +2,14 @@ from sqlalchemy import create_engine, MetaData
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool, QueuePool
+from typing import AsyncIterator, TYPE_CHECKING
 import os
+from slow_query_utils import instrument_engine
 from .config import settings
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 # Database URL configuration
 DATABASE_URL = settings.database_url
 
@@ -40,6 +45,9 @@ else:
         max_overflow=20,
     )
 
+# Slow-query log and per-statement stats (no-op unless SLOW_QUERY_LOG=true)
+instrument_engine(engine)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -61,15 +69,90 @@ def get_db():
         db.close()
 
 
-def create_tables():
+def get_async_database_url(url: str = DATABASE_URL) -> str:
+    """
+    Map the sync DATABASE_URL onto its async driver:
+    postgresql:// -> postgresql+asyncpg://, sqlite:// -> sqlite+aiosqlite://
+    """
+    if os.getenv("ASYNC_DATABASE_URL"):
+        return os.getenv("ASYNC_DATABASE_URL")
+    scheme, _, rest = url.partition("://")
+    base = scheme.split("+", 1)[0]
+    if base in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    if base == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+
+# The async engine is created on first use so the sync app (and the Lambda
+# handlers) do not need asyncpg installed
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_engine():
+    """Process-wide AsyncEngine, created on first use"""
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = get_async_database_url()
+        if url.startswith("sqlite"):
+            _async_engine = create_async_engine(url, poolclass=StaticPool)
+        else:
+            _async_engine = create_async_engine(
+                url,
+                pool_pre_ping=True,
+                pool_recycle=300,
+                pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+                max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+                connect_args={"server_settings": {"application_name": "gamarriando-product-service"}},
+            )
+        instrument_engine(_async_engine)
+    return _async_engine
+
+
+def get_async_session_factory():
+    """async_sessionmaker bound to the async engine"""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        # expire_on_commit=False: returned objects stay readable after commit
+        # without an implicit (and in async, illegal) lazy refresh
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncIterator["AsyncSession"]:
+    """
+    Dependency to get an async database session
+    """
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+def model_metadata() -> MetaData:
+    """
+    Metadata of the mapped models (app.models.base.Base), with every model imported
+    """
+    from .models.base import Base as ModelBase
+    from .models import category, product, vendor  # noqa: F401
+    return ModelBase.metadata
+
+
+def create_tables(bind=None):
     """
     Create all tables in the database
     """
-    Base.metadata.create_all(bind=engine)
+    model_metadata().create_all(bind=bind or engine)
 
 
-def drop_tables():
+def drop_tables(bind=None):
     """
     Drop all tables in the database
     """
-    Base.metadata.drop_all(bind=engine)
\ No newline at end of file
+    model_metadata().drop_all(bind=bind or engine)
\ No newline at end of file
@@ -5,8 +5,9 @@ import os
 import sys
 from alembic.config import Config
 from alembic import command
-from .database import create_tables, drop_tables
+from .database import create_tables, drop_tables, engine
 from .config import settings
+from .schema_check import check_schema_version
 
 
 def run_migrations():
@@ -37,6 +38,21 @@ def show_current_revision():
     command.current(alembic_cfg)
 
 
+def stamp_revision(revision: str = "head"):
+    """Record a revision without running it (databases built from migrations/*.sql)"""
+    alembic_cfg = Config("alembic.ini")
+    alembic_cfg.set_main_option("sqlalchemy.url", settings.database_url)
+    command.stamp(alembic_cfg, revision)
+
+
+def check_schema():
+    """Run the startup schema-version check and exit non-zero if it fails"""
+    status = check_schema_version(engine, settings.schema_version)
+    print(f"Schema {'ready' if status.ready else 'not ready'}: {status.as_dict()}")
+    if not status.ready:
+        sys.exit(1)
+
+
 def show_migration_history():
     """Show migration history"""
     alembic_cfg = Config("alembic.ini")
@@ -67,6 +83,8 @@ if __name__ == "__main__":
         print("  create <message> - Create new migration")
         print("  downgrade [revision] - Downgrade migration")
         print("  current - Show current revision")
+        print("  stamp [revision] - Mark the database as migrated without running migrations")
+        print("  check - Verify the database is at SCHEMA_VERSION (the startup check)")
         print("  history - Show migration history")
         sys.exit(1)
     
@@ -89,6 +107,11 @@ if __name__ == "__main__":
         downgrade_migration(revision)
     elif command_name == "current":
         show_current_revision()
+    elif command_name == "stamp":
+        revision = sys.argv[2] if len(sys.argv) > 2 else "head"
+        stamp_revision(revision)
+    elif command_name == "check":
+        check_schema()
     elif command_name == "history":
         show_migration_history()
     else:
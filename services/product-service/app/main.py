@@ -1,9 +1,17 @@
+import time
+
+# Process start of the app module, for the startup timing report
+_import_started = time.perf_counter()
+
+import logging
 from fastapi import FastAPI, Depends
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 import uvicorn
+import slow_query_utils
 from .config import settings
-from .database import create_tables
+from .schema_check import prepare_schema, schema_status
 from .api.v1.api import api_router
 
 # Create FastAPI app
@@ -34,15 +42,31 @@ if not settings.debug:
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
+logger = logging.getLogger(__name__)
+_imported_ms = (time.perf_counter() - _import_started) * 1000
+
+
+def startup() -> dict:
+    """
+    Run the schema step (cached per process) and log how long boot took.
+    Called from the startup event and, where lifespan is off (Mangum), at import.
+    """
+    status = prepare_schema()
+    report = {
+        "import_ms": round(_imported_ms, 2),
+        "schema_mode": status.mode,
+        "schema_ms": round(status.elapsed_ms, 2),
+        "schema_ready": status.ready,
+        "boot_ms": round((time.perf_counter() - _import_started) * 1000, 2),
+    }
+    logger.info(f"Startup timing: {report}")
+    return report
+
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database tables on startup"""
-    try:
-        create_tables()
-    except Exception as e:
-        # Log error but don't fail startup in Lambda
-        print(f"Warning: Could not create tables: {e}")
-        pass
+    """Check the schema is migrated (migrations run out-of-band, see app/db_migrations.py)"""
+    startup()
 
 @app.get("/")
 async def root():
@@ -62,6 +86,36 @@ async def health_check():
         "version": "1.0.0"
     }
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness: 503 until the database is at the expected schema revision"""
+    status = schema_status()
+    return JSONResponse(
+        status_code=200 if status.ready else 503,
+        content={"status": "ready" if status.ready else "not_ready", "schema": status.as_dict()}
+    )
+
+def query_stats_available() -> bool:
+    """The /debug/query-stats routes exist only in debug mode with SLOW_QUERY_LOG=true"""
+    return settings.debug and slow_query_utils.ENABLED
+
+@app.get("/debug/query-stats")
+async def query_stats(limit: int = 20, order_by: str = "total_ms"):
+    """Per-fingerprint SQL stats of this process"""
+    if not query_stats_available():
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    if order_by not in ("total_ms", "count", "p50_ms", "p95_ms", "max_ms", "slow"):
+        return JSONResponse(status_code=400, content={"detail": f"Invalid order_by '{order_by}'"})
+    return {"queries": slow_query_utils.dump_stats(limit, order_by)}
+
+@app.post("/debug/query-stats/reset")
+async def reset_query_stats():
+    """Forget the collected SQL stats"""
+    if not query_stats_available():
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    slow_query_utils.reset_stats()
+    return {"reset": True}
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base
@@ -17,4 +17,17 @@ class Category(Base):
 
     # Relationships
     parent = relationship("Category", remote_side=[id], backref="children")
-    products = relationship("Product", back_populates="category")
\ No newline at end of file
+    products = relationship("Product", back_populates="category")
+
+class CategoryClosure(Base):
+    """Every (ancestor, descendant) pair of the hierarchy, including depth-0 self rows.
+    Maintained by triggers in migrations/category_closure.sql."""
+    __tablename__ = "category_closure"
+
+    ancestor_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("idx_category_closure_descendant", "descendant_id", "depth"),
+    )
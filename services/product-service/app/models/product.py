@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, JSON, DateTime
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, JSON, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base
@@ -7,19 +7,27 @@ class Product(Base):
     __tablename__ = "products"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False, index=True)
+    name = Column(String(255), nullable=False)
     slug = Column(String(255), unique=True, nullable=False, index=True)
     description = Column(Text)
     price = Column(Float, nullable=False)
-    stock = Column(Integer, default=0)
+    stock = Column(Integer, default=0, nullable=False)
     status = Column(String(50), default="draft")  # draft, active, inactive, out_of_stock
     vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
     images = Column(JSON)  # Array of image URLs
     tags = Column(JSON)  # Array of tags
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     vendor = relationship("Vendor", back_populates="products")
-    category = relationship("Category", back_populates="products")
\ No newline at end of file
+    category = relationship("Category", back_populates="products")
+
+    # One (column, id) index per sortable list key, as in migrations/list_sort_indexes.sql
+    __table_args__ = (
+        Index("idx_products_price_id", "price", "id"),
+        Index("idx_products_name_id", "name", "id"),
+        Index("idx_products_stock_id", "stock", "id"),
+        Index("idx_products_created_at_id", "created_at", "id"),
+    )
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Schema readiness check for the FastAPI app
+
+Migrations run out-of-band (`python app/db_migrations.py migrate`, `make migrate`);
+at boot the app no longer calls Base.metadata.create_all, which inspects the
+catalog once per table on every cold start. Instead it confirms the database is
+at the expected alembic revision with a single query and caches the answer for
+the life of the process, so warm requests (and warm Lambda invocations) pay nothing.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_STARTUP_MODES = ("check", "create", "skip")
+
+
+@dataclass
+class SchemaStatus:
+    """Result of the startup schema step"""
+
+    mode: str
+    ready: bool
+    revisions: Tuple[str, ...] = ()
+    expected: Optional[str] = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "ready": self.ready,
+            "revisions": list(self.revisions),
+            "expected": self.expected,
+            "error": self.error,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+        }
+
+
+_status: Optional[SchemaStatus] = None
+
+
+def check_schema_version(engine, expected: Optional[str] = None) -> SchemaStatus:
+    """
+    One round trip: read alembic_version and compare it with `expected`
+    (any applied revision counts as ready when no revision is pinned)
+    """
+    started = time.perf_counter()
+    try:
+        with engine.connect() as connection:
+            revisions = tuple(
+                connection.execute(text("SELECT version_num FROM alembic_version")).scalars()
+            )
+    except Exception as e:
+        return SchemaStatus(
+            "check",
+            False,
+            expected=expected,
+            error=f"alembic_version unreadable: {e}",
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if not revisions:
+        return SchemaStatus(
+            "check", False, expected=expected, error="no migration applied", elapsed_ms=elapsed_ms
+        )
+    if expected and expected not in revisions:
+        return SchemaStatus(
+            "check",
+            False,
+            revisions,
+            expected,
+            error=f"database at {', '.join(revisions)}, expected {expected}",
+            elapsed_ms=elapsed_ms,
+        )
+    return SchemaStatus("check", True, revisions, expected, elapsed_ms=elapsed_ms)
+
+
+def prepare_schema(engine=None, mode: Optional[str] = None, refresh: bool = False) -> SchemaStatus:
+    """
+    Run the configured startup step once per process and cache its status.
+    "check" (default) verifies the alembic revision, "create" keeps the old
+    create_all for throwaway local databases, "skip" trusts the deployment.
+    """
+    global _status
+    if _status is not None and not refresh:
+        return _status
+
+    mode = mode or settings.schema_startup
+    if mode not in SCHEMA_STARTUP_MODES:
+        raise ValueError(f"Invalid SCHEMA_STARTUP '{mode}'; use {', '.join(SCHEMA_STARTUP_MODES)}")
+    if engine is None:
+        from .database import engine
+
+    if mode == "check":
+        status = check_schema_version(engine, settings.schema_version)
+    elif mode == "create":
+        from .database import create_tables
+
+        started = time.perf_counter()
+        try:
+            create_tables(engine)
+            status = SchemaStatus("create", True, elapsed_ms=(time.perf_counter() - started) * 1000)
+        except Exception as e:
+            status = SchemaStatus(
+                "create", False, error=str(e), elapsed_ms=(time.perf_counter() - started) * 1000
+            )
+    else:
+        status = SchemaStatus("skip", True)
+
+    if not status.ready:
+        # Do not fail startup: the app still serves /health and reports the problem on /health/ready
+        logger.warning(f"Schema not ready ({status.mode}): {status.error}")
+    _status = status
+    return status
+
+
+def schema_status() -> SchemaStatus:
+    """Cached status, running the check on first use (e.g. Mangum with lifespan off)"""
+    return _status or prepare_schema()
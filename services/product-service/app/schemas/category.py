@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import List, Optional
 from datetime import datetime
 
 class CategoryBase(BaseModel):
@@ -24,5 +24,6 @@ class CategoryResponse(CategoryBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+CATEGORY_LIST_ADAPTER = TypeAdapter(List[CategoryResponse])
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -41,5 +41,7 @@ class ProductResponse(ProductBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# Built once at import: list endpoints validate ORM objects and dump JSON bytes with it
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[ProductResponse])
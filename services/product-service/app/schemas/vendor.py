@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, EmailStr
+from typing import List, Optional
 from datetime import datetime
 
 class VendorBase(BaseModel):
@@ -28,5 +28,6 @@ class VendorResponse(VendorBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+VENDOR_LIST_ADAPTER = TypeAdapter(List[VendorResponse])
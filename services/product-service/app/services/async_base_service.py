@@ -0,0 +1,177 @@
+from typing import TypeVar, Generic, Type, Optional, List, Dict, Any
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+from ..database import Base
+from ..schemas.common import PaginationParams, PaginatedResponse
+from .eager_loading import Loaders, loader_options
+from .list_query import ListQueryMixin
+from .projection import response_columns
+import math
+
+ModelType = TypeVar("ModelType", bound=Base)
+CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
+UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+
+
+class AsyncBaseService(ListQueryMixin, Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """Async variant of BaseService: same CRUD operations on an AsyncSession"""
+
+    async def get(self, db: AsyncSession, id: int) -> Optional[ModelType]:
+        """Get a single record by ID"""
+        return await db.get(self.model, id)
+
+    async def get_multi(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+        loaders: Loaders = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> List[ModelType]:
+        """
+        Get multiple records with pagination and filtering; loaders eager-loads relationships.
+        A cursor from cursor_after() replaces skip with an index seek past that row.
+        """
+        stmt = (
+            self._list_statement(
+                self.model,
+                filters=filters,
+                search=search,
+                search_fields=search_fields,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                cursor=cursor,
+            )
+            .options(*loader_options(self.model, loaders))
+            .offset(0 if cursor else skip)
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        return list(result.unique().scalars().all())
+
+    async def get_multi_rows(
+        self,
+        db: AsyncSession,
+        schema: Type[BaseModel],
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Core read mode of get_multi: select only the columns `schema` exposes and
+        return plain dicts, skipping ORM hydration and response validation
+        """
+        stmt = (
+            self._list_statement(
+                *response_columns(self.model, schema),
+                filters=filters,
+                search=search,
+                search_fields=search_fields,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                cursor=cursor,
+            )
+            .offset(0 if cursor else skip)
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        return [dict(row) for row in result.mappings()]
+
+    async def get_paginated(
+        self,
+        db: AsyncSession,
+        pagination: PaginationParams,
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+        loaders: Loaders = None,
+    ) -> PaginatedResponse:
+        """Get paginated results; the page and the total come from one statement"""
+        skip = (pagination.page - 1) * pagination.size
+        sort_by, sort_order = self._pagination_sort(pagination)
+        stmt = (
+            self._list_statement(
+                self.model,
+                func.count().over().label("total_count"),
+                filters=filters,
+                search=search,
+                search_fields=search_fields,
+                sort_by=sort_by,
+                sort_order=sort_order,
+            )
+            .options(*loader_options(self.model, loaders))
+            .offset(skip)
+            .limit(pagination.size)
+        )
+        rows = (await db.execute(stmt)).unique().all()
+        items = [row[0] for row in rows]
+
+        if rows:
+            total = rows[0].total_count
+        elif skip:
+            # Paged past the end: the window count has no row to ride on
+            count_stmt = self._count_statement(filters, search, search_fields)
+            total = (await db.execute(count_stmt)).scalar_one()
+        else:
+            total = 0
+
+        pages = math.ceil(total / pagination.size) if total > 0 else 1
+        return PaginatedResponse(
+            items=items,
+            total=total,
+            page=pagination.page,
+            size=pagination.size,
+            pages=pages,
+            has_next=pagination.page < pages,
+            has_prev=pagination.page > 1,
+        )
+
+    async def create(self, db: AsyncSession, obj_in: CreateSchemaType) -> ModelType:
+        """Create a new record"""
+        obj_data = obj_in.model_dump() if isinstance(obj_in, BaseModel) else obj_in
+        db_obj = self.model(**obj_data)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self, db: AsyncSession, db_obj: ModelType, obj_in: UpdateSchemaType
+    ) -> ModelType:
+        """Update an existing record"""
+        obj_data = (
+            obj_in.model_dump(exclude_unset=True) if isinstance(obj_in, BaseModel) else obj_in
+        )
+
+        for field, value in obj_data.items():
+            if hasattr(db_obj, field):
+                setattr(db_obj, field, value)
+
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def delete(self, db: AsyncSession, id: int) -> Optional[ModelType]:
+        """Delete a record by ID"""
+        obj = await db.get(self.model, id)
+        if obj:
+            await db.delete(obj)
+            await db.commit()
+        return obj
+
+    async def exists(self, db: AsyncSession, id: int) -> bool:
+        """Check if a record exists by ID"""
+        stmt = select(self.model.id).where(self.model.id == id).limit(1)
+        return (await db.execute(stmt)).first() is not None
@@ -0,0 +1,115 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+from app.models.category import Category, CategoryClosure
+from app.models.product import Product
+from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
+from app.services.projection import response_columns
+
+
+class AsyncCategoryService:
+    """Async variant of CategoryService for the FastAPI endpoints"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_categories(self) -> List[Category]:
+        result = await self.db.execute(select(Category))
+        return list(result.scalars().all())
+
+    async def get_category_rows(self) -> List[Dict[str, Any]]:
+        """Core read mode of get_categories: CategoryResponse columns as plain dicts"""
+        result = await self.db.execute(select(*response_columns(Category, CategoryResponse)))
+        return [dict(row) for row in result.mappings()]
+
+    async def get_category(self, category_id: int) -> Optional[Category]:
+        return await self.db.get(Category, category_id)
+
+    async def create_category(self, category: CategoryCreate) -> Category:
+        db_category = Category(**category.model_dump())
+        self.db.add(db_category)
+        await self.db.commit()
+        await self.db.refresh(db_category)
+        return db_category
+
+    async def get_ancestors(self, category_id: int) -> List[Category]:
+        """Ancestors ordered root first (breadcrumb), excluding the category itself"""
+        stmt = (
+            select(Category)
+            .join(CategoryClosure, CategoryClosure.ancestor_id == Category.id)
+            .where(CategoryClosure.descendant_id == category_id, CategoryClosure.depth > 0)
+            .order_by(CategoryClosure.depth.desc())
+        )
+        return list((await self.db.execute(stmt)).scalars().all())
+
+    async def get_descendants(
+        self, category_id: int, max_depth: Optional[int] = None
+    ) -> List[Category]:
+        """All descendants ordered by depth, excluding the category itself"""
+        stmt = (
+            select(Category)
+            .join(CategoryClosure, CategoryClosure.descendant_id == Category.id)
+            .where(CategoryClosure.ancestor_id == category_id, CategoryClosure.depth > 0)
+        )
+        if max_depth is not None:
+            stmt = stmt.where(CategoryClosure.depth <= max_depth)
+        stmt = stmt.order_by(CategoryClosure.depth, Category.order, Category.name)
+        return list((await self.db.execute(stmt)).scalars().all())
+
+    async def get_subtree_products(
+        self, category_id: int, skip: int = 0, limit: int = 20, status: Optional[str] = None
+    ) -> List[Product]:
+        """Products in the category or any descendant, newest first"""
+        stmt = (
+            select(Product)
+            .join(CategoryClosure, CategoryClosure.descendant_id == Product.category_id)
+            .where(CategoryClosure.ancestor_id == category_id)
+        )
+        if status:
+            stmt = stmt.where(Product.status == status)
+        stmt = stmt.order_by(Product.created_at.desc(), Product.id.desc()).offset(skip).limit(limit)
+        return list((await self.db.execute(stmt)).scalars().all())
+
+    async def creates_cycle(self, category_id: int, parent_id: Optional[int]) -> bool:
+        """True when parent_id is the category itself or one of its descendants"""
+        if parent_id is None:
+            return False
+        if parent_id == category_id:
+            return True
+        stmt = (
+            select(CategoryClosure.depth)
+            .where(
+                CategoryClosure.ancestor_id == category_id,
+                CategoryClosure.descendant_id == parent_id,
+            )
+            .limit(1)
+        )
+        return (await self.db.execute(stmt)).first() is not None
+
+    async def update_category(
+        self, category_id: int, category: CategoryUpdate
+    ) -> Optional[Category]:
+        db_category = await self.get_category(category_id)
+        if not db_category:
+            return None
+
+        update_data = category.model_dump(exclude_unset=True)
+        if "parent_id" in update_data and await self.creates_cycle(
+            category_id, update_data["parent_id"]
+        ):
+            raise ValueError("Category cannot be moved under itself or one of its subcategories")
+        for field, value in update_data.items():
+            setattr(db_category, field, value)
+
+        await self.db.commit()
+        await self.db.refresh(db_category)
+        return db_category
+
+    async def delete_category(self, category_id: int) -> bool:
+        db_category = await self.get_category(category_id)
+        if not db_category:
+            return False
+
+        await self.db.delete(db_category)
+        await self.db.commit()
+        return True
@@ -0,0 +1,84 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+from app.models.product import Product
+from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.services.eager_loading import Loaders, loader_options
+from app.services.product_service import ProductService
+from app.services.projection import response_columns
+
+
+class AsyncProductService:
+    """Async variant of ProductService for the FastAPI endpoints"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_products(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        category_id: Optional[int] = None,
+        vendor_id: Optional[int] = None,
+        status: Optional[str] = None,
+        loaders: Loaders = None,
+    ) -> List[Product]:
+        # Lazy loads cannot run on an AsyncSession: request any relationship
+        # the caller will touch, e.g. {"vendor": "joined", "category": "joined"}
+        stmt = (
+            select(Product)
+            .options(*loader_options(Product, loaders))
+            .where(*ProductService._filters(category_id, vendor_id, status))
+        )
+        result = await self.db.execute(stmt.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_product_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        category_id: Optional[int] = None,
+        vendor_id: Optional[int] = None,
+        status: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Core read mode of get_products: ProductResponse columns as plain dicts"""
+        stmt = (
+            select(*response_columns(Product, ProductResponse))
+            .where(*ProductService._filters(category_id, vendor_id, status))
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self.db.execute(stmt)
+        return [dict(row) for row in result.mappings()]
+
+    async def get_product(self, product_id: int) -> Optional[Product]:
+        return await self.db.get(Product, product_id)
+
+    async def create_product(self, product: ProductCreate) -> Product:
+        db_product = Product(**product.model_dump())
+        self.db.add(db_product)
+        await self.db.commit()
+        await self.db.refresh(db_product)
+        return db_product
+
+    async def update_product(self, product_id: int, product: ProductUpdate) -> Optional[Product]:
+        db_product = await self.get_product(product_id)
+        if not db_product:
+            return None
+
+        update_data = product.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_product, field, value)
+
+        await self.db.commit()
+        await self.db.refresh(db_product)
+        return db_product
+
+    async def delete_product(self, product_id: int) -> bool:
+        db_product = await self.get_product(product_id)
+        if not db_product:
+            return False
+
+        await self.db.delete(db_product)
+        await self.db.commit()
+        return True
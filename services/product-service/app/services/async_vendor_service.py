@@ -0,0 +1,54 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+from app.models.vendor import Vendor
+from app.schemas.vendor import VendorCreate, VendorUpdate, VendorResponse
+from app.services.projection import response_columns
+
+
+class AsyncVendorService:
+    """Async variant of VendorService for the FastAPI endpoints"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_vendors(self) -> List[Vendor]:
+        result = await self.db.execute(select(Vendor))
+        return list(result.scalars().all())
+
+    async def get_vendor_rows(self) -> List[Dict[str, Any]]:
+        """Core read mode of get_vendors: VendorResponse columns as plain dicts"""
+        result = await self.db.execute(select(*response_columns(Vendor, VendorResponse)))
+        return [dict(row) for row in result.mappings()]
+
+    async def get_vendor(self, vendor_id: int) -> Optional[Vendor]:
+        return await self.db.get(Vendor, vendor_id)
+
+    async def create_vendor(self, vendor: VendorCreate) -> Vendor:
+        db_vendor = Vendor(**vendor.model_dump())
+        self.db.add(db_vendor)
+        await self.db.commit()
+        await self.db.refresh(db_vendor)
+        return db_vendor
+
+    async def update_vendor(self, vendor_id: int, vendor: VendorUpdate) -> Optional[Vendor]:
+        db_vendor = await self.get_vendor(vendor_id)
+        if not db_vendor:
+            return None
+
+        update_data = vendor.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_vendor, field, value)
+
+        await self.db.commit()
+        await self.db.refresh(db_vendor)
+        return db_vendor
+
+    async def delete_vendor(self, vendor_id: int) -> bool:
+        db_vendor = await self.get_vendor(vendor_id)
+        if not db_vendor:
+            return False
+
+        await self.db.delete(db_vendor)
+        await self.db.commit()
+        return True
@@ -1,9 +1,12 @@
 from typing import TypeVar, Generic, Type, Optional, List, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import func
 from pydantic import BaseModel
 from ..database import Base
 from ..schemas.common import PaginationParams, PaginatedResponse
+from .eager_loading import Loaders, loader_options
+from .list_query import ListQueryMixin
+from .projection import response_columns
 import math
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -11,12 +14,9 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
-class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+class BaseService(ListQueryMixin, Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base service class with common CRUD operations"""
     
-    def __init__(self, model: Type[ModelType]):
-        self.model = model
-    
     def get(self, db: Session, id: int) -> Optional[ModelType]:
         """Get a single record by ID"""
         return db.query(self.model).filter(self.model.id == id).first()
@@ -28,32 +28,53 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         limit: int = 100,
         filters: Optional[Dict[str, Any]] = None,
         search: Optional[str] = None,
-        search_fields: Optional[List[str]] = None
+        search_fields: Optional[List[str]] = None,
+        loaders: Loaders = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[ModelType]:
-        """Get multiple records with pagination and filtering"""
-        query = db.query(self.model)
-        
-        # Apply filters
-        if filters:
-            for field, value in filters.items():
-                if hasattr(self.model, field) and value is not None:
-                    if isinstance(value, list):
-                        query = query.filter(getattr(self.model, field).in_(value))
-                    else:
-                        query = query.filter(getattr(self.model, field) == value)
-        
-        # Apply search
-        if search and search_fields:
-            search_conditions = []
-            for field in search_fields:
-                if hasattr(self.model, field):
-                    search_conditions.append(
-                        getattr(self.model, field).ilike(f"%{search}%")
-                    )
-            if search_conditions:
-                query = query.filter(or_(*search_conditions))
-        
-        return query.offset(skip).limit(limit).all()
+        """
+        Get multiple records with pagination and filtering; loaders eager-loads relationships.
+        A cursor from cursor_after() replaces skip with an index seek past that row.
+        """
+        stmt = (
+            self._list_statement(
+                self.model, filters=filters, search=search, search_fields=search_fields,
+                sort_by=sort_by, sort_order=sort_order, cursor=cursor
+            )
+            .options(*loader_options(self.model, loaders))
+            .offset(0 if cursor else skip)
+            .limit(limit)
+        )
+        return list(db.execute(stmt).unique().scalars().all())
+    
+    def get_multi_rows(
+        self,
+        db: Session,
+        schema: Type[BaseModel],
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Core read mode of get_multi: select only the columns `schema` exposes and
+        return plain dicts, skipping ORM hydration and response validation
+        """
+        stmt = (
+            self._list_statement(
+                *response_columns(self.model, schema), filters=filters, search=search,
+                search_fields=search_fields, sort_by=sort_by, sort_order=sort_order, cursor=cursor
+            )
+            .offset(0 if cursor else skip)
+            .limit(limit)
+        )
+        return [dict(row) for row in db.execute(stmt).mappings()]
     
     def get_paginated(
         self,
@@ -61,42 +82,33 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         pagination: PaginationParams,
         filters: Optional[Dict[str, Any]] = None,
         search: Optional[str] = None,
-        search_fields: Optional[List[str]] = None
-    ) -> PaginatedResponse[ModelType]:
-        """Get paginated results"""
-        # Count total records
-        count_query = db.query(self.model)
-        
-        if filters:
-            for field, value in filters.items():
-                if hasattr(self.model, field) and value is not None:
-                    if isinstance(value, list):
-                        count_query = count_query.filter(getattr(self.model, field).in_(value))
-                    else:
-                        count_query = count_query.filter(getattr(self.model, field) == value)
-        
-        if search and search_fields:
-            search_conditions = []
-            for field in search_fields:
-                if hasattr(self.model, field):
-                    search_conditions.append(
-                        getattr(self.model, field).ilike(f"%{search}%")
-                    )
-            if search_conditions:
-                count_query = count_query.filter(or_(*search_conditions))
-        
-        total = count_query.count()
-        
-        # Get paginated results
+        search_fields: Optional[List[str]] = None,
+        loaders: Loaders = None
+    ) -> PaginatedResponse:
+        """Get paginated results; the page and the total come from one statement"""
         skip = (pagination.page - 1) * pagination.size
-        items = self.get_multi(
-            db=db,
-            skip=skip,
-            limit=pagination.size,
-            filters=filters,
-            search=search,
-            search_fields=search_fields
+        sort_by, sort_order = self._pagination_sort(pagination)
+        stmt = (
+            self._list_statement(
+                self.model, func.count().over().label("total_count"),
+                filters=filters, search=search, search_fields=search_fields,
+                sort_by=sort_by, sort_order=sort_order
+            )
+            .options(*loader_options(self.model, loaders))
+            .offset(skip)
+            .limit(pagination.size)
         )
+        rows = db.execute(stmt).unique().all()
+        items = [row[0] for row in rows]
+        
+        if rows:
+            total = rows[0].total_count
+        elif skip:
+            # Paged past the end: the window count has no row to ride on
+            count_stmt = self._count_statement(filters, search, search_fields)
+            total = db.execute(count_stmt).scalar_one()
+        else:
+            total = 0
         
         # Calculate pagination info
         pages = math.ceil(total / pagination.size) if total > 0 else 1
@@ -115,7 +127,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     
     def create(self, db: Session, obj_in: CreateSchemaType) -> ModelType:
         """Create a new record"""
-        obj_data = obj_in.dict() if hasattr(obj_in, 'dict') else obj_in
+        obj_data = obj_in.model_dump() if isinstance(obj_in, BaseModel) else obj_in
         db_obj = self.model(**obj_data)
         db.add(db_obj)
         db.commit()
@@ -129,7 +141,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in: UpdateSchemaType
     ) -> ModelType:
         """Update an existing record"""
-        obj_data = obj_in.dict(exclude_unset=True) if hasattr(obj_in, 'dict') else obj_in
+        obj_data = obj_in.model_dump(exclude_unset=True) if isinstance(obj_in, BaseModel) else obj_in
         
         for field, value in obj_data.items():
             if hasattr(db_obj, field):
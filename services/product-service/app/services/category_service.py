@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.models.category import Category
+from app.models.category import Category, CategoryClosure
+from app.models.product import Product
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
 class CategoryService:
@@ -14,18 +15,69 @@ class CategoryService:
         return self.db.query(Category).filter(Category.id == category_id).first()
 
     def create_category(self, category: CategoryCreate) -> Category:
-        db_category = Category(**category.dict())
+        db_category = Category(**category.model_dump())
         self.db.add(db_category)
         self.db.commit()
         self.db.refresh(db_category)
         return db_category
 
+    def get_ancestors(self, category_id: int) -> List[Category]:
+        """Ancestors ordered root first (breadcrumb), excluding the category itself"""
+        return (
+            self.db.query(Category)
+            .join(CategoryClosure, CategoryClosure.ancestor_id == Category.id)
+            .filter(CategoryClosure.descendant_id == category_id, CategoryClosure.depth > 0)
+            .order_by(CategoryClosure.depth.desc())
+            .all()
+        )
+
+    def get_descendants(self, category_id: int, max_depth: Optional[int] = None) -> List[Category]:
+        """All descendants ordered by depth, excluding the category itself"""
+        query = (
+            self.db.query(Category)
+            .join(CategoryClosure, CategoryClosure.descendant_id == Category.id)
+            .filter(CategoryClosure.ancestor_id == category_id, CategoryClosure.depth > 0)
+        )
+        if max_depth is not None:
+            query = query.filter(CategoryClosure.depth <= max_depth)
+        return query.order_by(CategoryClosure.depth, Category.order, Category.name).all()
+
+    def get_subtree_products(
+        self,
+        category_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        status: Optional[str] = None
+    ) -> List[Product]:
+        """Products in the category or any descendant, newest first"""
+        query = (
+            self.db.query(Product)
+            .join(CategoryClosure, CategoryClosure.descendant_id == Product.category_id)
+            .filter(CategoryClosure.ancestor_id == category_id)
+        )
+        if status:
+            query = query.filter(Product.status == status)
+        return query.order_by(Product.created_at.desc(), Product.id.desc()).offset(skip).limit(limit).all()
+
+    def creates_cycle(self, category_id: int, parent_id: Optional[int]) -> bool:
+        """True when parent_id is the category itself or one of its descendants"""
+        if parent_id is None:
+            return False
+        if parent_id == category_id:
+            return True
+        return self.db.query(CategoryClosure).filter(
+            CategoryClosure.ancestor_id == category_id,
+            CategoryClosure.descendant_id == parent_id
+        ).first() is not None
+
     def update_category(self, category_id: int, category: CategoryUpdate) -> Optional[Category]:
         db_category = self.get_category(category_id)
         if not db_category:
             return None
             
-        update_data = category.dict(exclude_unset=True)
+        update_data = category.model_dump(exclude_unset=True)
+        if "parent_id" in update_data and self.creates_cycle(category_id, update_data["parent_id"]):
+            raise ValueError("Category cannot be moved under itself or one of its subcategories")
         for field, value in update_data.items():
             setattr(db_category, field, value)
             
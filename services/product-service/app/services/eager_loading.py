@@ -0,0 +1,43 @@
+from typing import Any, Dict, List, Optional, Type
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload, lazyload, raiseload
+
+# Relationship loading strategies a caller can ask for, by name.
+# "joined" suits many-to-one (Product.vendor, Product.category, Category.parent);
+# "selectin" suits collections (Category.children, Vendor.products);
+# "raise" turns any unplanned lazy load into an error.
+LOADER_STRATEGIES = {
+    "joined": joinedload,
+    "selectin": selectinload,
+    "lazy": lazyload,
+    "raise": raiseload,
+}
+
+Loaders = Optional[Dict[str, str]]
+
+
+def loader_options(model: Type[Any], loaders: Loaders = None) -> List[Any]:
+    """
+    Build ORM loader options from {relationship path: strategy}, e.g.
+    {"vendor": "joined", "category.parent": "joined", "children": "selectin"}.
+    Dotted paths chain through related models; every hop uses the given strategy.
+    """
+    options = []
+    for path, strategy in (loaders or {}).items():
+        if strategy not in LOADER_STRATEGIES:
+            raise ValueError(f"Unknown loader strategy '{strategy}' for '{path}'")
+
+        option = None
+        current = model
+        for name in path.split("."):
+            relationship = inspect(current).relationships.get(name)
+            if relationship is None:
+                raise ValueError(f"{current.__name__} has no relationship '{name}'")
+            attribute = getattr(current, name)
+            if option is None:
+                option = LOADER_STRATEGIES[strategy](attribute)
+            else:
+                option = getattr(option, f"{strategy}load")(attribute)
+            current = relationship.mapper.class_
+        options.append(option)
+    return options
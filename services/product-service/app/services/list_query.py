@@ -0,0 +1,189 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
+from sqlalchemy import Boolean, DateTime, func, or_, select, tuple_
+from query_utils import (
+    ListSpec,
+    FilterField,
+    OPERATORS,
+    parse_filters,
+    parse_sort,
+    parse_bool,
+    parse_datetime,
+    escape_like,
+    sort_keys,
+    decode_cursor,
+    encode_cursor,
+)
+
+# SQLAlchemy counterparts of query_utils.OPERATORS; the spec, validation and
+# value parsing are shared with the Lambda handlers, only this last step differs.
+# SQLAlchemy caches the compiled statement per shape itself, since values are bound.
+ORM_OPERATORS = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "in": lambda column, value: column.in_(value),
+    "contains": lambda column, value: column.ilike(value, escape="\\"),
+}
+
+
+def _parser(column) -> Any:
+    if isinstance(column.type, Boolean):
+        return parse_bool
+    if isinstance(column.type, DateTime):
+        return parse_datetime
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return str
+    return python_type if python_type in (int, float, str) else str
+
+
+def _indexed_columns(table) -> set:
+    """Columns that lead an index or unique constraint, i.e. that an index can return in order"""
+    leading = {list(table.primary_key.columns)[0].name}
+    for index in list(table.indexes) + list(table.constraints):
+        columns = list(getattr(index, "columns", ()))
+        if columns:
+            leading.add(columns[0].name)
+    return leading
+
+
+@lru_cache(maxsize=None)
+def model_list_spec(model: Type[Any]) -> ListSpec:
+    """Default whitelist for a model: every column, any operator, sortable by indexed columns"""
+    columns = list(model.__table__.columns)
+    indexed = _indexed_columns(model.__table__)
+    return ListSpec(
+        table=model.__tablename__,
+        columns=", ".join(column.name for column in columns),
+        filters={
+            column.key: FilterField(column.name, _parser(column), tuple(OPERATORS))
+            for column in columns
+        },
+        sort_fields={column.key: column.name for column in columns if column.name in indexed},
+        default_sort=("id", "asc"),
+    )
+
+
+def orm_conditions(
+    model: Type[Any],
+    spec: ListSpec,
+    filters: Optional[Dict[str, Any]] = None,
+    search: Optional[str] = None,
+    search_fields: Optional[List[str]] = None,
+) -> List[Any]:
+    """WHERE clauses for a list call, validated against the spec"""
+    table = model.__table__
+    conditions = [
+        ORM_OPERATORS[operator](table.c[column], value)
+        for _, column, operator, value in parse_filters(spec, filters or {})
+    ]
+    search = (search or "").strip()
+    search_columns = [
+        table.c[name] for name in (search_fields or spec.search_columns) if name in table.c
+    ]
+    if search and search_columns:
+        pattern = f"%{escape_like(search)}%"
+        conditions.append(or_(*(column.ilike(pattern, escape="\\") for column in search_columns)))
+    return conditions
+
+
+def orm_order_by(
+    model: Type[Any],
+    spec: ListSpec,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = None,
+) -> List[Any]:
+    """ORDER BY clauses for a whitelisted sort key, ending with the tiebreaker"""
+    order = parse_sort(spec, sort_by, sort_order)
+    columns = [model.__table__.c[name] for name in sort_keys(spec, order)]
+    return [column.desc() if order[1] == "desc" else column.asc() for column in columns]
+
+
+def orm_keyset(
+    model: Type[Any],
+    spec: ListSpec,
+    cursor: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    sort_order: Optional[str] = None,
+) -> List[Any]:
+    """WHERE clause that resumes after a cursor's row; empty without a cursor"""
+    if not cursor:
+        return []
+    order = parse_sort(spec, sort_by, sort_order)
+    columns = [model.__table__.c[name] for name in sort_keys(spec, order)]
+    key, values = tuple_(*columns), tuple_(*decode_cursor(spec, order, cursor))
+    return [key < values if order[1] == "desc" else key > values]
+
+
+class ListQueryMixin:
+    """
+    Statement building shared by BaseService and AsyncBaseService; the
+    subclasses only differ in how they execute what is built here.
+    """
+
+    def __init__(self, model: Type[Any], list_spec: Optional[ListSpec] = None):
+        self.model = model
+        # Filterable/sortable fields; defaults to every column of the model
+        self.list_spec = list_spec or model_list_spec(model)
+
+    def _conditions(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+    ) -> List[Any]:
+        """WHERE clauses for the filters and search of a list call, validated against list_spec"""
+        return orm_conditions(self.model, self.list_spec, filters, search, search_fields)
+
+    def _list_statement(
+        self,
+        *entities: Any,
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> Any:
+        """The one filtered and sorted SELECT every list method builds on"""
+        return (
+            select(*entities)
+            .where(*self._conditions(filters, search, search_fields))
+            .where(*orm_keyset(self.model, self.list_spec, cursor, sort_by, sort_order))
+            .order_by(*orm_order_by(self.model, self.list_spec, sort_by, sort_order))
+        )
+
+    def _count_statement(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+    ) -> Any:
+        """COUNT(*) over the rows a list call matches"""
+        return (
+            select(func.count())
+            .select_from(self.model)
+            .where(*self._conditions(filters, search, search_fields))
+        )
+
+    @staticmethod
+    def _pagination_sort(pagination: Any) -> Tuple[Optional[str], Optional[str]]:
+        """
+        sort_by/sort_order of PaginationParams; sort_order only when the client
+        sent it, so the spec's default_sort direction applies otherwise
+        """
+        sort_order = (
+            pagination.sort_order.value if "sort_order" in pagination.model_fields_set else None
+        )
+        return pagination.sort_by, sort_order
+
+    def cursor_after(
+        self, item: Any, sort_by: Optional[str] = None, sort_order: Optional[str] = None
+    ) -> str:
+        """Keyset cursor for the page that follows `item` (a model instance or row dict)"""
+        return encode_cursor(self.list_spec, parse_sort(self.list_spec, sort_by, sort_order), item)
@@ -1,36 +1,70 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from app.models.product import Product
-from app.schemas.product import ProductCreate, ProductUpdate
+from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
+from app.services.eager_loading import Loaders, loader_options
+from app.services.projection import response_columns
 
 class ProductService:
     def __init__(self, db: Session):
         self.db = db
 
+    @staticmethod
+    def _filters(
+        category_id: Optional[int] = None,
+        vendor_id: Optional[int] = None,
+        status: Optional[str] = None
+    ) -> List[Any]:
+        conditions = []
+        if category_id:
+            conditions.append(Product.category_id == category_id)
+        if vendor_id:
+            conditions.append(Product.vendor_id == vendor_id)
+        if status:
+            conditions.append(Product.status == status)
+        return conditions
+
     def get_products(
         self,
         skip: int = 0,
         limit: int = 100,
         category_id: Optional[int] = None,
         vendor_id: Optional[int] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        loaders: Loaders = None
     ) -> List[Product]:
-        query = self.db.query(Product)
-        
-        if category_id:
-            query = query.filter(Product.category_id == category_id)
-        if vendor_id:
-            query = query.filter(Product.vendor_id == vendor_id)
-        if status:
-            query = query.filter(Product.status == status)
-            
+        # loaders, e.g. {"vendor": "joined", "category": "joined"}, fetches the
+        # relationships with the page instead of one query per product
+        query = (
+            self.db.query(Product)
+            .options(*loader_options(Product, loaders))
+            .filter(*self._filters(category_id, vendor_id, status))
+        )
         return query.offset(skip).limit(limit).all()
 
+    def get_product_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        category_id: Optional[int] = None,
+        vendor_id: Optional[int] = None,
+        status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Core read mode of get_products: ProductResponse columns as plain dicts"""
+        stmt = (
+            select(*response_columns(Product, ProductResponse))
+            .where(*self._filters(category_id, vendor_id, status))
+            .offset(skip)
+            .limit(limit)
+        )
+        return [dict(row) for row in self.db.execute(stmt).mappings()]
+
     def get_product(self, product_id: int) -> Optional[Product]:
         return self.db.query(Product).filter(Product.id == product_id).first()
 
     def create_product(self, product: ProductCreate) -> Product:
-        db_product = Product(**product.dict())
+        db_product = Product(**product.model_dump())
         self.db.add(db_product)
         self.db.commit()
         self.db.refresh(db_product)
@@ -41,7 +75,7 @@ class ProductService:
         if not db_product:
             return None
             
-        update_data = product.dict(exclude_unset=True)
+        update_data = product.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_product, field, value)
             
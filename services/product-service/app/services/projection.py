@@ -0,0 +1,44 @@
+import json
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Type
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_jsonable_python
+
+
+@lru_cache(maxsize=None)
+def response_columns(model: Type[Any], schema: Type[BaseModel]) -> Tuple[Any, ...]:
+    """
+    The model columns a response schema exposes, in schema field order, so a
+    list query can select exactly those instead of whole ORM entities.
+    """
+    table_columns = model.__table__.columns
+    return tuple(getattr(model, name) for name in schema.model_fields if name in table_columns)
+
+
+def _json_default(value: Any) -> Any:
+    # Numeric columns back float schema fields
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    # Datetimes and the rest in pydantic's format (UTC as "Z", not "+00:00"),
+    # so both read modes produce the same strings
+    return to_jsonable_python(value)
+
+
+def rows_to_json(rows: List[Dict[str, Any]]) -> bytes:
+    """Serialize projected rows straight to a JSON body (no pydantic round trip)"""
+    return json.dumps(
+        rows, default=_json_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def models_to_json(adapter: TypeAdapter, items: List[Any]) -> bytes:
+    """
+    ORM read mode body: validate the objects through a prebuilt list TypeAdapter
+    and dump JSON bytes in one pass, instead of FastAPI's response_model route
+    (validate, dump to Python, then json.dumps)
+    """
+    return adapter.dump_json(adapter.validate_python(items, from_attributes=True))
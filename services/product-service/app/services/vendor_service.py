@@ -14,7 +14,7 @@ class VendorService:
         return self.db.query(Vendor).filter(Vendor.id == vendor_id).first()
 
     def create_vendor(self, vendor: VendorCreate) -> Vendor:
-        db_vendor = Vendor(**vendor.dict())
+        db_vendor = Vendor(**vendor.model_dump())
         self.db.add(db_vendor)
         self.db.commit()
         self.db.refresh(db_vendor)
@@ -25,7 +25,7 @@ class VendorService:
         if not db_vendor:
             return None
             
-        update_data = vendor.dict(exclude_unset=True)
+        update_data = vendor.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_vendor, field, value)
             
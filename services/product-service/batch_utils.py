@@ -0,0 +1,67 @@
+"""
+Batch lookup utilities for Gamarriando Product Service
+
+Backs the ?ids=1,2,3 mode of the list endpoints: one WHERE id = ANY(%s)
+query (minus any cache hits) instead of one GET per id, with results in
+request order and the ids that were not found reported separately.
+"""
+
+import os
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+from db_utils import execute_query
+from cache_utils import TTLCache, cache_records
+
+
+def get_batch_max_ids() -> int:
+    """Hard cap on ids per batch request"""
+    return int(os.getenv("BATCH_GET_MAX_IDS", "100"))
+
+
+def parse_id_list(raw: str, max_ids: Optional[int] = None) -> List[int]:
+    """Parse '1,2,3' into unique integer ids in request order"""
+    max_ids = max_ids or get_batch_max_ids()
+    ids = []
+    seen = set()
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            value = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid id '{part}' in ids")
+        if value not in seen:
+            seen.add(value)
+            ids.append(value)
+
+    if not ids:
+        raise ValueError("ids must contain at least one id")
+    if len(ids) > max_ids:
+        raise ValueError(f"ids accepts at most {max_ids} ids, got {len(ids)}")
+    return ids
+
+
+def fetch_by_ids(
+    sql: str,
+    ids: List[int],
+    serialize: Callable[[Dict[str, Any]], Dict[str, Any]],
+    cache: Optional[TTLCache] = None,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Run sql (which must filter on id = ANY(%s)) for the ids not in cache and
+    return (rows in request order, missing ids). Rows are passed through
+    serialize before being cached and returned.
+    """
+    found = cache.get_many(ids) if cache is not None else {}
+
+    missing_from_cache = [record_id for record_id in ids if record_id not in found]
+    if missing_from_cache:
+        loaded = {row["id"]: serialize(row) for row in execute_query(sql, (missing_from_cache,))}
+        if cache is not None:
+            cache_records(cache, list(loaded.values()))
+        found.update(loaded)
+
+    ordered = [dict(found[record_id]) for record_id in ids if record_id in found]
+    missing = [str(record_id) for record_id in ids if record_id not in found]
+    return ordered, missing
@@ -0,0 +1,120 @@
+"""
+In-process caching utilities for Gamarriando Product Service
+
+Entries live in the Lambda container between warm invocations and expire
+after a short TTL, which bounds how stale a cached product can be across
+containers (writes in the same process also invalidate their entries).
+Products and categories are cached under both their id and ('slug', slug),
+so id and slug lookups share entries.
+"""
+
+import os
+import time
+import threading
+from typing import Dict, Any, Optional, Iterable, Hashable, List
+
+
+def get_cache_config() -> Dict[str, Any]:
+    """Get cache configuration from environment variables"""
+    return {
+        "product_ttl_seconds": float(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "30")),
+        "product_max_entries": int(os.getenv("PRODUCT_CACHE_MAX_ENTRIES", "5000")),
+        "category_ttl_seconds": float(os.getenv("CATEGORY_CACHE_TTL_SECONDS", "60")),
+        "category_max_entries": int(os.getenv("CATEGORY_CACHE_MAX_ENTRIES", "2000")),
+    }
+
+
+class TTLCache:
+    """Thread-safe key -> value cache with a per-entry expiry"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry and entry[0] > now:
+                    found[key] = entry[1]
+        return found
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, values: Dict[Hashable, Any]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if len(self._entries) + len(values) > self.max_entries:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) + len(values) > self.max_entries:
+                    self._entries.clear()
+            for key, value in values.items():
+                self._entries[key] = (expires_at, value)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_product_cache: Optional[TTLCache] = None
+
+
+def get_product_cache() -> TTLCache:
+    """Process-wide cache of serialized products keyed by product id"""
+    global _product_cache
+    if _product_cache is None:
+        config = get_cache_config()
+        _product_cache = TTLCache(config["product_ttl_seconds"], config["product_max_entries"])
+    return _product_cache
+
+
+_category_cache: Optional[TTLCache] = None
+
+
+def get_category_cache() -> TTLCache:
+    """Process-wide cache of serialized categories keyed by category id and slug"""
+    global _category_cache
+    if _category_cache is None:
+        config = get_cache_config()
+        _category_cache = TTLCache(config["category_ttl_seconds"], config["category_max_entries"])
+    return _category_cache
+
+
+def slug_key(slug: str) -> tuple:
+    """Cache key for a slug (kept apart from integer id keys)"""
+    return ("slug", slug)
+
+
+def cache_records(cache: TTLCache, records: List[Dict[str, Any]]) -> None:
+    """Cache serialized records under their id and, when they have one, their slug"""
+    entries = {}
+    for record in records:
+        entries[int(record["id"])] = record
+        if record.get("slug"):
+            entries[slug_key(record["slug"])] = record
+    cache.set_many(entries)
+
+
+def invalidate_record(cache: TTLCache, record_id: int, *slugs: Optional[str]) -> None:
+    """Drop a record's id key and every slug key it may be cached under"""
+    cached = cache.get(int(record_id))
+    keys = [int(record_id)] + [slug_key(slug) for slug in slugs if slug]
+    if cached and cached.get("slug"):
+        keys.append(slug_key(cached["slug"]))
+    for key in keys:
+        cache.delete(key)
@@ -11,6 +11,8 @@ from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
 from typing import Generator
 
+from slow_query_utils import instrument_engine
+
 logger = logging.getLogger(__name__)
 
 # Database configuration
@@ -55,7 +57,8 @@ def create_database_engine():
         echo=os.getenv('DEBUG', 'false').lower() == 'true'
     )
     
-    return engine
+    # Slow-query log and per-statement stats (no-op unless SLOW_QUERY_LOG=true)
+    return instrument_engine(engine)
 
 # Global engine instance (reused across Lambda invocations)
 engine = create_database_engine()
@@ -3,12 +3,17 @@ Database utilities for Gamarriando Product Service using psycopg2
 """
 
 import os
+import time
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
 import logging
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Callable
 from contextlib import contextmanager
 
+import slow_query_utils
+
 logger = logging.getLogger(__name__)
 
 def get_db_config() -> Dict[str, str]:
@@ -21,13 +26,79 @@ def get_db_config() -> Dict[str, str]:
         'password': os.getenv('DB_PASSWORD', '')
     }
 
+# Observers of database activity, called as hook(event, elapsed_ms, **details):
+# 'connect' when a connection opens, 'query' after every cursor.execute with
+# sql, parameters, rows (cursor.rowcount) and cursor. timing_utils registers one,
+# slow_query_utils another when SLOW_QUERY_LOG=true.
+DB_HOOKS: List[Callable[..., None]] = []
+
+def add_db_hook(hook: Callable[..., None]) -> None:
+    """Register a database activity observer (once)"""
+    if hook not in DB_HOOKS:
+        DB_HOOKS.append(hook)
+
+def remove_db_hook(hook: Callable[..., None]) -> None:
+    """Unregister a database activity observer"""
+    if hook in DB_HOOKS:
+        DB_HOOKS.remove(hook)
+
+def _notify(event: str, elapsed_ms: float, **details) -> None:
+    for hook in list(DB_HOOKS):
+        try:
+            hook(event, elapsed_ms, **details)
+        except Exception as e:
+            # Instrumentation must never fail the query it observes
+            logger.warning(f"Database hook error: {str(e)}")
+
+if slow_query_utils.ENABLED:
+    add_db_hook(slow_query_utils.on_db_event)
+
+class InstrumentedCursorMixin:
+    """Times execute/executemany and reports them to DB_HOOKS"""
+
+    def execute(self, query, vars=None):
+        if not DB_HOOKS:
+            return super().execute(query, vars)
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            _notify('query', (time.perf_counter() - started) * 1000,
+                    sql=query, parameters=vars, rows=self.rowcount, cursor=self)
+
+    def executemany(self, query, vars_list):
+        if not DB_HOOKS:
+            return super().executemany(query, vars_list)
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            _notify('query', (time.perf_counter() - started) * 1000,
+                    sql=query, parameters=None, rows=self.rowcount, cursor=self)
+
+@lru_cache(maxsize=None)
+def instrumented_cursor(cursor_factory: type) -> type:
+    """The cursor class with InstrumentedCursorMixin in front, e.g. for RealDictCursor"""
+    return type(f"Instrumented{cursor_factory.__name__}", (InstrumentedCursorMixin, cursor_factory), {})
+
+class InstrumentedConnection(psycopg2.extensions.connection):
+    """Connection whose cursors, of whatever factory, report to DB_HOOKS"""
+
+    def cursor(self, *args, **kwargs):
+        factory = kwargs.get('cursor_factory') or self.cursor_factory or psycopg2.extensions.cursor
+        kwargs['cursor_factory'] = instrumented_cursor(factory)
+        return super().cursor(*args, **kwargs)
+
 @contextmanager
 def get_db_connection():
     """Get database connection with automatic cleanup"""
     config = get_db_config()
     conn = None
     try:
-        conn = psycopg2.connect(**config)
+        started = time.perf_counter()
+        conn = psycopg2.connect(**config, connection_factory=InstrumentedConnection)
+        if DB_HOOKS:
+            _notify('connect', (time.perf_counter() - started) * 1000)
         yield conn
     except Exception as e:
         if conn:
@@ -0,0 +1,99 @@
+"""
+Categories Ancestors Lambda function with RDS support
+GET /api/v1/categories/{category_id}/ancestors
+"""
+
+import logging
+from typing import Dict, Any
+import sys
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from hierarchy_utils import get_ancestors
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Categories Ancestors Lambda function - GET /api/v1/categories/{category_id}/ancestors
+    Breadcrumb: the category and its ancestors, root first
+    """
+    try:
+        log_request(event, context, "categories_ancestors")
+
+        # Handle CORS
+        if event.get("httpMethod") == "OPTIONS":
+            return {
+                "statusCode": 200,
+                "headers": {
+                    "Access-Control-Allow-Origin": "*",
+                    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+                    "Access-Control-Allow-Methods": "GET, OPTIONS",
+                },
+                "body": "",
+            }
+
+        # Get category ID from path parameters
+        path_parameters = event.get("pathParameters") or {}
+        category_id = path_parameters.get("category_id")
+
+        if not category_id:
+            return error_response("Category ID is required", 400)
+
+        # One closure lookup returns the category and its whole ancestor chain
+        result = get_ancestors(int(category_id))
+        if result is None:
+            return not_found_response("Category not found")
+
+        category, ancestors = result
+        return success_response(
+            {"category": category, "ancestors": ancestors, "total": len(ancestors)},
+            f"Retrieved {len(ancestors)} ancestors",
+        )
+
+    except ValueError as e:
+        return error_response("Invalid category ID or query parameters", 400, str(e))
+    except Exception as e:
+        logger.error(f"Categories ancestors error: {str(e)}")
+        return error_response("Failed to retrieve category ancestors", 500, str(e))
+
+
+def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
+    """Create success response"""
+    return {
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(
+            {
+                "data": data,
+                "message": message,
+            }
+        ),
+    }
+
+
+def error_response(message: str, status_code: int = 500, error: str = None) -> Dict[str, Any]:
+    """Create error response"""
+    response_data = {"message": message}
+    if error:
+        response_data["error"] = str(error)
+
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(response_data),
+    }
+
+
+def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
+    """Create not found response"""
+    return {
+        "statusCode": 404,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body({"message": message}),
+    }
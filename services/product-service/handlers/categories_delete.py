@@ -3,7 +3,6 @@ Categories Delete Lambda function with RDS support
 DELETE /api/v1/categories/{category_id}
 """
 
-import json
 import logging
 import os
 import sys
@@ -12,16 +11,20 @@ from typing import Dict, Any
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_single_query, execute_delete
+from cache_utils import get_category_cache, invalidate_record
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Categories Delete Lambda function - DELETE /api/v1/categories/{category_id}
     """
     try:
-        logger.info(f"Categories delete request: {json.dumps(event)}")
+        log_request(event, context, 'categories_delete')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -42,32 +45,41 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if not category_id:
             return error_response("Category ID is required", 400)
         
-        # Check if category exists
-        check_query = "SELECT id, name FROM categories WHERE id = %s"
+        # Check existence, products and subcategories in one lookup; the counts are
+        # maintained by triggers in category_stats
+        check_query = """
+            SELECT c.id, c.name, c.slug, s.direct_product_count, s.child_count
+            FROM categories c
+            LEFT JOIN category_stats s ON s.category_id = c.id
+            WHERE c.id = %s
+        """
         existing_category = execute_single_query(check_query, (int(category_id),))
         
         if not existing_category:
             return not_found_response("Category not found")
         
-        # Check if category has products
-        products_check_query = "SELECT COUNT(*) as count FROM products WHERE category_id = %s"
-        products_result = execute_single_query(products_check_query, (int(category_id),))
-        products_count = products_result['count'] if products_result else 0
+        products_count = existing_category['direct_product_count']
+        subcategories_count = existing_category['child_count']
+        if products_count is None or subcategories_count is None:
+            # No stats row for this category (drift not yet repaired): count directly
+            counts_query = """
+                SELECT (SELECT COUNT(*) FROM products WHERE category_id = %s) AS products_count,
+                       (SELECT COUNT(*) FROM categories WHERE parent_id = %s) AS subcategories_count
+            """
+            counts = execute_single_query(counts_query, (int(category_id), int(category_id)))
+            products_count = counts['products_count']
+            subcategories_count = counts['subcategories_count']
         
         if products_count > 0:
             return error_response(f"Cannot delete category with {products_count} products. Please move or delete products first.", 409)
         
-        # Check if category has subcategories
-        subcategories_check_query = "SELECT COUNT(*) as count FROM categories WHERE parent_id = %s"
-        subcategories_result = execute_single_query(subcategories_check_query, (int(category_id),))
-        subcategories_count = subcategories_result['count'] if subcategories_result else 0
-        
         if subcategories_count > 0:
             return error_response(f"Cannot delete category with {subcategories_count} subcategories. Please move or delete subcategories first.", 409)
         
         # Delete category from database
         delete_query = "DELETE FROM categories WHERE id = %s"
         affected_rows = execute_delete(delete_query, (int(category_id),))
+        invalidate_record(get_category_cache(), int(category_id), existing_category['slug'])
         
         if affected_rows == 0:
             return error_response("Category not found or could not be deleted", 404)
@@ -86,7 +98,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -100,7 +112,7 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'message': message
         })
     }
@@ -117,5 +129,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
@@ -0,0 +1,109 @@
+"""
+Categories Descendants Lambda function with RDS support
+GET /api/v1/categories/{category_id}/descendants
+"""
+
+import logging
+from typing import Dict, Any
+import sys
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from hierarchy_utils import get_descendants
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Categories Descendants Lambda function - GET /api/v1/categories/{category_id}/descendants
+    All descendants (optionally limited with ?max_depth=), ordered by depth
+    """
+    try:
+        log_request(event, context, "categories_descendants")
+
+        # Handle CORS
+        if event.get("httpMethod") == "OPTIONS":
+            return {
+                "statusCode": 200,
+                "headers": {
+                    "Access-Control-Allow-Origin": "*",
+                    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+                    "Access-Control-Allow-Methods": "GET, OPTIONS",
+                },
+                "body": "",
+            }
+
+        # Get category ID from path parameters
+        path_parameters = event.get("pathParameters") or {}
+        category_id = path_parameters.get("category_id")
+
+        if not category_id:
+            return error_response("Category ID is required", 400)
+
+        query_params = event.get("queryStringParameters") or {}
+        max_depth = int(query_params["max_depth"]) if query_params.get("max_depth") else None
+        if max_depth is not None and max_depth < 1:
+            raise ValueError("max_depth must be at least 1")
+
+        # One closure lookup returns the category and every descendant with its depth
+        result = get_descendants(int(category_id), max_depth)
+        if result is None:
+            return not_found_response("Category not found")
+
+        category, descendants = result
+        return success_response(
+            {
+                "category": category,
+                "descendants": descendants,
+                "total": len(descendants),
+                "max_depth": max_depth,
+            },
+            f"Retrieved {len(descendants)} descendants",
+        )
+
+    except ValueError as e:
+        return error_response("Invalid category ID or query parameters", 400, str(e))
+    except Exception as e:
+        logger.error(f"Categories descendants error: {str(e)}")
+        return error_response("Failed to retrieve category descendants", 500, str(e))
+
+
+def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
+    """Create success response"""
+    return {
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(
+            {
+                "data": data,
+                "message": message,
+            }
+        ),
+    }
+
+
+def error_response(message: str, status_code: int = 500, error: str = None) -> Dict[str, Any]:
+    """Create error response"""
+    response_data = {"message": message}
+    if error:
+        response_data["error"] = str(error)
+
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(response_data),
+    }
+
+
+def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
+    """Create not found response"""
+    return {
+        "statusCode": 404,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body({"message": message}),
+    }
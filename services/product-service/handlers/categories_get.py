@@ -1,9 +1,9 @@
 """
 Categories Get Lambda function with RDS support
 GET /api/v1/categories/{category_id}
+GET /api/v1/categories/by-slug/{slug}
 """
 
-import json
 import logging
 import os
 import boto3
@@ -13,16 +13,22 @@ import sys
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_single_query, create_parameter
+from cache_utils import get_category_cache, cache_records, slug_key
+from serializers import CATEGORY_COLUMNS, CATEGORY_SOURCE, serialize_category
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Categories Get Lambda function - GET /api/v1/categories/{category_id}
+    Also serves GET /api/v1/categories/by-slug/{slug} (unique index on categories.slug)
     """
     try:
-        logger.info(f"Categories get request: {json.dumps(event)}")
+        log_request(event, context, 'categories_get')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -36,37 +42,37 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'body': ''
             }
         
-        # Get category ID from path parameters
+        # Get category ID or slug from path parameters
         path_parameters = event.get('pathParameters') or {}
         category_id = path_parameters.get('category_id')
+        slug = path_parameters.get('slug')
         
-        if not category_id:
-            return error_response("Category ID is required", 400)
+        if not category_id and not slug:
+            return error_response("Category ID or slug is required", 400)
         
-        # Query category from database using psycopg2
-        query = """
-            SELECT id, name, slug, description, parent_id, "order", is_active, created_at, updated_at
-            FROM categories
-            WHERE id = %s
-        """
+        # Categories are cached in-process under both id and slug; product counts
+        # come from the joined category_stats row
+        cache = get_category_cache()
+        category = cache.get(int(category_id) if category_id else slug_key(slug))
+        if category is None:
+            lookup_column, lookup_value = ('id', int(category_id)) if category_id else ('slug', slug)
+            query = f"""
+                SELECT {CATEGORY_COLUMNS}
+                FROM {CATEGORY_SOURCE}
+                WHERE c.{lookup_column} = %s
+            """
+            row = execute_single_query(query, (lookup_value,))
 
-        parameters = (int(category_id),)
-        category = execute_single_query(query, parameters)
+            if not row:
+                return not_found_response("Category not found")
 
-        if not category:
-            return not_found_response("Category not found")
-
-        # Convert data types for JSON serialization
-        category['id'] = str(category['id'])
-        if category['parent_id']:
-            category['parent_id'] = str(category['parent_id'])
-        if category['created_at']:
-            category['created_at'] = category['created_at'].isoformat()
-        if category['updated_at']:
-            category['updated_at'] = category['updated_at'].isoformat()
+            category = serialize_category(row)
+            cache_records(cache, [category])
 
         return success_response(category, "Category retrieved successfully")
         
+    except ValueError as e:
+        return error_response("Invalid category ID format", 400, str(e))
     except Exception as e:
         logger.error(f"Categories get error: {str(e)}")
         return error_response("Failed to retrieve category", 500, str(e))
@@ -79,7 +85,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -97,7 +103,7 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
 
 def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
@@ -108,5 +114,5 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({'message': message})
+        'body': json_body({'message': message})
     }
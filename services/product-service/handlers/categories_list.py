@@ -3,7 +3,6 @@ Categories List Lambda function with RDS support
 GET /api/v1/categories
 """
 
-import json
 import logging
 import os
 import boto3
@@ -13,16 +12,23 @@ import sys
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_query
+from batch_utils import parse_id_list, fetch_by_ids
+from cache_utils import get_category_cache
+from serializers import CATEGORY_COLUMNS, CATEGORY_SOURCE, serialize_category
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Categories List Lambda function - GET /api/v1/categories
+    GET /api/v1/categories?ids=1,2,3 fetches several categories in one call
     """
     try:
-        logger.info(f"Categories list request: {json.dumps(event)}")
+        log_request(event, context, 'categories_list')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -36,30 +42,36 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'body': ''
             }
         
-        # Query categories from database
-        query = """
-            SELECT id, name, slug, description, parent_id, "order", is_active, created_at, updated_at
-            FROM categories 
-            ORDER BY "order" ASC, name ASC
-        """
+        # Batch mode: ?ids=1,2,3 returns those categories in request order
+        query_params = event.get('queryStringParameters') or {}
+        if query_params.get('ids') is not None:
+            ids = parse_id_list(query_params['ids'])
+            categories_data, missing_ids = fetch_by_ids(
+                f"SELECT {CATEGORY_COLUMNS} FROM {CATEGORY_SOURCE} WHERE c.id = ANY(%s)",
+                ids, serialize_category, get_category_cache()
+            )
+            return success_response({
+                'categories': categories_data,
+                'missing_ids': missing_ids,
+                'total': len(categories_data)
+            }, f"Retrieved {len(categories_data)} of {len(ids)} categories")
         
-        categories_data = execute_query(query)
+        # Query categories from database, with product counts from category_stats
+        query = f"""
+            SELECT {CATEGORY_COLUMNS}
+            FROM {CATEGORY_SOURCE}
+            ORDER BY c."order" ASC, c.name ASC
+        """
         
-        # Convert data types for JSON serialization
-        for category in categories_data:
-            category['id'] = str(category['id'])
-            if category['parent_id']:
-                category['parent_id'] = str(category['parent_id'])
-            if category['created_at']:
-                category['created_at'] = category['created_at'].isoformat()
-            if category['updated_at']:
-                category['updated_at'] = category['updated_at'].isoformat()
+        categories_data = [serialize_category(row) for row in execute_query(query)]
         
         return success_response({
             'categories': categories_data,
             'total': len(categories_data)
         }, f"Retrieved {len(categories_data)} categories")
         
+    except ValueError as e:
+        return error_response("Invalid query parameters", 400, str(e))
     except Exception as e:
         logger.error(f"Categories list error: {str(e)}")
         return error_response("Failed to retrieve categories", 500, str(e))
@@ -72,7 +84,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message
         })
@@ -90,5 +102,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Categories Products Lambda function with RDS support
+GET /api/v1/categories/{category_id}/products
+"""
+
+import logging
+from typing import Dict, Any
+import sys
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from hierarchy_utils import get_hierarchy_config, get_subtree_products, category_exists
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Categories Products Lambda function - GET /api/v1/categories/{category_id}/products
+    Products in the category or any of its subcategories, newest first
+    """
+    try:
+        log_request(event, context, "categories_products")
+
+        # Handle CORS
+        if event.get("httpMethod") == "OPTIONS":
+            return {
+                "statusCode": 200,
+                "headers": {
+                    "Access-Control-Allow-Origin": "*",
+                    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+                    "Access-Control-Allow-Methods": "GET, OPTIONS",
+                },
+                "body": "",
+            }
+
+        # Get category ID from path parameters
+        path_parameters = event.get("pathParameters") or {}
+        category_id = path_parameters.get("category_id")
+
+        if not category_id:
+            return error_response("Category ID is required", 400)
+
+        query_params = event.get("queryStringParameters") or {}
+        skip = int(query_params.get("skip", 0))
+        limit = int(query_params.get("limit", 20))
+        status = query_params.get("status", "active")
+        max_limit = get_hierarchy_config()["subtree_max_limit"]
+        if skip < 0 or limit < 1 or limit > max_limit:
+            raise ValueError(f"skip must be >= 0 and limit between 1 and {max_limit}")
+
+        # Products of the category and all its descendants, with the total, in one query
+        products_data, total_count = get_subtree_products(
+            int(category_id), status or None, skip, limit
+        )
+        if total_count == 0 and not category_exists(int(category_id)):
+            return not_found_response("Category not found")
+
+        return success_response(
+            {
+                "products": products_data,
+                "total": total_count,
+                "pagination": {
+                    "skip": skip,
+                    "limit": limit,
+                    "has_more": (skip + limit) < total_count,
+                },
+                "filters": {
+                    "category_id": category_id,
+                    "status": status,
+                    "include_descendants": True,
+                },
+            },
+            f"Retrieved {len(products_data)} products",
+        )
+
+    except ValueError as e:
+        return error_response("Invalid category ID or query parameters", 400, str(e))
+    except Exception as e:
+        logger.error(f"Categories products error: {str(e)}")
+        return error_response("Failed to retrieve category products", 500, str(e))
+
+
+def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
+    """Create success response"""
+    return {
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(
+            {
+                "data": data,
+                "message": message,
+            }
+        ),
+    }
+
+
+def error_response(message: str, status_code: int = 500, error: str = None) -> Dict[str, Any]:
+    """Create error response"""
+    response_data = {"message": message}
+    if error:
+        response_data["error"] = str(error)
+
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(response_data),
+    }
+
+
+def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
+    """Create not found response"""
+    return {
+        "statusCode": 404,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body({"message": message}),
+    }
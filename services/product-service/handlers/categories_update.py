@@ -12,17 +12,23 @@ from typing import Dict, Any
 
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
+import psycopg2
 from db_utils import execute_single_query, execute_update
+from cache_utils import get_category_cache, invalidate_record
+from hierarchy_utils import creates_cycle
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Categories Update Lambda function - PUT /api/v1/categories/{category_id}
     """
     try:
-        logger.info(f"Categories update request: {json.dumps(event)}")
+        log_request(event, context, 'categories_update')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -47,7 +53,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         body = json.loads(event.get('body', '{}'))
         
         # Check if category exists
-        check_query = "SELECT id FROM categories WHERE id = %s"
+        check_query = "SELECT id, slug FROM categories WHERE id = %s"
         existing_category = execute_single_query(check_query, (int(category_id),))
         
         if not existing_category:
@@ -78,8 +84,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             parameters.append(body['description'])
         
         if 'parent_id' in body:
+            parent_id = int(body['parent_id']) if body['parent_id'] else None
+            # A category cannot be moved under itself or one of its descendants
+            # (the category_closure trigger enforces the same rule)
+            if creates_cycle(int(category_id), parent_id):
+                return error_response("Category cannot be moved under itself or one of its subcategories", 409)
             update_fields.append("parent_id = %s")
-            parameters.append(int(body['parent_id']) if body['parent_id'] else None)
+            parameters.append(parent_id)
         
         if 'order' in body:
             update_fields.append('"order" = %s')
@@ -107,6 +118,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         """
         
         affected_rows = execute_update(update_query, tuple(parameters))
+        invalidate_record(get_category_cache(), int(category_id), existing_category['slug'], body.get('slug'))
         
         if affected_rows == 0:
             return error_response("Category not found or no changes made", 404)
@@ -133,6 +145,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
     except json.JSONDecodeError:
         return error_response("Invalid JSON in request body", 400)
+    except psycopg2.IntegrityError as e:
+        if getattr(e.diag, 'constraint_name', None) == 'category_hierarchy_cycle':
+            return error_response("Category cannot be moved under itself or one of its subcategories", 409)
+        logger.error(f"Categories update error: {str(e)}")
+        return error_response("Failed to update category", 500, str(e))
     except Exception as e:
         logger.error(f"Categories update error: {str(e)}")
         return error_response("Failed to update category", 500, str(e))
@@ -145,7 +162,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -159,7 +176,7 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'message': message
         })
     }
@@ -176,5 +193,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
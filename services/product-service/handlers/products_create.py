@@ -14,16 +14,19 @@ from datetime import datetime
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_insert, execute_single_query, create_parameter
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Products Create Lambda function - POST /api/v1/products
     """
     try:
-        logger.info(f"Products create request: {json.dumps(event)}")
+        log_request(event, context, 'products_create')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -115,7 +118,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message
         })
@@ -129,7 +132,7 @@ def created_response(data: Any, message: str = "Created successfully") -> Dict[s
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message
         })
@@ -147,5 +150,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
@@ -3,7 +3,6 @@ Products Delete Lambda function with RDS support
 DELETE /api/v1/products/{product_id}
 """
 
-import json
 import logging
 import os
 import sys
@@ -12,16 +11,20 @@ from typing import Dict, Any
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_single_query, execute_delete
+from cache_utils import get_product_cache, invalidate_record
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Products Delete Lambda function - DELETE /api/v1/products/{product_id}
     """
     try:
-        logger.info(f"Products delete request: {json.dumps(event)}")
+        log_request(event, context, 'products_delete')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -43,7 +46,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return error_response("Product ID is required", 400)
         
         # Check if product exists
-        check_query = "SELECT id, name FROM products WHERE id = %s"
+        check_query = "SELECT id, name, slug FROM products WHERE id = %s"
         existing_product = execute_single_query(check_query, (int(product_id),))
         
         if not existing_product:
@@ -52,6 +55,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Delete product from database
         delete_query = "DELETE FROM products WHERE id = %s"
         affected_rows = execute_delete(delete_query, (int(product_id),))
+        invalidate_record(get_product_cache(), int(product_id), existing_product['slug'])
         
         if affected_rows == 0:
             return error_response("Product not found or could not be deleted", 404)
@@ -70,7 +74,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -84,7 +88,7 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'message': message
         })
     }
@@ -101,5 +105,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
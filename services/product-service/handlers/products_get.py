@@ -1,9 +1,9 @@
 """
 Products Get Lambda function with RDS support
 GET /api/v1/products/{product_id}
+GET /api/v1/products/by-slug/{slug}
 """
 
-import json
 import logging
 import os
 import boto3
@@ -13,16 +13,22 @@ import sys
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_single_query, create_parameter
+from cache_utils import get_product_cache, cache_records, slug_key
+from serializers import PRODUCT_COLUMNS, serialize_product
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Products Get Lambda function - GET /api/v1/products/{product_id}
+    Also serves GET /api/v1/products/by-slug/{slug} (unique index on products.slug)
     """
     try:
-        logger.info(f"Products get request: {json.dumps(event)}")
+        log_request(event, context, 'products_get')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -36,43 +42,37 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'body': ''
             }
         
-        # Get product ID from path parameters
+        # Get product ID or slug from path parameters
         path_parameters = event.get('pathParameters') or {}
         product_id = path_parameters.get('product_id')
+        slug = path_parameters.get('slug')
         
-        if not product_id:
-            return error_response("Product ID is required", 400)
+        if not product_id and not slug:
+            return error_response("Product ID or slug is required", 400)
         
-        # Query product from database using psycopg2
-        query = """
-            SELECT id, name, slug, description, price, stock, status,
-                   category_id, vendor_id, images, tags, created_at, updated_at
-            FROM products
-            WHERE id = %s
-        """
-
-        parameters = (int(product_id),)
-        product = execute_single_query(query, parameters)
-        
-        if not product:
-            return not_found_response("Product not found")
-        
-        # Convert data types for JSON serialization
-        product['id'] = str(product['id'])
-        product['category_id'] = str(product['category_id'])
-        product['vendor_id'] = str(product['vendor_id'])
-        product['price'] = float(product['price'])
-        if product['created_at']:
-            product['created_at'] = product['created_at'].isoformat()
-        if product['updated_at']:
-            product['updated_at'] = product['updated_at'].isoformat()
-        if product['images'] is None:
-            product['images'] = []
-        if product['tags'] is None:
-            product['tags'] = []
+        # Hot products are served from the in-process cache shared with batch lookups;
+        # entries are keyed by both id and slug
+        cache = get_product_cache()
+        product = cache.get(int(product_id) if product_id else slug_key(slug))
+        if product is None:
+            lookup_column, lookup_value = ('id', int(product_id)) if product_id else ('slug', slug)
+            query = f"""
+                SELECT {PRODUCT_COLUMNS}
+                FROM products
+                WHERE {lookup_column} = %s
+            """
+            row = execute_single_query(query, (lookup_value,))
+            
+            if not row:
+                return not_found_response("Product not found")
+            
+            product = serialize_product(row)
+            cache_records(cache, [product])
         
         return success_response(product, "Product retrieved successfully")
         
+    except ValueError as e:
+        return error_response("Invalid product ID format", 400, str(e))
     except Exception as e:
         logger.error(f"Products get error: {str(e)}")
         return error_response("Failed to retrieve product", 500, str(e))
@@ -85,7 +85,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message
         })
@@ -103,7 +103,7 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
 
 def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
@@ -114,5 +114,5 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({'message': message})
+        'body': json_body({'message': message})
     }
@@ -0,0 +1,128 @@
+"""
+Products Import Lambda function with RDS support
+POST /api/v1/products/import
+"""
+
+import io
+import base64
+import logging
+from typing import Dict, Any
+import sys
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from import_utils import IMPORT_FORMATS, decode_lines, import_products
+from storage_utils import get_object_store
+from cache_utils import get_product_cache
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonlines": "ndjson",
+}
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Products Import Lambda function - POST /api/v1/products/import
+    - Body: CSV (text/csv) or NDJSON (application/x-ndjson) rows
+    - ?object_key=imports/vendor-12.csv reads the file from the object store instead
+    - ?format=csv|ndjson overrides the detected format, ?dry_run=true validates without writing
+    Products are upserted on slug.
+    """
+    try:
+        log_request(event, context, "products_import")
+
+        # Handle CORS
+        if event.get("httpMethod") == "OPTIONS":
+            return {
+                "statusCode": 200,
+                "headers": {
+                    "Access-Control-Allow-Origin": "*",
+                    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+                    "Access-Control-Allow-Methods": "POST, OPTIONS",
+                },
+                "body": "",
+            }
+
+        query_params = event.get("queryStringParameters") or {}
+        headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+        object_key = query_params.get("object_key")
+        dry_run = str(query_params.get("dry_run", "false")).lower() == "true"
+
+        # Resolve the format from ?format, then Content-Type, then the object key extension
+        content_type = (headers.get("content-type") or "").split(";")[0].strip().lower()
+        fmt = query_params.get("format") or CONTENT_TYPE_FORMATS.get(content_type)
+        if not fmt and object_key:
+            fmt = "ndjson" if object_key.endswith((".ndjson", ".jsonl")) else "csv"
+        fmt = (fmt or "csv").lower()
+        if fmt not in IMPORT_FORMATS:
+            return error_response(
+                f"Unsupported format '{fmt}'. Use one of: {', '.join(IMPORT_FORMATS)}", 400
+            )
+
+        # Stream rows from the object store or from the request body
+        if object_key:
+            try:
+                stream = get_object_store().open_object(object_key)
+            except FileNotFoundError:
+                return error_response(f"Object '{object_key}' not found", 404)
+        else:
+            body = event.get("body") or ""
+            if not body:
+                return error_response("Request body or object_key is required", 400)
+            raw = base64.b64decode(body) if event.get("isBase64Encoded") else body.encode("utf-8")
+            stream = io.BytesIO(raw)
+
+        try:
+            result = import_products(decode_lines(stream), fmt, dry_run=dry_run)
+        finally:
+            stream.close()
+
+        if not dry_run and (result["inserted"] or result["updated"]):
+            get_product_cache().clear()
+
+        logger.info(
+            f"Products import: {result['rows_received']} rows, {result['inserted']} inserted, "
+            f"{result['updated']} updated, {result['failed']} failed in {result['duration_ms']} ms"
+        )
+        message = "Products import validated (dry run)" if dry_run else "Products import completed"
+        return success_response(result, message)
+
+    except UnicodeDecodeError as e:
+        return error_response("Import file must be UTF-8 encoded", 400, str(e))
+    except ValueError as e:
+        return error_response("Invalid import request", 400, str(e))
+    except Exception as e:
+        logger.error(f"Products import error: {str(e)}")
+        return error_response("Failed to import products", 500, str(e))
+
+
+def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
+    """Create success response"""
+    return {
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body({"data": data, "message": message}),
+    }
+
+
+def error_response(message: str, status_code: int = 500, error: str = None) -> Dict[str, Any]:
+    """Create error response"""
+    response_data = {"message": message}
+    if error:
+        response_data["error"] = str(error)
+
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(response_data),
+    }
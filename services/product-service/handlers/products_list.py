@@ -3,7 +3,6 @@ Products List Lambda function with RDS support
 GET /api/v1/products
 """
 
-import json
 import logging
 import os
 import boto3
@@ -12,17 +11,41 @@ import sys
 
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
-from db_utils import execute_query, create_parameter
+from batch_utils import parse_id_list, fetch_by_ids
+from cache_utils import get_product_cache
+from serializers import PRODUCT_COLUMNS, serialize_product
+from query_utils import ListSpec, FilterField, fetch_page, parse_datetime
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+PRODUCTS_LIST = ListSpec(
+    table='products',
+    columns=PRODUCT_COLUMNS,
+    filters={
+        'status': FilterField('status', operators=('eq', 'in')),
+        'category_id': FilterField('category_id', int, ('eq', 'in')),
+        'vendor_id': FilterField('vendor_id', int, ('eq', 'in')),
+        'price': FilterField('price', float, ('gte', 'lte', 'gt', 'lt')),
+        'stock': FilterField('stock', int, ('gte', 'lte', 'gt', 'lt')),
+        'created_at': FilterField('created_at', parse_datetime, ('gte', 'lte'))
+    },
+    # Each sort key has a (column, id) index: migrations/list_sort_indexes.sql
+    sort_fields={'created_at': 'created_at', 'price': 'price', 'name': 'name', 'stock': 'stock'},
+    search_columns=('name', 'description'),
+    defaults={'status': 'active'}
+)
+
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Products List Lambda function - GET /api/v1/products
+    GET /api/v1/products?ids=1,2,3 fetches several products in one call
     """
     try:
-        logger.info(f"Products list request: {json.dumps(event)}")
+        log_request(event, context, 'products_list')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -38,61 +61,30 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         # Parse query parameters
         query_params = event.get('queryStringParameters') or {}
-        skip = int(query_params.get('skip', 0))
-        limit = int(query_params.get('limit', 100))
-        category_id = query_params.get('category_id')
-        vendor_id = query_params.get('vendor_id')
-        status = query_params.get('status', 'active')
-        
-        # Build query with filters using psycopg2 parameters
-        where_conditions = ["status = %s"]
-        parameters = [status]
-        
-        if category_id:
-            where_conditions.append("category_id = %s")
-            parameters.append(int(category_id))
-        
-        if vendor_id:
-            where_conditions.append("vendor_id = %s")
-            parameters.append(int(vendor_id))
         
-        where_clause = " AND ".join(where_conditions)
+        # Batch mode: ?ids=1,2,3 returns those products in request order
+        if query_params.get('ids') is not None:
+            ids = parse_id_list(query_params['ids'])
+            products_data, missing_ids = fetch_by_ids(
+                f"SELECT {PRODUCT_COLUMNS} FROM products WHERE id = ANY(%s)",
+                ids, serialize_product, get_product_cache()
+            )
+            return success_response({
+                'products': products_data,
+                'missing_ids': missing_ids,
+                'total': len(products_data)
+            }, f"Retrieved {len(products_data)} of {len(ids)} products")
         
-        # Add pagination parameters
-        parameters.extend([limit, skip])
-        
-        # Query products from database
-        query = f"""
-            SELECT id, name, slug, description, price, stock, status,
-                   category_id, vendor_id, images, tags, created_at, updated_at
-            FROM products
-            WHERE {where_clause}
-            ORDER BY created_at DESC
-            LIMIT %s OFFSET %s
-        """
-
-        products_data = execute_query(query, tuple(parameters))
-
-        # Get total count for pagination (remove limit and offset parameters)
-        count_parameters = parameters[:-2]
-        count_query = f"SELECT COUNT(*) as total FROM products WHERE {where_clause}"
-        count_result = execute_query(count_query, tuple(count_parameters))
-        total_count = int(count_result[0]['total']) if count_result else 0
+        skip = int(query_params.get('skip', 0))
+        limit = int(query_params.get('limit', 100))
         
-        # Convert data types for JSON serialization
-        for product in products_data:
-            product['id'] = str(product['id'])
-            product['category_id'] = str(product['category_id'])
-            product['vendor_id'] = str(product['vendor_id'])
-            product['price'] = float(product['price'])
-            if product['created_at']:
-                product['created_at'] = product['created_at'].isoformat()
-            if product['updated_at']:
-                product['updated_at'] = product['updated_at'].isoformat()
-            if product['images'] is None:
-                product['images'] = []
-            if product['tags'] is None:
-                product['tags'] = []
+        # Filters, search and sort are validated against PRODUCTS_LIST and compiled
+        # into one statement that also returns the total; ?cursor= (a previous page's
+        # next_cursor) switches to a keyset seek that skips the total
+        rows, total_count, list_query = fetch_page(
+            PRODUCTS_LIST, query_params, skip, limit, query_params.get('cursor')
+        )
+        products_data = [serialize_product(row) for row in rows]
         
         return success_response({
             'products': products_data,
@@ -100,13 +92,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'pagination': {
                 'skip': skip,
                 'limit': limit,
-                'has_more': (skip + limit) < total_count
+                'has_more': list_query.has_more,
+                'next_cursor': list_query.next_cursor
             },
-            'filters': {
-                'category_id': category_id,
-                'vendor_id': vendor_id,
-                'status': status
-            }
+            # category_id / vendor_id / status are always reported, as before filters were generic
+            'filters': {'category_id': None, 'vendor_id': None, 'status': None, **list_query.filters},
+            'sort': list_query.sort
         }, f"Retrieved {len(products_data)} products")
         
     except ValueError as e:
@@ -126,7 +117,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Requested-With, X-Amz-Date, X-Api-Key, X-Amz-Security-Token',
             'Access-Control-Allow-Methods': 'GET, OPTIONS'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message
         })
@@ -146,5 +137,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Access-Control-Allow-Headers': 'Content-Type, Authorization, X-Requested-With, X-Amz-Date, X-Api-Key, X-Amz-Security-Token',
             'Access-Control-Allow-Methods': 'GET, OPTIONS'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
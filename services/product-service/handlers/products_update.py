@@ -13,16 +13,20 @@ from typing import Dict, Any
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_single_query, execute_update
+from cache_utils import get_product_cache, invalidate_record
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Products Update Lambda function - PUT /api/v1/products/{product_id}
     """
     try:
-        logger.info(f"Products update request: {json.dumps(event)}")
+        log_request(event, context, 'products_update')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -47,7 +51,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         body = json.loads(event.get('body', '{}'))
         
         # Check if product exists
-        check_query = "SELECT id FROM products WHERE id = %s"
+        check_query = "SELECT id, slug FROM products WHERE id = %s"
         existing_product = execute_single_query(check_query, (int(product_id),))
         
         if not existing_product:
@@ -115,6 +119,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         """
         
         affected_rows = execute_update(update_query, tuple(parameters))
+        invalidate_record(get_product_cache(), int(product_id), existing_product['slug'], body.get('slug'))
         
         if affected_rows == 0:
             return error_response("Product not found or no changes made", 404)
@@ -159,7 +164,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -173,7 +178,7 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'message': message
         })
     }
@@ -190,5 +195,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
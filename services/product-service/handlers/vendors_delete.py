@@ -3,7 +3,6 @@ Vendors Delete Lambda function with RDS support
 DELETE /api/v1/vendors/{vendor_id}
 """
 
-import json
 import logging
 import os
 import sys
@@ -12,16 +11,19 @@ from typing import Dict, Any
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_single_query, execute_delete
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Vendors Delete Lambda function - DELETE /api/v1/vendors/{vendor_id}
     """
     try:
-        logger.info(f"Vendors delete request: {json.dumps(event)}")
+        log_request(event, context, 'vendors_delete')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -78,7 +80,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -92,7 +94,7 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'message': message
         })
     }
@@ -109,5 +111,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
@@ -3,7 +3,6 @@ Vendors Get Lambda function with RDS support
 GET /api/v1/vendors/{vendor_id}
 """
 
-import json
 import logging
 import os
 import boto3
@@ -13,16 +12,19 @@ import sys
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_single_query, create_parameter
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Vendors Get Lambda function - GET /api/v1/vendors/{vendor_id}
     """
     try:
-        logger.info(f"Vendors get request: {json.dumps(event)}")
+        log_request(event, context, 'vendors_get')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -84,7 +86,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message,
         })
@@ -102,7 +104,7 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
 
 def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
@@ -113,5 +115,5 @@ def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({'message': message})
+        'body': json_body({'message': message})
     }
@@ -3,7 +3,6 @@ Vendors List Lambda function with RDS support
 GET /api/v1/vendors
 """
 
-import json
 import logging
 import os
 import boto3
@@ -13,16 +12,22 @@ import sys
 # Add parent directory to path to import db_utils
 sys.path.append('/var/task')
 from db_utils import execute_query
+from batch_utils import parse_id_list, fetch_by_ids
+from serializers import VENDOR_COLUMNS, serialize_vendor
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Vendors List Lambda function - GET /api/v1/vendors
+    GET /api/v1/vendors?ids=1,2,3 fetches several vendors in one call
     """
     try:
-        logger.info(f"Vendors list request: {json.dumps(event)}")
+        log_request(event, context, 'vendors_list')
         
         # Handle CORS
         if event.get('httpMethod') == 'OPTIONS':
@@ -36,6 +41,20 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'body': ''
             }
         
+        # Batch mode: ?ids=1,2,3 returns those vendors in request order
+        query_params = event.get('queryStringParameters') or {}
+        if query_params.get('ids') is not None:
+            ids = parse_id_list(query_params['ids'])
+            vendors_data, missing_ids = fetch_by_ids(
+                f"SELECT {VENDOR_COLUMNS} FROM vendors WHERE id = ANY(%s)",
+                ids, serialize_vendor
+            )
+            return success_response({
+                'vendors': vendors_data,
+                'missing_ids': missing_ids,
+                'total': len(vendors_data)
+            }, f"Retrieved {len(vendors_data)} of {len(ids)} vendors")
+        
         # Query vendors from database
         query = """
             SELECT id, name, email, phone, address, description, is_active, 
@@ -66,6 +85,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'total': len(vendors_data)
         }, f"Retrieved {len(vendors_data)} vendors")
         
+    except ValueError as e:
+        return error_response("Invalid query parameters", 400, str(e))
     except Exception as e:
         logger.error(f"Vendors list error: {str(e)}")
         return error_response("Failed to retrieve vendors", 500, str(e))
@@ -78,7 +99,7 @@ def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': json_body({
             'data': data,
             'message': message
         })
@@ -96,5 +117,5 @@ def error_response(message: str, status_code: int = 500, error: str = None) -> D
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps(response_data)
+        'body': json_body(response_data)
     }
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Vendors Stats Lambda function with RDS support
+GET /api/v1/vendors/{vendor_id}/stats
+"""
+
+import logging
+from typing import Dict, Any
+import sys
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from vendor_stats_utils import get_vendor_stats_config, get_vendor_stats
+from timing_utils import timed_handler, json_body
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Vendors Stats Lambda function - GET /api/v1/vendors/{vendor_id}/stats
+    Sales by day, top products and stock-outs, read from the daily rollups
+    """
+    try:
+        log_request(event, context, "vendors_stats")
+
+        # Handle CORS
+        if event.get("httpMethod") == "OPTIONS":
+            return {
+                "statusCode": 200,
+                "headers": {
+                    "Access-Control-Allow-Origin": "*",
+                    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+                    "Access-Control-Allow-Methods": "GET, OPTIONS",
+                },
+                "body": "",
+            }
+
+        # Get vendor ID from path parameters
+        path_parameters = event.get("pathParameters") or {}
+        vendor_id = path_parameters.get("vendor_id")
+
+        if not vendor_id:
+            return error_response("Vendor ID is required", 400)
+
+        config = get_vendor_stats_config()
+        query_params = event.get("queryStringParameters") or {}
+        days = int(query_params.get("days", config["default_days"]))
+        top = int(query_params.get("top", 10))
+        if not 1 <= days <= config["max_days"]:
+            raise ValueError(f"days must be between 1 and {config['max_days']}")
+        if not 1 <= top <= 100:
+            raise ValueError("top must be between 1 and 100")
+
+        # One round trip over the rollup tables; cost does not grow with order history
+        stats = get_vendor_stats(int(vendor_id), days, top)
+        if stats is None:
+            return not_found_response("Vendor not found")
+
+        return success_response(stats, "Vendor stats retrieved successfully")
+
+    except ValueError as e:
+        return error_response("Invalid vendor ID or query parameters", 400, str(e))
+    except Exception as e:
+        logger.error(f"Vendors stats error: {str(e)}")
+        return error_response("Failed to retrieve vendor stats", 500, str(e))
+
+
+def success_response(data: Any, message: str = "Success") -> Dict[str, Any]:
+    """Create success response"""
+    return {
+        "statusCode": 200,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(
+            {
+                "data": data,
+                "message": message,
+            }
+        ),
+    }
+
+
+def error_response(message: str, status_code: int = 500, error: str = None) -> Dict[str, Any]:
+    """Create error response"""
+    response_data = {"message": message}
+    if error:
+        response_data["error"] = str(error)
+
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body(response_data),
+    }
+
+
+def not_found_response(message: str = "Resource not found") -> Dict[str, Any]:
+    """Create not found response"""
+    return {
+        "statusCode": 404,
+        "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*"},
+        "body": json_body({"message": message}),
+    }
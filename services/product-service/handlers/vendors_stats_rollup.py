@@ -0,0 +1,47 @@
+"""
+Vendors Stats Rollup Lambda function with RDS support
+Scheduled (EventBridge) incremental rollup of vendor sales from payments/order_items
+"""
+
+import json
+import logging
+import sys
+from typing import Dict, Any
+
+# Add parent directory to path to import db_utils
+sys.path.append("/var/task")
+from vendor_stats_utils import rollup_vendor_sales
+from timing_utils import timed_handler
+from log_utils import log_request
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Stop starting new batches when less than this much invocation time is left
+MIN_REMAINING_MS = 10000
+
+
+@timed_handler
+def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Vendors Stats Rollup Lambda function - scheduled every few minutes
+    Applies payments and refunds changed since the high-water mark, batch by batch
+    """
+    log_request(event, context, "vendors_stats_rollup")
+
+    totals = {"batches": 0, "payments": 0, "refunds": 0, "vendor_days": 0, "product_days": 0}
+
+    while True:
+        stats = rollup_vendor_sales()
+        totals["batches"] += 1
+        for key in ("payments", "refunds", "vendor_days", "product_days"):
+            totals[key] += stats[key]
+        totals["high_water_mark"] = stats["high_water_mark"]
+
+        if not stats["more"]:
+            break
+        if context is not None and context.get_remaining_time_in_millis() < MIN_REMAINING_MS:
+            break
+
+    logger.info(f"Vendors stats rollup result: {json.dumps(totals)}")
+    return totals
@@ -0,0 +1,142 @@
+"""
+Category hierarchy utilities for Gamarriando Product Service
+
+Ancestors, descendants and subtree products are read through the
+category_closure table (see migrations/category_closure.sql), which stores
+every (ancestor, descendant, depth) pair. Each lookup is one indexed join;
+no recursive CTEs and no per-level queries.
+"""
+
+import os
+from typing import Dict, Any, List, Optional, Tuple
+
+from db_utils import execute_query, execute_single_query
+from serializers import (
+    CATEGORY_COLUMNS,
+    CATEGORY_SOURCE,
+    PRODUCT_COLUMNS,
+    serialize_category,
+    serialize_product,
+)
+
+
+def get_hierarchy_config() -> Dict[str, Any]:
+    """Get hierarchy configuration from environment variables"""
+    return {"subtree_max_limit": int(os.getenv("SUBTREE_PRODUCTS_MAX_LIMIT", "100"))}
+
+
+def get_ancestors(category_id: int) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Return (category, ancestors) with ancestors ordered root first, ready to
+    render as a breadcrumb; None when the category does not exist.
+    """
+    rows = execute_query(
+        f"""
+        SELECT {CATEGORY_COLUMNS}, cc.depth
+        FROM category_closure cc
+        JOIN {CATEGORY_SOURCE} ON c.id = cc.ancestor_id
+        WHERE cc.descendant_id = %s
+        ORDER BY cc.depth DESC
+    """,
+        (category_id,),
+    )
+    if not rows:
+        return None
+    path = [_with_depth(row) for row in rows]
+    return path[-1], path[:-1]
+
+
+def get_descendants(
+    category_id: int, max_depth: Optional[int] = None
+) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Return (category, descendants) ordered by depth, then "order" and name;
+    max_depth=1 gives direct children only. None when the category does not exist.
+    """
+    depth_condition = "AND cc.depth <= %s" if max_depth is not None else ""
+    parameters = (category_id, max_depth) if max_depth is not None else (category_id,)
+    rows = execute_query(
+        f"""
+        SELECT {CATEGORY_COLUMNS}, cc.depth
+        FROM category_closure cc
+        JOIN {CATEGORY_SOURCE} ON c.id = cc.descendant_id
+        WHERE cc.ancestor_id = %s {depth_condition}
+        ORDER BY cc.depth, c."order", c.name
+    """,
+        parameters,
+    )
+    if not rows:
+        return None
+    tree = [_with_depth(row) for row in rows]
+    return tree[0], tree[1:]
+
+
+def get_subtree_products(
+    category_id: int, status: Optional[str], skip: int, limit: int
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Return (products, total) for every product in the category or any of its
+    descendants, newest first. The total comes from a window count in the same query.
+    """
+    status_condition = "AND p.status = %s" if status else ""
+    parameters = [category_id] + ([status] if status else []) + [limit, skip]
+    product_columns = ", ".join(f"p.{column.strip()}" for column in PRODUCT_COLUMNS.split(","))
+    rows = execute_query(
+        f"""
+        SELECT {product_columns}, COUNT(*) OVER () AS total_count
+        FROM category_closure cc
+        JOIN products p ON p.category_id = cc.descendant_id
+        WHERE cc.ancestor_id = %s {status_condition}
+        ORDER BY p.created_at DESC, p.id DESC
+        LIMIT %s OFFSET %s
+    """,
+        tuple(parameters),
+    )
+    if rows:
+        total = int(rows[0]["total_count"])
+    elif skip:
+        # Paged past the end: the window count has no row to ride on
+        total = int(
+            execute_single_query(
+                f"""
+            SELECT COUNT(*) AS total
+            FROM category_closure cc
+            JOIN products p ON p.category_id = cc.descendant_id
+            WHERE cc.ancestor_id = %s {status_condition}
+        """,
+                tuple(parameters[:-2]),
+            )["total"]
+        )
+    else:
+        total = 0
+    for row in rows:
+        row.pop("total_count")
+    return [serialize_product(row) for row in rows], total
+
+
+def category_exists(category_id: int) -> bool:
+    """True when the category exists"""
+    return (
+        execute_single_query("SELECT 1 AS found FROM categories WHERE id = %s", (category_id,))
+        is not None
+    )
+
+
+def creates_cycle(category_id: int, parent_id: Optional[int]) -> bool:
+    """True when parent_id is the category itself or one of its descendants"""
+    if parent_id is None:
+        return False
+    if parent_id == category_id:
+        return True
+    row = execute_single_query(
+        "SELECT 1 AS found FROM category_closure WHERE ancestor_id = %s AND descendant_id = %s",
+        (category_id, parent_id),
+    )
+    return row is not None
+
+
+def _with_depth(row: Dict[str, Any]) -> Dict[str, Any]:
+    depth = row.pop("depth")
+    category = serialize_category(row)
+    category["depth"] = depth
+    return category
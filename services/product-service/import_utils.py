@@ -0,0 +1,345 @@
+"""
+Bulk product import utilities for Gamarriando Product Service
+
+Rows are parsed from CSV or NDJSON as a stream, checked for shape in Python
+and COPYed in chunks into a temporary staging table. Everything else is set
+based: duplicate slugs and unknown category/vendor references are removed
+from staging with one DELETE each, and the remaining rows are upserted into
+products with a single INSERT ... ON CONFLICT (slug) DO UPDATE.
+"""
+
+import io
+import os
+import csv
+import json
+import time
+import codecs
+import logging
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Tuple
+
+from db_utils import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+STAGING_COLUMNS = (
+    "row_no",
+    "name",
+    "slug",
+    "description",
+    "price",
+    "stock",
+    "status",
+    "category_id",
+    "vendor_id",
+    "images",
+    "tags",
+)
+
+# Values the staging/products columns accept; anything else would fail the COPY
+# (and with it the whole import) instead of being reported for its row
+PRODUCT_STATUSES = ("draft", "active", "inactive", "out_of_stock")
+MAX_PRICE = Decimal("99999999.99")  # DECIMAL(10,2)
+CENT = Decimal("0.01")
+INT4_MAX = 2**31 - 1
+
+
+def get_import_config() -> Dict[str, Any]:
+    """Get bulk import configuration from environment variables"""
+    return {
+        "copy_chunk_rows": int(os.getenv("IMPORT_COPY_CHUNK_ROWS", "5000")),
+        "max_reported_errors": int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "1000")),
+    }
+
+
+class ImportReport:
+    """Per-row errors (capped) and counters for one import"""
+
+    def __init__(self, max_reported_errors: int):
+        self.max_reported_errors = max_reported_errors
+        self.errors: List[Dict[str, Any]] = []
+        self.failed = 0
+        self.received = 0
+
+    def add_error(
+        self, row: int, reason: str, slug: Optional[str] = None, detail: Optional[str] = None
+    ) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_reported_errors:
+            error = {"row": row, "reason": reason}
+            if slug:
+                error["slug"] = slug
+            if detail:
+                error["detail"] = detail
+            self.errors.append(error)
+
+
+def decode_lines(stream) -> Iterator[str]:
+    """Iterate text lines of a binary stream without reading it all into memory"""
+    return iter(codecs.getreader("utf-8-sig")(stream))
+
+
+def iter_records(
+    lines: Iterable[str], fmt: str
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Yield (row number, record, parse error) for each data row; rows are numbered from 1"""
+    if fmt == "csv":
+        for row_no, record in enumerate(csv.DictReader(lines), start=1):
+            yield row_no, record, None
+    elif fmt == "ndjson":
+        row_no = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            row_no += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_no, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield row_no, None, "Each line must be a JSON object"
+                continue
+            yield row_no, record, None
+    else:
+        raise ValueError(
+            f"Unsupported import format '{fmt}'. Use one of: {', '.join(IMPORT_FORMATS)}"
+        )
+
+
+def _parse_list(value: Any, field: str) -> List[Any]:
+    """Lists come as JSON arrays (NDJSON, or CSV cells like '["a","b"]') or 'a|b' CSV cells"""
+    if value is None or value == "":
+        return []
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("["):
+            parsed = json.loads(value)
+            if isinstance(parsed, list):
+                return parsed
+        else:
+            return [part.strip() for part in value.split("|") if part.strip()]
+    raise ValueError(f"Field '{field}' must be a list")
+
+
+def _parse_int(value: Any, field: str) -> int:
+    """An INTEGER column value; out-of-range ids would otherwise abort the COPY"""
+    number = int(value)
+    if not -INT4_MAX - 1 <= number <= INT4_MAX:
+        raise ValueError(f"Field '{field}' is out of range")
+    return number
+
+
+def normalize_record(row_no: int, record: Dict[str, Any]) -> tuple:
+    """Validate one record and return its staging row; raises ValueError with the reason"""
+    for field in ("name", "slug", "price", "category_id", "vendor_id"):
+        if record.get(field) in (None, ""):
+            raise ValueError(f"Field '{field}' is required")
+
+    slug = str(record["slug"]).strip()
+    if len(slug) > 255 or len(str(record["name"])) > 255:
+        raise ValueError("Fields 'name' and 'slug' are limited to 255 characters")
+
+    try:
+        price = Decimal(str(record["price"]))
+    except InvalidOperation:
+        raise ValueError("Field 'price' must be a number")
+    if not price.is_finite():
+        raise ValueError("Field 'price' must be a number")
+    # Rounded the way DECIMAL(10,2) stores it, so 99999999.995 is caught here, not by the COPY
+    price = price.quantize(CENT, rounding=ROUND_HALF_EVEN)
+    if price < 0 or price > MAX_PRICE:
+        raise ValueError("Field 'price' is out of range")
+
+    stock = _parse_int(record.get("stock") or 0, "stock")
+    if stock < 0:
+        raise ValueError("Field 'stock' cannot be negative")
+
+    status = str(record.get("status") or "active").strip()
+    if status not in PRODUCT_STATUSES:
+        raise ValueError(f"Field 'status' must be one of: {', '.join(PRODUCT_STATUSES)}")
+
+    return (
+        row_no,
+        str(record["name"]).strip(),
+        slug,
+        record.get("description") or "",
+        price,
+        stock,
+        status,
+        _parse_int(record["category_id"], "category_id"),
+        _parse_int(record["vendor_id"], "vendor_id"),
+        json.dumps(_parse_list(record.get("images"), "images")),
+        json.dumps(_parse_list(record.get("tags"), "tags")),
+    )
+
+
+def _copy_chunk(cursor, rows: List[tuple]) -> None:
+    """COPY a chunk of staging rows through an in-memory CSV buffer"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY product_import_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
+
+
+def import_products(lines: Iterable[str], fmt: str, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Import products from CSV/NDJSON lines and upsert them on slug.
+    With dry_run the whole import is validated and counted, then rolled back.
+    Returns throughput stats and per-row errors.
+    """
+    config = get_import_config()
+    report = ImportReport(config["max_reported_errors"])
+    timings = {}
+    started = time.perf_counter()
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                CREATE TEMP TABLE product_import_staging (
+                    row_no INTEGER NOT NULL,
+                    name VARCHAR(255) NOT NULL,
+                    slug VARCHAR(255) NOT NULL,
+                    description TEXT,
+                    price DECIMAL(10,2) NOT NULL,
+                    stock INTEGER NOT NULL,
+                    status VARCHAR(50) NOT NULL,
+                    category_id INTEGER NOT NULL,
+                    vendor_id INTEGER NOT NULL,
+                    images JSONB NOT NULL,
+                    tags JSONB NOT NULL
+                ) ON COMMIT DROP
+            """)
+
+            # Parse and stage
+            staged = 0
+            chunk = []
+            for row_no, record, parse_error in iter_records(lines, fmt):
+                report.received += 1
+                if parse_error:
+                    report.add_error(row_no, "invalid_row", detail=parse_error)
+                    continue
+                try:
+                    chunk.append(normalize_record(row_no, record))
+                except (ValueError, TypeError, ArithmeticError) as e:
+                    # ArithmeticError: decimal signals and int(inf) overflow
+                    report.add_error(row_no, "invalid_row", slug=record.get("slug"), detail=str(e))
+                    continue
+                if len(chunk) >= config["copy_chunk_rows"]:
+                    _copy_chunk(cursor, chunk)
+                    staged += len(chunk)
+                    chunk = []
+            if chunk:
+                _copy_chunk(cursor, chunk)
+                staged += len(chunk)
+            timings["stage_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+            # Set-based validation: a later row with the same slug supersedes earlier ones,
+            # and rows pointing at unknown categories/vendors are dropped
+            phase_started = time.perf_counter()
+            cursor.execute("""
+                DELETE FROM product_import_staging s
+                USING product_import_staging later
+                WHERE later.slug = s.slug AND later.row_no > s.row_no
+                RETURNING s.row_no, s.slug
+            """)
+            for row_no, slug in cursor.fetchall():
+                report.add_error(
+                    row_no,
+                    "duplicate_slug",
+                    slug=slug,
+                    detail="Superseded by a later row with the same slug",
+                )
+
+            cursor.execute("""
+                DELETE FROM product_import_staging s
+                WHERE NOT EXISTS (SELECT 1 FROM categories c WHERE c.id = s.category_id)
+                   OR NOT EXISTS (SELECT 1 FROM vendors v WHERE v.id = s.vendor_id)
+                RETURNING s.row_no, s.slug, s.category_id, s.vendor_id,
+                          EXISTS (SELECT 1 FROM categories c WHERE c.id = s.category_id)
+                              AS category_exists
+            """)
+            for row_no, slug, category_id, vendor_id, category_exists in cursor.fetchall():
+                if not category_exists:
+                    report.add_error(
+                        row_no,
+                        "unknown_category",
+                        slug=slug,
+                        detail=f"Category {category_id} does not exist",
+                    )
+                else:
+                    report.add_error(
+                        row_no,
+                        "unknown_vendor",
+                        slug=slug,
+                        detail=f"Vendor {vendor_id} does not exist",
+                    )
+            timings["validate_ms"] = round((time.perf_counter() - phase_started) * 1000, 2)
+
+            # Upsert; rows identical to the stored product are not rewritten
+            phase_started = time.perf_counter()
+            cursor.execute("""
+                WITH upserted AS (
+                    INSERT INTO products (name, slug, description, price, stock, status,
+                                          category_id, vendor_id, images, tags,
+                                          created_at, updated_at)
+                    SELECT name, slug, description, price, stock, status,
+                           category_id, vendor_id, images, tags, NOW(), NOW()
+                    FROM product_import_staging
+                    ORDER BY slug
+                    ON CONFLICT (slug) DO UPDATE SET
+                        name = EXCLUDED.name,
+                        description = EXCLUDED.description,
+                        price = EXCLUDED.price,
+                        stock = EXCLUDED.stock,
+                        status = EXCLUDED.status,
+                        category_id = EXCLUDED.category_id,
+                        vendor_id = EXCLUDED.vendor_id,
+                        images = EXCLUDED.images,
+                        tags = EXCLUDED.tags,
+                        updated_at = NOW()
+                    WHERE (products.name, products.description, products.price, products.stock,
+                           products.status, products.category_id, products.vendor_id,
+                           products.images, products.tags)
+                          IS DISTINCT FROM
+                          (EXCLUDED.name, EXCLUDED.description, EXCLUDED.price, EXCLUDED.stock,
+                           EXCLUDED.status, EXCLUDED.category_id, EXCLUDED.vendor_id,
+                           EXCLUDED.images, EXCLUDED.tags)
+                    RETURNING (xmax = 0) AS inserted
+                )
+                SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted)
+                FROM upserted
+            """)
+            inserted, updated = cursor.fetchone()
+            cursor.execute("SELECT COUNT(*) FROM product_import_staging")
+            valid = cursor.fetchone()[0]
+            timings["upsert_ms"] = round((time.perf_counter() - phase_started) * 1000, 2)
+
+            if dry_run:
+                conn.rollback()
+            else:
+                conn.commit()
+
+    duration = time.perf_counter() - started
+    return {
+        "dry_run": dry_run,
+        "format": fmt,
+        "rows_received": report.received,
+        "rows_staged": staged,
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": valid - inserted - updated,
+        "failed": report.failed,
+        "errors": report.errors,
+        "errors_truncated": report.failed > len(report.errors),
+        "duration_ms": round(duration * 1000, 2),
+        "rows_per_second": round(report.received / duration, 1) if duration > 0 else None,
+        "timings": timings,
+    }
@@ -2,6 +2,8 @@ import json
 import logging
 from typing import Dict, Any, List
 
+from log_utils import log_request
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
@@ -445,7 +447,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     try:
         # Log the incoming event
-        logger.info(f"Received event: {json.dumps(event)}")
+        log_request(event, context, 'lambda_handler')
         
         # Extract HTTP method and path
         http_method = event.get('httpMethod', 'GET')
@@ -2,7 +2,10 @@
 AWS Lambda handler for Gamarriando Product Service
 """
 from mangum import Mangum
-from app.main import app
+from app.main import app, startup
+
+# lifespan is off, so run the (cached) schema check during the Lambda init phase
+startup()
 
 # Create the Lambda handler
 handler = Mangum(app, lifespan="off")
\ No newline at end of file
@@ -0,0 +1,106 @@
+-- Gamarriando Product Service - Category hierarchy closure table
+-- One row per (ancestor, descendant) pair, including each category with itself at
+-- depth 0, so ancestors, descendants and subtree products are single indexed joins.
+-- Maintained by triggers on categories; moves that would create a cycle are rejected.
+-- Run after init_database.sql.
+
+CREATE TABLE IF NOT EXISTS category_closure (
+    ancestor_id INTEGER NOT NULL REFERENCES categories(id) ON DELETE CASCADE,
+    descendant_id INTEGER NOT NULL REFERENCES categories(id) ON DELETE CASCADE,
+    depth INTEGER NOT NULL CHECK (depth >= 0),
+    PRIMARY KEY (ancestor_id, descendant_id)
+);
+
+-- Descendants use the primary key; ancestors (breadcrumbs) use this one
+CREATE INDEX IF NOT EXISTS idx_category_closure_descendant ON category_closure(descendant_id, depth);
+
+-- Reject parent changes that would make a category its own ancestor
+CREATE OR REPLACE FUNCTION category_closure_check_cycle()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.parent_id IS NULL OR NEW.parent_id IS NOT DISTINCT FROM OLD.parent_id THEN
+        RETURN NEW;
+    END IF;
+    -- Serialize hierarchy moves so two concurrent moves cannot build a cycle together
+    PERFORM pg_advisory_xact_lock(hashtext('category_hierarchy'));
+    IF NEW.parent_id = NEW.id OR EXISTS (
+        SELECT 1 FROM category_closure WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id
+    ) THEN
+        RAISE EXCEPTION 'Category % cannot be moved under its own descendant %', NEW.id, NEW.parent_id
+            USING ERRCODE = 'check_violation', CONSTRAINT = 'category_hierarchy_cycle';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS category_closure_check_cycle ON categories;
+CREATE TRIGGER category_closure_check_cycle
+    BEFORE UPDATE OF parent_id ON categories
+    FOR EACH ROW EXECUTE FUNCTION category_closure_check_cycle();
+
+-- Insert: self row plus one row per ancestor of the parent.
+-- Move: detach the subtree from its old ancestors and attach it under the new parent.
+-- Delete needs nothing here: the FKs cascade and children are re-parented to NULL,
+-- which fires the move branch.
+CREATE OR REPLACE FUNCTION category_closure_maintain()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+        SELECT NEW.id, NEW.id, 0
+        UNION ALL
+        SELECT ancestor_id, NEW.id, depth + 1
+        FROM category_closure
+        WHERE descendant_id = NEW.parent_id;
+        RETURN NULL;
+    END IF;
+
+    IF NEW.parent_id IS NOT DISTINCT FROM OLD.parent_id THEN
+        RETURN NULL;
+    END IF;
+
+    DELETE FROM category_closure link
+    USING category_closure subtree, category_closure above
+    WHERE subtree.ancestor_id = NEW.id
+      AND above.descendant_id = NEW.id
+      AND above.ancestor_id <> NEW.id
+      AND link.ancestor_id = above.ancestor_id
+      AND link.descendant_id = subtree.descendant_id;
+
+    IF NEW.parent_id IS NOT NULL THEN
+        INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+        SELECT above.ancestor_id, subtree.descendant_id, above.depth + subtree.depth + 1
+        FROM category_closure above
+        CROSS JOIN category_closure subtree
+        WHERE above.descendant_id = NEW.parent_id
+          AND subtree.ancestor_id = NEW.id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS category_closure_maintain ON categories;
+CREATE TRIGGER category_closure_maintain
+    AFTER INSERT OR UPDATE OF parent_id ON categories
+    FOR EACH ROW EXECUTE FUNCTION category_closure_maintain();
+
+-- Backfill from parent_id (existing cycles, if any, are cut at depth 64)
+INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+    SELECT id, id, 0 FROM categories
+    UNION ALL
+    SELECT t.ancestor_id, c.id, t.depth + 1
+    FROM tree t
+    JOIN categories c ON c.parent_id = t.descendant_id
+    WHERE c.id <> t.ancestor_id AND t.depth < 64
+)
+SELECT ancestor_id, descendant_id, MIN(depth)
+FROM tree
+GROUP BY ancestor_id, descendant_id
+ON CONFLICT (ancestor_id, descendant_id) DO NOTHING;
+
+-- Subtree product listings: products of the closure's descendants, newest first
+CREATE INDEX IF NOT EXISTS idx_products_category_created ON products(category_id, created_at DESC, id DESC);
+
+-- Display summary
+SELECT 'Category closure migration completed successfully!' as status;
@@ -0,0 +1,324 @@
+-- Gamarriando Product Service - Category statistics
+-- Per-category product counts (direct and whole subtree, total and per status) kept
+-- up to date by statement-level triggers on products and row triggers on categories,
+-- so listings read counts with a join instead of COUNT(*) per request.
+-- Run after init_database.sql. Repair drift with: SELECT rebuild_category_stats();
+
+CREATE TABLE IF NOT EXISTS category_stats (
+    -- No FK: the categories delete trigger must still read this row to update ancestors
+    category_id INTEGER PRIMARY KEY,
+    direct_product_count INTEGER NOT NULL DEFAULT 0,
+    subtree_product_count INTEGER NOT NULL DEFAULT 0,
+    direct_status_counts JSONB NOT NULL DEFAULT '{}',   -- {"active": 12, "draft": 3}
+    subtree_status_counts JSONB NOT NULL DEFAULT '{}',
+    child_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Add per-status deltas to a counts object, dropping statuses that reach zero
+CREATE OR REPLACE FUNCTION category_stats_merge(counts JSONB, deltas JSONB)
+RETURNS JSONB AS $$
+    SELECT COALESCE(jsonb_object_agg(key, total) FILTER (WHERE total <> 0), '{}'::jsonb)
+    FROM (
+        SELECT key, SUM(value::integer) AS total
+        FROM (
+            SELECT key, value FROM jsonb_each_text(counts)
+            UNION ALL
+            SELECT key, value FROM jsonb_each_text(deltas)
+        ) entries
+        GROUP BY key
+    ) merged;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Apply product count deltas: (category, status, delta) triples. Direct counts change
+-- on the category itself (when p_direct); subtree counts on it and all its ancestors.
+-- Every affected row is locked first in category_id order, so concurrent writers
+-- touching overlapping subtrees queue up instead of deadlocking.
+CREATE OR REPLACE FUNCTION category_stats_apply(p_category_ids INTEGER[], p_statuses TEXT[],
+                                                p_deltas INTEGER[], p_direct BOOLEAN DEFAULT TRUE)
+RETURNS VOID AS $$
+DECLARE
+    v_affected INTEGER[];
+BEGIN
+    WITH RECURSIVE lineage(category_id, depth) AS (
+        SELECT DISTINCT category_id, 0
+        FROM unnest(p_category_ids) AS d(category_id)
+        WHERE category_id IS NOT NULL
+        UNION ALL
+        SELECT c.parent_id, l.depth + 1
+        FROM lineage l
+        JOIN categories c ON c.id = l.category_id
+        WHERE c.parent_id IS NOT NULL AND l.depth < 64
+    )
+    SELECT array_agg(DISTINCT category_id) INTO v_affected FROM lineage;
+
+    PERFORM 1 FROM category_stats
+    WHERE category_id = ANY(v_affected)
+    ORDER BY category_id
+    FOR UPDATE;
+
+    IF p_direct THEN
+        WITH delta AS (
+            SELECT category_id, status, SUM(delta)::integer AS delta
+            FROM unnest(p_category_ids, p_statuses, p_deltas) AS d(category_id, status, delta)
+            WHERE category_id IS NOT NULL
+            GROUP BY category_id, status
+        ), direct AS (
+            SELECT category_id, SUM(delta)::integer AS total, jsonb_object_agg(status, delta) AS by_status
+            FROM delta
+            GROUP BY category_id
+        )
+        UPDATE category_stats s
+        SET direct_product_count = s.direct_product_count + d.total,
+            direct_status_counts = category_stats_merge(s.direct_status_counts, d.by_status),
+            updated_at = NOW()
+        FROM direct d
+        WHERE s.category_id = d.category_id;
+    END IF;
+
+    WITH RECURSIVE delta AS (
+        SELECT category_id, status, SUM(delta)::integer AS delta
+        FROM unnest(p_category_ids, p_statuses, p_deltas) AS d(category_id, status, delta)
+        WHERE category_id IS NOT NULL
+        GROUP BY category_id, status
+    ), lineage(category_id, ancestor_id, depth) AS (
+        SELECT DISTINCT category_id, category_id, 0 FROM delta
+        UNION ALL
+        SELECT l.category_id, c.parent_id, l.depth + 1
+        FROM lineage l
+        JOIN categories c ON c.id = l.ancestor_id
+        WHERE c.parent_id IS NOT NULL AND l.depth < 64
+    ), subtree AS (
+        SELECT l.ancestor_id AS category_id, d.status, SUM(d.delta)::integer AS delta
+        FROM lineage l
+        JOIN delta d ON d.category_id = l.category_id
+        GROUP BY l.ancestor_id, d.status
+    ), totals AS (
+        SELECT category_id, SUM(delta)::integer AS total, jsonb_object_agg(status, delta) AS by_status
+        FROM subtree
+        GROUP BY category_id
+    )
+    UPDATE category_stats s
+    SET subtree_product_count = s.subtree_product_count + t.total,
+        subtree_status_counts = category_stats_merge(s.subtree_status_counts, t.by_status),
+        updated_at = NOW()
+    FROM totals t
+    WHERE s.category_id = t.category_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Products: statement-level triggers with transition tables, so a bulk import of
+-- thousands of rows updates each affected category once
+CREATE OR REPLACE FUNCTION category_stats_products_changed()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_ids INTEGER[];
+    v_statuses TEXT[];
+    v_deltas INTEGER[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(category_id), array_agg(status), array_agg(delta)
+        INTO v_ids, v_statuses, v_deltas
+        FROM (
+            SELECT category_id, COALESCE(status, 'unknown')::text AS status, COUNT(*)::integer AS delta
+            FROM new_rows WHERE category_id IS NOT NULL GROUP BY 1, 2
+        ) d;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(category_id), array_agg(status), array_agg(delta)
+        INTO v_ids, v_statuses, v_deltas
+        FROM (
+            SELECT category_id, COALESCE(status, 'unknown')::text AS status, -COUNT(*)::integer AS delta
+            FROM old_rows WHERE category_id IS NOT NULL GROUP BY 1, 2
+        ) d;
+    ELSE
+        SELECT array_agg(category_id), array_agg(status), array_agg(delta)
+        INTO v_ids, v_statuses, v_deltas
+        FROM (
+            SELECT category_id, status, SUM(delta)::integer AS delta
+            FROM (
+                SELECT category_id, COALESCE(status, 'unknown')::text AS status, 1 AS delta FROM new_rows
+                UNION ALL
+                SELECT category_id, COALESCE(status, 'unknown')::text AS status, -1 AS delta FROM old_rows
+            ) changes
+            WHERE category_id IS NOT NULL
+            GROUP BY 1, 2
+            HAVING SUM(delta) <> 0
+        ) d;
+    END IF;
+
+    IF v_ids IS NOT NULL THEN
+        PERFORM category_stats_apply(v_ids, v_statuses, v_deltas, TRUE);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS category_stats_products_insert ON products;
+CREATE TRIGGER category_stats_products_insert
+    AFTER INSERT ON products
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION category_stats_products_changed();
+
+DROP TRIGGER IF EXISTS category_stats_products_update ON products;
+CREATE TRIGGER category_stats_products_update
+    AFTER UPDATE ON products
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION category_stats_products_changed();
+
+DROP TRIGGER IF EXISTS category_stats_products_delete ON products;
+CREATE TRIGGER category_stats_products_delete
+    AFTER DELETE ON products
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION category_stats_products_changed();
+
+-- Add (p_sign = 1) or remove (p_sign = -1) a subtree's per-status counts on a
+-- category and all of its ancestors
+CREATE OR REPLACE FUNCTION category_stats_shift(p_category_id INTEGER, p_counts JSONB, p_sign INTEGER)
+RETURNS VOID AS $$
+BEGIN
+    IF p_category_id IS NULL OR p_counts IS NULL OR p_counts = '{}'::jsonb THEN
+        RETURN;
+    END IF;
+    PERFORM category_stats_apply(
+        ARRAY(SELECT p_category_id FROM jsonb_each_text(p_counts) ORDER BY key),
+        ARRAY(SELECT key FROM jsonb_each_text(p_counts) ORDER BY key),
+        ARRAY(SELECT p_sign * value::integer FROM jsonb_each_text(p_counts) ORDER BY key),
+        FALSE
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Categories: keep one stats row per category and child counts, and move subtree
+-- counts between ancestors when a category is re-parented or deleted
+CREATE OR REPLACE FUNCTION category_stats_categories_changed()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_counts JSONB;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO category_stats (category_id) VALUES (NEW.id) ON CONFLICT (category_id) DO NOTHING;
+        UPDATE category_stats SET child_count = child_count + 1, updated_at = NOW()
+        WHERE category_id = NEW.parent_id;
+        RETURN NULL;
+    END IF;
+
+    SELECT subtree_status_counts INTO v_counts FROM category_stats WHERE category_id = OLD.id;
+
+    IF TG_OP = 'DELETE' THEN
+        -- Runs BEFORE DELETE, while the ancestor chain is intact. The stats row goes
+        -- away here, so the ON DELETE SET NULL cascades on products and child
+        -- categories that follow only touch rows that no longer exist.
+        UPDATE category_stats SET child_count = child_count - 1, updated_at = NOW()
+        WHERE category_id = OLD.parent_id;
+        PERFORM category_stats_shift(OLD.parent_id, v_counts, -1);
+        DELETE FROM category_stats WHERE category_id = OLD.id;
+        RETURN OLD;
+    END IF;
+
+    -- AFTER UPDATE OF parent_id
+    IF NEW.parent_id IS DISTINCT FROM OLD.parent_id THEN
+        UPDATE category_stats SET child_count = child_count - 1, updated_at = NOW()
+        WHERE category_id = OLD.parent_id;
+        UPDATE category_stats SET child_count = child_count + 1, updated_at = NOW()
+        WHERE category_id = NEW.parent_id;
+        PERFORM category_stats_shift(OLD.parent_id, v_counts, -1);
+        PERFORM category_stats_shift(NEW.parent_id, v_counts, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS category_stats_categories_changed ON categories;
+CREATE TRIGGER category_stats_categories_changed
+    AFTER INSERT OR UPDATE OF parent_id ON categories
+    FOR EACH ROW EXECUTE FUNCTION category_stats_categories_changed();
+
+DROP TRIGGER IF EXISTS category_stats_categories_deleted ON categories;
+CREATE TRIGGER category_stats_categories_deleted
+    BEFORE DELETE ON categories
+    FOR EACH ROW EXECUTE FUNCTION category_stats_categories_changed();
+
+-- Recompute every row from scratch (drift repair). Returns the number of rows that changed.
+CREATE OR REPLACE FUNCTION rebuild_category_stats()
+RETURNS INTEGER AS $$
+DECLARE
+    v_changed INTEGER;
+BEGIN
+    -- Serialize with the triggers so counts cannot move while they are recomputed
+    LOCK TABLE category_stats IN EXCLUSIVE MODE;
+
+    DELETE FROM category_stats s WHERE NOT EXISTS (SELECT 1 FROM categories c WHERE c.id = s.category_id);
+
+    WITH RECURSIVE tree(ancestor_id, category_id, depth) AS (
+        SELECT id, id, 0 FROM categories
+        UNION ALL
+        SELECT t.ancestor_id, c.id, t.depth + 1
+        FROM tree t
+        JOIN categories c ON c.parent_id = t.category_id
+        WHERE t.depth < 64
+    ), direct_by_status AS (
+        SELECT category_id, COALESCE(status, 'unknown')::text AS status, COUNT(*)::integer AS total
+        FROM products
+        WHERE category_id IS NOT NULL
+        GROUP BY 1, 2
+    ), direct AS (
+        SELECT category_id, SUM(total)::integer AS total, jsonb_object_agg(status, total) AS by_status
+        FROM direct_by_status
+        GROUP BY category_id
+    ), subtree_by_status AS (
+        SELECT t.ancestor_id AS category_id, d.status, SUM(d.total)::integer AS total
+        FROM tree t
+        JOIN direct_by_status d ON d.category_id = t.category_id
+        GROUP BY 1, 2
+    ), subtree AS (
+        SELECT category_id, SUM(total)::integer AS total, jsonb_object_agg(status, total) AS by_status
+        FROM subtree_by_status
+        GROUP BY category_id
+    ), children AS (
+        SELECT parent_id AS category_id, COUNT(*)::integer AS total
+        FROM categories
+        WHERE parent_id IS NOT NULL
+        GROUP BY parent_id
+    ), computed AS (
+        SELECT c.id AS category_id,
+               COALESCE(d.total, 0) AS direct_product_count,
+               COALESCE(s.total, 0) AS subtree_product_count,
+               COALESCE(d.by_status, '{}'::jsonb) AS direct_status_counts,
+               COALESCE(s.by_status, '{}'::jsonb) AS subtree_status_counts,
+               COALESCE(ch.total, 0) AS child_count
+        FROM categories c
+        LEFT JOIN direct d ON d.category_id = c.id
+        LEFT JOIN subtree s ON s.category_id = c.id
+        LEFT JOIN children ch ON ch.category_id = c.id
+    ), upserted AS (
+        INSERT INTO category_stats (category_id, direct_product_count, subtree_product_count,
+                                    direct_status_counts, subtree_status_counts, child_count, updated_at)
+        SELECT category_id, direct_product_count, subtree_product_count,
+               direct_status_counts, subtree_status_counts, child_count, NOW()
+        FROM computed
+        ON CONFLICT (category_id) DO UPDATE SET
+            direct_product_count = EXCLUDED.direct_product_count,
+            subtree_product_count = EXCLUDED.subtree_product_count,
+            direct_status_counts = EXCLUDED.direct_status_counts,
+            subtree_status_counts = EXCLUDED.subtree_status_counts,
+            child_count = EXCLUDED.child_count,
+            updated_at = NOW()
+        WHERE (category_stats.direct_product_count, category_stats.subtree_product_count,
+               category_stats.direct_status_counts, category_stats.subtree_status_counts,
+               category_stats.child_count)
+              IS DISTINCT FROM
+              (EXCLUDED.direct_product_count, EXCLUDED.subtree_product_count,
+               EXCLUDED.direct_status_counts, EXCLUDED.subtree_status_counts,
+               EXCLUDED.child_count)
+        RETURNING 1
+    )
+    SELECT COUNT(*) INTO v_changed FROM upserted;
+    RETURN v_changed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill
+SELECT rebuild_category_stats() AS category_stats_rows_written;
+
+-- Display summary
+SELECT 'Category stats migration completed successfully!' as status;
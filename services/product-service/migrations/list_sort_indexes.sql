@@ -0,0 +1,22 @@
+-- Gamarriando Product Service - Indexes behind the product list sort keys
+-- Every key in PRODUCTS_LIST.sort_fields has a (column, id) index. List queries
+-- order by the key and then id, so "ORDER BY price, id LIMIT n" and the keyset seek
+-- "(price, id) > (x, y)" are index range scans instead of a sort of every match,
+-- and rows sharing a price keep a stable order across pages.
+-- Run after init_database.sql with psql (CONCURRENTLY cannot run inside a transaction).
+
+-- Row comparisons never match NULL, so sort columns must be NOT NULL for cursors to
+-- reach every row; both columns already have defaults
+UPDATE products SET stock = 0 WHERE stock IS NULL;
+UPDATE products SET created_at = NOW() WHERE created_at IS NULL;
+ALTER TABLE products ALTER COLUMN stock SET NOT NULL;
+ALTER TABLE products ALTER COLUMN created_at SET NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_price_id ON products(price, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_name_id ON products(name, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_stock_id ON products(stock, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_products_created_at_id ON products(created_at, id);
+
+-- Superseded by the composite indexes above, which serve the same lookups
+DROP INDEX CONCURRENTLY IF EXISTS idx_products_price;
+DROP INDEX CONCURRENTLY IF EXISTS idx_products_created_at;
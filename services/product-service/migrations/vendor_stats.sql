@@ -0,0 +1,77 @@
+-- Gamarriando Product Service - Vendor dashboard rollups
+-- Per-vendor and per-product daily sales, filled incrementally from payments, refund
+-- transactions and order_items
+-- by the vendors_stats_rollup scheduled Lambda. GET /api/v1/vendors/{id}/stats reads only
+-- these tables (plus a partial index for stock-outs), never the order history.
+-- Run after init_database.sql and the payment service's payment_tables.sql.
+
+CREATE TABLE IF NOT EXISTS vendor_daily_sales (
+    vendor_id INTEGER NOT NULL,
+    day DATE NOT NULL,
+    orders_count INTEGER NOT NULL DEFAULT 0,
+    units_sold INTEGER NOT NULL DEFAULT 0,
+    gross_revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    refunds_count INTEGER NOT NULL DEFAULT 0,
+    refunded_units INTEGER NOT NULL DEFAULT 0,
+    refunded_amount DECIMAL(14,2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (vendor_id, day)
+);
+
+CREATE TABLE IF NOT EXISTS vendor_product_daily_sales (
+    vendor_id INTEGER NOT NULL,
+    day DATE NOT NULL,
+    product_id INTEGER NOT NULL,
+    units_sold INTEGER NOT NULL DEFAULT 0,
+    revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+    refunded_units INTEGER NOT NULL DEFAULT 0,
+    refunded_amount DECIMAL(14,2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (vendor_id, day, product_id)
+);
+
+-- Which payments have had their sale rolled up (state is the status at that time),
+-- so re-scanning an overlapping window never counts a sale twice
+CREATE TABLE IF NOT EXISTS vendor_rollup_payments (
+    payment_id INTEGER PRIMARY KEY,
+    state VARCHAR(50) NOT NULL,
+    rolled_up_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Which completed refund transactions have been rolled up; partial refunds are booked
+-- by their actual amount, so refunds are tracked per transaction, not per payment state
+CREATE TABLE IF NOT EXISTS vendor_rollup_refunds (
+    transaction_id INTEGER PRIMARY KEY,
+    rolled_up_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Refunds already booked through the old payment-state rollup must not be counted again
+INSERT INTO vendor_rollup_refunds (transaction_id)
+SELECT t.id
+FROM transactions t
+JOIN vendor_rollup_payments l ON l.payment_id = t.payment_id AND l.state = 'refunded'
+WHERE t.transaction_type = 'refund' AND t.status = 'completed'
+ON CONFLICT (transaction_id) DO NOTHING;
+
+-- High-water marks of incremental batch jobs
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    name VARCHAR(100) PRIMARY KEY,
+    high_water_mark TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_run_at TIMESTAMP WITH TIME ZONE,
+    last_run_rows INTEGER
+);
+
+INSERT INTO rollup_watermarks (name, high_water_mark)
+VALUES ('vendor_sales', 'epoch')
+ON CONFLICT (name) DO NOTHING;
+
+-- The rollup scans payments changed since the high-water mark
+CREATE INDEX IF NOT EXISTS idx_payments_updated_at ON payments(updated_at);
+CREATE INDEX IF NOT EXISTS idx_transactions_completed_refunds ON transactions(updated_at)
+    WHERE transaction_type = 'refund' AND status = 'completed';
+
+-- Stock-out list for the dashboard
+CREATE INDEX IF NOT EXISTS idx_products_vendor_stockout ON products(vendor_id, updated_at DESC) WHERE stock <= 0;
+
+-- Display summary
+SELECT 'Vendor stats migration completed successfully!' as status;
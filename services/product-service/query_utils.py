@@ -0,0 +1,370 @@
+"""
+List query utilities for Gamarriando Product Service
+
+A list endpoint declares in a ListSpec what may be filtered, searched and
+sorted. Request parameters are validated against that whitelist and compiled
+into one statement that returns the page and, through COUNT(*) OVER (), the
+total. The SQL text depends only on which filters are present (the filter
+shape), so it is compiled once per shape and cached; values always travel as
+parameters.
+
+Sorts always end with the spec's tiebreaker (id), so the order is total: offset
+pages never repeat or skip rows that share a sort value, and the last row of a
+page is a keyset cursor. With ?cursor=... the next page is read as
+"(column, id) > (value, id) ORDER BY column, id LIMIT n", which a (column, id)
+index answers with a range scan whatever the page depth; sort_fields should
+therefore only list columns that have such an index.
+
+Query string syntax:
+    ?status=active                 equality
+    ?price__gte=10&price__lt=50    comparison (ne, gt, gte, lt, lte)
+    ?status__in=draft,active       any of a comma-separated list
+    ?name__contains=polo           case-insensitive substring
+    ?search=polo                   ILIKE over the spec's search columns
+    ?sort_by=price&sort_order=desc sort on a whitelisted key
+    ?cursor=<next_cursor>          keyset page after a previous page's last row
+"""
+
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Callable
+
+from db_utils import execute_query, execute_single_query
+
+OPERATORS = {
+    "eq": "{column} = %s",
+    "ne": "{column} <> %s",
+    "gt": "{column} > %s",
+    "gte": "{column} >= %s",
+    "lt": "{column} < %s",
+    "lte": "{column} <= %s",
+    "in": "{column} = ANY(%s)",
+    "contains": "{column} ILIKE %s",
+}
+
+SORT_ORDERS = ("asc", "desc")
+
+
+def parse_bool(value: str) -> bool:
+    """Parse true/false query string values"""
+    lowered = value.strip().lower()
+    if lowered in ("true", "1", "yes"):
+        return True
+    if lowered in ("false", "0", "no"):
+        return False
+    raise ValueError(f"invalid boolean '{value}'")
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse ISO 8601 timestamps, including a trailing Z"""
+    return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input matches literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class FilterField:
+    """A filterable parameter: its column, value parser and allowed operators"""
+
+    def __init__(
+        self, column: str, parse: Callable[[str], Any] = str, operators: Sequence[str] = ("eq",)
+    ):
+        unknown = set(operators) - set(OPERATORS)
+        if unknown:
+            raise ValueError(f"Unknown operators for {column}: {sorted(unknown)}")
+        self.column = column
+        self.parse = parse
+        self.operators = tuple(operators)
+
+
+class ListSpec:
+    """
+    What a list endpoint may filter, search and sort on. `defaults` are filter
+    values applied when the request does not set that parameter at all;
+    `base_conditions` are fixed SQL conditions (no parameters). `tiebreaker`
+    is a unique column appended to every sort; each sort field should have a
+    (column, tiebreaker) index.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        columns: str,
+        filters: Dict[str, FilterField],
+        sort_fields: Dict[str, str],
+        default_sort: Tuple[str, str] = ("created_at", "desc"),
+        search_columns: Sequence[str] = (),
+        base_conditions: Sequence[str] = (),
+        defaults: Optional[Dict[str, str]] = None,
+        tiebreaker: str = "id",
+    ):
+        if default_sort[1] not in SORT_ORDERS:
+            raise ValueError(f"Invalid default sort order '{default_sort[1]}'")
+        self.table = table
+        self.columns = columns
+        self.filters = filters
+        self.sort_fields = sort_fields
+        self.default_sort = default_sort
+        self.search_columns = tuple(search_columns)
+        self.base_conditions = tuple(base_conditions)
+        self.defaults = defaults or {}
+        self.tiebreaker = tiebreaker
+
+
+class ListQuery:
+    """A compiled list statement, its parameters and what was applied"""
+
+    def __init__(
+        self,
+        sql: str,
+        count_sql: str,
+        parameters: List[Any],
+        filters: Dict[str, Any],
+        sort: Dict[str, str],
+        order: Optional[Tuple[str, str]] = None,
+        keyset: bool = False,
+    ):
+        self.sql = sql
+        self.count_sql = count_sql
+        self.parameters = parameters
+        self.filters = filters
+        self.sort = sort
+        self.order = order
+        self.keyset = keyset
+        # Set by fetch_page
+        self.has_more = False
+        self.next_cursor = None
+
+
+def parse_filters(spec: ListSpec, params: Dict[str, Any]) -> List[Tuple[str, str, str, Any]]:
+    """
+    Validate request parameters against the spec and return
+    (parameter, column, operator, value) tuples in a stable order.
+    String values are parsed with the field's parser; already-typed values
+    (FastAPI callers) pass through, and a list given for equality means 'in'.
+    Parameters that are not filters (skip, limit, ids, ...) are ignored.
+    """
+    present = set()
+    conditions = []
+    for key, raw in (params or {}).items():
+        name, _, operator = key.partition("__")
+        field = spec.filters.get(name)
+        if field is None:
+            continue
+        present.add(name)
+        if raw is None or raw == "":
+            continue
+        operator = operator or "eq"
+        if operator == "eq" and isinstance(raw, (list, tuple)):
+            operator = "in"
+        if operator not in field.operators:
+            raise ValueError(f"Operator '{operator}' is not allowed for '{name}'")
+        conditions.append((key, field.column, operator, _parse_value(key, field, operator, raw)))
+
+    for name, value in spec.defaults.items():
+        if name not in present:
+            field = spec.filters[name]
+            conditions.append((name, field.column, "eq", _parse_value(name, field, "eq", value)))
+
+    conditions = [condition for condition in conditions if condition[3] != []]
+    return sorted(conditions, key=lambda condition: (condition[1], condition[2]))
+
+
+def _parse_value(key: str, field: FilterField, operator: str, raw: Any) -> Any:
+    try:
+        if operator == "in":
+            items = raw.split(",") if isinstance(raw, str) else raw
+            return [
+                field.parse(item.strip()) if isinstance(item, str) else item
+                for item in items
+                if not (isinstance(item, str) and not item.strip())
+            ]
+        if operator == "contains":
+            return f"%{escape_like(str(raw))}%"
+        return field.parse(raw) if isinstance(raw, str) else raw
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid value for '{key}': {e}")
+
+
+def parse_sort(
+    spec: ListSpec, sort_by: Optional[str], sort_order: Optional[str]
+) -> Tuple[str, str]:
+    """Resolve sort_by/sort_order to a whitelisted (column, direction)"""
+    column = spec.default_sort[0]
+    if sort_by:
+        if sort_by not in spec.sort_fields:
+            raise ValueError(
+                f"Cannot sort by '{sort_by}'; allowed: {', '.join(sorted(spec.sort_fields))}"
+            )
+        column = spec.sort_fields[sort_by]
+    direction = (sort_order or (spec.default_sort[1] if not sort_by else "asc")).lower()
+    if direction not in SORT_ORDERS:
+        raise ValueError(f"Invalid sort_order '{sort_order}'; use asc or desc")
+    return column, direction
+
+
+def sort_keys(spec: ListSpec, order: Tuple[str, str]) -> Tuple[str, ...]:
+    """Columns of the total order: the sort column, then the tiebreaker"""
+    return (order[0],) if order[0] == spec.tiebreaker else (order[0], spec.tiebreaker)
+
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"decimal": str(value)}
+    return value
+
+
+def _row_value(row: Any, column: str) -> Any:
+    return row[column] if isinstance(row, dict) else getattr(row, column)
+
+
+def encode_cursor(spec: ListSpec, order: Tuple[str, str], row: Any) -> str:
+    """Opaque cursor pointing just after `row` (a dict or an ORM object) in this order"""
+    payload = {
+        "sort": list(order),
+        "after": [_cursor_value(_row_value(row, column)) for column in sort_keys(spec, order)],
+    }
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(spec: ListSpec, order: Tuple[str, str], cursor: str) -> List[Any]:
+    """Key values stored in a cursor; it must have been issued for the same sort"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values = payload["after"]
+        matches = tuple(payload["sort"]) == tuple(order)
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+    if not matches:
+        raise ValueError("Cursor was issued for a different sort; request the first page again")
+    if not isinstance(values, list) or len(values) != len(sort_keys(spec, order)):
+        raise ValueError("Invalid cursor")
+    try:
+        return [
+            (
+                parse_datetime(value["datetime"])
+                if isinstance(value, dict) and "datetime" in value
+                else (
+                    Decimal(value["decimal"])
+                    if isinstance(value, dict) and "decimal" in value
+                    else value
+                )
+            )
+            for value in values
+        ]
+    except (ValueError, TypeError, ArithmeticError):
+        raise ValueError("Invalid cursor")
+
+
+@lru_cache(maxsize=256)
+def _compile(
+    spec: ListSpec,
+    shape: Tuple[Tuple[str, str], ...],
+    search: bool,
+    order: Tuple[str, str],
+    keyset: bool,
+) -> Tuple[str, str]:
+    """SQL text for one filter shape; specs are hashed by identity"""
+    where = list(spec.base_conditions)
+    where.extend(OPERATORS[operator].format(column=column) for column, operator in shape)
+    if search:
+        where.append(
+            "(" + " OR ".join(f"{column} ILIKE %s" for column in spec.search_columns) + ")"
+        )
+    count_sql = f"SELECT COUNT(*) AS total FROM {spec.table} WHERE {' AND '.join(where) or 'TRUE'}"
+
+    keys = sort_keys(spec, order)
+    order_by = ", ".join(f"{column} {order[1].upper()}" for column in keys)
+    if keyset:
+        # Row comparison matches the (column, id) index, so the seek is a range scan.
+        # The window total would read every remaining row, so keyset pages skip it.
+        comparison = "<" if order[1] == "desc" else ">"
+        where.append(f"({', '.join(keys)}) {comparison} ({', '.join(['%s'] * len(keys))})")
+        sql = f"""
+        SELECT {spec.columns}
+        FROM {spec.table}
+        WHERE {' AND '.join(where)}
+        ORDER BY {order_by}
+        LIMIT %s
+    """
+    else:
+        sql = f"""
+        SELECT {spec.columns}, COUNT(*) OVER () AS total_count
+        FROM {spec.table}
+        WHERE {' AND '.join(where) or 'TRUE'}
+        ORDER BY {order_by}
+        LIMIT %s OFFSET %s
+    """
+    return sql, count_sql
+
+
+def build_list_query(
+    spec: ListSpec, params: Dict[str, Any], cursor: Optional[str] = None
+) -> ListQuery:
+    """Compile the request's filters, search, sort and optional cursor into a ListQuery"""
+    conditions = parse_filters(spec, params)
+    search = (params.get("search") or "").strip() if spec.search_columns else ""
+    order = parse_sort(spec, params.get("sort_by"), params.get("sort_order"))
+
+    shape = tuple((column, operator) for _, column, operator, _ in conditions)
+    sql, count_sql = _compile(spec, shape, bool(search), order, bool(cursor))
+
+    parameters = [value for _, _, _, value in conditions]
+    if search:
+        parameters.extend([f"%{escape_like(search)}%"] * len(spec.search_columns))
+    if cursor:
+        parameters.extend(decode_cursor(spec, order, cursor))
+    return ListQuery(
+        sql,
+        count_sql,
+        parameters,
+        filters={
+            key: params[key] if key in params else spec.defaults.get(key)
+            for key, _, _, _ in conditions
+        },
+        sort={"sort_by": params.get("sort_by") or spec.default_sort[0], "sort_order": order[1]},
+        order=order,
+        keyset=bool(cursor),
+    )
+
+
+def fetch_page(
+    spec: ListSpec, params: Dict[str, Any], skip: int, limit: int, cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[int], ListQuery]:
+    """
+    Run the compiled list query: returns (rows, total, query) in one round trip.
+    With a cursor, skip is ignored and total is None: the page is a keyset seek
+    and has_more comes from reading one extra row. query.next_cursor resumes
+    after the last row in both modes.
+    """
+    if skip < 0 or limit < 1:
+        raise ValueError("skip must be >= 0 and limit >= 1")
+    query = build_list_query(spec, params, cursor)
+    if query.keyset:
+        rows = execute_query(query.sql, tuple(query.parameters + [limit + 1]))
+        total = None
+        query.has_more = len(rows) > limit
+        rows = rows[:limit]
+    else:
+        rows = execute_query(query.sql, tuple(query.parameters + [limit, skip]))
+        if rows:
+            total = int(rows[0]["total_count"])
+        elif skip:
+            # Paged past the end: the window count has no row to ride on
+            total = int(execute_single_query(query.count_sql, tuple(query.parameters))["total"])
+        else:
+            total = 0
+        for row in rows:
+            row.pop("total_count")
+        query.has_more = skip + len(rows) < total
+    if query.has_more and rows:
+        query.next_cursor = encode_cursor(spec, query.order, rows[-1])
+    return rows, total, query
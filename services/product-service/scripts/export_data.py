@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Export products as NDJSON/CSV using a server-side cursor.
+
+Examples:
+    python scripts/export_data.py products --format csv --status active --output /tmp/products.csv
+    python scripts/export_data.py products --vendor-id 12 \
+        --object-key exports/products/vendor-12.ndjson
+    python scripts/export_data.py products --output - | gzip > products.ndjson.gz
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# Make the service modules importable when run from the repository
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from export_utils import (
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+    build_export_query,
+    iter_export_rows,
+    write_rows,
+    export_dataset,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stream an export of product-service data")
+    parser.add_argument("dataset", choices=sorted(EXPORT_DATASETS))
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--status")
+    parser.add_argument("--date-from", help="Inclusive ISO date/datetime on created_at")
+    parser.add_argument("--date-to", help="Exclusive ISO date/datetime on created_at")
+    parser.add_argument("--category-id")
+    parser.add_argument("--vendor-id")
+    parser.add_argument(
+        "--itersize", type=int, help="Rows fetched per round trip (default EXPORT_ITERSIZE)"
+    )
+    parser.add_argument("--output", help="File path, or '-' for stdout")
+    parser.add_argument("--object-key", help="Upload the export to the object store under this key")
+    args = parser.parse_args()
+
+    filters = {
+        "status": args.status,
+        "date_from": args.date_from,
+        "date_to": args.date_to,
+        "category_id": args.category_id,
+        "vendor_id": args.vendor_id,
+    }
+
+    if args.output == "-":
+        sql, columns, parameters = build_export_query(args.dataset, filters)
+        rows = write_rows(
+            iter_export_rows(sql, parameters, args.itersize), sys.stdout, args.format, columns
+        )
+        print(f"Exported {rows} {args.dataset}", file=sys.stderr)
+        return 0
+
+    result = export_dataset(
+        args.dataset,
+        args.format,
+        filters,
+        path=args.output,
+        object_key=args.object_key,
+        itersize=args.itersize,
+    )
+    print(json.dumps(result, indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
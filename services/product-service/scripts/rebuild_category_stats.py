@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Rebuild the trigger-maintained category_stats table from products/categories.
+
+Examples:
+    python scripts/rebuild_category_stats.py            # repair drift
+    python scripts/rebuild_category_stats.py --dry-run  # only report drifted rows
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# Make the service modules importable when run from the repository
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from stats_utils import rebuild_category_stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Recompute category product counts")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report drifted rows without repairing them"
+    )
+    args = parser.parse_args()
+
+    result = rebuild_category_stats(dry_run=args.dry_run)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
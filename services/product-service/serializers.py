@@ -0,0 +1,89 @@
+"""
+Row serializers for Gamarriando Product Service Lambda handlers
+
+Convert psycopg2 rows (Decimal, datetime, NULL JSON columns) into JSON-ready
+dicts. Shared by the single-item handlers and the batch lookups so cached
+entries have the same shape whichever handler produced them.
+"""
+
+from typing import Dict, Any
+
+PRODUCT_COLUMNS = """id, name, slug, description, price, stock, status,
+                   category_id, vendor_id, images, tags, created_at, updated_at"""
+
+VENDOR_COLUMNS = """id, name, email, phone, address, description, is_active,
+                   is_verified, rating, total_products, created_at, updated_at"""
+
+# Categories are read joined to category_stats (maintained by triggers, see
+# migrations/category_stats.sql), so counts come with the row at no extra query
+CATEGORY_COLUMNS = """c.id, c.name, c.slug, c.description, c.parent_id, c."order", c.is_active,
+                    c.created_at, c.updated_at, s.direct_product_count, s.subtree_product_count,
+                    s.direct_status_counts, s.subtree_status_counts, s.child_count"""
+
+CATEGORY_SOURCE = """categories c LEFT JOIN category_stats s ON s.category_id = c.id"""
+
+CATEGORY_STATS_FIELDS = (
+    "direct_product_count",
+    "subtree_product_count",
+    "direct_status_counts",
+    "subtree_status_counts",
+    "child_count",
+)
+
+
+def serialize_product(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a products row for JSON serialization"""
+    product = dict(product)
+    product["id"] = str(product["id"])
+    product["category_id"] = str(product["category_id"])
+    product["vendor_id"] = str(product["vendor_id"])
+    product["price"] = float(product["price"])
+    if product["created_at"]:
+        product["created_at"] = product["created_at"].isoformat()
+    if product["updated_at"]:
+        product["updated_at"] = product["updated_at"].isoformat()
+    if product["images"] is None:
+        product["images"] = []
+    if product["tags"] is None:
+        product["tags"] = []
+    return product
+
+
+def serialize_vendor(vendor: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a vendors row for JSON serialization"""
+    vendor = dict(vendor)
+    vendor["id"] = str(vendor["id"])
+    if vendor.get("rating") is not None:
+        vendor["rating"] = float(vendor["rating"])
+    if vendor.get("total_products") is not None:
+        vendor["total_products"] = int(vendor["total_products"])
+    if vendor["created_at"]:
+        vendor["created_at"] = vendor["created_at"].isoformat()
+    if vendor["updated_at"]:
+        vendor["updated_at"] = vendor["updated_at"].isoformat()
+    if vendor["address"] is None:
+        vendor["address"] = {}
+    return vendor
+
+
+def serialize_category(category: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a categories row for JSON serialization"""
+    category = dict(category)
+    category["id"] = str(category["id"])
+    if category["parent_id"]:
+        category["parent_id"] = str(category["parent_id"])
+    if category["created_at"]:
+        category["created_at"] = category["created_at"].isoformat()
+    if category["updated_at"]:
+        category["updated_at"] = category["updated_at"].isoformat()
+    # Stats columns are folded into one object; a category without a stats row
+    # (migration not yet applied to it) reports zero counts
+    stats = {field: category.pop(field, None) for field in CATEGORY_STATS_FIELDS}
+    category["stats"] = {
+        "product_count": stats["direct_product_count"] or 0,
+        "subtree_product_count": stats["subtree_product_count"] or 0,
+        "status_counts": stats["direct_status_counts"] or {},
+        "subtree_status_counts": stats["subtree_status_counts"] or {},
+        "subcategory_count": stats["child_count"] or 0,
+    }
+    return category
@@ -0,0 +1,324 @@
+"""
+Slow-query log for Gamarriando Product Service
+
+Opt-in (SLOW_QUERY_LOG=true). Every statement run through db_utils (via its
+DB_HOOKS) or through an instrumented SQLAlchemy engine is fingerprinted: the
+SQL is normalized (literals and placeholders become ?, IN lists collapse) so
+"WHERE id = 7" and "WHERE id = 9" count as the same query. Per fingerprint we
+keep count, total, max and a bounded sample of durations for p50/p95.
+
+Statements slower than SLOW_QUERY_MS are logged with the normalized SQL, the
+parameter types (never the values), duration and rows. A sample of them
+(SLOW_QUERY_EXPLAIN_SAMPLE, at most once per fingerprint every
+SLOW_QUERY_EXPLAIN_INTERVAL seconds) also gets its plan from
+EXPLAIN (ANALYZE, BUFFERS). ANALYZE runs the statement a second time, so only
+SELECTs are explained, inside a savepoint that is rolled back, and only on
+psycopg2 connections.
+
+The stats table is returned by stats_table(), logged by dump_stats() and,
+when SLOW_QUERY_STATS_INTERVAL is set, logged periodically.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("SLOW_QUERY_LOG", "false").lower() == "true"
+THRESHOLD_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+EXPLAIN_SAMPLE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE", "0.1"))
+EXPLAIN_ANALYZE = os.getenv("SLOW_QUERY_EXPLAIN_ANALYZE", "true").lower() == "true"
+EXPLAIN_INTERVAL = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "300"))
+STATS_INTERVAL = float(os.getenv("SLOW_QUERY_STATS_INTERVAL", "0"))
+MAX_FINGERPRINTS = int(os.getenv("SLOW_QUERY_MAX_FINGERPRINTS", "500"))
+# Durations kept per fingerprint for the percentiles; count/total/max are exact
+SAMPLES_PER_FINGERPRINT = 512
+MAX_PLAN_LINES = 80
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|(?<![:\w]):\w+|\$\d+")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalize_sql(sql: str) -> str:
+    """SQL with literals and placeholders replaced by ?, on one line"""
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = " ".join(sql.split())
+    return _IN_LIST.sub("(?, ...)", sql)
+
+
+def _type_name(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Types of the bound parameters, e.g. ['int', 'str', 'list[3]']; values are never kept"""
+    if parameters is None:
+        return None
+    if isinstance(parameters, dict):
+        return {key: _type_name(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_type_name(value) for value in parameters]
+    return _type_name(parameters)
+
+
+def _sql_text(sql: Any, cursor: Any = None) -> str:
+    if hasattr(sql, "as_string") and cursor is not None:
+        return sql.as_string(cursor)
+    if isinstance(sql, bytes):
+        return sql.decode("utf-8", "replace")
+    return str(sql)
+
+
+class QueryStats:
+    """Running statistics of one fingerprint"""
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.count = 0
+        self.slow = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=SAMPLES_PER_FINGERPRINT)
+        self.explained_at = None
+
+    def add(self, elapsed_ms: float, slow: bool) -> None:
+        self.count += 1
+        self.slow += slow
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.samples.append(elapsed_ms)
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+    def as_dict(self, fingerprint: str) -> Dict[str, Any]:
+        return {
+            "fingerprint": fingerprint,
+            "sql": self.sql[:500],
+            "count": self.count,
+            "slow": self.slow,
+            "total_ms": round(self.total_ms, 2),
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.5), 2),
+            "p95_ms": round(self.percentile(0.95), 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+_stats: Dict[str, QueryStats] = {}
+_dropped = 0
+_lock = threading.Lock()
+_last_dump = time.monotonic()
+
+
+def fingerprint(normalized_sql: str) -> str:
+    """Short stable id of a normalized statement"""
+    return hashlib.sha1(normalized_sql.encode("utf-8")).hexdigest()[:12]
+
+
+def _explainable(normalized_sql: str) -> bool:
+    return normalized_sql.split(" ", 1)[0].upper() == "SELECT"
+
+
+def explain_plan(connection: Any, sql: str, parameters: Any = None) -> Optional[List[str]]:
+    """
+    EXPLAIN (ANALYZE, BUFFERS) of a SELECT on a psycopg2 connection, run on a
+    plain cursor (not reported to the hooks) inside a savepoint that is always
+    rolled back, so a failing EXPLAIN cannot abort the caller's transaction.
+    None when the connection is not psycopg2 or is not usable.
+    """
+    try:
+        import psycopg2.extensions as extensions
+    except ImportError:
+        return None
+    if not isinstance(connection, extensions.connection):
+        return None
+    if connection.get_transaction_status() not in (
+        extensions.TRANSACTION_STATUS_IDLE,
+        extensions.TRANSACTION_STATUS_INTRANS,
+    ):
+        return None
+
+    options = "ANALYZE, BUFFERS" if EXPLAIN_ANALYZE else "COSTS"
+    savepoint = not connection.autocommit
+    with extensions.cursor(connection) as cursor:
+        if savepoint:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN ({options}) {sql}", parameters)
+            return [row[0] for row in cursor.fetchall()][:MAX_PLAN_LINES]
+        finally:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+
+
+def _should_explain(stats: QueryStats, now: float) -> bool:
+    if random.random() >= EXPLAIN_SAMPLE:
+        return False
+    if stats.explained_at is not None and now - stats.explained_at < EXPLAIN_INTERVAL:
+        return False
+    stats.explained_at = now
+    return True
+
+
+def record(
+    sql: Any,
+    parameters: Any,
+    elapsed_ms: float,
+    rows: Optional[int] = None,
+    cursor: Any = None,
+    source: str = "db_utils",
+    executemany: bool = False,
+) -> None:
+    """Add a statement to the stats; log it (with a sampled plan) when it is slow"""
+    global _dropped
+    try:
+        text = _sql_text(sql, cursor)
+        normalized = normalize_sql(text)
+        key = fingerprint(normalized)
+        slow = elapsed_ms >= THRESHOLD_MS
+        now = time.monotonic()
+        with _lock:
+            stats = _stats.get(key)
+            if stats is None and len(_stats) < MAX_FINGERPRINTS:
+                stats = _stats[key] = QueryStats(normalized)
+            if stats is None:
+                # Table full: the statement still gets its slow log line
+                _dropped += 1
+                explain = False
+            else:
+                stats.add(elapsed_ms, slow)
+                explain = (
+                    slow
+                    and not executemany
+                    and cursor is not None
+                    and _explainable(normalized)
+                    and _should_explain(stats, now)
+                )
+
+        if slow:
+            entry = {
+                "fingerprint": key,
+                "sql": normalized[:1000],
+                "parameters": (
+                    f"{len(parameters)} x {parameter_shape(parameters[0])}"
+                    if executemany and parameters
+                    else parameter_shape(parameters)
+                ),
+                "ms": round(elapsed_ms, 2),
+                "threshold_ms": THRESHOLD_MS,
+                "rows": rows if rows is not None and rows >= 0 else None,
+                "source": source,
+            }
+            if explain:
+                try:
+                    entry["plan"] = explain_plan(
+                        getattr(cursor, "connection", None), text, parameters
+                    )
+                except Exception as e:
+                    entry["plan_error"] = str(e)
+            logger.warning(f"Slow query: {json.dumps(entry, default=str)}")
+
+        if STATS_INTERVAL and now - _last_dump >= STATS_INTERVAL:
+            dump_stats()
+    except Exception as e:
+        # The log must never fail the statement it observes
+        logger.warning(f"Slow query log error: {str(e)}")
+
+
+def on_db_event(
+    event: str,
+    elapsed_ms: float,
+    sql: Any = None,
+    parameters: Any = None,
+    rows: Optional[int] = None,
+    cursor: Any = None,
+    **details,
+) -> None:
+    """db_utils.DB_HOOKS observer"""
+    if event == "query":
+        record(sql, parameters, elapsed_ms, rows, cursor, source="db_utils")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._slow_query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_slow_query_started", None)
+    if started is None:
+        return
+    record(
+        statement,
+        parameters,
+        (time.perf_counter() - started) * 1000,
+        cursor.rowcount,
+        cursor,
+        source="sqlalchemy",
+        executemany=executemany,
+    )
+
+
+def instrument_engine(engine: Any, force: bool = False) -> Any:
+    """
+    Record the statements of a SQLAlchemy Engine (or AsyncEngine, via its
+    sync_engine; plans are only captured for psycopg2). No-op unless enabled.
+    """
+    if not (ENABLED or force):
+        return engine
+    from sqlalchemy import event
+
+    target = getattr(engine, "sync_engine", engine)
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+def stats_table(limit: Optional[int] = 20, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+    """Per-fingerprint stats, heaviest first"""
+    with _lock:
+        rows = [stats.as_dict(key) for key, stats in _stats.items()]
+    rows.sort(key=lambda row: row[order_by], reverse=True)
+    return rows[:limit] if limit else rows
+
+
+def dump_stats(
+    limit: Optional[int] = 20, order_by: str = "total_ms", reset: bool = False
+) -> List[Dict[str, Any]]:
+    """Log the stats table as one JSON line and return it"""
+    global _last_dump
+    table = stats_table(limit, order_by)
+    _last_dump = time.monotonic()
+    summary = {"fingerprints": len(_stats), "dropped": _dropped, "queries": table}
+    logger.warning(f"Query stats: {json.dumps(summary)}")
+    if reset:
+        reset_stats()
+    return table
+
+
+def reset_stats() -> None:
+    """Forget every fingerprint"""
+    global _dropped
+    with _lock:
+        _stats.clear()
+        _dropped = 0
@@ -0,0 +1,46 @@
+"""
+Category statistics utilities for Gamarriando Product Service
+
+category_stats holds direct and subtree product counts (total and per status)
+for every category. Triggers on products and categories keep it current (see
+migrations/category_stats.sql); rebuild_category_stats() recomputes it from
+scratch to repair drift, e.g. after triggers were disabled for a manual load.
+"""
+
+import time
+import logging
+from typing import Dict, Any
+
+from db_utils import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_category_stats(dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Recompute category_stats in one set-based pass and return how many rows
+    had drifted. With dry_run the rebuild is rolled back, so it only reports.
+    """
+    started = time.perf_counter()
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT rebuild_category_stats()")
+            drifted = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM category_stats")
+            total = cursor.fetchone()[0]
+        if dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+
+    if drifted:
+        logger.warning(
+            f"category_stats: {drifted} of {total} rows had drifted"
+            f"{' (dry run, not repaired)' if dry_run else ' and were repaired'}"
+        )
+    return {
+        "dry_run": dry_run,
+        "categories": total,
+        "drifted_rows": drifted,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -1,15 +1,20 @@
+import os
 import pytest
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
-from app.database import get_db, Base
-from app.config import settings
+from app.database import get_async_db, get_db, model_metadata
 
 # Create test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# The same file through the async driver the API endpoints use
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -18,6 +23,54 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# NullPool: every request opens its own connection on the TestClient's event loop
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# N+1 guard: API requests made through the test client may not run more SQL than this
+MAX_QUERIES_PER_REQUEST = int(os.getenv("MAX_QUERIES_PER_REQUEST", "10"))
+
+
+class QueryCounter:
+    """Records every SQL statement executed on any engine while active"""
+
+    def __init__(self):
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(Engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@contextmanager
+def max_queries(limit, label="block"):
+    """Fail the test when the wrapped block executes more than `limit` statements"""
+    with QueryCounter() as counter:
+        yield counter
+    if counter.count > limit:
+        statements = "\n".join(f"  {i}. {sql.strip()}" for i, sql in enumerate(counter.statements, 1))
+        pytest.fail(f"{label} executed {counter.count} SQL statements (limit {limit}), likely N+1:\n{statements}")
+
+
+class QueryCountingClient(TestClient):
+    """TestClient that applies the N+1 guard to every request"""
+
+    max_queries_per_request = MAX_QUERIES_PER_REQUEST
+
+    def request(self, method, url, *args, **kwargs):
+        with max_queries(self.max_queries_per_request, f"{method} {url}"):
+            return super().request(method, url, *args, **kwargs)
+
 
 def override_get_db():
     try:
@@ -27,12 +80,17 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+
 @pytest.fixture(scope="session")
 def db_engine():
     """Create test database engine"""
-    Base.metadata.create_all(bind=engine)
+    model_metadata().create_all(bind=engine)
     yield engine
-    Base.metadata.drop_all(bind=engine)
+    model_metadata().drop_all(bind=engine)
 
 
 @pytest.fixture(scope="function")
@@ -50,12 +108,37 @@ def db_session(db_engine):
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
-    """Create test client"""
-    app.dependency_overrides[get_db] = lambda: db_session
-    with TestClient(app) as test_client:
-        yield test_client
-    app.dependency_overrides.clear()
+def client(db_engine):
+    """
+    Create test client. Both the sync and the async (aiosqlite) session
+    dependencies use the test database, so data committed through
+    TestingSessionLocal is visible to every endpoint. Tables are emptied
+    afterwards.
+    """
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        with QueryCountingClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.clear()
+        with db_engine.begin() as connection:
+            for table in reversed(model_metadata().sorted_tables):
+                connection.execute(table.delete())
+
+
+@pytest.fixture(scope="function")
+def client_session(client):
+    """Session on the test database whose commits are visible to `client` requests"""
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """`with assert_max_queries(2): ...` fails the test if the block runs more statements"""
+    return max_queries
 
 
 @pytest.fixture
@@ -0,0 +1,75 @@
+"""
+Tests for the async endpoints through the test client
+"""
+
+import pytest
+
+from app.models.category import Category, CategoryClosure
+from app.services.async_category_service import AsyncCategoryService
+
+pytest.importorskip("aiosqlite")
+
+
+class TestAsyncSession:
+    """Test that requests run on the test database through get_async_db"""
+
+    def test_created_category_is_listed(self, client):
+        """Test that a write and a later read share the test database"""
+        created = client.post("/api/v1/categories/", json={"name": "Polos", "slug": "polos"})
+
+        assert created.status_code == 200
+        listed = client.get("/api/v1/categories/")
+        assert [category["slug"] for category in listed.json()] == ["polos"]
+
+    def test_committed_rows_are_visible_to_requests(self, client, client_session):
+        """Test that rows committed through client_session reach the endpoints"""
+        client_session.add(Category(name="Casacas", slug="casacas"))
+        client_session.commit()
+
+        assert [category["slug"] for category in client.get("/api/v1/categories/").json()] == [
+            "casacas"
+        ]
+
+
+def category_chain(db, depth):
+    """Categories root > level-1 > ... with their closure rows; returns the deepest id"""
+    categories = [Category(name=f"Level {i}", slug=f"level-{i}") for i in range(depth)]
+    db.add_all(categories)
+    db.flush()
+    for i, category in enumerate(categories):
+        category.parent_id = categories[i - 1].id if i else None
+        db.add_all(
+            CategoryClosure(ancestor_id=ancestor.id, descendant_id=category.id, depth=i - j)
+            for j, ancestor in enumerate(categories[: i + 1])
+        )
+    db.commit()
+    return categories[-1].id
+
+
+class TestQueryBudget:
+    """Test the per-request N+1 guard of the test client"""
+
+    def test_ancestors_take_constant_queries(self, client, client_session):
+        """Test that a breadcrumb deeper than the budget is still fetched in one statement"""
+        leaf_id = category_chain(client_session, client.max_queries_per_request + 2)
+
+        response = client.get(f"/api/v1/categories/{leaf_id}/ancestors")
+
+        assert response.status_code == 200
+        assert len(response.json()) == client.max_queries_per_request + 1
+
+    def test_guard_fails_a_request_that_walks_parents(self, client, client_session, monkeypatch):
+        """Test that an ancestors lookup done parent by parent trips the guard"""
+        leaf_id = category_chain(client_session, client.max_queries_per_request + 2)
+
+        async def walk_parents(self, category_id):
+            ancestors = []
+            category = await self.get_category(category_id)
+            while category.parent_id is not None:
+                category = await self.db.get(Category, category.parent_id)
+                ancestors.insert(0, category)
+            return ancestors
+
+        monkeypatch.setattr(AsyncCategoryService, "get_ancestors", walk_parents)
+        with pytest.raises(pytest.fail.Exception, match="likely N\\+1"):
+            client.get(f"/api/v1/categories/{leaf_id}/ancestors")
@@ -0,0 +1,55 @@
+"""
+Tests for batch lookups by id list
+"""
+
+import pytest
+
+import batch_utils
+from batch_utils import parse_id_list, fetch_by_ids
+from cache_utils import TTLCache
+
+
+class TestParseIdList:
+    """Test parsing of the ?ids= query parameter"""
+
+    def test_keeps_request_order_and_drops_duplicates(self):
+        """Test that ids come back unique and in the order requested"""
+        assert parse_id_list("3, 1,3,,2") == [3, 1, 2]
+
+    def test_rejects_invalid_and_oversized_lists(self):
+        """Test that bad ids and batches over the cap are refused"""
+        with pytest.raises(ValueError):
+            parse_id_list("1,abc")
+        with pytest.raises(ValueError):
+            parse_id_list("")
+        with pytest.raises(ValueError):
+            parse_id_list("1,2,3", max_ids=2)
+
+
+class TestFetchByIds:
+    """Test the single-query batch fetch"""
+
+    def test_preserves_order_reports_missing_and_uses_cache(self, monkeypatch):
+        """Test that only cache misses are queried, in one ANY() lookup"""
+        rows = {1: {"id": 1, "name": "a"}, 2: {"id": 2, "name": "b"}}
+        queries = []
+
+        def execute_query(sql, parameters=None):
+            queries.append(list(parameters[0]))
+            return [rows[i] for i in parameters[0] if i in rows]
+
+        monkeypatch.setattr(batch_utils, "execute_query", execute_query)
+        cache = TTLCache(ttl_seconds=30, max_entries=10)
+        cache.set(2, {"id": "2", "name": "cached"})
+
+        found, missing = fetch_by_ids(
+            "SELECT ... WHERE id = ANY(%s)",
+            [2, 9, 1],
+            lambda row: {**row, "id": str(row["id"])},
+            cache,
+        )
+
+        assert queries == [[9, 1]]
+        assert [item["name"] for item in found] == ["cached", "a"]
+        assert missing == ["9"]
+        assert cache.get(1) == {"id": "1", "name": "a"}
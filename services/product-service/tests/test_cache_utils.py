@@ -0,0 +1,37 @@
+"""
+Tests for the in-process TTL cache
+"""
+
+import time
+
+from cache_utils import TTLCache, cache_records, invalidate_record, slug_key
+
+
+class TestTTLCache:
+    """Test expiry and id/slug keyed entries"""
+
+    def test_entries_expire(self, monkeypatch):
+        """Test that entries are not returned after their TTL"""
+        cache = TTLCache(ttl_seconds=10, max_entries=10)
+        cache.set(1, "a")
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+        assert cache.get(1) is None
+
+    def test_records_are_shared_between_id_and_slug(self):
+        """Test that one cached record answers both id and slug lookups"""
+        cache = TTLCache(ttl_seconds=30, max_entries=10)
+        cache_records(cache, [{"id": "5", "slug": "polo-azul", "name": "Polo"}])
+
+        assert cache.get(5) is cache.get(slug_key("polo-azul"))
+
+    def test_invalidation_drops_old_and_new_slugs(self):
+        """Test that an update clears the id key and every slug the record had"""
+        cache = TTLCache(ttl_seconds=30, max_entries=10)
+        cache_records(cache, [{"id": "5", "slug": "polo-azul"}])
+
+        invalidate_record(cache, 5, None, "polo-celeste")
+
+        assert cache.get(5) is None
+        assert cache.get(slug_key("polo-azul")) is None
@@ -0,0 +1,212 @@
+"""
+Tests for the column-projected (core) read mode
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.models.base import Base
+from app.models.product import Product
+from app.models.category import Category
+from app.models.vendor import Vendor
+from app.schemas.category import CATEGORY_LIST_ADAPTER
+from app.schemas.product import ProductResponse, PRODUCT_LIST_ADAPTER
+from app.schemas.vendor import VendorResponse
+from app.services.base_service import BaseService
+from app.services.product_service import ProductService
+from app.services.projection import models_to_json, response_columns, rows_to_json
+
+
+def seed(db):
+    vendor = Vendor(name="Vendor", email="vendor@example.com")
+    category = Category(name="Polos", slug="polos")
+    db.add_all([vendor, category])
+    db.flush()
+    db.add_all(
+        [
+            Product(
+                name=f"Polo {i}",
+                slug=f"polo-{i}",
+                description="Algodón pima",
+                price=29.9 + i,
+                stock=i,
+                status="active" if i % 2 else "draft",
+                vendor_id=vendor.id,
+                category_id=category.id,
+                images=[f"{i}.jpg"],
+                tags=["polo"],
+            )
+            for i in range(4)
+        ]
+    )
+    db.commit()
+
+
+@pytest.fixture
+def catalog_session():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    seed(session)
+    session.expunge_all()
+
+    yield session
+
+    session.close()
+    engine.dispose()
+
+
+class TestProjection:
+    """Test which columns the core mode selects"""
+
+    def test_columns_follow_the_response_schema(self):
+        """Test that only ProductResponse fields that are table columns are selected"""
+        names = [column.key for column in response_columns(Product, ProductResponse)]
+
+        assert names[:3] == ["name", "slug", "description"]
+        assert set(names) == set(ProductResponse.model_fields) & set(
+            Product.__table__.columns.keys()
+        )
+
+    def test_rows_are_plain_dicts_without_hydration(self, catalog_session, assert_max_queries):
+        """Test that core rows come from a single statement and never touch the identity map"""
+        with assert_max_queries(1):
+            rows = ProductService(catalog_session).get_product_rows(status="active")
+
+        assert [row["slug"] for row in rows] == ["polo-1", "polo-3"]
+        assert all(isinstance(row, dict) for row in rows)
+        assert len(catalog_session.identity_map) == 0
+
+
+class TestPayloadParity:
+    """Test that both read modes produce the same JSON"""
+
+    def test_products_core_matches_orm_payload(self, catalog_session):
+        """Test core JSON against ORM objects validated through ProductResponse"""
+        service = ProductService(catalog_session)
+        adapter = TypeAdapter(List[ProductResponse])
+        orm_payload = adapter.dump_python(
+            adapter.validate_python(service.get_products(), from_attributes=True), mode="json"
+        )
+
+        core_payload = json.loads(rows_to_json(service.get_product_rows()))
+
+        assert core_payload == orm_payload
+
+    def test_aware_timestamps_match_pydantic(self):
+        """Test that UTC and offset datetimes are written exactly as pydantic writes them"""
+        rows = [
+            {
+                "id": 1,
+                "name": "Polos",
+                "slug": "polos",
+                "description": None,
+                "parent_id": None,
+                "order": 0,
+                "created_at": datetime(2024, 3, 1, 12, 30, 5, 120000, tzinfo=timezone.utc),
+                "updated_at": datetime(2024, 3, 2, 8, 0, tzinfo=timezone(timedelta(hours=-5))),
+            },
+            {
+                "id": 2,
+                "name": "Casacas",
+                "slug": "casacas",
+                "description": "Abrigo",
+                "parent_id": 1,
+                "order": 1,
+                "created_at": datetime(2024, 3, 1, tzinfo=timezone.utc),
+                "updated_at": None,
+            },
+        ]
+        expected = CATEGORY_LIST_ADAPTER.dump_python(
+            CATEGORY_LIST_ADAPTER.validate_python(rows), mode="json"
+        )
+
+        payload = json.loads(rows_to_json(rows))
+
+        assert payload == expected
+        assert payload[0]["created_at"] == "2024-03-01T12:30:05.120000Z"
+        assert payload[0]["updated_at"] == "2024-03-02T08:00:00-05:00"
+
+    def test_adapter_dump_json_matches_response_model_payload(self, catalog_session):
+        """Test the prebuilt TypeAdapter body against FastAPI's validate + dump + json.dumps"""
+        products = ProductService(catalog_session).get_products()
+        expected = PRODUCT_LIST_ADAPTER.dump_python(
+            PRODUCT_LIST_ADAPTER.validate_python(products, from_attributes=True), mode="json"
+        )
+
+        body = models_to_json(PRODUCT_LIST_ADAPTER, products)
+
+        assert isinstance(body, bytes) and json.loads(body) == expected
+
+    def test_base_service_rows_with_filters(self, catalog_session):
+        """Test get_multi_rows applies the same filters and search as get_multi"""
+        service = BaseService(Vendor)
+
+        rows = service.get_multi_rows(
+            catalog_session, VendorResponse, search="vend", search_fields=["name"]
+        )
+
+        assert [row["email"] for row in rows] == ["vendor@example.com"]
+        assert set(rows[0]) == set(VendorResponse.model_fields)
+
+
+class TestReadModeSelection:
+    """Test per-endpoint selection of the read mode"""
+
+    def test_read_mode_setting(self, monkeypatch):
+        """Test that endpoints outside CORE_READ_ENDPOINTS use the ORM mode"""
+        monkeypatch.setattr(settings, "core_read_endpoints", {"products.list"})
+
+        assert settings.read_mode("products.list") == "core"
+        assert settings.read_mode("vendors.list") == "orm"
+
+    @pytest.mark.parametrize("endpoints", [{"products.list"}, set()])
+    def test_products_endpoint_in_both_modes(self, monkeypatch, endpoints):
+        """Test that GET /products returns the same body in core and ORM mode"""
+        pytest.importorskip("aiosqlite")
+        import httpx
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        from app.main import app
+        from app.database import get_async_db
+
+        monkeypatch.setattr(settings, "core_read_endpoints", endpoints)
+
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            async with session_factory() as db:
+                await db.run_sync(seed)
+
+            async def override_get_async_db():
+                async with session_factory() as db:
+                    yield db
+
+            app.dependency_overrides[get_async_db] = override_get_async_db
+            try:
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    response = await client.get("/api/v1/products/", params={"status": "active"})
+            finally:
+                app.dependency_overrides.clear()
+                await engine.dispose()
+            return response
+
+        response = asyncio.run(run())
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [product["slug"] for product in body] == ["polo-1", "polo-3"]
+        assert body[0]["images"] == ["1.jpg"] and body[0]["price"] == 30.9
@@ -0,0 +1,163 @@
+"""
+Tests for relationship loader options and the N+1 guard
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.base import Base
+from app.models.product import Product
+from app.models.category import Category
+from app.models.vendor import Vendor
+from app.services.base_service import BaseService
+from app.services.product_service import ProductService
+from app.services.eager_loading import loader_options
+
+
+@pytest.fixture
+def catalog_session():
+    """In-memory catalog: 2 vendors, a parent category with 2 children, 6 products"""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    vendors = [Vendor(name=f"Vendor {i}", email=f"v{i}@example.com") for i in range(2)]
+    parent = Category(name="Ropa", slug="ropa")
+    children = [Category(name=f"Sub {i}", slug=f"sub-{i}", parent=parent) for i in range(2)]
+    session.add_all(vendors + [parent] + children)
+    session.flush()
+    session.add_all(
+        [
+            Product(
+                name=f"P{i}",
+                slug=f"p{i}",
+                price=10 + i,
+                status="active",
+                vendor_id=vendors[i % 2].id,
+                category_id=children[i % 2].id,
+            )
+            for i in range(6)
+        ]
+    )
+    session.commit()
+    session.expunge_all()
+
+    yield session
+
+    session.close()
+    engine.dispose()
+
+
+def touch_relations(products):
+    return [(p.vendor.name, p.category.name) for p in products]
+
+
+class TestProductLoaders:
+    """Test that loader options remove per-row relationship queries"""
+
+    def test_default_lazy_loading_is_caught_by_the_guard(self, catalog_session, assert_max_queries):
+        """Test that the N+1 guard fails on lazy relationship access"""
+        with pytest.raises(pytest.fail.Exception, match="likely N\\+1"):
+            with assert_max_queries(3):
+                touch_relations(ProductService(catalog_session).get_products())
+
+    def test_joined_loads_everything_in_one_query(self, catalog_session, assert_max_queries):
+        """Test that joinedload fetches vendor and category with the page"""
+        with assert_max_queries(1) as counter:
+            products = ProductService(catalog_session).get_products(
+                loaders={"vendor": "joined", "category": "joined"}
+            )
+            relations = touch_relations(products)
+
+        assert counter.count == 1
+        assert len(relations) == 6
+
+    def test_selectin_uses_one_query_per_relationship(self, catalog_session, assert_max_queries):
+        """Test that selectinload costs a fixed number of queries regardless of page size"""
+        with assert_max_queries(3) as counter:
+            products = ProductService(catalog_session).get_products(
+                status="active", loaders={"vendor": "selectin", "category": "selectin"}
+            )
+            touch_relations(products)
+
+        assert counter.count == 3
+
+    def test_dotted_path_reaches_the_parent_category(self, catalog_session, assert_max_queries):
+        """Test that category.parent is loaded through the chained option"""
+        with assert_max_queries(1):
+            products = ProductService(catalog_session).get_products(
+                loaders={"category.parent": "joined"}
+            )
+            parents = {p.category.parent.name for p in products}
+
+        assert parents == {"Ropa"}
+
+
+class TestBaseServiceLoaders:
+    """Test loader options on the generic service"""
+
+    def test_children_collection_with_selectin(self, catalog_session, assert_max_queries):
+        """Test that the self-referential children collection loads in one extra query"""
+        service = BaseService(Category)
+
+        with assert_max_queries(2):
+            categories = service.get_multi(catalog_session, loaders={"children": "selectin"})
+            children = {c.slug: sorted(child.slug for child in c.children) for c in categories}
+
+        assert children["ropa"] == ["sub-0", "sub-1"]
+
+    def test_raise_strategy_blocks_lazy_loads(self, catalog_session):
+        """Test that 'raise' turns an unplanned lazy load into an error"""
+        products = ProductService(catalog_session).get_products(loaders={"vendor": "raise"})
+
+        with pytest.raises(Exception, match="raise"):
+            products[0].vendor
+
+    def test_unknown_relationship_or_strategy(self):
+        """Test that bad loader specs are rejected up front"""
+        with pytest.raises(ValueError, match="no relationship 'owner'"):
+            loader_options(Product, {"owner": "joined"})
+        with pytest.raises(ValueError, match="Unknown loader strategy"):
+            loader_options(Product, {"vendor": "eager"})
+
+
+class TestAsyncProductLoaders:
+    """Test that the async service can load relationships without lazy IO"""
+
+    def test_joined_loaders_on_async_session(self, catalog_session, assert_max_queries):
+        """Test that AsyncProductService returns usable relationships in one query"""
+        pytest.importorskip("aiosqlite")
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        from app.services.async_product_service import AsyncProductService
+
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                vendor = Vendor(name="V", email="v@example.com")
+                category = Category(name="C", slug="c")
+                db.add_all([vendor, category])
+                await db.flush()
+                db.add(
+                    Product(
+                        name="P", slug="p", price=1, vendor_id=vendor.id, category_id=category.id
+                    )
+                )
+                await db.commit()
+                db.expunge_all()
+
+                with assert_max_queries(1):
+                    products = await AsyncProductService(db).get_products(
+                        loaders={"vendor": "joined", "category": "joined"}
+                    )
+            await engine.dispose()
+            return touch_relations(products)
+
+        assert asyncio.run(run()) == [("V", "C")]
@@ -0,0 +1,134 @@
+"""
+Tests for closure-table hierarchy lookups
+"""
+
+import hierarchy_utils
+from hierarchy_utils import get_ancestors, get_descendants, get_subtree_products, creates_cycle
+
+
+def category_row(category_id, parent_id, depth):
+    return {
+        "id": category_id,
+        "name": f"c{category_id}",
+        "slug": f"c{category_id}",
+        "description": None,
+        "parent_id": parent_id,
+        "order": 0,
+        "is_active": True,
+        "created_at": None,
+        "updated_at": None,
+        "direct_product_count": 0,
+        "subtree_product_count": 0,
+        "direct_status_counts": {},
+        "subtree_status_counts": {},
+        "child_count": 0,
+        "depth": depth,
+    }
+
+
+def product_row(product_id, total):
+    return {
+        "id": product_id,
+        "name": "p",
+        "slug": f"p{product_id}",
+        "description": "",
+        "price": 10,
+        "stock": 1,
+        "status": "active",
+        "category_id": 9,
+        "vendor_id": 1,
+        "images": None,
+        "tags": None,
+        "created_at": None,
+        "updated_at": None,
+        "total_count": total,
+    }
+
+
+class TestAncestorsAndDescendants:
+    """Test that one closure query is split into the category and its relatives"""
+
+    def test_ancestors_come_root_first_without_the_category(self, monkeypatch):
+        """Test the breadcrumb order and that the depth-0 row is the category"""
+        queries = []
+
+        def execute_query(sql, parameters=None):
+            queries.append(parameters)
+            return [category_row(1, None, 2), category_row(2, 1, 1), category_row(7, 2, 0)]
+
+        monkeypatch.setattr(hierarchy_utils, "execute_query", execute_query)
+
+        category, ancestors = get_ancestors(7)
+
+        assert category["id"] == "7" and category["depth"] == 0
+        assert [a["id"] for a in ancestors] == ["1", "2"]
+        assert len(queries) == 1
+
+    def test_unknown_category_returns_none(self, monkeypatch):
+        """Test that a category without a closure self row is reported as missing"""
+        monkeypatch.setattr(hierarchy_utils, "execute_query", lambda sql, parameters=None: [])
+
+        assert get_ancestors(99) is None
+        assert get_descendants(99) is None
+
+    def test_descendants_pass_max_depth(self, monkeypatch):
+        """Test that max_depth is bound as a query parameter"""
+        seen = {}
+
+        def execute_query(sql, parameters=None):
+            seen["parameters"] = parameters
+            return [category_row(2, None, 0), category_row(7, 2, 1)]
+
+        monkeypatch.setattr(hierarchy_utils, "execute_query", execute_query)
+
+        category, descendants = get_descendants(2, max_depth=1)
+
+        assert seen["parameters"] == (2, 1)
+        assert category["id"] == "2" and [d["id"] for d in descendants] == ["7"]
+
+
+class TestSubtreeProducts:
+    """Test subtree product paging"""
+
+    def test_total_comes_from_the_window_count(self, monkeypatch):
+        """Test that no separate COUNT query runs when the page has rows"""
+        calls = []
+
+        def execute_query(sql, parameters=None):
+            calls.append(parameters)
+            return [product_row(41, 37), product_row(40, 37)]
+
+        monkeypatch.setattr(hierarchy_utils, "execute_query", execute_query)
+
+        products, total = get_subtree_products(2, "active", 0, 2)
+
+        assert total == 37
+        assert calls == [(2, "active", 2, 0)]
+        assert [p["id"] for p in products] == ["41", "40"]
+        assert "total_count" not in products[0]
+
+
+class TestCreatesCycle:
+    """Test cycle detection for category moves"""
+
+    def test_self_parent_and_root_need_no_query(self, monkeypatch):
+        """Test the shortcuts that do not touch the database"""
+
+        def execute_single_query(sql, parameters=None):
+            raise AssertionError("unexpected query")
+
+        monkeypatch.setattr(hierarchy_utils, "execute_single_query", execute_single_query)
+
+        assert creates_cycle(5, 5) is True
+        assert creates_cycle(5, None) is False
+
+    def test_descendant_parent_is_a_cycle(self, monkeypatch):
+        """Test that moving under a descendant is detected through the closure"""
+        monkeypatch.setattr(
+            hierarchy_utils,
+            "execute_single_query",
+            lambda sql, parameters=None: {"found": 1} if parameters == (5, 8) else None,
+        )
+
+        assert creates_cycle(5, 8) is True
+        assert creates_cycle(5, 3) is False
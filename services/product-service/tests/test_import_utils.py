@@ -0,0 +1,169 @@
+"""
+Tests for bulk product import parsing and validation
+"""
+
+import io
+import json
+
+import pytest
+
+from import_utils import decode_lines, iter_records, normalize_record, ImportReport
+from storage_utils import LocalObjectStore, ObjectStore
+
+
+class TestIterRecords:
+    """Test streaming CSV/NDJSON parsing"""
+
+    def test_csv_rows_are_numbered_from_one(self):
+        """Test that CSV rows (header excluded) are read from a byte stream with a BOM"""
+        data = (
+            "\ufeffname,slug,price,category_id,vendor_id,tags\n"
+            "Shirt,shirt,19.90,1,2,cotton|summer\n"
+        )
+        rows = list(iter_records(decode_lines(io.BytesIO(data.encode("utf-8"))), "csv"))
+
+        assert len(rows) == 1
+        row_no, record, error = rows[0]
+        assert (row_no, error) == (1, None)
+        assert record["slug"] == "shirt"
+
+    def test_ndjson_reports_bad_lines_and_skips_blank_ones(self):
+        """Test that malformed NDJSON lines become row errors"""
+        lines = ['{"slug": "a"}\n', "\n", "not json\n", "[1, 2]\n"]
+        rows = list(iter_records(lines, "ndjson"))
+
+        assert [(row_no, error is None) for row_no, _, error in rows] == [
+            (1, True),
+            (2, False),
+            (3, False),
+        ]
+
+    def test_unknown_format_is_rejected(self):
+        """Test that only csv and ndjson are accepted"""
+        with pytest.raises(ValueError):
+            list(iter_records([], "xlsx"))
+
+
+class TestNormalizeRecord:
+    """Test per-row validation before staging"""
+
+    def test_builds_staging_row(self):
+        """Test that lists accept pipe-separated CSV cells and JSON arrays"""
+        row = normalize_record(
+            4,
+            {
+                "name": "Shirt",
+                "slug": " shirt ",
+                "price": "19.90",
+                "stock": "3",
+                "category_id": "1",
+                "vendor_id": 2,
+                "tags": "cotton|summer",
+                "images": '["a.jpg"]',
+            },
+        )
+
+        assert row[0:3] == (4, "Shirt", "shirt")
+        assert row[6:9] == ("active", 1, 2)
+        assert json.loads(row[9]) == ["a.jpg"]
+        assert json.loads(row[10]) == ["cotton", "summer"]
+
+    @pytest.mark.parametrize(
+        "record",
+        [
+            {"name": "Shirt", "price": "1", "category_id": 1, "vendor_id": 1},
+            {"name": "Shirt", "slug": "s", "price": "abc", "category_id": 1, "vendor_id": 1},
+            {
+                "name": "Shirt",
+                "slug": "s",
+                "price": "1",
+                "stock": "-1",
+                "category_id": 1,
+                "vendor_id": 1,
+            },
+            {"name": "Shirt", "slug": "s", "price": "NaN", "category_id": 1, "vendor_id": 1},
+            {"name": "Shirt", "slug": "s", "price": "sNaN", "category_id": 1, "vendor_id": 1},
+            {"name": "Shirt", "slug": "s", "price": "Infinity", "category_id": 1, "vendor_id": 1},
+            {
+                "name": "Shirt",
+                "slug": "s",
+                "price": "99999999.995",
+                "category_id": 1,
+                "vendor_id": 1,
+            },
+            {
+                "name": "Shirt",
+                "slug": "s",
+                "price": "1",
+                "status": "x" * 51,
+                "category_id": 1,
+                "vendor_id": 1,
+            },
+            {
+                "name": "Shirt",
+                "slug": "s",
+                "price": "1",
+                "status": "archived",
+                "category_id": 1,
+                "vendor_id": 1,
+            },
+            {"name": "Shirt", "slug": "s", "price": "1", "category_id": 2**31, "vendor_id": 1},
+            {
+                "name": "Shirt",
+                "slug": "s",
+                "price": "1",
+                "category_id": 1,
+                "vendor_id": "-2147483649",
+            },
+        ],
+    )
+    def test_rejects_invalid_rows(self, record):
+        """Test that rows the COPY would choke on are refused here, row by row"""
+        with pytest.raises(ValueError):
+            normalize_record(1, record)
+
+    def test_price_is_rounded_like_the_column(self):
+        """Test that the staged price is the DECIMAL(10,2) value"""
+        row = normalize_record(
+            1, {"name": "S", "slug": "s", "price": "99999999.994", "category_id": 1, "vendor_id": 1}
+        )
+
+        assert str(row[4]) == "99999999.99"
+
+
+class TestImportReport:
+    """Test error reporting limits"""
+
+    def test_errors_are_capped_but_counted(self):
+        """Test that failures beyond the cap are counted but not listed"""
+        report = ImportReport(max_reported_errors=2)
+        for row in range(5):
+            report.add_error(row, "invalid_row")
+
+        assert report.failed == 5
+        assert len(report.errors) == 2
+
+
+class TestLocalObjectStore:
+    """Test the offline object store"""
+
+    def test_reads_objects_and_rejects_escaping_keys(self, tmp_path):
+        """Test that keys resolve under the base directory only"""
+        (tmp_path / "imports").mkdir()
+        (tmp_path / "imports" / "a.csv").write_bytes(b"name\n")
+        store = LocalObjectStore(str(tmp_path))
+
+        with store.open_object("imports/a.csv") as stream:
+            assert stream.read() == b"name\n"
+        with pytest.raises(ValueError):
+            store.open_object("../outside.csv")
+
+    def test_incomplete_store_cannot_be_instantiated(self):
+        """Test that a store must implement both open_object and put_file"""
+
+        class ReadOnlyStore(ObjectStore):
+            def open_object(self, key):
+                return io.BytesIO()
+
+        with pytest.raises(TypeError):
+            ReadOnlyStore()
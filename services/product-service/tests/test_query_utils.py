@@ -0,0 +1,343 @@
+"""
+Tests for the declarative list filter spec and its SQL/ORM compilers
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import query_utils
+from query_utils import (
+    ListSpec,
+    FilterField,
+    build_list_query,
+    fetch_page,
+    parse_datetime,
+    encode_cursor,
+    decode_cursor,
+)
+from app.models.base import Base
+from app.models.category import Category
+from app.models.product import Product
+from app.models.vendor import Vendor
+from app.schemas.common import PaginationParams
+from app.services.base_service import BaseService
+
+SPEC = ListSpec(
+    table="products",
+    columns="id, name",
+    filters={
+        "status": FilterField("status", operators=("eq", "in")),
+        "category_id": FilterField("category_id", int, ("eq", "in")),
+        "price": FilterField("price", float, ("gte", "lte")),
+        "created_at": FilterField("created_at", parse_datetime, ("gte",)),
+    },
+    sort_fields={"created_at": "created_at", "price": "price", "name": "name"},
+    search_columns=("name", "description"),
+    defaults={"status": "active"},
+)
+
+
+class TestBuildListQuery:
+    """Test compilation of request parameters into SQL text and parameters"""
+
+    def test_filters_search_and_sort_compile_to_one_statement(self):
+        """Test the WHERE clause, parameter order and window total"""
+        query = build_list_query(
+            SPEC,
+            {
+                "price__gte": "10",
+                "category_id__in": "1,2",
+                "search": "po_lo",
+                "sort_by": "price",
+                "sort_order": "desc",
+                "skip": "20",
+            },
+        )
+
+        assert "WHERE category_id = ANY(%s) AND price >= %s AND status = %s" in query.sql
+        assert "(name ILIKE %s OR description ILIKE %s)" in query.sql
+        assert "COUNT(*) OVER () AS total_count" in query.sql
+        assert "ORDER BY price DESC, id DESC" in query.sql
+        assert query.parameters == [[1, 2], 10.0, "active", "%po\\_lo%", "%po\\_lo%"]
+        assert query.filters == {"category_id__in": "1,2", "price__gte": "10", "status": "active"}
+
+    def test_sql_text_is_cached_per_filter_shape(self):
+        """Test that different values with the same shape reuse the compiled text"""
+        first = build_list_query(SPEC, {"category_id": "1", "price__lte": "50"})
+        second = build_list_query(SPEC, {"price__lte": "9.5", "category_id": "7"})
+        other_shape = build_list_query(SPEC, {"category_id": "1"})
+
+        assert first.sql is second.sql
+        assert first.parameters != second.parameters
+        assert other_shape.sql != first.sql
+
+    def test_defaults_apply_only_when_the_parameter_is_absent(self):
+        """Test the status default, its override and an explicit empty value"""
+        assert build_list_query(SPEC, {}).parameters == ["active"]
+        assert build_list_query(SPEC, {"status__in": "draft,active"}).parameters == [
+            ["draft", "active"]
+        ]
+        assert build_list_query(SPEC, {"status": ""}).parameters == []
+
+    @pytest.mark.parametrize(
+        "params, message",
+        [
+            ({"price": "10"}, "Operator 'eq' is not allowed for 'price'"),
+            ({"price__gte": "cheap"}, "Invalid value for 'price__gte'"),
+            ({"created_at__gte": "yesterday"}, "Invalid value for 'created_at__gte'"),
+            ({"sort_by": "id"}, "Cannot sort by 'id'"),
+            ({"sort_order": "sideways"}, "Invalid sort_order"),
+        ],
+    )
+    def test_invalid_parameters_raise_value_error(self, params, message):
+        """Test that anything outside the whitelist is rejected"""
+        with pytest.raises(ValueError, match=message):
+            build_list_query(SPEC, params)
+
+    def test_unknown_parameters_are_ignored(self):
+        """Test that pagination and other parameters do not become filters"""
+        query = build_list_query(SPEC, {"limit": "10", "owner": "me"})
+
+        assert query.parameters == ["active"]
+
+
+class TestKeysetCursor:
+    """Test the id tiebreaker and cursors that resume after a row"""
+
+    def test_cursor_round_trips_typed_values(self):
+        """Test that timestamps and decimals come back with their types"""
+        created = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+        cursor = encode_cursor(SPEC, ("created_at", "desc"), {"id": 7, "created_at": created})
+        price_cursor = encode_cursor(SPEC, ("price", "asc"), {"id": 8, "price": Decimal("19.90")})
+
+        assert decode_cursor(SPEC, ("created_at", "desc"), cursor) == [created, 7]
+        assert decode_cursor(SPEC, ("price", "asc"), price_cursor) == [Decimal("19.90"), 8]
+
+    def test_cursor_compiles_to_a_row_comparison_without_total(self):
+        """Test the seek condition, its direction and the parameter order"""
+        cursor = encode_cursor(SPEC, ("price", "desc"), {"id": 3, "price": 25.0})
+        query = build_list_query(SPEC, {"sort_by": "price", "sort_order": "desc"}, cursor)
+
+        assert "(price, id) < (%s, %s)" in query.sql
+        assert "ORDER BY price DESC, id DESC" in query.sql
+        assert "OVER ()" not in query.sql and "OFFSET" not in query.sql
+        assert query.parameters == ["active", 25.0, 3]
+
+    @pytest.mark.parametrize(
+        "cursor, message",
+        [
+            ("not-a-cursor", "Invalid cursor"),
+            (
+                encode_cursor(SPEC, ("created_at", "desc"), {"id": 1, "created_at": "2024-01-01"}),
+                "different sort",
+            ),
+        ],
+    )
+    def test_bad_or_mismatched_cursor_raises_value_error(self, cursor, message):
+        """Test that a garbled cursor or one from another sort is a client error"""
+        with pytest.raises(ValueError, match=message):
+            build_list_query(SPEC, {"sort_by": "price"}, cursor)
+
+
+class TestFetchPage:
+    """Test the single round trip and the past-the-end fallback"""
+
+    def test_total_comes_from_the_window_count(self, monkeypatch):
+        """Test that one query returns rows and total"""
+        calls = []
+
+        def execute_query(sql, parameters=None):
+            calls.append(parameters)
+            return [{"id": 1, "created_at": "2024-01-01", "total_count": 42}]
+
+        monkeypatch.setattr(query_utils, "execute_query", execute_query)
+
+        rows, total, _ = fetch_page(SPEC, {"category_id": "3"}, skip=0, limit=1)
+
+        assert rows == [{"id": 1, "created_at": "2024-01-01"}]
+        assert total == 42
+        assert calls == [(3, "active", 1, 0)]
+
+    def test_count_fallback_when_paging_past_the_end(self, monkeypatch):
+        """Test that an empty page beyond the first still reports the total"""
+        monkeypatch.setattr(query_utils, "execute_query", lambda sql, parameters=None: [])
+        monkeypatch.setattr(
+            query_utils, "execute_single_query", lambda sql, parameters=None: {"total": 5}
+        )
+
+        rows, total, _ = fetch_page(SPEC, {}, skip=100, limit=10)
+
+        assert rows == [] and total == 5
+
+    def test_offset_page_hands_out_a_cursor(self, monkeypatch):
+        """Test that a full offset page exposes has_more and the cursor of its last row"""
+        monkeypatch.setattr(
+            query_utils,
+            "execute_query",
+            lambda sql, parameters=None: [
+                {"id": 4, "name": "d", "total_count": 9},
+                {"id": 2, "name": "b", "total_count": 9},
+            ],
+        )
+
+        _, total, query = fetch_page(
+            SPEC, {"sort_by": "name", "sort_order": "desc"}, skip=0, limit=2
+        )
+
+        assert total == 9 and query.has_more
+        assert decode_cursor(SPEC, ("name", "desc"), query.next_cursor) == ["b", 2]
+
+    def test_keyset_page_reads_one_extra_row(self, monkeypatch):
+        """Test has_more from the extra row and that no total is computed"""
+        calls = []
+
+        def execute_query(sql, parameters=None):
+            calls.append(parameters)
+            return [{"id": i, "name": n} for i, n in ((5, "e"), (6, "f"), (7, "g"))]
+
+        monkeypatch.setattr(query_utils, "execute_query", execute_query)
+        cursor = encode_cursor(SPEC, ("name", "asc"), {"id": 4, "name": "d"})
+
+        rows, total, query = fetch_page(SPEC, {"sort_by": "name"}, skip=40, limit=2, cursor=cursor)
+
+        assert [row["id"] for row in rows] == [5, 6] and total is None
+        assert calls == [("active", "d", 4, 3)]
+        assert query.has_more and decode_cursor(SPEC, ("name", "asc"), query.next_cursor) == [
+            "f",
+            6,
+        ]
+
+
+@pytest.fixture
+def catalog_session():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    vendor = Vendor(name="Vendor", email="vendor@example.com")
+    category = Category(name="Polos", slug="polos")
+    session.add_all([vendor, category])
+    session.flush()
+    session.add_all(
+        [
+            Product(
+                name=f"Polo {i}",
+                slug=f"polo-{i}",
+                price=10.0 * (i + 1),
+                stock=i,
+                status="active" if i < 4 else "draft",
+                vendor_id=vendor.id,
+                category_id=category.id,
+            )
+            for i in range(6)
+        ]
+    )
+    session.commit()
+
+    yield session
+
+    session.close()
+    engine.dispose()
+
+
+class TestBaseServiceSpec:
+    """Test that BaseService compiles the same spec through SQLAlchemy"""
+
+    def test_operators_and_sort(self, catalog_session):
+        """Test comparison filters, 'in' from a list and whitelisted sorting"""
+        service = BaseService(Product)
+
+        products = service.get_multi(
+            catalog_session,
+            filters={"price__gte": "20", "status": ["active"]},
+            sort_by="price",
+            sort_order="desc",
+        )
+
+        assert [p.slug for p in products] == ["polo-3", "polo-2", "polo-1"]
+
+    def test_custom_spec_restricts_fields(self, catalog_session):
+        """Test that a service-specific spec rejects filters and sorts it does not list"""
+        service = BaseService(
+            Product,
+            list_spec=ListSpec(
+                table="products",
+                columns="*",
+                filters={"status": FilterField("status")},
+                sort_fields={"name": "name"},
+                default_sort=("name", "asc"),
+            ),
+        )
+
+        with pytest.raises(ValueError, match="Cannot sort by 'price'"):
+            service.get_multi(catalog_session, sort_by="price")
+        with pytest.raises(ValueError, match="not allowed"):
+            service.get_multi(catalog_session, filters={"status__in": "active,draft"})
+
+    def test_paginated_page_and_total_in_one_statement(self, catalog_session, assert_max_queries):
+        """Test that get_paginated no longer issues a separate count query"""
+        service = BaseService(Product)
+        pagination = PaginationParams(page=2, size=2, sort_by="price", sort_order="asc")
+
+        with assert_max_queries(1):
+            page = service.get_paginated(catalog_session, pagination, filters={"status": "active"})
+
+        assert [p.slug for p in page.items] == ["polo-2", "polo-3"]
+        assert (page.total, page.pages, page.has_next, page.has_prev) == (4, 2, False, True)
+
+    def test_paginated_past_the_end_still_counts(self, catalog_session):
+        """Test the count fallback on an empty page"""
+        page = BaseService(Product).get_paginated(catalog_session, PaginationParams(page=9, size=5))
+
+        assert page.items == [] and page.total == 6
+
+    def test_paginated_keeps_the_spec_default_direction(self, catalog_session):
+        """Test that a sort_order the client did not send does not override default_sort"""
+        service = BaseService(
+            Product,
+            list_spec=ListSpec(
+                table="products",
+                columns="*",
+                filters={},
+                sort_fields={"id": "id"},
+                default_sort=("id", "desc"),
+            ),
+        )
+
+        newest = service.get_paginated(catalog_session, PaginationParams(size=2))
+        oldest = service.get_paginated(catalog_session, PaginationParams(size=2, sort_order="asc"))
+
+        assert [p.id for p in newest.items] == sorted((p.id for p in newest.items), reverse=True)
+        assert newest.items[0].id > oldest.items[0].id
+
+    def test_default_spec_only_sorts_on_indexed_columns(self):
+        """Test that the model-derived whitelist follows the model's indexes"""
+        sort_fields = BaseService(Product).list_spec.sort_fields
+
+        assert {"id", "price", "name", "stock", "created_at", "slug"} <= set(sort_fields)
+        assert "description" not in sort_fields and "status" not in sort_fields
+
+    def test_cursor_pages_are_stable_across_ties(self, catalog_session):
+        """Test that keyset pages over equal sort values neither repeat nor skip rows"""
+        for product in catalog_session.query(Product):
+            product.price = 10.0
+        catalog_session.commit()
+        service = BaseService(Product)
+
+        seen, cursor = [], None
+        while True:
+            page = service.get_multi(
+                catalog_session, limit=4, sort_by="price", sort_order="desc", cursor=cursor
+            )
+            seen.extend(p.id for p in page)
+            if len(page) < 4:
+                break
+            cursor = service.cursor_after(page[-1], "price", "desc")
+
+        assert seen == sorted(seen, reverse=True) and len(seen) == 6
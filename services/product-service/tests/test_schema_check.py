@@ -0,0 +1,97 @@
+"""
+Tests for the startup schema step that replaced create_all at boot
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import StaticPool
+
+from app import schema_check
+from app.config import settings
+from app.main import app
+from app.schema_check import SchemaStatus, check_schema_version, prepare_schema
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def migrated(engine):
+    with engine.begin() as connection:
+        connection.execute(
+            text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)")
+        )
+        connection.execute(text("INSERT INTO alembic_version VALUES ('0001_baseline')"))
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def fresh_status(monkeypatch):
+    """Each test starts without a cached status"""
+    monkeypatch.setattr(schema_check, "_status", None)
+    monkeypatch.setattr(settings, "schema_version", None)
+
+
+def test_check_is_one_query_and_cached(migrated, assert_max_queries):
+    """Test that boot costs a single statement and later calls none"""
+    with assert_max_queries(1):
+        status = prepare_schema(migrated, mode="check")
+    with assert_max_queries(0):
+        assert prepare_schema(migrated, mode="check") is status
+
+    assert status.ready and status.revisions == ("0001_baseline",)
+
+
+def test_pinned_revision_must_match(migrated, monkeypatch):
+    """Test that SCHEMA_VERSION pins the expected revision"""
+    monkeypatch.setattr(settings, "schema_version", "0002_next")
+
+    status = prepare_schema(migrated, mode="check")
+
+    assert not status.ready
+    assert status.error == "database at 0001_baseline, expected 0002_next"
+
+
+def test_unmigrated_database_is_reported_not_raised(engine):
+    """Test that a missing alembic_version leaves the app up but not ready"""
+    status = check_schema_version(engine)
+
+    assert not status.ready and "alembic_version unreadable" in status.error
+
+
+def test_create_mode_builds_the_model_tables(engine):
+    """Test the local-development mode still creates the tables"""
+    status = prepare_schema(engine, mode="create")
+
+    assert status.ready
+    assert {"products", "categories", "vendors"} <= set(inspect(engine).get_table_names())
+
+
+def test_invalid_mode_is_rejected(engine):
+    """Test that a typo in SCHEMA_STARTUP fails loudly"""
+    with pytest.raises(ValueError, match="Invalid SCHEMA_STARTUP"):
+        prepare_schema(engine, mode="migrate")
+
+
+def test_readiness_endpoint_reflects_the_cached_status(monkeypatch):
+    """Test that /health/ready is 503 until the schema check passes"""
+    client = TestClient(app)
+    monkeypatch.setattr(
+        schema_check, "_status", SchemaStatus("check", False, error="no migration applied")
+    )
+    not_ready = client.get("/health/ready")
+    monkeypatch.setattr(schema_check, "_status", SchemaStatus("check", True, ("0001_baseline",)))
+    ready = client.get("/health/ready")
+
+    assert (
+        not_ready.status_code == 503
+        and not_ready.json()["schema"]["error"] == "no migration applied"
+    )
+    assert ready.status_code == 200 and ready.json()["status"] == "ready"
@@ -0,0 +1,66 @@
+"""
+Tests for row serializers
+"""
+
+from datetime import datetime
+
+from serializers import serialize_category
+
+
+class TestSerializeCategory:
+    """Test category rows joined to category_stats"""
+
+    def test_folds_stats_columns_into_stats_object(self):
+        """Test that the trigger-maintained counts are returned under 'stats'"""
+        row = {
+            "id": 3,
+            "name": "Polos",
+            "slug": "polos",
+            "description": "",
+            "parent_id": 1,
+            "order": 1,
+            "is_active": True,
+            "created_at": datetime(2024, 10, 4, 21, 0),
+            "updated_at": None,
+            "direct_product_count": 5,
+            "subtree_product_count": 9,
+            "direct_status_counts": {"active": 4, "draft": 1},
+            "subtree_status_counts": {"active": 8, "draft": 1},
+            "child_count": 2,
+        }
+
+        category = serialize_category(row)
+
+        assert category["id"] == "3" and category["parent_id"] == "1"
+        assert "direct_product_count" not in category
+        assert category["stats"] == {
+            "product_count": 5,
+            "subtree_product_count": 9,
+            "status_counts": {"active": 4, "draft": 1},
+            "subtree_status_counts": {"active": 8, "draft": 1},
+            "subcategory_count": 2,
+        }
+
+    def test_missing_stats_row_reports_zero_counts(self):
+        """Test that a category without a stats row (LEFT JOIN NULLs) reports zeros"""
+        row = {
+            "id": 4,
+            "name": "Nueva",
+            "slug": "nueva",
+            "description": None,
+            "parent_id": None,
+            "order": 0,
+            "is_active": True,
+            "created_at": None,
+            "updated_at": None,
+            "direct_product_count": None,
+            "subtree_product_count": None,
+            "direct_status_counts": None,
+            "subtree_status_counts": None,
+            "child_count": None,
+        }
+
+        stats = serialize_category(row)["stats"]
+
+        assert stats["product_count"] == 0 and stats["subcategory_count"] == 0
+        assert stats["status_counts"] == {} and stats["subtree_status_counts"] == {}
@@ -0,0 +1,172 @@
+"""
+Tests for the slow-query log and per-fingerprint stats
+"""
+
+import json
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+import db_utils
+import slow_query_utils
+from app.config import settings
+from app.main import app
+from slow_query_utils import normalize_sql, parameter_shape, instrument_engine, stats_table
+
+
+class FakeCursor:
+    """Stands in for a psycopg2 cursor class behind InstrumentedCursorMixin"""
+
+    rowcount = 4
+    connection = None
+
+    def execute(self, query, vars=None):
+        return None
+
+
+@pytest.fixture(autouse=True)
+def clean_stats(monkeypatch):
+    """Each test starts with an empty stats table and a 50 ms threshold"""
+    monkeypatch.setattr(slow_query_utils, "THRESHOLD_MS", 50.0)
+    slow_query_utils.reset_stats()
+    yield
+    slow_query_utils.reset_stats()
+
+
+def slow_lines(caplog):
+    return [
+        json.loads(record.message.split(": ", 1)[1])
+        for record in caplog.records
+        if record.message.startswith("Slow query:")
+    ]
+
+
+class TestNormalize:
+    """Test fingerprinting input"""
+
+    def test_literals_and_placeholders_collapse(self):
+        """Test that queries differing only in values share one fingerprint"""
+        first = normalize_sql("SELECT * FROM products WHERE id IN (%s, %s, %s) AND name = 'a''b'")
+        second = normalize_sql("SELECT *\n  FROM products WHERE id IN (7,8) AND name = %(name)s")
+
+        assert first == second == "SELECT * FROM products WHERE id IN (?, ...) AND name = ?"
+
+    def test_casts_and_identifiers_with_digits_are_kept(self):
+        """Test that ::casts and names like idx_1 are not mistaken for values"""
+        assert (
+            normalize_sql("SELECT price::text, idx_1 FROM t LIMIT 20")
+            == "SELECT price::text, idx_1 FROM t LIMIT ?"
+        )
+
+    def test_parameter_shape_hides_values(self):
+        """Test that only types reach the log"""
+        assert parameter_shape((1, "secret@example.com", [1, 2], None)) == [
+            "int",
+            "str",
+            "list[2]",
+            "null",
+        ]
+        assert parameter_shape({"email": "secret@example.com"}) == {"email": "str"}
+
+
+class TestRecord:
+    """Test the stats table and the slow log line"""
+
+    def test_stats_per_fingerprint(self):
+        """Test count, p50, p95 and max over one fingerprint"""
+        for ms in range(1, 101):
+            slow_query_utils.record("SELECT * FROM products WHERE id = %s", (ms,), float(ms))
+
+        [row] = stats_table()
+        assert row["count"] == 100 and row["slow"] == 51
+        assert row["p50_ms"] == 51.0 and row["p95_ms"] == 96.0 and row["max_ms"] == 100.0
+
+    def test_slow_statement_is_logged_without_values(self, caplog):
+        """Test the slow log line carries normalized SQL and parameter types"""
+        with caplog.at_level(logging.WARNING):
+            slow_query_utils.record(
+                "SELECT * FROM users WHERE email = %s", ("secret@example.com",), 80.0, rows=1
+            )
+            slow_query_utils.record(
+                "SELECT * FROM users WHERE email = %s", ("other@example.com",), 10.0, rows=1
+            )
+
+        [line] = slow_lines(caplog)
+        assert line["sql"] == "SELECT * FROM users WHERE email = ?"
+        assert line["parameters"] == ["str"] and line["ms"] == 80.0 and line["rows"] == 1
+        assert "secret@example.com" not in caplog.text
+
+    def test_db_utils_hook_feeds_the_stats(self, monkeypatch):
+        """Test statements of instrumented db_utils cursors are recorded"""
+        monkeypatch.setattr(db_utils, "DB_HOOKS", [slow_query_utils.on_db_event])
+
+        cursor = db_utils.instrumented_cursor(FakeCursor)()
+        cursor.execute("SELECT * FROM categories WHERE id = %s", (1,))
+        cursor.execute("SELECT * FROM categories WHERE id = %s", (2,))
+
+        [row] = stats_table()
+        assert row["sql"] == "SELECT * FROM categories WHERE id = ?" and row["count"] == 2
+
+    def test_sqlalchemy_engine_is_instrumented_without_plans_off_postgres(
+        self, caplog, monkeypatch
+    ):
+        """Test that engine statements are recorded and SQLite never gets EXPLAIN"""
+        monkeypatch.setattr(slow_query_utils, "THRESHOLD_MS", 0.0)
+        monkeypatch.setattr(slow_query_utils, "EXPLAIN_SAMPLE", 1.0)
+        engine = instrument_engine(create_engine("sqlite://", poolclass=StaticPool), force=True)
+
+        with caplog.at_level(logging.WARNING), engine.connect() as connection:
+            connection.execute(text("SELECT :value"), {"value": 1})
+
+        [line] = slow_lines(caplog)
+        assert line["source"] == "sqlalchemy" and line["plan"] is None
+        engine.dispose()
+
+    def test_full_table_still_logs_slow_statements(self, caplog, monkeypatch):
+        """Test the fingerprint cap bounds memory, not the slow log"""
+        monkeypatch.setattr(slow_query_utils, "MAX_FINGERPRINTS", 1)
+        with caplog.at_level(logging.WARNING):
+            slow_query_utils.record("SELECT 1 FROM a", None, 1.0)
+            slow_query_utils.record("SELECT 1 FROM b", None, 90.0)
+
+        assert len(stats_table()) == 1 and len(slow_lines(caplog)) == 1
+
+
+def test_stats_endpoint_requires_opt_in(monkeypatch):
+    """Test /debug/query-stats is hidden unless SLOW_QUERY_LOG is on in debug mode"""
+    client = TestClient(app)
+    monkeypatch.setattr(settings, "debug", True)
+    monkeypatch.setattr(slow_query_utils, "ENABLED", False)
+    assert client.get("/debug/query-stats").status_code == 404
+
+    monkeypatch.setattr(slow_query_utils, "ENABLED", True)
+    slow_query_utils.record("SELECT * FROM vendors", None, 5.0)
+    response = client.get("/debug/query-stats", params={"order_by": "p95_ms"})
+
+    assert (
+        response.status_code == 200
+        and response.json()["queries"][0]["sql"] == "SELECT * FROM vendors"
+    )
+    assert client.get("/debug/query-stats", params={"order_by": "sql"}).status_code == 400
+
+    monkeypatch.setattr(settings, "debug", False)
+    assert client.get("/debug/query-stats").status_code == 404
+    assert client.post("/debug/query-stats/reset").status_code == 404
+
+
+def test_stats_reset_is_a_post(monkeypatch):
+    """Test that reading the stats never clears them; only POST .../reset does"""
+    client = TestClient(app)
+    monkeypatch.setattr(settings, "debug", True)
+    monkeypatch.setattr(slow_query_utils, "ENABLED", True)
+    slow_query_utils.record("SELECT * FROM vendors", None, 5.0)
+
+    client.get("/debug/query-stats", params={"reset": "true"})
+    assert len(stats_table()) == 1
+    assert client.get("/debug/query-stats/reset").status_code == 405
+
+    assert client.post("/debug/query-stats/reset").json() == {"reset": True}
+    assert stats_table() == []
@@ -0,0 +1,166 @@
+"""
+Tests for vendor dashboard rollups
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import vendor_stats_utils
+from vendor_stats_utils import rollup_vendor_sales, get_vendor_stats
+
+
+class FakeCursor:
+    def __init__(self, results):
+        self.results = list(results)
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql, parameters=None):
+        self.executed.append((sql, parameters))
+
+    def fetchone(self):
+        return self.results.pop(0)
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.committed = False
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.committed = True
+
+
+def fake_db(monkeypatch, results):
+    cursor = FakeCursor(results)
+    conn = FakeConnection(cursor)
+
+    @contextmanager
+    def get_db_connection():
+        yield conn
+
+    monkeypatch.setattr(vendor_stats_utils, "get_db_connection", get_db_connection)
+    return cursor, conn
+
+
+class TestRollupVendorSales:
+    """Test high-water mark handling of the incremental rollup"""
+
+    def test_partial_batch_advances_mark_to_scan_end(self, monkeypatch):
+        """Test that the scan window starts before the mark and ends at the run time"""
+        mark = datetime(2024, 10, 7, 15, 0, tzinfo=timezone.utc)
+        now = mark + timedelta(minutes=5)
+        cursor, conn = fake_db(
+            monkeypatch, [(mark, now), (3, now - timedelta(seconds=30), 1, now, 2, 4, 4)]
+        )
+
+        stats = rollup_vendor_sales(batch_size=100, overlap_seconds=300)
+
+        scan = cursor.executed[1][1]
+        assert scan["scan_from"] == mark - timedelta(seconds=300)
+        assert scan["scan_to"] == now
+        assert cursor.executed[2][1][0] == now
+        assert stats["more"] is False and stats["payments"] == 3 and stats["refunds"] == 1
+        assert cursor.executed[2][1][1] == 4
+        assert conn.committed
+
+    def test_full_batch_resumes_from_last_payment_seen(self, monkeypatch):
+        """Test that a full batch only advances the mark to the last payment applied"""
+        mark = datetime(2024, 10, 7, 15, 0, tzinfo=timezone.utc)
+        last_seen = mark + timedelta(minutes=1)
+        cursor, _ = fake_db(
+            monkeypatch,
+            [(mark, mark + timedelta(minutes=5)), (2, last_seen, 0, None, 1, 1, 2)],
+        )
+
+        stats = rollup_vendor_sales(batch_size=2, overlap_seconds=0)
+
+        assert stats["more"] is True
+        assert cursor.executed[2][1][0] == last_seen
+
+    def test_full_refund_batch_resumes_from_earliest_full_stream(self, monkeypatch):
+        """Test that the mark stops at the earliest last-seen row of the full streams"""
+        mark = datetime(2024, 10, 7, 15, 0, tzinfo=timezone.utc)
+        payments_seen = mark + timedelta(minutes=3)
+        refunds_seen = mark + timedelta(minutes=1)
+        cursor, _ = fake_db(
+            monkeypatch,
+            [(mark, mark + timedelta(minutes=5)), (1, payments_seen, 2, refunds_seen, 1, 1, 3)],
+        )
+
+        stats = rollup_vendor_sales(batch_size=2, overlap_seconds=0)
+
+        assert stats["more"] is True
+        assert cursor.executed[2][1][0] == refunds_seen
+
+    def test_refunds_are_rolled_up_from_completed_refund_transactions(self):
+        """Test that refunds come from refund transactions tracked by id, not payment status"""
+        sql = vendor_stats_utils.ROLLUP_SQL
+
+        assert "t.transaction_type = 'refund'" in sql
+        assert "vendor_rollup_refunds l ON l.transaction_id = t.id" in sql
+        assert "c.status = 'refunded'" not in sql
+
+
+class TestGetVendorStats:
+    """Test the dashboard read"""
+
+    def test_totals_are_summed_from_daily_rollups(self, monkeypatch):
+        """Test that window totals come from the daily rows of the single query"""
+        daily = [
+            {
+                "day": "2024-10-06",
+                "orders_count": 2,
+                "units_sold": 3,
+                "gross_revenue": 30.5,
+                "refunds_count": 0,
+                "refunded_units": 0,
+                "refunded_amount": 0,
+                "net_revenue": 30.5,
+            },
+            {
+                "day": "2024-10-07",
+                "orders_count": 1,
+                "units_sold": 1,
+                "gross_revenue": 10.25,
+                "refunds_count": 1,
+                "refunded_units": 1,
+                "refunded_amount": 10.25,
+                "net_revenue": 0,
+            },
+        ]
+        row = {
+            "vendor_exists": True,
+            "data_as_of": datetime(2024, 10, 7, tzinfo=timezone.utc),
+            "daily": daily,
+            "top_products": [],
+            "stock_outs": [],
+        }
+        monkeypatch.setattr(
+            vendor_stats_utils, "execute_single_query", lambda sql, parameters=None: row
+        )
+
+        stats = get_vendor_stats(1, days=7)
+
+        assert stats["totals"]["orders_count"] == 3
+        assert stats["totals"]["gross_revenue"] == 40.75
+        assert stats["totals"]["net_revenue"] == 30.5
+        assert stats["period"]["days"] == 7
+
+    def test_unknown_vendor_returns_none(self, monkeypatch):
+        """Test that a missing vendor is reported instead of empty stats"""
+        monkeypatch.setattr(
+            vendor_stats_utils,
+            "execute_single_query",
+            lambda sql, parameters=None: {"vendor_exists": False},
+        )
+
+        assert get_vendor_stats(99, days=7) is None
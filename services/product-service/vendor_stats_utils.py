@@ -0,0 +1,306 @@
+"""
+Vendor dashboard utilities for Gamarriando Product Service
+
+Sales are rolled up per vendor and day (and per product and day) by an
+incremental batch job: each run scans payments and refund transactions
+changed since the stored high-water mark, minus a small overlap for late
+commits, and applies only the ones the vendor_rollup_payments /
+vendor_rollup_refunds ledgers have not seen.
+The stats endpoint reads the rollups in one round trip, so its cost depends
+on the requested window, not on the size of the order history.
+"""
+
+import os
+import time
+import logging
+from datetime import date, timedelta
+from typing import Dict, Any, Optional
+
+from db_utils import get_db_connection, execute_single_query
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "vendor_sales"
+
+
+def get_vendor_stats_config() -> Dict[str, Any]:
+    """Get vendor stats configuration from environment variables"""
+    return {
+        "rollup_batch_size": int(os.getenv("VENDOR_ROLLUP_BATCH_SIZE", "5000")),
+        "rollup_overlap_seconds": int(os.getenv("VENDOR_ROLLUP_OVERLAP_SECONDS", "300")),
+        "default_days": int(os.getenv("VENDOR_STATS_DEFAULT_DAYS", "30")),
+        "max_days": int(os.getenv("VENDOR_STATS_MAX_DAYS", "366")),
+    }
+
+
+# Two streams over (high-water mark - overlap, now], each deduplicated by its own ledger:
+# payments that reached a paid state add the sale once, and completed refund
+# transactions add the refunded amount (partial or full) on the day they completed.
+# A refund is split across the order's lines in proportion to their total_price, with
+# the rounding remainder on the largest line; refunded units are only counted when the
+# refund covers the whole payment.
+ROLLUP_SQL = """
+    WITH changed AS (
+        SELECT p.id, p.order_id, p.status, p.updated_at
+        FROM payments p
+        LEFT JOIN vendor_rollup_payments l ON l.payment_id = p.id
+        WHERE p.updated_at > %(scan_from)s
+          AND p.updated_at <= %(scan_to)s
+          AND p.status IN ('completed', 'refunding', 'refunded')
+          AND l.payment_id IS NULL
+        ORDER BY p.updated_at, p.id
+        LIMIT %(batch_size)s
+    ), refunds AS (
+        SELECT t.id, t.amount, t.updated_at, p.order_id, t.amount >= p.amount AS full_refund
+        FROM transactions t
+        JOIN payments p ON p.id = t.payment_id
+        LEFT JOIN vendor_rollup_refunds l ON l.transaction_id = t.id
+        WHERE t.transaction_type = 'refund'
+          AND t.status = 'completed'
+          AND t.updated_at > %(scan_from)s
+          AND t.updated_at <= %(scan_to)s
+          AND l.transaction_id IS NULL
+        ORDER BY t.updated_at, t.id
+        LIMIT %(batch_size)s
+    ), refund_shares AS (
+        SELECT r.id AS refund_id, r.order_id, r.updated_at, r.amount, r.full_refund,
+               oi.product_id, oi.quantity,
+               ROUND(r.amount * oi.total_price
+                     / NULLIF(SUM(oi.total_price) OVER (PARTITION BY r.id), 0), 2) AS share,
+               ROW_NUMBER() OVER (PARTITION BY r.id ORDER BY oi.total_price DESC, oi.id) AS rn
+        FROM refunds r
+        JOIN order_items oi ON oi.order_id = r.order_id
+    ), refund_lines AS (
+        SELECT order_id, updated_at, product_id,
+               CASE WHEN full_refund THEN quantity ELSE 0 END AS refunded_units,
+               COALESCE(share, 0)
+               + CASE WHEN rn = 1
+                      THEN amount - COALESCE(SUM(share) OVER (PARTITION BY refund_id), 0)
+                      ELSE 0 END AS refunded_amount
+        FROM refund_shares
+    ), lines AS (
+        SELECT pr.vendor_id, oi.product_id, c.order_id,
+               (c.updated_at AT TIME ZONE 'UTC')::date AS day,
+               oi.quantity AS units_sold,
+               oi.total_price AS revenue,
+               0 AS refunded_units,
+               0 AS refunded_amount
+        FROM changed c
+        JOIN order_items oi ON oi.order_id = c.order_id
+        JOIN products pr ON pr.id = oi.product_id
+        UNION ALL
+        SELECT pr.vendor_id, rl.product_id, rl.order_id,
+               (rl.updated_at AT TIME ZONE 'UTC')::date AS day,
+               0 AS units_sold,
+               0 AS revenue,
+               rl.refunded_units,
+               rl.refunded_amount
+        FROM refund_lines rl
+        JOIN products pr ON pr.id = rl.product_id
+    ), product_rollup AS (
+        INSERT INTO vendor_product_daily_sales AS s
+            (vendor_id, day, product_id, units_sold, revenue, refunded_units, refunded_amount,
+             updated_at)
+        SELECT vendor_id, day, product_id, SUM(units_sold), SUM(revenue),
+               SUM(refunded_units), SUM(refunded_amount), NOW()
+        FROM lines
+        GROUP BY vendor_id, day, product_id
+        ON CONFLICT (vendor_id, day, product_id) DO UPDATE SET
+            units_sold = s.units_sold + EXCLUDED.units_sold,
+            revenue = s.revenue + EXCLUDED.revenue,
+            refunded_units = s.refunded_units + EXCLUDED.refunded_units,
+            refunded_amount = s.refunded_amount + EXCLUDED.refunded_amount,
+            updated_at = NOW()
+        RETURNING 1
+    ), vendor_rollup AS (
+        INSERT INTO vendor_daily_sales AS s
+            (vendor_id, day, orders_count, units_sold, gross_revenue,
+             refunds_count, refunded_units, refunded_amount, updated_at)
+        SELECT vendor_id, day,
+               COUNT(DISTINCT order_id) FILTER (WHERE units_sold > 0),
+               SUM(units_sold), SUM(revenue),
+               COUNT(DISTINCT order_id) FILTER (WHERE refunded_amount > 0),
+               SUM(refunded_units), SUM(refunded_amount), NOW()
+        FROM lines
+        GROUP BY vendor_id, day
+        ON CONFLICT (vendor_id, day) DO UPDATE SET
+            orders_count = s.orders_count + EXCLUDED.orders_count,
+            units_sold = s.units_sold + EXCLUDED.units_sold,
+            gross_revenue = s.gross_revenue + EXCLUDED.gross_revenue,
+            refunds_count = s.refunds_count + EXCLUDED.refunds_count,
+            refunded_units = s.refunded_units + EXCLUDED.refunded_units,
+            refunded_amount = s.refunded_amount + EXCLUDED.refunded_amount,
+            updated_at = NOW()
+        RETURNING 1
+    ), payment_ledger AS (
+        INSERT INTO vendor_rollup_payments (payment_id, state, rolled_up_at)
+        SELECT id, status, NOW() FROM changed
+        ON CONFLICT (payment_id) DO NOTHING
+        RETURNING 1
+    ), refund_ledger AS (
+        INSERT INTO vendor_rollup_refunds (transaction_id, rolled_up_at)
+        SELECT id, NOW() FROM refunds
+        ON CONFLICT (transaction_id) DO NOTHING
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM changed) AS payments,
+           (SELECT MAX(updated_at) FROM changed) AS payments_last_seen,
+           (SELECT COUNT(*) FROM refunds) AS refunds,
+           (SELECT MAX(updated_at) FROM refunds) AS refunds_last_seen,
+           (SELECT COUNT(*) FROM vendor_rollup) AS vendor_days,
+           (SELECT COUNT(*) FROM product_rollup) AS product_days,
+           (SELECT COUNT(*) FROM payment_ledger) + (SELECT COUNT(*) FROM refund_ledger)
+               AS ledger_rows
+"""
+
+
+def rollup_vendor_sales(
+    batch_size: Optional[int] = None, overlap_seconds: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Apply one batch of paid payments and completed refunds to the daily rollups
+    and advance the high-water mark, all in one transaction. Returns the batch
+    stats; 'more' is True when either stream filled its batch and another run
+    should follow.
+    """
+    config = get_vendor_stats_config()
+    batch_size = batch_size or config["rollup_batch_size"]
+    overlap = timedelta(
+        seconds=config["rollup_overlap_seconds"] if overlap_seconds is None else overlap_seconds
+    )
+    started = time.perf_counter()
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            # Locking the watermark row serializes concurrent runs
+            cursor.execute(
+                "SELECT high_water_mark, NOW() FROM rollup_watermarks WHERE name = %s FOR UPDATE",
+                (WATERMARK_NAME,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                raise RuntimeError(
+                    "rollup_watermarks has no 'vendor_sales' row; run migrations/vendor_stats.sql"
+                )
+            high_water_mark, now = row
+
+            cursor.execute(
+                ROLLUP_SQL,
+                {"scan_from": high_water_mark - overlap, "scan_to": now, "batch_size": batch_size},
+            )
+            (
+                payments,
+                payments_last_seen,
+                refunds,
+                refunds_last_seen,
+                vendor_days,
+                product_days,
+                _,
+            ) = cursor.fetchone()
+
+            # A full stream may have stopped mid-window: resume from the earliest row
+            # seen by a full stream (the ledgers skip what is re-scanned)
+            resume_from = [
+                last_seen
+                for count, last_seen in (
+                    (payments, payments_last_seen),
+                    (refunds, refunds_last_seen),
+                )
+                if count >= batch_size
+            ]
+            more = bool(resume_from)
+            new_mark = min(resume_from) if more else now
+            cursor.execute(
+                """
+                UPDATE rollup_watermarks
+                SET high_water_mark = GREATEST(high_water_mark, %s), last_run_at = NOW(),
+                    last_run_rows = %s
+                WHERE name = %s
+            """,
+                (new_mark, payments + refunds, WATERMARK_NAME),
+            )
+        conn.commit()
+
+    return {
+        "payments": payments,
+        "refunds": refunds,
+        "vendor_days": vendor_days,
+        "product_days": product_days,
+        "high_water_mark": new_mark.isoformat() if new_mark else None,
+        "more": more,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+# Everything the dashboard shows, from the rollups and one partial index, in one round trip
+STATS_SQL = """
+    SELECT
+        EXISTS (SELECT 1 FROM vendors WHERE id = %(vendor_id)s) AS vendor_exists,
+        (SELECT high_water_mark FROM rollup_watermarks WHERE name = %(watermark)s) AS data_as_of,
+        (SELECT COALESCE(json_agg(d ORDER BY d.day), '[]'::json) FROM (
+            SELECT day, orders_count, units_sold, gross_revenue, refunds_count, refunded_units,
+                   refunded_amount, gross_revenue - refunded_amount AS net_revenue
+            FROM vendor_daily_sales
+            WHERE vendor_id = %(vendor_id)s AND day >= %(since)s
+        ) d) AS daily,
+        (SELECT COALESCE(json_agg(t), '[]'::json) FROM (
+            SELECT s.product_id, p.name, p.slug,
+                   SUM(s.units_sold) - SUM(s.refunded_units) AS units_sold,
+                   SUM(s.revenue) - SUM(s.refunded_amount) AS net_revenue
+            FROM vendor_product_daily_sales s
+            LEFT JOIN products p ON p.id = s.product_id
+            WHERE s.vendor_id = %(vendor_id)s AND s.day >= %(since)s
+            GROUP BY s.product_id, p.name, p.slug
+            ORDER BY net_revenue DESC, units_sold DESC, s.product_id
+            LIMIT %(top)s
+        ) t) AS top_products,
+        (SELECT COALESCE(json_agg(o), '[]'::json) FROM (
+            SELECT id AS product_id, name, slug, stock, status, updated_at
+            FROM products
+            WHERE vendor_id = %(vendor_id)s AND stock <= 0
+            ORDER BY updated_at DESC
+            LIMIT %(stockout_limit)s
+        ) o) AS stock_outs
+"""
+
+
+def get_vendor_stats(
+    vendor_id: int, days: int, top: int = 10, stockout_limit: int = 50
+) -> Optional[Dict[str, Any]]:
+    """Dashboard aggregates for the last `days` days; None when the vendor does not exist"""
+    since = date.today() - timedelta(days=days - 1)
+    row = execute_single_query(
+        STATS_SQL,
+        {
+            "vendor_id": vendor_id,
+            "watermark": WATERMARK_NAME,
+            "since": since,
+            "top": top,
+            "stockout_limit": stockout_limit,
+        },
+    )
+    if not row or not row["vendor_exists"]:
+        return None
+
+    daily = row["daily"]
+    totals = {
+        key: round(sum(day[key] for day in daily), 2)
+        for key in (
+            "orders_count",
+            "units_sold",
+            "gross_revenue",
+            "refunds_count",
+            "refunded_units",
+            "refunded_amount",
+            "net_revenue",
+        )
+    }
+    return {
+        "vendor_id": str(vendor_id),
+        "period": {"days": days, "from": since.isoformat(), "to": date.today().isoformat()},
+        "data_as_of": row["data_as_of"].isoformat() if row["data_as_of"] else None,
+        "totals": totals,
+        "sales_by_day": daily,
+        "top_products": row["top_products"],
+        "stock_outs": row["stock_outs"],
+    }
@@ -5,6 +5,7 @@ Authentication and JWT utilities for Gamarriando User Service
 import os
 import secrets
 import hashlib
+from functools import wraps
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import jwt
@@ -12,6 +13,8 @@ from passlib.context import CryptContext
 from passlib.hash import bcrypt
 import logging
 
+from timing_utils import span
+
 logger = logging.getLogger(__name__)
 
 # Password hashing context
@@ -33,11 +36,13 @@ def hash_password(password: str) -> str:
     if len(password.encode('utf-8')) > 72:
         password = password[:72]
     # Use bcrypt directly with proper configuration
-    return bcrypt.hash(password, rounds=BCRYPT_ROUNDS)
+    with span('auth'):
+        return bcrypt.hash(password, rounds=BCRYPT_ROUNDS)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    with span('auth'):
+        return pwd_context.verify(plain_password, hashed_password)
 
 def generate_token(user_id: int, email: str, username: str, roles: list, 
                   token_type: str = 'access') -> str:
@@ -176,6 +181,7 @@ def get_user_from_token(token: str) -> Optional[Dict[str, Any]]:
 def require_roles(required_roles: list):
     """Decorator to require specific roles"""
     def decorator(func):
+        @wraps(func)
         def wrapper(event, context):
             # Extract token from Authorization header
             headers = event.get('headers', {})
@@ -202,7 +208,8 @@ def require_roles(required_roles: list):
                     'body': '{"message": "Invalid authorization header format"}'
                 }
             
-            user = get_user_from_token(token)
+            with span('auth'):
+                user = get_user_from_token(token)
             if not user:
                 return {
                     'statusCode': 401,
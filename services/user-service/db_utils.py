@@ -3,14 +3,24 @@ Database utilities for Gamarriando User Service using psycopg2
 """
 
 import os
+import time
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
 import logging
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Callable
 from contextlib import contextmanager
 
+import slow_query_utils
+
 logger = logging.getLogger(__name__)
 
+# Public user columns, shared by the batch lookup and the users_list spec
+USER_COLUMNS = """id, email, username, first_name, last_name, phone, date_of_birth,
+                is_active, is_verified, is_admin, profile_picture_url, preferences,
+                last_login_at, created_at, updated_at"""
+
 def get_db_config() -> Dict[str, str]:
     """Get database configuration from environment variables"""
     return {
@@ -21,13 +31,79 @@ def get_db_config() -> Dict[str, str]:
         'password': os.getenv('DB_PASSWORD', '')
     }
 
+# Observers of database activity, called as hook(event, elapsed_ms, **details):
+# 'connect' when a connection opens, 'query' after every cursor.execute with
+# sql, parameters, rows (cursor.rowcount) and cursor. timing_utils registers one,
+# slow_query_utils another when SLOW_QUERY_LOG=true.
+DB_HOOKS: List[Callable[..., None]] = []
+
+def add_db_hook(hook: Callable[..., None]) -> None:
+    """Register a database activity observer (once)"""
+    if hook not in DB_HOOKS:
+        DB_HOOKS.append(hook)
+
+def remove_db_hook(hook: Callable[..., None]) -> None:
+    """Unregister a database activity observer"""
+    if hook in DB_HOOKS:
+        DB_HOOKS.remove(hook)
+
+def _notify(event: str, elapsed_ms: float, **details) -> None:
+    for hook in list(DB_HOOKS):
+        try:
+            hook(event, elapsed_ms, **details)
+        except Exception as e:
+            # Instrumentation must never fail the query it observes
+            logger.warning(f"Database hook error: {str(e)}")
+
+if slow_query_utils.ENABLED:
+    add_db_hook(slow_query_utils.on_db_event)
+
+class InstrumentedCursorMixin:
+    """Times execute/executemany and reports them to DB_HOOKS"""
+
+    def execute(self, query, vars=None):
+        if not DB_HOOKS:
+            return super().execute(query, vars)
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            _notify('query', (time.perf_counter() - started) * 1000,
+                    sql=query, parameters=vars, rows=self.rowcount, cursor=self)
+
+    def executemany(self, query, vars_list):
+        if not DB_HOOKS:
+            return super().executemany(query, vars_list)
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            _notify('query', (time.perf_counter() - started) * 1000,
+                    sql=query, parameters=None, rows=self.rowcount, cursor=self)
+
+@lru_cache(maxsize=None)
+def instrumented_cursor(cursor_factory: type) -> type:
+    """The cursor class with InstrumentedCursorMixin in front, e.g. for RealDictCursor"""
+    return type(f"Instrumented{cursor_factory.__name__}", (InstrumentedCursorMixin, cursor_factory), {})
+
+class InstrumentedConnection(psycopg2.extensions.connection):
+    """Connection whose cursors, of whatever factory, report to DB_HOOKS"""
+
+    def cursor(self, *args, **kwargs):
+        factory = kwargs.get('cursor_factory') or self.cursor_factory or psycopg2.extensions.cursor
+        kwargs['cursor_factory'] = instrumented_cursor(factory)
+        return super().cursor(*args, **kwargs)
+
 @contextmanager
 def get_db_connection():
     """Get database connection with automatic cleanup"""
     config = get_db_config()
     conn = None
     try:
-        conn = psycopg2.connect(**config)
+        started = time.perf_counter()
+        conn = psycopg2.connect(**config, connection_factory=InstrumentedConnection)
+        if DB_HOOKS:
+            _notify('connect', (time.perf_counter() - started) * 1000)
         yield conn
     except Exception as e:
         if conn:
@@ -291,64 +367,15 @@ def verify_user_email(user_id: int) -> int:
     sql = "UPDATE users SET is_verified = true, updated_at = NOW() WHERE id = %s"
     return execute_update(sql, (user_id,))
 
-def get_users_with_pagination(limit: int = 10, offset: int = 0, 
-                            filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
-    """Get users with pagination and optional filters"""
-    where_conditions = ["is_active = true"]
-    parameters = []
-    
-    if filters:
-        if filters.get('is_verified') is not None:
-            where_conditions.append("is_verified = %s")
-            parameters.append(filters['is_verified'])
-        
-        if filters.get('is_admin') is not None:
-            where_conditions.append("is_admin = %s")
-            parameters.append(filters['is_admin'])
-        
-        if filters.get('search'):
-            where_conditions.append("(email ILIKE %s OR username ILIKE %s OR first_name ILIKE %s OR last_name ILIKE %s)")
-            search_term = f"%{filters['search']}%"
-            parameters.extend([search_term, search_term, search_term, search_term])
-    
-    where_clause = " AND ".join(where_conditions)
-    parameters.extend([limit, offset])
-    
+def get_users_by_ids(user_ids: List[int]) -> List[Dict[str, Any]]:
+    """Get active users for a list of IDs in one query, in the order of user_ids"""
     sql = f"""
-        SELECT id, email, username, first_name, last_name, phone, date_of_birth,
-               is_active, is_verified, is_admin, profile_picture_url, preferences,
-               last_login_at, created_at, updated_at
+        SELECT {USER_COLUMNS}
         FROM users
-        WHERE {where_clause}
-        ORDER BY created_at DESC
-        LIMIT %s OFFSET %s
+        WHERE id = ANY(%s) AND is_active = true
     """
-    return execute_query(sql, tuple(parameters))
-
-def count_users(filters: Dict[str, Any] = None) -> int:
-    """Count total users with optional filters"""
-    where_conditions = ["is_active = true"]
-    parameters = []
-    
-    if filters:
-        if filters.get('is_verified') is not None:
-            where_conditions.append("is_verified = %s")
-            parameters.append(filters['is_verified'])
-        
-        if filters.get('is_admin') is not None:
-            where_conditions.append("is_admin = %s")
-            parameters.append(filters['is_admin'])
-        
-        if filters.get('search'):
-            where_conditions.append("(email ILIKE %s OR username ILIKE %s OR first_name ILIKE %s OR last_name ILIKE %s)")
-            search_term = f"%{filters['search']}%"
-            parameters.extend([search_term, search_term, search_term, search_term])
-    
-    where_clause = " AND ".join(where_conditions)
-    
-    sql = f"SELECT COUNT(*) as count FROM users WHERE {where_clause}"
-    result = execute_single_query(sql, tuple(parameters))
-    return result['count'] if result else 0
+    users_by_id = {user['id']: user for user in execute_query(sql, (list(user_ids),))}
+    return [users_by_id[user_id] for user_id in user_ids if user_id in users_by_id]
 
 def cleanup_expired_sessions() -> int:
     """Clean up expired sessions"""
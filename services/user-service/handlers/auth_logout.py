@@ -16,10 +16,12 @@ from response_utils import (
     success_response, error_response, unauthorized_response,
     cors_response, extract_headers, log_request, log_response
 )
+from timing_utils import timed_handler
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     try:
         log_request(event, context, 'auth_logout')
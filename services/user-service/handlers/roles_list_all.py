@@ -15,10 +15,12 @@ from response_utils import (
     success_response, error_response,
     cors_response, log_request, log_response
 )
+from timing_utils import timed_handler
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+@timed_handler
 @require_auth
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     try:
@@ -10,16 +10,34 @@ import sys
 from typing import Dict, Any
 
 sys.path.append('/var/task')
-from db_utils import get_users_with_pagination, count_users
+from db_utils import USER_COLUMNS, get_users_by_ids
+from query_utils import ListSpec, FilterField, fetch_page, parse_bool, parse_datetime
 from auth_utils import require_admin, format_user_response
 from response_utils import (
     success_response, error_response, bad_request_response,
-    cors_response, extract_query_parameters, paginate_results, log_request, log_response
+    cors_response, extract_query_parameters, extract_id_list, paginate_results, log_request, log_response
 )
+from timing_utils import timed_handler
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+USERS_LIST = ListSpec(
+    table='users',
+    columns=USER_COLUMNS,
+    filters={
+        'is_verified': FilterField('is_verified', parse_bool),
+        'is_admin': FilterField('is_admin', parse_bool),
+        'created_at': FilterField('created_at', parse_datetime, ('gte', 'lte')),
+        'last_login_at': FilterField('last_login_at', parse_datetime, ('gte', 'lte'))
+    },
+    # Each sort key has a partial (column, id) index: migrations/list_sort_indexes.sql
+    sort_fields={'created_at': 'created_at', 'email': 'email'},
+    search_columns=('email', 'username', 'first_name', 'last_name'),
+    base_conditions=('is_active = true',)
+)
+
+@timed_handler
 @require_admin
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     try:
@@ -32,6 +50,20 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Extract query parameters
         query_params = extract_query_parameters(event)
         
+        # Batch mode: ?ids=1,2,3 returns those users in request order
+        user_ids = extract_id_list(query_params)
+        if user_ids is not None:
+            users = get_users_by_ids(user_ids)
+            found_ids = {user['id'] for user in users}
+            batch_data = {
+                'users': [format_user_response(user) for user in users],
+                'missing_ids': [str(user_id) for user_id in user_ids if user_id not in found_ids],
+                'total': len(users)
+            }
+            response = success_response(batch_data, f"Retrieved {len(users)} of {len(user_ids)} users")
+            log_response(response, 'users_list')
+            return response
+        
         # Parse pagination parameters
         try:
             page = int(query_params.get('page', '1'))
@@ -46,28 +78,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         except ValueError:
             return bad_request_response("Invalid pagination parameters")
         
-        # Parse filter parameters
-        filters = {}
-        
-        # Boolean filters
-        if query_params.get('is_verified') is not None:
-            filters['is_verified'] = query_params['is_verified'].lower() == 'true'
-        
-        if query_params.get('is_admin') is not None:
-            filters['is_admin'] = query_params['is_admin'].lower() == 'true'
-        
-        # Search filter
-        if query_params.get('search'):
-            filters['search'] = query_params['search'].strip()
-        
         # Calculate offset
         offset = (page - 1) * per_page
         
-        # Get users with pagination
-        users = get_users_with_pagination(per_page, offset, filters)
-        
-        # Get total count for pagination
-        total_count = count_users(filters)
+        # Filters, search and sort are validated against USERS_LIST and compiled
+        # into one statement that also returns the total
+        users, total_count, list_query = fetch_page(USERS_LIST, query_params, offset, per_page)
         
         # Format user responses
         formatted_users = []
@@ -78,6 +94,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Create paginated response
         paginated_data = {
             'users': formatted_users,
+            'sort': list_query.sort,
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -0,0 +1,169 @@
+"""
+Request logging for Gamarriando User Service Lambda handlers
+
+log_request/log_response replace logging json.dumps(event): the whole API
+Gateway event (headers, requestContext, the body with passwords) is never
+serialized. Instead a small summary is built, and only when it will be written:
+
+- Sampling: REQUEST_LOG_SAMPLE_RATE (0..1) of requests are logged, decided once
+  per request from its request id so the request and response lines agree.
+  Responses with status >= 500 are always logged.
+- Laziness: nothing is built when INFO is disabled or the request is sampled
+  out; a sampled-out call costs one dict lookup and a comparison.
+- Redaction: values under sensitive keys (password, token, authorization, ...
+  plus LOG_REDACT_KEYS) are replaced before anything is formatted. Bodies are
+  logged by length only.
+- Format: one compact JSON object per line (LazyJson), serialized by the
+  logging handler only if the record is emitted.
+"""
+
+import json
+import logging
+import os
+import random
+import zlib
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVICE = "user-service"
+SAMPLE_RATE = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "1.0"))
+REDACTED = "[REDACTED]"
+REDACT_KEYS = frozenset(
+    {
+        "password",
+        "new_password",
+        "current_password",
+        "old_password",
+        "token",
+        "access_token",
+        "refresh_token",
+        "reset_token",
+        "authorization",
+        "cookie",
+        "set-cookie",
+        "secret",
+        "api_key",
+        "x-api-key",
+        "card_number",
+        "cvv",
+        "x-amz-security-token",
+    }
+    | {key.strip().lower() for key in os.getenv("LOG_REDACT_KEYS", "").split(",") if key.strip()}
+)
+# Headers worth keeping; everything else (cookies, auth, tracing noise) is dropped
+LOGGED_HEADERS = (
+    "user-agent",
+    "content-type",
+    "content-length",
+    "idempotency-key",
+    "x-amzn-trace-id",
+)
+
+_sampled: ContextVar = ContextVar("request_log_sampled", default=None)
+
+
+class LazyJson:
+    """Log message serialized to compact JSON only when a handler formats it"""
+
+    __slots__ = ("build",)
+
+    def __init__(self, build: Callable[[], Dict[str, Any]]):
+        self.build = build
+
+    def __str__(self) -> str:
+        return json.dumps(self.build(), separators=(",", ":"), default=str)
+
+
+def redact(value: Any) -> Any:
+    """Copy of a dict/list with sensitive keys masked"""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if str(key).lower() in REDACT_KEYS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def is_sampled(request_id: Optional[str]) -> bool:
+    """Same answer for every call with the same request id"""
+    if SAMPLE_RATE >= 1:
+        return True
+    if SAMPLE_RATE <= 0:
+        return False
+    if not request_id:
+        return random.random() < SAMPLE_RATE
+    return zlib.crc32(request_id.encode("utf-8")) % 10000 < SAMPLE_RATE * 10000
+
+
+def _request_id(event: Dict[str, Any], context: Any) -> Optional[str]:
+    return getattr(context, "aws_request_id", None) or (event.get("requestContext") or {}).get(
+        "requestId"
+    )
+
+
+def summarize_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """What is worth knowing about an event, without its body or secrets"""
+    if "httpMethod" not in event and "requestContext" not in event:
+        # Scheduled and queue events
+        return {
+            "source": event.get("source"),
+            "detail_type": event.get("detail-type"),
+            "records": len(event["Records"]) if isinstance(event.get("Records"), list) else None,
+        }
+    headers = {str(key).lower(): value for key, value in (event.get("headers") or {}).items()}
+    body = event.get("body")
+    return {
+        "method": event.get("httpMethod"),
+        "path": event.get("path"),
+        "path_parameters": redact(event.get("pathParameters")),
+        "query": redact(event.get("queryStringParameters")),
+        "headers": {key: headers[key] for key in LOGGED_HEADERS if key in headers},
+        "body_length": len(body) if isinstance(body, str) else None,
+    }
+
+
+def log_request(event: Dict[str, Any], context: Any, function_name: str) -> None:
+    """One sampled, redacted INFO line for an incoming event"""
+    request_id = _request_id(event, context)
+    sampled = is_sampled(request_id)
+    _sampled.set(sampled)
+    if not sampled or not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info(
+        LazyJson(
+            lambda: {
+                "event": "request",
+                "service": SERVICE,
+                "handler": function_name,
+                "request_id": request_id,
+                **summarize_event(event),
+            }
+        )
+    )
+
+
+def log_response(response: Dict[str, Any], function_name: str) -> None:
+    """One line for the response: sampled like its request, always for 5xx"""
+    status_code = response.get("statusCode") if isinstance(response, dict) else None
+    failed = isinstance(status_code, int) and status_code >= 500
+    level = logging.ERROR if failed else logging.INFO
+    # None: no log_request in this request, so nothing to agree with
+    sampled = _sampled.get() is not False
+    if not (failed or sampled) or not logger.isEnabledFor(level):
+        return
+    logger.log(
+        level,
+        LazyJson(
+            lambda: {
+                "event": "response",
+                "service": SERVICE,
+                "handler": function_name,
+                "status": status_code,
+                "body_length": len(response.get("body") or ""),
+            }
+        ),
+    )
@@ -0,0 +1,13 @@
+-- Gamarriando User Service - Indexes behind the users list sort keys
+-- USERS_LIST always filters on is_active = true and sorts by its key and then id,
+-- so each sort key gets a partial (column, id) index with the same predicate:
+-- "ORDER BY created_at DESC, id DESC LIMIT n" is then an index range scan over
+-- active users only, with a stable order for users created in the same instant.
+-- Run after user_tables.sql with psql (CONCURRENTLY cannot run inside a transaction).
+
+-- Sort columns must be NOT NULL for the tiebreaker order to be total
+UPDATE users SET created_at = NOW() WHERE created_at IS NULL;
+ALTER TABLE users ALTER COLUMN created_at SET NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_active_created_at_id ON users(created_at, id) WHERE is_active = true;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_active_email_id ON users(email, id) WHERE is_active = true;
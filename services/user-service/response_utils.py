@@ -2,12 +2,17 @@
 Common response utilities for Gamarriando User Service Lambda functions
 """
 
+import os
 import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime, date
 from decimal import Decimal
 
+from timing_utils import json_body
+# Sampled, redacted request/response logging, re-exported for the handlers
+from log_utils import log_request, log_response  # noqa: F401
+
 logger = logging.getLogger(__name__)
 
 class JSONEncoder(json.JSONEncoder):
@@ -34,7 +39,7 @@ def success_response(data: Any = None, message: str = "Success", status_code: in
             'Access-Control-Allow-Headers': 'Content-Type, Authorization',
             'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS'
         },
-        'body': json.dumps(response_data, cls=JSONEncoder)
+        'body': json_body(response_data, cls=JSONEncoder)
     }
 
 def created_response(data: Any = None, message: str = "Created successfully") -> Dict[str, Any]:
@@ -59,7 +64,7 @@ def error_response(message: str, status_code: int = 500, error: str = None, deta
             'Access-Control-Allow-Headers': 'Content-Type, Authorization',
             'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS'
         },
-        'body': json.dumps(response_data, cls=JSONEncoder)
+        'body': json_body(response_data, cls=JSONEncoder)
     }
 
 def bad_request_response(message: str, details: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -133,6 +138,31 @@ def extract_headers(event: Dict[str, Any]) -> Dict[str, str]:
     """Extract headers from Lambda event"""
     return event.get('headers', {}) or {}
 
+def extract_id_list(query_params: Dict[str, str], name: str = 'ids', max_ids: int = None) -> Optional[List[int]]:
+    """Parse a comma-separated id list (?ids=1,2,3) into unique ids in request order"""
+    raw = query_params.get(name)
+    if raw is None:
+        return None
+    
+    max_ids = max_ids or int(os.getenv('BATCH_GET_MAX_IDS', '100'))
+    ids = []
+    for part in raw.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            value = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid id '{part}' in {name}")
+        if value not in ids:
+            ids.append(value)
+    
+    if not ids:
+        raise ValueError(f"{name} must contain at least one id")
+    if len(ids) > max_ids:
+        raise ValueError(f"{name} accepts at most {max_ids} ids, got {len(ids)}")
+    return ids
+
 def get_user_id_from_path(event: Dict[str, Any]) -> Optional[int]:
     """Extract user_id from path parameters"""
     path_params = extract_path_parameters(event)
@@ -202,25 +232,3 @@ def paginate_results(results: list, page: int = 1, per_page: int = 10) -> Dict[s
             'has_prev': page > 1
         }
     }
-
-def log_request(event: Dict[str, Any], context: Any, function_name: str):
-    """Log request details for debugging"""
-    request_data = {
-        'httpMethod': event.get('httpMethod'),
-        'path': event.get('path'),
-        'pathParameters': event.get('pathParameters'),
-        'queryStringParameters': event.get('queryStringParameters'),
-        'headers': {k: v for k, v in event.get('headers', {}).items() 
-                   if k.lower() not in ['authorization', 'cookie']},
-        'requestId': context.aws_request_id if context else None
-    }
-    logger.info(f"{function_name} - Request: {json.dumps(request_data, cls=JSONEncoder)}")
-
-def log_response(response: Dict[str, Any], function_name: str):
-    """Log response details for debugging"""
-    response_data = {
-        'statusCode': response.get('statusCode'),
-        'headers': response.get('headers'),
-        'body': response.get('body')[:500] + '...' if len(response.get('body', '')) > 500 else response.get('body')
-    }
-    logger.info(f"{function_name} - Response: {json.dumps(response_data, cls=JSONEncoder)}")
@@ -97,6 +97,16 @@ else
     exit 1
 fi
 
+# Sortable list keys get (column, id) indexes, created concurrently outside a transaction
+SORT_INDEXES_FILE="$SCRIPT_DIR/../migrations/list_sort_indexes.sql"
+echo -e "${YELLOW}🔄 Creating list sort indexes...${NC}"
+if PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" -f "$SORT_INDEXES_FILE"; then
+    echo -e "${GREEN}✅ List sort indexes created successfully!${NC}"
+else
+    echo -e "${RED}❌ Error: List sort indexes migration failed${NC}"
+    exit 1
+fi
+
 # Verify the tables were created
 echo -e "${YELLOW}🔍 Verifying table creation...${NC}"
 TABLES=$(PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" -t -c "
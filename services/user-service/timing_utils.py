@@ -0,0 +1,195 @@
+"""
+Request timing for Gamarriando User Service Lambda handlers
+
+@timed_handler wraps a lambda_handler and records where each request's time
+went: auth, db_connect, db (every statement run through db_utils, with its row
+count), serialize (response JSON encoding) and total. When the handler returns
+it writes one CloudWatch Embedded Metric Format (EMF) JSON line to stdout, which
+CloudWatch turns into metrics without any API call. With DEBUG=true it also adds
+a Server-Timing header to HTTP responses; it stays off by default because it
+exposes per-request database timings to any client.
+
+Code marks its own phases with `with span('auth'): ...`; spans are no-ops
+outside a timed request. Set REQUEST_TIMING=false to turn it all off.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+import db_utils
+
+SERVICE = "user-service"
+NAMESPACE = os.getenv("METRICS_NAMESPACE", "Gamarriando")
+ENABLED = os.getenv("REQUEST_TIMING", "true").lower() == "true"
+SERVER_TIMING_HEADER = os.getenv("DEBUG", "false").lower() == "true"
+# Statements listed in the log line; the counts and totals always cover all of them
+MAX_LOGGED_STATEMENTS = int(os.getenv("TIMING_MAX_STATEMENTS", "20"))
+
+STANDARD_SPANS = ("auth", "db_connect", "db", "serialize")
+
+_current: ContextVar = ContextVar("request_timing", default=None)
+
+
+class RequestTiming:
+    """Accumulated span durations and statements of one request"""
+
+    def __init__(self, handler: str):
+        self.handler = handler
+        self.started = time.perf_counter()
+        self.spans: Dict[str, float] = {}
+        self.statements: List[Dict[str, Any]] = []
+
+    def add(self, name: str, elapsed_ms: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + elapsed_ms
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """The timing of the request being handled, if any"""
+    return _current.get()
+
+
+@contextmanager
+def span(name: str):
+    """Add the duration of the block to the current request's `name` span"""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, (time.perf_counter() - started) * 1000)
+
+
+def json_body(data: Any, **kwargs) -> str:
+    """json.dumps for response bodies, timed as the serialize span"""
+    with span("serialize"):
+        return json.dumps(data, **kwargs)
+
+
+def statement_text(sql: Any, cursor: Any = None) -> str:
+    """One-line SQL text for logs: str, bytes or psycopg2.sql.Composed"""
+    if hasattr(sql, "as_string") and cursor is not None:
+        sql = sql.as_string(cursor)
+    elif isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    return " ".join(str(sql).split())
+
+
+def _on_db_event(
+    event: str,
+    elapsed_ms: float,
+    sql: Any = None,
+    rows: Optional[int] = None,
+    cursor: Any = None,
+    **details,
+) -> None:
+    timing = _current.get()
+    if timing is None:
+        return
+    if event == "connect":
+        timing.add("db_connect", elapsed_ms)
+        return
+    timing.add("db", elapsed_ms)
+    timing.statements.append(
+        {
+            "sql": statement_text(sql, cursor)[:200],
+            "ms": round(elapsed_ms, 2),
+            "rows": rows if rows is not None and rows >= 0 else None,
+        }
+    )
+
+
+db_utils.add_db_hook(_on_db_event)
+
+
+def server_timing(timing: RequestTiming, total_ms: float) -> str:
+    """Server-Timing header value, e.g. db;dur=12.3;desc="3 queries", total;dur=15.0"""
+    parts = []
+    for name, elapsed_ms in timing.spans.items():
+        part = f"{name};dur={elapsed_ms:.1f}"
+        if name == "db":
+            part += f';desc="{len(timing.statements)} queries"'
+        parts.append(part)
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+
+def _metric_name(span_name: str) -> str:
+    return "".join(word.capitalize() for word in span_name.split("_")) + "Ms"
+
+
+def emf_record(
+    timing: RequestTiming, total_ms: float, status_code: Optional[int], context: Any = None
+) -> Dict[str, Any]:
+    """One EMF log record: metrics for every span, the statements as properties"""
+    spans = {name: 0.0 for name in STANDARD_SPANS}
+    spans.update(timing.spans)
+    values = {_metric_name(name): round(elapsed_ms, 2) for name, elapsed_ms in spans.items()}
+    values["TotalMs"] = round(total_ms, 2)
+    rows = [statement["rows"] for statement in timing.statements if statement["rows"] is not None]
+    return {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [
+                {
+                    "Namespace": NAMESPACE,
+                    "Dimensions": [["Service", "Handler"]],
+                    "Metrics": [{"Name": name, "Unit": "Milliseconds"} for name in values]
+                    + [{"Name": "DbQueries", "Unit": "Count"}, {"Name": "DbRows", "Unit": "Count"}],
+                }
+            ],
+        },
+        "Service": SERVICE,
+        "Handler": timing.handler,
+        **values,
+        "DbQueries": len(timing.statements),
+        "DbRows": sum(rows),
+        "StatusCode": status_code,
+        "RequestId": getattr(context, "aws_request_id", None),
+        "Statements": timing.statements[:MAX_LOGGED_STATEMENTS],
+    }
+
+
+def emit(record: Dict[str, Any]) -> None:
+    """EMF records must be the whole log line, so they bypass the logging prefix"""
+    print(json.dumps(record, default=str), flush=True)
+
+
+def timed_handler(handler: Callable) -> Callable:
+    """Decorator for lambda_handler functions: time the request and report it"""
+    name = handler.__module__.rsplit(".", 1)[-1]
+
+    @wraps(handler)
+    def wrapper(event: Dict[str, Any], context: Any) -> Any:
+        if not ENABLED or _current.get() is not None:
+            return handler(event, context)
+        timing = RequestTiming(name)
+        token = _current.set(timing)
+        response = None
+        try:
+            response = handler(event, context)
+            return response
+        finally:
+            _current.reset(token)
+            total_ms = timing.elapsed_ms()
+            status_code = response.get("statusCode") if isinstance(response, dict) else None
+            if status_code is not None and SERVER_TIMING_HEADER:
+                response["headers"] = {
+                    **(response.get("headers") or {}),
+                    "Server-Timing": server_timing(timing, total_ms),
+                }
+            emit(
+                emf_record(timing, total_ms, status_code if response is not None else 500, context)
+            )
+
+    return wrapper